@@ -1,37 +1,44 @@
 import streamlit as st
 import requests
-from datetime import datetime, timedelta, timezone, time
+from datetime import datetime
+from io import BytesIO
+import contextlib
+import contextvars
+import itertools
 import json
-import openai
-import os
 import re
-from urllib.parse import urlparse
-from config import KEYWORD_CATEGORIES, NAVER_API_SETTINGS
-
-# 페이지 설정
-st.set_page_config(
-    page_title="PwC 뉴스 분석기",
-    page_icon="logo_orange.png",
-    layout="wide"
-)
-
-# 한국 시간대 설정
-KST = timezone(timedelta(hours=9))
-
-# 유효언론사 목록 정의 (삼일PwC, 경쟁사 제외한 카테고리에서 사용)
-VALID_PRESS = {
-    # 대형 언론사 (최우선)
-    "조선일보": 1, "중앙일보": 2, "동아일보": 3,
-    "한국경제": 4, "매일경제": 5, "연합뉴스": 6,
-    # 전문 경제지 (우선)
-    "이데일리": 7, "아시아경제": 8, "뉴스핌": 9, "뉴시스": 10,
-    "헤럴드경제": 11, "더벨": 12, "비즈니스포스트": 13, "머니투데이": 14,
-    # 기타 유효언론사
-    "KBS": 15, "경향신문": 16, "노컷뉴스": 17, "데일리안": 18, "뉴스1": 19, "매경이코노미": 20
-}
+import time as time_module
+from config import KEYWORD_CATEGORIES, VALID_PRESS, NAVER_API_SETTINGS, JOB_SETTINGS, DEFAULT_GPT_MODEL, DEFAULT_NEWS_COUNT_PER_KEYWORD, EMBEDDING_SETTINGS, FULLTEXT_SETTINGS, ARCHIVE_SETTINGS, CHECKPOINT_SETTINGS, SPOOL_SETTINGS, BACKFILL_SETTINGS, CACHE_SETTINGS, DELTA_SETTINGS, KST
+from jobs import get_job_runner, ACTIVE_STATUSES, STATUS_DONE
+from cache import news_cache, llm_cache, make_cache_key
+from press import resolve_press
+from normalize import normalize_items
+from tracing import Tracer, activate, span, maybe_profile
+from embeddings import dedupe_news, embedding_store, article_id
+from ranking import rank_candidates, fallback_selection
+from fulltext import attach_fulltext
+from archive import get_archive, DECISION_FAILED
+from query_planner import plan_run, RunQueryFetcher
+from model_router import route_model, validate_selection, model_stats
+from prompts import build_messages, PROMPT_VERSION
+from llm_client import get_llm_client
+from checkpoint import get_checkpoint_store, RunCheckpoint
+from circuit_breaker import get_breaker, breaker_states, degraded_services, CircuitOpenError, SERVICE_LABELS
+from spool import NewsSpool
+from scheduler import schedule_run, priority_order, get_call_ledger, CONSUMER_RUN, CONSUMER_BACKFILL
+from backfill import get_backfill_store, run_backfill_job, BACKFILL_LABELS, SHARD_LABELS, SHARD_DONE, SHARD_FALLBACK
+from prewarm import get_prewarmer, default_window
+from delta import load_baseline, delta_candidates, has_new_articles, carried_selection, summarize_delta, judged_ids
+
+# openai, openpyxl은 무거운 패키지라 처음 사용할 때 불러온다 (앱 시작 시간 단축)
+
+# 회로 차단기 상태 / 대체 수집 출처 표시 이름
+BREAKER_STATE_LABELS = {"closed": "정상", "open": "차단", "half_open": "복구 확인 중"}
+JOB_STATUS_LABELS = {"queued": "대기", "running": "실행 중", "done": "완료", "failed": "실패", "interrupted": "중단"}
+FALLBACK_SOURCE_LABELS = {"google_news": SERVICE_LABELS["google_news"], "archive": "로컬 아카이브"}
 
 # 커스텀 CSS
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main-title {
         color: #d04a02;
@@ -85,794 +92,424 @@ st.markdown("""
         margin: 10px 0;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def setup_page():
+    """페이지 설정과 커스텀 CSS (모듈을 불러올 때가 아니라 main에서 한 번 실행)"""
+    st.set_page_config(
+        page_title="PwC 뉴스 분석기",
+        page_icon="logo_orange.png",
+        layout="wide"
+    )
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
 
-def collect_news_from_naver_api(category_keywords, start_dt, end_dt, category_name="", max_per_keyword=50):
-    """네이버 뉴스 API에서 카테고리별 키워드로 뉴스 수집 - 2개 키워드씩 묶어서 검색"""
-    all_news = []
+# 파이프라인 알림을 모으는 함수 (백그라운드 작업 스레드에는 Streamlit 화면이 없어 st.warning 등이 표시되지 않음)
+_notice_sink = contextvars.ContextVar("news_notice_sink", default=None)
+
+def notify(level, message):
+    """파이프라인 알림 - collect_notices 안(백그라운드 작업)이면 모아 두고, 아니면 화면에 st.<level>로 바로 표시
     
+    level은 "info", "warning", "error" 중 하나.
+    """
+    sink = _notice_sink.get()
+    if sink is None:
+        getattr(st, level)(message)
+    else:
+        sink.append({"level": level, "message": message})
+
+@contextlib.contextmanager
+def collect_notices():
+    """현재 컨텍스트의 파이프라인 알림을 화면 대신 목록에 모음 (with collect_notices() as notices: ...)"""
+    notices = []
+    token = _notice_sink.set(notices)
+    try:
+        yield notices
+    finally:
+        _notice_sink.reset(token)
+
+def render_notices(notices):
+    """모아 둔 파이프라인 알림 표시"""
+    for notice in notices:
+        getattr(st, notice["level"])(notice["message"])
+
+def collect_news_from_naver_api(category_keywords, start_dt, end_dt, category_name="", max_per_keyword=50, on_progress=None, fetcher=None):
+    """네이버 뉴스 API에서 카테고리별 키워드로 뉴스 수집 - query_planner의 검색 계획대로 OR로 묶어서 검색
+
+    on_progress가 주어지면 키워드 검색이 끝날 때마다 누적 수집 건수로 호출한다 (스트리밍 모드용).
+    fetcher(실행 단위 RunQueryFetcher)가 주어지면 다른 카테고리에서 이미 검색한 쿼리는 결과를 재사용한다.
+    """
     # 네이버 API 키 확인
+    if not naver_headers():
+        notify("error", "⚠️ 네이버 API 키가 설정되지 않았습니다. 환경변수 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET을 설정해주세요.")
+        return []
+    
+    # 실행 단위 수집기가 없으면 이 카테고리만의 검색 계획으로 수집
+    if fetcher is None or category_name not in fetcher.plan["categories"]:
+        fetcher = create_run_fetcher({category_name: category_keywords}, start_dt, end_dt, max_per_keyword=max_per_keyword)
+    
+    all_news = fetcher.collect(
+        category_name,
+        on_query=(lambda query, count: on_progress(count)) if on_progress else None,
+        on_error=report_query_error
+    )
+    fetcher.stats.save()
+    return all_news
+
+def report_query_error(query, e):
+    """쿼리 검색 실패 표시 - 회로 차단으로 대체 소스도 못 쓴 경우는 실행 후 장애 배너로 한 번만 알림"""
+    if not isinstance(e, CircuitOpenError):
+        notify("warning", f"'{query}' 검색 중 오류: {str(e)}")
+
+def naver_headers():
+    """네이버 API 인증 헤더 (키가 없으면 None)"""
     client_id = NAVER_API_SETTINGS["client_id"]
     client_secret = NAVER_API_SETTINGS["client_secret"]
-    
     if not client_id or not client_secret:
-        st.error("⚠️ 네이버 API 키가 설정되지 않았습니다. 환경변수 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET을 설정해주세요.")
-        return []
-    
-    # API 헤더 설정
-    headers = {
+        return None
+    return {
         "X-Naver-Client-Id": client_id,
         "X-Naver-Client-Secret": client_secret
     }
+
+def create_run_fetcher(categories, start_dt, end_dt, max_per_keyword=50, spool=None):
+    """실행 단위 검색 수집기 - 카테고리 전체의 검색 계획을 세우고 같은 쿼리는 한 번만 검색 (query_planner.plan_run)
+
+    categories는 {카테고리: 키워드 목록} (수집 순서대로).
+    spool(NewsSpool)이 주어지면 쿼리 결과를 디스크에 내려 두고 다른 카테고리에서 재사용할 때 다시 읽는다.
+    남은 하루 호출 한도나 수집 제한 시간이 부족하면 우선순위가 낮은 카테고리의 검색을 줄인다 (scheduler.schedule_run).
+    """
+    target_count = max_per_keyword * 2
+    plan = plan_run(categories, start_dt, end_dt, capacity=target_count)
+    schedule = schedule_run(plan, list(categories), target_count, get_call_ledger().remaining())
     
-    # 키워드 처리 방식 (카테고리별 다르게 적용)
-    if category_name in ["삼일PwC", "경쟁사"]:
-        # 삼일PwC, 경쟁사: 개별 키워드로 검색
-        keyword_pairs = [(keyword, None) for keyword in category_keywords]
-    else:
-        # 다른 카테고리: 2개씩 묶어서 OR 조건으로 검색
-        keyword_pairs = []
-        for i in range(0, len(category_keywords), 2):
-            if i + 1 < len(category_keywords):
-                keyword_pairs.append((category_keywords[i], category_keywords[i + 1]))
-            else:
-                keyword_pairs.append((category_keywords[i], None))
+    def fetch(query, limit):
+        result = fetch_naver_query(query, start_dt, end_dt, limit)
+        # 하루 호출 한도는 모든 실행/백필이 나눠 쓰므로 보낸 호출을 기록
+        get_call_ledger().add(CONSUMER_RUN, result["http_calls"])
+        return result
     
-    for keyword1, keyword2 in keyword_pairs:
-        try:
-            # 검색 쿼리 생성 (카테고리별 다르게 적용)
-            if category_name in ["삼일PwC", "경쟁사"]:
-                # 삼일PwC, 경쟁사: 개별 키워드
-                query = keyword1
-                keywords = [keyword1]
-            else:
-                # 다른 카테고리: 2개 키워드를 OR 조건으로 검색
-                if keyword2:
-                    query = f"{keyword1} OR {keyword2}"
-                    keywords = [keyword1, keyword2]
-                else:
-                    query = keyword1
-                    keywords = [keyword1]
-            
-            # 페이지네이션을 통한 네이버 뉴스 API 호출
-            all_items = []
-            target_count = max_per_keyword * 2  # 목표 수집 개수
-            current_start = 1
-            
-            while len(all_items) < target_count:
-                params = {
-                    "query": query,
-                    "display": min(100, target_count - len(all_items)),  # 남은 개수만큼 요청
-                    "start": current_start,
-                    "sort": NAVER_API_SETTINGS["sort"]
-                }
-                
-                response = requests.get(
-                    NAVER_API_SETTINGS["base_url"],
-                    headers=headers,
-                    params=params,
-                    timeout=30
-                )
-                
-                if response.status_code != 200:
-                    st.warning(f"'{query}' 검색 중 API 오류: {response.status_code}")
-                    break
-                
-                # JSON 응답 파싱
-                data = response.json()
-                items = data.get('items', [])
-                
-                if not items:  # 더 이상 결과가 없으면 중단
-                    break
-                
-                all_items.extend(items)
-                current_start += len(items)
-                
-                # API 호출 간격 조절
-                import time
-                time.sleep(0.1)
-            
-            items = all_items
-            
+    return RunQueryFetcher(
+        plan,
+        fetch,
+        start_dt, end_dt, target_count,
+        spool=spool,
+        schedule=schedule
+    )
 
-            
+def fetch_naver_query(query, start_dt, end_dt, target_count):
+    """검색 쿼리 하나를 가져와 정규화 (RunQueryFetcher의 fetch 함수)
 
-            
-            # 날짜 필터링 통계를 위한 카운터
-            total_items = len(items)
-            date_filtered_count = 0
-            
-            for item in items:
-                
-                # 날짜 파싱 (네이버 API는 RFC 822 형식)
-                try:
-                    date_str = item.get('pubDate', '')
-                    if date_str:
-                        # RFC 822 형식 파싱: "Wed, 15 Jan 2025 10:30:00 +0900"
-                        from email.utils import parsedate_to_datetime
-                        pub_date = parsedate_to_datetime(date_str)
-                        
-                        # ✅ tz-aware면 그대로 KST로 변환, naive면 UTC로 가정 후 KST로
-                        if pub_date.tzinfo is None:
-                            pub_date = pub_date.replace(tzinfo=timezone.utc).astimezone(KST)
-                        else:
-                            pub_date = pub_date.astimezone(KST)
-                    else:
-                        pub_date = datetime.now(KST)
-                except Exception as date_error:
-                    # 날짜 파싱 실패 시 현재 시간 사용
-                    pub_date = datetime.now(KST)
-                
+    페이지가 도착하는 대로 정규화하고 원본 항목은 버리므로, 메모리에는 기간 내 정규화 기사만 남는다.
+    """
+    counters = {"http_calls": 0, "error": False, "raw_count": 0, "oldest_pub_date": ""}
+    query_news = []
+    with span("naver.query", "collect", query=query) as query_span:
+        # 페이지네이션을 통한 네이버 뉴스 API 호출 - 장애(회로 차단, 타임아웃, 5xx)면 대체 소스 사용
+        try:
+            for page in iter_naver_pages(query, naver_headers(), target_count=target_count, counters=counters):
+                # 페이지 단위 정규화 (HTML 정리, 발행일 파싱, 기간 필터, 언론사 판별)
+                # 검색 쿼리를 키워드로 사용 ("삼일PWC OR 삼일회계법인" 형태)
+                query_news.extend(normalize_items(page, start_dt, end_dt, keyword=query))
+        except (CircuitOpenError, requests.RequestException) as e:
+            if query_span:
+                query_span.set(fallback=type(e).__name__)
+            fallback = fetch_fallback_query(query, start_dt, end_dt, target_count)
+            fallback["http_calls"] += counters["http_calls"]
+            return fallback
+        
+        if query_span:
+            query_span.set(fetched=counters["raw_count"], in_range=len(query_news))
+    
+    return {
+        "raw_count": counters["raw_count"],
+        "oldest_pub_date": counters["oldest_pub_date"],
+        "news": query_news,
+        "http_calls": counters["http_calls"],
+        "complete": not counters["error"]
+    }
 
-                
-                # 날짜 및 시간 범위 확인 (모든 카테고리에서 시간 필터 적용)
-                date_in_range = start_dt <= pub_date <= end_dt
-                
-                if date_in_range:
-                    date_filtered_count += 1
-                    # 제목과 요약 정리
-                    title = clean_html_entities(item.get('title', ''))
-                    summary = clean_html_entities(item.get('description', ''))
-                    
-                    # 검색 쿼리를 키워드로 사용
-                    search_keyword = query  # "삼일PWC OR 삼일회계법인" 형태
-                    
-                    # 언론사 정보 추출 (originallink 우선 사용)
-                    press_name = extract_press_from_url(
-                        url=item.get('link', ''),
-                        originallink=item.get('originallink')
-                    )
-                    
-                    news_item = {
-                        'title': title,
-                        'url': item.get('link', ''),
-                        'date': pub_date.strftime('%Y-%m-%d'),
-                        'summary': summary,
-                        'keyword': search_keyword,
-                        'press': press_name
-                    }
-                    all_news.append(news_item)
-                    
+def fetch_fallback_query(query, start_dt, end_dt, target_count):
+    """네이버 검색을 쓸 수 없을 때 같은 쿼리를 대체 소스로 가져옴 - Google News RSS, 결과가 없으면 로컬 아카이브
 
-                    
-        except Exception as e:
-            st.warning(f"'{query if 'query' in locals() else keyword1}' 검색 중 오류: {str(e)}")
-            continue
+    기사마다 source(수집 출처)를 표시하고, 결과 수 통계에 섞이지 않도록 complete=False로 반환한다.
+    """
+    with span("fallback.query", "collect", query=query) as fallback_span:
+        items, source = fetch_google_news_items(query, target_count), "google_news"
+        news_list = normalize_items(items, start_dt, end_dt, keyword=query)
+        if news_list:
+            # Google News 링크는 중계 주소라 URL로 언론사를 알 수 없으므로 RSS의 언론사명 사용
+            press_by_link = {item["link"]: item["press"] for item in items}
+            news_list = [dict(news, press=press_by_link.get(news["url"]) or news["press"]) for news in news_list]
+        else:
+            source = "archive"
+            terms = [term.strip() for term in query.split(" OR ")]
+            news_list = [
+                dict(news, keyword=query)
+                for news in get_archive().articles_between(
+                    terms, start_dt.astimezone(KST).date().isoformat(), end_dt.astimezone(KST).date().isoformat(),
+                    limit=target_count
+                )
+            ]
+        if fallback_span:
+            fallback_span.set(source=source, items=len(news_list))
     
+    return {
+        "raw_count": len(items),
+        "oldest_pub_date": "",
+        "news": [dict(news, source=source) for news in news_list],
+        "http_calls": 0,
+        "complete": False
+    }
 
+def fetch_google_news_items(query, target_count):
+    """Google News RSS 검색 결과를 네이버 API 항목 형태로 변환 (제목 끝의 ' - 언론사' 제거)"""
+    from googlenews import GoogleNews
+
+    return GoogleNews().search_naver_items(query, k=target_count)
+
+def format_fetch_summary(summary):
+    """실행 단위 검색 공유 결과 문구"""
+    text = f"네이버 검색 {summary['queries']}건 · HTTP {summary['http_calls']}회"
+    if summary["category_queries"] > summary["queries"] + summary["skipped"]:
+        text += (f" (카테고리별로 검색했다면 {summary['category_queries']}건 → "
+                 f"약 {summary['http_calls_saved']}회 절약)")
+    if summary["planned_calls"] is not None:
+        text += f" · 예상 {summary['planned_calls']}회"
+    if summary["skipped"] or summary["late"]:
+        text += f" · 호출 한도/제한 시간으로 뺀 쿼리 {summary['skipped']}건, 얕게 검색한 쿼리 {summary['late']}건"
+    return text
+
+def empty_category_message(fetcher, category):
+    """수집된 기사가 없는 카테고리 안내 - 호출 한도/제한 시간으로 검색을 모두 뺀 경우 구분"""
+    plan = fetcher.schedule["categories"].get(category) if fetcher.schedule else None
+    if plan and plan["full_calls"] and not plan["planned_calls"]:
+        return f"{category} 카테고리는 오늘 남은 네이버 호출 한도/수집 제한 시간이 부족해 수집하지 않았습니다."
+    return f"{category} 카테고리에서 수집된 뉴스가 없습니다."
+
+def call_spend_rows(schedule, summary):
+    """카테고리별 네이버 호출 계획/실제 표 (우선순위 순서)"""
+    return [{
+        "우선순위": plan["priority"],
+        "카테고리": category,
+        "예상 호출": plan["full_calls"],
+        "계획 호출": plan["planned_calls"],
+        "실제 호출": summary["calls_by_category"].get(category, 0),
+        "깊이 축소": plan["shallow"],
+        "제외 쿼리": plan["dropped"]
+    } for category, plan in schedule["categories"].items()]
+
+def iter_naver_pages(query, headers, target_count, counters=None):
+    """네이버 뉴스 API를 페이지 단위로 호출하여 target_count개까지 원본 항목을 페이지별로 전달 (제너레이터)
+
+    counters가 주어지면 http_calls(요청 수), error(API 오류 여부), raw_count(받은 원본 항목 수),
+    oldest_pub_date(마지막으로 받은 항목의 pubDate)를 기록한다.
+    """
+    received = 0
+    current_start = 1
+    breaker = get_breaker("naver")
     
-    return all_news
+    while received < target_count:
+        # 연속 실패로 회로가 열려 있으면 제한 시간을 기다리지 않고 바로 실패 (이미 받은 페이지가 있으면 그만큼만 사용)
+        if not breaker.allow():
+            if not received:
+                raise CircuitOpenError("naver", breaker.retry_in())
+            if counters is not None:
+                counters["error"] = True
+            break
+        
+        params = {
+            "query": query,
+            "display": min(100, target_count - received),  # 남은 개수만큼 요청
+            "start": current_start,
+            "sort": NAVER_API_SETTINGS["sort"]
+        }
+        
+        with span("naver.request", "http", query=query, start=current_start) as request_span:
+            try:
+                response = requests.get(
+                    NAVER_API_SETTINGS["base_url"],
+                    headers=headers,
+                    params=params,
+                    timeout=NAVER_API_SETTINGS["timeout"]
+                )
+            except requests.RequestException as e:
+                breaker.record_failure(e)
+                raise
+            if request_span:
+                request_span.set(status=response.status_code)
+        if counters is not None:
+            counters["http_calls"] += 1
+        
+        # 5xx만 장애로 기록 (429 등은 서비스가 응답한 것이므로 정상)
+        if response.status_code >= 500:
+            error = requests.HTTPError(f"네이버 API 오류: {response.status_code}")
+            breaker.record_failure(error)
+            if not received:
+                raise error
+        else:
+            breaker.record_success()
+        
+        if response.status_code != 200:
+            st.warning(f"'{query}' 검색 중 API 오류: {response.status_code}")
+            if counters is not None:
+                counters["error"] = True
+            break
+        
+        # JSON 응답 파싱
+        data = response.json()
+        items = data.get('items', [])
+        
+        if not items:  # 더 이상 결과가 없으면 중단
+            break
+        
+        received += len(items)
+        current_start += len(items)
+        if counters is not None:
+            counters["raw_count"] = received
+            counters["oldest_pub_date"] = items[-1].get("pubDate", "")
+        yield items
+        
+        # API 호출 간격 조절
+        with span("naver.sleep", "collect"):
+            time_module.sleep(0.1)
 
-def clean_html_entities(text):
-    """HTML 엔티티를 정리하는 함수"""
-    if not text:
-        return ""
-    
-    # HTML 태그 제거
-    import re
-    clean_text = re.sub(r'<[^>]+>', '', text)
-    
-    # HTML 엔티티 디코딩
-    clean_text = clean_text.replace('&quot;', '"')
-    clean_text = clean_text.replace('&amp;', '&')
-    clean_text = clean_text.replace('&lt;', '<')
-    clean_text = clean_text.replace('&gt;', '>')
-    clean_text = clean_text.replace('&apos;', "'")
-    
-    # 연속된 공백 정리
-    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
-    
-    return clean_text
+def press_priority(news):
+    """대표 기사 선택 기준 - 유효언론사 순위가 높고 최신일수록 우선"""
+    date_digits = re.sub(r'\D', '', news.get('date', ''))
+    return (VALID_PRESS.get(news.get('press', ''), 999), -int(date_digits or 0))
 
-def check_title_similarity(title1, title2):
-    """제목 유사도를 계산하는 함수"""
-    if not title1 or not title2:
-        return 0.0
-    
-    # 제목을 소문자로 변환하고 특수문자 제거
-    import re
-    clean_title1 = re.sub(r'[^\w\s]', '', title1.lower())
-    clean_title2 = re.sub(r'[^\w\s]', '', title2.lower())
-    
-    # 단어로 분리
-    words1 = set(clean_title1.split())
-    words2 = set(clean_title2.split())
-    
-    if not words1 or not words2:
-        return 0.0
+def dedupe_candidates(news_list, category_name, enabled=True):
+    """AI 분석 전 의미상 중복 기사 묶기 (embeddings.dedupe_news)
+
+    Returns:
+        (중복 표시가 된 전체 목록, AI에 보낼 대표 기사 목록)
+    """
+    if not enabled or len(news_list) < 2:
+        return news_list, news_list
+    with span("dedupe", "pipeline", category=category_name, items=len(news_list)) as dedupe_span:
+        annotated, representatives = dedupe_news(news_list, priority=press_priority)
+        if dedupe_span:
+            dedupe_span.set(representatives=len(representatives))
+    return annotated, representatives
+
+def prepare_candidates(news_list, category_name, dedupe=True):
+    """AI 분석 후보 준비 - 중복 묶기 후 로컬 중요도 점수 상위 N건만 남김 (ranking.rank_candidates)
+
+    Returns:
+        (중복/순위 밖 표시가 된 전체 목록, AI에 보낼 후보 목록)
+    """
+    news_list, candidates = dedupe_candidates(news_list, category_name, enabled=dedupe)
     
-    # Jaccard 유사도 계산
-    intersection = len(words1.intersection(words2))
-    union = len(words1.union(words2))
+    # 삼일PwC, 경쟁사가 아닌 카테고리는 유효언론사 기사만 순위 경쟁 (AI 분석 후보 필터는 여기 한 곳)
+    if category_name not in ["삼일PwC", "경쟁사"]:
+        candidates = [news for news in candidates if news.get('press', '') in VALID_PRESS]
     
-    return intersection / union if union > 0 else 0.0
+    with span("rank", "pipeline", category=category_name, items=len(candidates)):
+        top, cut = rank_candidates(candidates, category_name)
+    if cut:
+        cut_urls = {news.get('url', '') for news in cut}
+        news_list = [dict(news, rank_cut=True) if news.get('url', '') in cut_urls and 'duplicate_of' not in news else news
+                     for news in news_list]
+    return news_list, top
 
 def extract_press_from_url(url: str, originallink: str | None = None) -> str:
     """
-    URL에서 언론사 정보를 추출.
+    URL에서 언론사 정보를 추출 (press.resolve_press 참고).
     - originallink가 있으면 우선 사용 (네이버 뉴스 원문 복원)
-    - 네이버 뉴스 링크는 별도 처리
-    - 하드코딩 매핑 + 베이스도메인 매핑
-    - 안전한 fallback
+    - 네이버 뉴스 링크는 oid로 판별
+    - press_map.json의 도메인 매핑 (접미사 트라이) + 안전한 fallback
     """
-    if not url and not originallink:
-        return "언론사 정보 없음"
-
-    from urllib.parse import urlparse, parse_qs
-
-    # 1) originallink가 있으면 그걸로 교체 (정확도 ↑)
-    target_url = originallink or url
-    try:
-        parsed = urlparse(target_url)
-        domain = parsed.netloc.lower()
-
-        # www.만 제거한 베이스 도메인 (서브도메인 과대일치 방지)
-        base = domain[4:] if domain.startswith("www.") else domain
-
-        # 네이버 뉴스 특수 처리: news.naver.com / n.news.naver.com / mnews.naver.com
-        if base in {"news.naver.com", "n.news.naver.com", "m.news.naver.com", "mnews.naver.com"}:
-            # 네이버 기사 URL엔 보통 oid(언론사 id) / aid가 포함됨
-            # 예: https://n.news.naver.com/mnews/article/001/0012345678
-            # path 분해해서 article/<oid>/<aid> 패턴 탐색
-            path_parts = [p for p in parsed.path.split("/") if p]
-            press_from_oid = None
-            if "article" in path_parts:
-                try:
-                    i = path_parts.index("article")
-                    oid = path_parts[i + 1]
-                    # 최소 맵만 넣어 실사용: (필요에 따라 확장)
-                    OID_MAP = {
-                        "001": "연합뉴스",
-                        "009": "매일경제",
-                        "015": "한국경제",
-                        "020": "동아일보",
-                        "023": "조선일보",
-                        "024": "매경이코노미",
-                        "025": "중앙일보",
-                        "032": "경향신문",
-                        "056": "KBS",
-                        "079": "노컷뉴스",
-                        "119": "데일리안",
-                        "277": "아시아경제",
-                        "421": "뉴스1",
-                        # 필요 언론사 계속 보강
-                    }
-                    press_from_oid = OID_MAP.get(oid)
-                except Exception:
-                    pass
-
-            # oid로 못 찾았으면 네이버 링크에선 명확히 단정하지 않음
-            return press_from_oid or "네이버 뉴스(원문 확인)"
-
-        # 2) 주요 언론사 매핑 (서브도메인 포함 매칭은 base 기준으로)
-        PRESS_MAP = {
-            "chosun.com": "조선일보",
-            "biz.chosun.com": "조선일보",
-            "joongang.co.kr": "중앙일보",
-            "donga.com": "동아일보",
-            "hankyung.com": "한국경제",
-            "magazine.hankyung.com": "한국경제",
-            "mk.co.kr": "매일경제",
-            "yna.co.kr": "연합뉴스",
-            "fnnews.com": "파이낸셜뉴스",
-            "edaily.co.kr": "이데일리",
-            "asiae.co.kr": "아시아경제",
-            "newspim.com": "뉴스핌",
-            "newsis.com": "뉴시스",
-            "heraldcorp.com": "헤럴드경제",
-            "thebell.co.kr": "더벨",
-            "businesspost.co.kr": "비즈니스포스트",
-            "mt.co.kr": "머니투데이",
-            "dailypharm.com": "데일리팜",
-            "it.chosun.com": "IT조선",
-            "itchosun.com": "IT조선",
-        }
+    return resolve_press(url, originallink)
 
-        # 정확/부분 매칭 (base가 map key이거나, base가 key의 서브도메인인 경우)
-        if base in PRESS_MAP:
-            return PRESS_MAP[base]
-        # base가 예: it.chosun.com 이고 키가 chosun.com인 경우를 커버
-        for k, v in PRESS_MAP.items():
-            if base.endswith(k):
-                return v
+def analyze_news_with_ai(news_list, category_name, on_token=None):
+    """AI를 사용하여 뉴스 분석 및 언론사 판별 - 카테고리별 프롬프트 적용
 
-        # 3) originallink가 없다면, Naver Search API의 `link`에만 의존하므로
-        #    이 경우엔 원문을 못찾을 수 있음 → target_url이 naver가 아니면 base 반환
-        #    (단, 의미없는 첫 세그먼트 title()은 지양)
-        return base
-
-    except Exception:
-        return "언론사 정보 없음"
-
-
-
-
-
-def analyze_news_with_ai(news_list, category_name):
-    """AI를 사용하여 뉴스 분석 및 언론사 판별 - 카테고리별 프롬프트 적용"""
+    on_token이 주어지면 OpenAI 스트리밍 API로 응답을 받으며, 토큰이 도착할 때마다
+    지금까지 누적된 응답 텍스트로 호출한다.
+    """
     try:
-        client = openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
-        
-        # 삼일PwC, 경쟁사가 아닌 카테고리는 유효언론사만 필터링
-        if category_name not in ["삼일PwC", "경쟁사"]:
-            filtered_news_list = [news for news in news_list if news.get('press', '') in VALID_PRESS]
-            if not filtered_news_list:
-                st.warning(f"{category_name} 카테고리에서 유효언론사 기사가 없습니다.")
-                return {
-                    "selected_news": [],
-                    "total_analyzed": len(news_list),
-                    "selected_count": 0,
-                    "error": "유효언론사 기사 없음"
-                }
-            news_list = filtered_news_list  # 필터링된 목록으로 교체
-        
-        # 뉴스 목록을 텍스트로 변환
-        news_text = ""
-        for i, news in enumerate(news_list, 1):
-            news_text += f"{i}. 제목: {news.get('title', '제목 없음')}\n"
-            news_text += f"   요약: {news.get('summary', '요약 없음')}\n"
-            news_text += f"   링크: {news.get('url', '링크 없음')}\n"
-            news_text += f"   언론사: {news.get('press', '언론사 정보 없음')}\n"
-            news_text += f"   날짜: {news.get('date', '날짜 없음')}\n"
-            news_text += f"   검색키워드: {news.get('keyword', '키워드 없음')}\n\n"
+        # 후보 없음 - 삼일PwC, 경쟁사가 아닌 카테고리는 유효언론사 기사만 후보로 남음 (prepare_candidates)
+        if not news_list:
+            notify("warning", f"{category_name} 카테고리에서 유효언론사 기사가 없습니다.")
+            return {
+                "selected_news": [],
+                "total_analyzed": 0,
+                "selected_count": 0,
+                "error": "유효언론사 기사 없음"
+            }
         
-        # 카테고리별 프롬프트 설정
-        if category_name == "삼일PwC":
-            # 삼일PwC 전용 상세 프롬프트
-            analysis_prompt = f"""
-당신은 삼일 회계법인 전문 뉴스 분석가입니다. 삼일PwC 관련 뉴스를 분석하여 중요한 뉴스를 선별하세요.
-
-삼일회계법인과 관련이 높은 것을 우선순위로 선별해주세요
-단, 중복이 있은 경우 1건만 선택해주세요
-제목의 중복 뿐 아니라 내용의 유사도가 너무 높은 것도 제외합니다.
-
-**중요**: 
-- **무조건 2개 이상의 뉴스를 반드시 선별해야 합니다.** 2개 미만으로 선별하면 안됩니다.
-
-- 언론사명은 정확하게 표기, 선별 이유는 간단명료하게.
-
-{news_text}
-
-선별된 뉴스를 다음과 같이 나열하세요:
-
-[뉴스 제목]
-선별 이유: [간단한 선별 이유]
-링크: [뉴스 URL]
-
-[뉴스 제목]
-선별 이유: [간단한 선별 이유]
-링크: [뉴스 URL]
-
-...
-"""
-        elif category_name == "경쟁사":
-            # 경쟁사 전용 상세 프롬프트
-            analysis_prompt = f"""
-당신은 회계법인 전문 뉴스 분석가입니다. 경쟁 회계법인(삼정KPMG, 한영EY, 딜로이트안진 등) 관련 뉴스를 분석하여 중요한 뉴스만 선별하세요.
-
-무조건 2건의 기사는 포함해야합니다.
-
-[우선순위]
-- 경쟁사 회계법인이 기사 주제일 때
-- 경쟁사가 핵심 역할(자문·감정·보고서·매각주관 등)을 맡았을 때
-- 경쟁사 보고서·코멘트·발표가 기사 논거의 중심일 때
-- 경쟁사 자체 발표·행사·보도자료
-
-[제외(N)]
-- 스포츠 기사
-- 광고성/스폰서 기사
-- 시스템 오류/버그/장애 관련 단순 보도
-- 목표주가/증권사 리포트 기사
-- 외국어 기사
-
-[중복 제거]
-- 같은 이슈는 반드시 1건만 남긴다
-- 제목/내용 유사도가 높으면 중복으로 간주
-- 다만 핵심 사건이나 시점이 다르면 별개 이슈로 인정
-
-**중요**
-- 무조건 2개 이상은 반드시 선별해야 함
-- 가능하면 3개까지 선별하되, 같은 이슈 중복은 금지
-- 기사 내용도 중복되면 안 됨
-- 언론사명은 정확하게, 선별 이유는 간단명료하게 작성
-
-
-
-{news_text}
-
-선별된 뉴스를 다음과 같이 나열하세요:
-
-[뉴스 제목]
-선별 이유: [간단한 선별 이유]
-링크: [뉴스 URL]
-
-[뉴스 제목]
-선별 이유: [간단한 선별 이유]
-링크: [뉴스 URL]
-
-...
-"""
-        else:
-            # 다른 카테고리용 일반 프롬프트 (유효언론사는 이미 필터링됨)
-            analysis_prompt = f"""
-다음은 '{category_name}' 카테고리로 수집된 뉴스 목록입니다. (유효언론사만 포함)
-
-[선별 기준]
-- 재무/실적 정보 (매출, 영업이익, 순이익, 투자계획)
-- 회계/감사 관련 (회계처리 변경, 감사의견, 회계법인 소식)
-- 비즈니스 중요도 (신규사업, M&A, 조직변화, 경영진 인사)
-- 산업 동향 (정책, 규제, 시장 변화)
-
-다음 조건 중 하나라도 해당하는 뉴스는 제외하세요:
-
-1. 경기 관련 내용
-   - 스포츠단 관련 내용
-   - 키워드: 야구단, 축구단, 구단, KBO, 프로야구, 감독, 선수
-
-2. 신제품 홍보, 사회공헌, ESG, 기부 등
-   - 키워드: 출시, 기부, 환경 캠페인, 브랜드 홍보, 사회공헌, 나눔, 캠페인 진행, 소비자 반응
-
-3. 단순 시스템 장애, 버그, 서비스 오류
-   - 키워드: 일시 중단, 접속 오류, 서비스 오류, 버그, 점검 중, 업데이트 실패
-
-4. 기술 성능, 품질, 테스트 관련 보도
-   - 키워드: 우수성 입증, 기술력 인정, 성능 비교, 품질 테스트, 기술 성과
-   
-5. 목표가 관련 보도
-   - 키워드: 목표가, 목표주가 달성, 목표주가 도달, 목표주가 향상, 목표가↑, 목표가
-
-6. 학생 정책 관련한 기사
-7. 교육 정책 관련한 기사
-8. 단순 워크숍 관련한 기사
-9. 단순 세미나 관련한 기사
-
-다음 기준에 해당하는 뉴스가 있다면 반드시 선택해야 합니다:
-
-1. 재무/실적 관련 정보 (최우선 순위)
-   - 매출, 영업이익, 순이익 등 실적 발표
-   - 재무제표 관련 정보
-   - 배당 정책 변경
-
-2. 회계/감사 관련 정보 (최우선 순위)
-   - 회계처리 방식 변경
-   - 감사의견 관련 내용
-   - 내부회계관리제도
-   - 회계 감리 결과
-   
-3. 구조적 기업가치 변동 정보 (높은 우선순위)
-    - 신규사업/투자/계약에 대한 내용
-    - 대외 전략(정부 정책, 글로벌 파트너, 지정학 리스크 등)
-    - 기업의 새로운 사업전략 및 방향성, 신사업 등
-    - 기업의 전략 방향성에 영향을 미칠 수 있는 정보
-    - 기존 수입모델/사업구조/고객구조 변화
-    - 공급망/수요망 등 valuechain 관련 내용 (예: 대형 생산지 이전, 주력 사업군 정리 등) 
-
-4. 기업구조 변경 정보 (높은 우선순위)
-   - 인수합병(M&A)
-   - 자회사 설립/매각
-   - 지분 변동
-   - 조직 개편
-
-**언론사 우선순위**
-다음 순서로 우선선별하세요:
-1. 대형 언론사: 조선일보 > 중앙일보 > 동아일보 > 한국경제 > 매일경제 > 연합뉴스
-2. 전문 경제지: 이데일리 > 아시아경제 > 뉴스핌 > 뉴시스 > 헤럴드경제 > 더벨 > 비즈니스포스트 > 머니투데이
-3. 기타 언론사: KBS > 경향신문 > 노컷뉴스 > 데일리안 > 뉴스1 > 매경이코노미
-
-**중복 제거 기준**
-다음 기준으로 중복 기사를 제거하세요:
-
-1. **동일 이슈 중복 보도**
-   - 같은 사건/이슈에 대한 여러 언론사 보도 중 가장 상세하고 신뢰할 수 있는 기사만 선택
-   - 우선순위: 조선일보 > 중앙일보 > 동아일보 > 한국경제 > 매일경제 > 연합뉴스 등 대형·원문 보도 매체
-
-2. **기사 품질 기준**
-   - 더 자세한 정보를 포함한 기사 우선
-   - 주요 인용문이나 전문가 의견이 포함된 기사 우선
-   - 단순 보도보다 분석적 내용이 포함된 기사 우선
-
-3. **시간 순서**
-   - 최초 보도나 가장 최신 정보를 담은 기사 우선
-
-4. **제목 유사성 판단**
-   - 제목이 거의 동일하거나 핵심 내용이 같은 경우 중복으로 간주
-   - 예: "삼성전자 실적 발표" vs "삼성전자, 2024년 실적 공개" → 중복
-   - 예: "삼성전자 실적 발표" vs "삼성전자 신규 사업 진출" → 중복 아님
-
-[응답 형식]
-선별된 뉴스를 다음과 같이 나열해주세요:
-
-1. [뉴스 제목]
-  
-   선별 이유: [간단한 선별 이유]
-   링크: [뉴스 URL]
-
-2. [뉴스 제목]
-  
-   선별 이유: [간단한 선별 이유]
-   링크: [뉴스 URL]
-
-...
-
-**중요**: 
-- **무조건 2개 이상의 뉴스를 반드시 선별해야 합니다.** 1개 미만으로 선별하면 안됩니다.
-- 가능하면 5개까지 선별하되, 최소 2개는 반드시 선별하세요.
-- 선별된 뉴스에 중복이 없어야 합니다.
-- 내용도 반드시 중복되면 안됩니다.
-- 언론사명은 정확하게 표기해주세요.
-- 선별 이유는 간단명료하게 작성해주세요.
-"""
-
-        # 분석할 뉴스 목록 추가
-        news_list_text = "\n".join([f"{i+1}. {news.get('title', '')} - {news.get('url', '')}" for i, news in enumerate(news_list)])
-        analysis_prompt += f"\n\n분석할 뉴스 목록:\n{news_list_text}"
+        # 카테고리/후보 수에 따라 모델 선택 (model_router)
+        route = route_model(category_name, len(news_list))
+        if route["model"] is None:
+            # 후보가 최소 선별 수 이하 - AI 응답도 전체 선택과 같으므로 호출 생략
+            model_stats.record_skip()
+            selected_news = [{
+                "title": news.get('title', '제목 없음'),
+                "url": news.get('url', ''),
+                "date": news.get('date', ''),
+                "keyword": news.get('keyword', ''),
+                "press_analysis": news.get('press', '언론사 정보 없음'),
+                "selection_reason": f"AI 분석 생략 ({route['reason']})",
+                "importance": "보통"
+            } for news in news_list]
+            return {
+                "selected_news": selected_news,
+                "total_analyzed": len(news_list),
+                "selected_count": len(selected_news),
+                "model": None
+            }
         
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {"role": "system", "content": "당신은 회계법인 관점에서 뉴스를 분석하는 전문가입니다."},
-                {"role": "user", "content": analysis_prompt}
-            ],
-            temperature=0.3
-        )
+        # 고정 지침이 앞, 기사 목록이 맨 뒤 (OpenAI 프롬프트 캐싱 적용 - prompts.py)
+        messages = build_messages(category_name, news_list)
         
-        ai_response = response.choices[0].message.content
+        model = route["model"]
+        try:
+            ai_response = request_chat_completion(messages, model=model, on_token=on_token)
+        except Exception as e:
+            # OpenAI 장애(회로 차단, 재시도 후에도 실패)면 로컬 중요도 점수로 대신 선별
+            return degraded_selection(news_list, category_name, e)
         
         # AI 응답을 파싱하여 구조화된 데이터로 변환
         try:
-            parsed_result = parse_ai_response(ai_response, news_list)
+            with span("llm.parse", "llm", category=category_name):
+                parsed_result = parse_ai_response(ai_response, news_list)
             
-            # ✅ 폴백: AI가 0건 선별하면, 카테고리별로 자동으로 뽑는다.
+            # 결과 검증 실패(선별 수 부족, 후보에 없는 링크) 시 더 강한 모델로 다시 분석
+            problems = validate_selection(parsed_result, news_list)
+            escalated_from = None
+            if problems and route["escalate_to"]:
+                notify("info", f"[모델 전환] {category_name}: {model} 결과 검증 실패 ({', '.join(problems)}) → {route['escalate_to']}로 다시 분석")
+                model_stats.record_escalation()
+                try:
+                    escalated_response = request_chat_completion(messages, model=route["escalate_to"], on_token=on_token)
+                    with span("llm.parse", "llm", category=category_name):
+                        escalated_result = parse_ai_response(escalated_response, news_list)
+                    # 강한 모델 결과도 검증에 실패하면 문제가 더 적은 쪽을 사용
+                    if len(validate_selection(escalated_result, news_list)) <= len(problems):
+                        ai_response, parsed_result = escalated_response, escalated_result
+                        escalated_from, model = model, route["escalate_to"]
+                except Exception as e:
+                    notify("warning", f"{route['escalate_to']} 재분석 실패, {model} 결과 사용: {str(e)}")
+            
+            # ✅ 폴백: AI가 0건 선별하면, 로컬 중요도 점수 순으로 자동으로 뽑는다.
             if (not parsed_result.get("selected_news")) and news_list:
-                # 카테고리별 폴백 개수 설정
-                if category_name == "삼일PwC":
-                    fallback_count = 2  # 삼일PwC는 2건
-                elif category_name == "경쟁사":
-                    fallback_count = 2  # 경쟁사는 2건
-                else:
-                    fallback_count = 1  # 다른 카테고리는 1건
-                
-                # 삼일PwC 폴백 로직: 삼일회계법인과 가장 관련성이 높은 뉴스 선택
-                if category_name == "삼일PwC":
-                    def samil_relevance_score(news):
-                        title = news.get("title", "").lower()
-                        summary = news.get("summary", "").lower()
-                        
-                        # 삼일PwC 관련 키워드 점수 계산
-                        samil_keywords = [
-                            "삼일pwc", "삼일회계법인", "삼일 pwc", "삼일 회계법인",
-                            "삼일p&c", "삼일 p&c", "삼일회계", "삼일 회계"
-                        ]
-                        
-                        # 제목에서 삼일PwC 키워드 발견 시 최고점
-                        title_score = 0
-                        for keyword in samil_keywords:
-                            if keyword in title:
-                                title_score = 100
-                                break
-                        
-                        # 요약에서 삼일PwC 키워드 발견 시 높은 점수
-                        summary_score = 0
-                        for keyword in samil_keywords:
-                            if keyword in summary:
-                                summary_score = 50
-                                break
-                        
-                        # 검색 키워드에서 삼일PwC 포함 시 추가 점수
-                        keyword_score = 0
-                        search_keyword = news.get("keyword", "").lower()
-                        if any(keyword in search_keyword for keyword in samil_keywords):
-                            keyword_score = 30
-                        
-                        # 언론사 점수 (유효언론사 우선)
-                        press = news.get("press", "")
-                        press_score = VALID_PRESS.get(press, 999)
-                        
-                        # 날짜 점수 (최신 우선, 문자열 비교로 충분)
-                        date_score = news.get("date", "0000-00-00")
-                        
-                        # 총점 계산 (관련성 > 언론사 > 날짜 순)
-                        total_score = (
-                            -(title_score + summary_score + keyword_score),  # 관련성 점수 (높을수록 우선)
-                            press_score,  # 언론사 점수 (낮을수록 우선)
-                            date_score   # 날짜 (최신 우선)
-                        )
-                        
-                        return total_score
-                    
-                    # 삼일PwC 관련성 기준으로 정렬하여 선택 (중복 제거 포함)
-                    sorted_news = sorted(news_list, key=samil_relevance_score)
-                    selected_news_list = []
-                    
-                    for news in sorted_news:
-                        if len(selected_news_list) >= fallback_count:
-                            break
-                            
-                        # 중복 체크
-                        is_duplicate = False
-                        for selected in selected_news_list:
-                            # 제목 유사도 체크
-                            title_similarity = check_title_similarity(news.get("title", ""), selected.get("title", ""))
-                            if title_similarity > 0.7:  # 70% 이상 유사하면 중복으로 간주
-                                is_duplicate = True
-                                break
-                        
-                        if not is_duplicate:
-                            title = news.get("title", "").lower()
-                            summary = news.get("summary", "").lower()
-                            
-                            # 관련성 수준 판단
-                            samil_keywords = ["삼일pwc", "삼일회계법인", "삼일 pwc", "삼일 회계법인"]
-                            has_samil_in_title = any(keyword in title for keyword in samil_keywords)
-                            has_samil_in_summary = any(keyword in summary for keyword in samil_keywords)
-                            
-                            if has_samil_in_title:
-                                fallback_reason = f"AI 무선별 → 폴백(제목에 삼일PwC 키워드 포함 자동선택 {len(selected_news_list)+1}/{fallback_count})"
-                            elif has_samil_in_summary:
-                                fallback_reason = f"AI 무선별 → 폴백(요약에 삼일PwC 키워드 포함 자동선택 {len(selected_news_list)+1}/{fallback_count})"
-                            else:
-                                fallback_reason = f"AI 무선별 → 폴백(검색키워드 기준 자동선택 {len(selected_news_list)+1}/{fallback_count})"
-                            
-                            selected_news_list.append({
-                                "title": news.get("title", "제목 없음"),
-                                "url": news.get("url", ""),
-                                "date": news.get("date", ""),
-                                "keyword": news.get("keyword", ""),
-                                "press_analysis": news.get("press", "언론사 정보 없음"),
-                                "selection_reason": fallback_reason,
-                                "importance": "보통",
-                            })
-                
-                elif category_name == "경쟁사":
-                    # 경쟁사 폴백 로직: 삼정KPMG, 딜로이트안진, 한영EY와 가장 관련성이 높은 뉴스 선택
-                    def competitor_relevance_score(news):
-                        title = news.get("title", "").lower()
-                        summary = news.get("summary", "").lower()
-                        
-                        # 경쟁사 회계법인 관련 키워드 점수 계산
-                        competitor_keywords = [
-                            # 삼정KPMG
-                            "삼정kpmg", "삼정 kpmg", "삼정회계법인", "삼정 회계법인", "삼정회계", "삼정 회계",
-                            # 딜로이트안진
-                            "딜로이트안진", "딜로이트 안진", "안진회계법인", "안진 회계법인", "안진회계", "안진 회계",
-                            # 한영EY
-                            "한영ey", "한영 ey", "한영회계법인", "한영 회계법인", "한영회계", "한영 회계",
-                            # 기타 경쟁사
-                            "kpmg", "deloitte", "ey", "ernst", "young", "pwc", "pricewaterhouse"
-                        ]
-                        
-                        # 제목에서 경쟁사 키워드 발견 시 최고점
-                        title_score = 0
-                        for keyword in competitor_keywords:
-                            if keyword in title:
-                                title_score = 100
-                                break
-                        
-                        # 요약에서 경쟁사 키워드 발견 시 높은 점수
-                        summary_score = 0
-                        for keyword in competitor_keywords:
-                            if keyword in summary:
-                                summary_score = 50
-                                break
-                        
-                        # 검색 키워드에서 경쟁사 포함 시 추가 점수
-                        keyword_score = 0
-                        search_keyword = news.get("keyword", "").lower()
-                        if any(keyword in search_keyword for keyword in competitor_keywords):
-                            keyword_score = 30
-                        
-                        # 언론사 점수 (유효언론사 우선)
-                        press = news.get("press", "")
-                        press_score = VALID_PRESS.get(press, 999)
-                        
-                        # 날짜 점수 (최신 우선, 문자열 비교로 충분)
-                        date_score = news.get("date", "0000-00-00")
-                        
-                        # 총점 계산 (관련성 > 언론사 > 날짜 순)
-                        total_score = (
-                            -(title_score + summary_score + keyword_score),  # 관련성 점수 (높을수록 우선)
-                            press_score,  # 언론사 점수 (낮을수록 우선)
-                            date_score   # 날짜 (최신 우선)
-                        )
-                        
-                        return total_score
-                    
-                    # 경쟁사 관련성 기준으로 정렬하여 선택 (중복 제거 포함)
-                    sorted_news = sorted(news_list, key=competitor_relevance_score)
-                    selected_news_list = []
-                    
-                    for news in sorted_news:
-                        if len(selected_news_list) >= fallback_count:
-                            break
-                            
-                        # 중복 체크
-                        is_duplicate = False
-                        for selected in selected_news_list:
-                            # 제목 유사도 체크
-                            title_similarity = check_title_similarity(news.get("title", ""), selected.get("title", ""))
-                            if title_similarity > 0.7:  # 70% 이상 유사하면 중복으로 간주
-                                is_duplicate = True
-                                break
-                        
-                        if not is_duplicate:
-                            title = news.get("title", "").lower()
-                            summary = news.get("summary", "").lower()
-                            
-                            # 관련성 수준 판단
-                            competitor_keywords = [
-                                "삼정kpmg", "삼정 kpmg", "삼정회계법인", "딜로이트안진", "딜로이트 안진", 
-                                "안진회계법인", "한영ey", "한영 ey", "한영회계법인"
-                            ]
-                            has_competitor_in_title = any(keyword in title for keyword in competitor_keywords)
-                            has_competitor_in_summary = any(keyword in summary for keyword in competitor_keywords)
-                            
-                            if has_competitor_in_title:
-                                fallback_reason = f"AI 무선별 → 폴백(제목에 경쟁사 키워드 포함 자동선택 {len(selected_news_list)+1}/{fallback_count})"
-                            elif has_competitor_in_summary:
-                                fallback_reason = f"AI 무선별 → 폴백(요약에 경쟁사 키워드 포함 자동선택 {len(selected_news_list)+1}/{fallback_count})"
-                            else:
-                                fallback_reason = f"AI 무선별 → 폴백(검색키워드 기준 자동선택 {len(selected_news_list)+1}/{fallback_count})"
-                            
-                            selected_news_list.append({
-                                "title": news.get("title", "제목 없음"),
-                                "url": news.get("url", ""),
-                                "date": news.get("date", ""),
-                                "keyword": news.get("keyword", ""),
-                                "press_analysis": news.get("press", "언론사 정보 없음"),
-                                "selection_reason": fallback_reason,
-                                "importance": "보통",
-                            })
-                
-                else:
-                    # 다른 카테고리 폴백 로직 (기존과 동일)
-                    valid_press = VALID_PRESS
-                    
-                    def score(n):
-                        p = n.get("press", "")
-                        # 유효언론사가 아니면 최하위 점수 부여
-                        if p not in valid_press:
-                            return (999, n.get("date", "0000-00-00"))
-                        return (valid_press.get(p, 999),  # 언론사 점수 낮을수록 우선
-                                n.get("date", "0000-00-00"))  # 날짜 최신 우선(문자열 비교 OK: YYYY-MM-DD)
-
-                    # 다른 카테고리는 유효언론사만 필터링
-                    filtered_news = [n for n in news_list if n.get("press", "") in VALID_PRESS]
-                    
-                    if filtered_news:
-                        # 상위 N건 선택
-                        best_news = sorted(filtered_news, key=score)[:fallback_count]
-                    else:
-                        # 필터링된 뉴스가 없으면 전체에서 최상위 선택
-                        best_news = sorted(news_list, key=lambda x: (999, x.get("date", "0000-00-00")))[:fallback_count]
-
-                    # 선택된 뉴스들을 결과에 추가
-                    selected_news_list = []
-                    for i, news in enumerate(best_news):
-                        is_valid_press = news.get("press", "") in VALID_PRESS
-                        fallback_reason = f"AI 무선별 → 폴백(유효언론사/최신성 기준 자동선택 {i+1}/{fallback_count})" if is_valid_press else f"AI 무선별 → 폴백(전체언론사/최신성 기준 자동선택 {i+1}/{fallback_count})"
-                        
-                        selected_news_list.append({
-                            "title": news.get("title", "제목 없음"),
-                            "url": news.get("url", ""),
-                            "date": news.get("date", ""),
-                            "keyword": news.get("keyword", ""),
-                            "press_analysis": news.get("press", "언론사 정보 없음"),
-                            "selection_reason": fallback_reason,
-                            "importance": "보통",
-                        })
-                
+                selected_news_list = fallback_selection(news_list, category_name)
                 parsed_result = {
                     "selected_news": selected_news_list,
                     "total_analyzed": len(news_list),
                     "selected_count": len(selected_news_list)
                 }
             
+            parsed_result["model"] = model
+            if escalated_from:
+                parsed_result["escalated_from"] = escalated_from
+            
             # AI 분석 후 필터링 정보 표시
-            st.info(f"[AI 선별 결과] {category_name}: {len(parsed_result['selected_news'])}개 기사 선별")
+            notify("info", f"[AI 선별 결과] {category_name}: {len(parsed_result['selected_news'])}개 기사 선별 ({model})")
             
             return parsed_result
         except Exception as parse_error:
-            st.warning(f"AI 응답 파싱 중 오류: {str(parse_error)}")
+            notify("warning", f"AI 응답 파싱 중 오류: {str(parse_error)}")
             # 파싱 실패 시 기본 구조 반환
             return {
                 "selected_news": [],
@@ -883,7 +520,7 @@ def analyze_news_with_ai(news_list, category_name):
             }
             
     except Exception as e:
-        st.error(f"AI 분석 중 오류: {str(e)}")
+        notify("error", f"AI 분석 중 오류: {str(e)}")
         return {
             "selected_news": [],
             "total_analyzed": len(news_list),
@@ -891,6 +528,127 @@ def analyze_news_with_ai(news_list, category_name):
             "error": f"AI 분석 실패: {str(e)}"
         }
 
+def degraded_selection(news_list, category_name, error):
+    """AI 요청이 실패했을 때의 대체 결과 - 로컬 중요도 점수 순 선별 (degraded에 사유 기록, 캐시/체크포인트에 남기지 않음)"""
+    selected_news = fallback_selection(news_list, category_name)
+    return {
+        "selected_news": selected_news,
+        "total_analyzed": len(news_list),
+        "selected_count": len(selected_news),
+        "model": None,
+        "degraded": str(error)
+    }
+
+def is_degraded_result(result):
+    """대체 소스로 수집했거나 AI 없이 선별한 카테고리 결과인지 (다시 실행하면 원래 소스로 재시도)"""
+    return ('degraded' in result['analysis_result']
+            or any(news.get('source') for news in result['collected_news']))
+
+def load_delta_baselines(categories):
+    """변경분만 분석 - 카테고리별 직전 실행의 선별 결과 (직전 실행이 없는 카테고리는 전체 분석)"""
+    if not ARCHIVE_SETTINGS["enabled"]:
+        notify("info", "기사 아카이브가 꺼져 있어 직전 실행과 비교할 수 없습니다. 전체를 분석합니다.")
+        return {}
+    
+    baselines = {}
+    try:
+        for category in categories:
+            baseline = load_baseline(category)
+            if baseline:
+                baselines[category] = baseline
+    except Exception as e:
+        notify("warning", f"직전 실행 기록을 읽을 수 없어 전체를 분석합니다: {str(e)}")
+        return {}
+    
+    missing = [category for category in categories if category not in baselines]
+    if missing:
+        notify("info", f"직전 실행 기록이 없는 카테고리({', '.join(missing)})는 전체를 분석합니다.")
+    return baselines
+
+def analyze_delta(candidates, category_name, news_list, baseline, on_token=None):
+    """변경분만 AI 분석 (candidates는 delta_candidates 결과) - 새 후보가 없으면 AI 호출 없이 직전 선별 유지,
+    결과의 delta에 새 선별/유지/빠짐 기록"""
+    if has_new_articles(candidates, baseline):
+        analysis_result = analyze_news_cached(candidates, category_name, on_token=on_token)
+    else:
+        analysis_result = carried_selection(candidates, baseline)
+    if 'error' in analysis_result:
+        return analysis_result
+    return dict(analysis_result, delta=summarize_delta(analysis_result, news_list, candidates, baseline))
+
+def news_cache_key(category_keywords, start_dt, end_dt, category_name="", max_per_keyword=50):
+    """카테고리 수집 결과의 공유 캐시 키"""
+    return make_cache_key("naver", category_name, list(category_keywords),
+                          start_dt.isoformat(), end_dt.isoformat(), max_per_keyword)
+
+def collect_news_cached(category_keywords, start_dt, end_dt, category_name="", max_per_keyword=50, on_progress=None, fetcher=None):
+    """공유 캐시를 거쳐 뉴스 수집 - 다른 세션이 같은 조건으로 수집 중이면 그 결과를 기다려 사용
+    
+    이미 끝난 기간의 수집 결과는 더 오래 보관한다 (캐시 미리 채우기 결과를 기준 시각 이후 실행들이 재사용).
+    호출 일정 때문에 잘린 수집 결과(fetcher.truncated)는 캐시하지 않는다.
+    """
+    if fetcher is None or category_name not in fetcher.plan["categories"]:
+        fetcher = create_run_fetcher({category_name: category_keywords}, start_dt, end_dt, max_per_keyword=max_per_keyword)
+    key = news_cache_key(category_keywords, start_dt, end_dt, category_name, max_per_keyword)
+    closed = end_dt <= datetime.now(KST)
+    return news_cache.get_or_compute(
+        key,
+        lambda: collect_news_from_naver_api(
+            category_keywords, start_dt, end_dt,
+            category_name=category_name,
+            max_per_keyword=max_per_keyword,
+            on_progress=on_progress,
+            fetcher=fetcher
+        ),
+        # 빈 결과(API 키 누락, 일시 오류 등), 대체 소스로 수집한 결과, 호출 일정 때문에 잘린 결과는 캐시하지 않음
+        should_cache=lambda news_list: (bool(news_list) and not any(news.get('source') for news in news_list)
+                                        and not fetcher.truncated(category_name)),
+        ttl_seconds=CACHE_SETTINGS["closed_window_ttl_seconds"] if closed else None
+    )
+
+def analyze_news_cached(news_list, category_name, on_token=None):
+    """공유 캐시를 거쳐 AI 분석 - 같은 기사 목록에 대한 선별 결과는 세션 간 재사용"""
+    key = make_cache_key("llm", PROMPT_VERSION, category_name, news_list)
+    return llm_cache.get_or_compute(
+        key,
+        lambda: analyze_news_with_ai(news_list, category_name, on_token=on_token),
+        should_cache=lambda result: 'error' not in result and 'degraded' not in result  # 실패/대체 분석은 캐시하지 않음
+    )
+
+def request_chat_completion(messages, model=DEFAULT_GPT_MODEL, on_token=None):
+    """chat completion 요청 후 응답 텍스트 반환 - on_token이 있으면 스트리밍으로 받으며 누적 텍스트 전달
+
+    요청은 프로세스 전역 비동기 클라이언트(llm_client.py)가 동시 요청 수 제한, 제한 시간,
+    재시도, hedging을 적용해 보낸다. 모델별 지연 시간/토큰/비용은 model_router.model_stats에 기록한다.
+    """
+    with span("llm.request", "llm", model=model, stream=bool(on_token)) as request_span:
+        def forward(text):
+            if request_span and "first_token_ms" not in request_span.attrs:
+                request_span.set(first_token_ms=round(request_span.duration_ms, 1))
+            on_token(text)
+        
+        result = get_llm_client().complete(messages, model, on_token=forward if on_token else None)
+        usage = result["usage"]
+        
+        # 프롬프트 캐싱으로 재사용된 입력 토큰 (prefix가 1024토큰 이상일 때만 적용)
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached_tokens = (getattr(details, "cached_tokens", 0) or 0) if usage else None
+        if request_span:
+            request_span.set(attempts=result["attempts"], hedged=result["hedged"])
+            if usage:
+                request_span.set(prompt_tokens=usage.prompt_tokens,
+                                 completion_tokens=usage.completion_tokens,
+                                 cached_tokens=cached_tokens)
+    
+    model_stats.record(
+        model,
+        result["latency_ms"],
+        prompt_tokens=usage.prompt_tokens if usage else None,
+        completion_tokens=usage.completion_tokens if usage else None,
+        cached_tokens=cached_tokens
+    )
+    return result["text"]
+
 def parse_ai_response(ai_response, news_list):
     """AI 응답을 파싱하여 구조화된 데이터로 변환 - 개선된 버전"""
     selected_news = []
@@ -981,6 +739,8 @@ def parse_ai_response(ai_response, news_list):
     }
 
 def main():
+    setup_page()
+    
     # 메인 타이틀
     st.markdown("<h1 class='main-title'>PwC 뉴스 분석기</h1>", unsafe_allow_html=True)
     st.markdown("<p style='text-align: center; font-size: 1.2rem; color: #666;'>회계법인 관점에서 중요한 뉴스를 자동으로 분석하는 AI 도구</p>", unsafe_allow_html=True)
@@ -990,8 +750,8 @@ def main():
     
     # 날짜 및 시간 필터
     st.sidebar.markdown("### 📅 날짜 및 시간 범위")
-    now = datetime.now(KST)
-    default_start = now - timedelta(days=1)
+    # 기본값은 어제 10시 ~ 오늘 10시 (캐시 미리 채우기와 같은 기간 - prewarm.default_window)
+    default_start, default_end = default_window()
     
     # 시작일과 시작시간을 묶어서 표시
     st.sidebar.markdown("#### 🟢 시작")
@@ -999,15 +759,15 @@ def main():
     with col1:
         start_date = st.date_input("시작일", value=default_start.date())
     with col2:
-        start_time = st.time_input("시작 시간", value=time(10, 0), help="기본값: 오전 10시")
+        start_time = st.time_input("시작 시간", value=default_start.time(), help=f"기본값: {default_start:%H:%M}")
     
     # 종료일과 종료시간을 묶어서 표시
     st.sidebar.markdown("#### 🔴 종료")
     col3, col4 = st.sidebar.columns(2)
     with col3:
-        end_date = st.date_input("종료일", value=now.date())
+        end_date = st.date_input("종료일", value=default_end.date())
     with col4:
-        end_time = st.time_input("종료 시간", value=time(10, 0), help="기본값: 오전 10시")
+        end_time = st.time_input("종료 시간", value=default_end.time(), help=f"기본값: {default_end:%H:%M}")
     
     # 카테고리 선택
     st.sidebar.markdown("### 🏷️ 분석할 카테고리")
@@ -1071,6 +831,108 @@ def main():
         - 목표가 관련 보도
         """)
     
+    # 결과 표시 방식
+    st.sidebar.markdown("### ⚡ 결과 표시")
+    streaming_mode = st.sidebar.checkbox(
+        "스트리밍 모드",
+        value=True,
+        help="카테고리별 분석이 끝나는 즉시 결과를 표시하고, AI 선별 과정을 실시간으로 보여줍니다."
+    )
+    background_mode = st.sidebar.checkbox(
+        "백그라운드 작업으로 실행",
+        value=False,
+        help="브라우저를 닫아도 분석이 계속됩니다. 같은 조건의 분석은 다른 사용자와 하나의 작업을 공유합니다."
+    )
+    
+    dedupe_enabled = st.sidebar.checkbox(
+        "중복 기사 묶기",
+        value=EMBEDDING_SETTINGS["enabled"],
+        help="제목·요약이 비슷한 같은 사건 기사를 로컬에서 묶고, 대표 기사만 AI 분석에 보냅니다."
+    )
+    
+    fulltext_enabled = st.sidebar.checkbox(
+        "기사 본문 수집",
+        value=FULLTEXT_SETTINGS["enabled"],
+        help="AI 분석 후보 기사의 원문을 내려받아 본문 앞부분을 함께 분석합니다. 한 번 받은 기사는 디스크에 캐시됩니다."
+    )
+    
+    delta_enabled = st.sidebar.checkbox(
+        "변경분만 분석",
+        value=False,
+        help=f"카테고리별 직전 실행({DELTA_SETTINGS['max_age_seconds'] // 3600}시간 이내) 이후 새로 수집된 기사만 "
+             f"직전 선별 기사와 함께 AI로 분석하고, 새 선별 / 유지 / 빠진 기사를 표시합니다."
+    )
+    
+    # 성능 측정
+    st.sidebar.markdown("### ⏱️ 성능 측정")
+    tracing_enabled = st.sidebar.checkbox(
+        "성능 추적",
+        value=False,
+        help="수집·분석·표시 단계별 소요 시간을 측정하고 Chrome trace / OpenTelemetry 형식으로 내려받을 수 있습니다."
+    )
+    profiling_enabled = st.sidebar.checkbox(
+        "cProfile 프로파일링",
+        value=False,
+        help="함수 단위 프로파일을 수집합니다. 실행이 느려지므로 문제 분석 시에만 사용하세요."
+    )
+    
+    # 공유 캐시 지표
+    with st.sidebar.expander("🗄️ 공유 캐시", expanded=False):
+        for cache_stats in (news_cache.stats(), llm_cache.stats()):
+            st.markdown(
+                f"**{cache_stats['name']}** · 적중률 {cache_stats['hit_rate']:.0%} "
+                f"(적중 {cache_stats['hits']} / 대기공유 {cache_stats['shared_waits']} / 미스 {cache_stats['misses']})  \n"
+                f"항목 {cache_stats['entries']}개 · {cache_stats['size_bytes'] / 1024 / 1024:.1f}MB · 제거 {cache_stats['evictions']}회"
+            )
+        embedding_stats = embedding_store.stats()
+        st.markdown(
+            f"**embeddings** · 적중률 {embedding_stats['hit_rate']:.0%} · 기사 벡터 {embedding_stats['entries']}개 "
+            f"· {embedding_stats['size_bytes'] / 1024 / 1024:.1f}MB"
+        )
+    
+    # 모델별 AI 호출 지표
+    with st.sidebar.expander("🤖 모델 사용", expanded=False):
+        routing_stats = model_stats.stats()
+        st.markdown(
+            f"호출 {routing_stats['calls']}회 · 비용 ${routing_stats['cost_usd']:.4f} · "
+            f"캐시 입력 토큰 {routing_stats['cached_ratio']:.0%}  \n"
+            f"강한 모델 재분석 {routing_stats['escalations']}회 · AI 생략 {routing_stats['skipped']}회"
+        )
+        llm_stats = get_llm_client().stats()
+        st.caption(
+            f"동시 요청 상한 {llm_stats['max_concurrency']} · 재시도 {llm_stats['retries']}회 · "
+            f"hedging {llm_stats['hedged']}회 (먼저 응답 {llm_stats['hedge_wins']}회) · 시간 초과 {llm_stats['timeouts']}회 · "
+            f"차단 {llm_stats['rejected']}회"
+        )
+        model_rows = model_stats.summary()
+        if model_rows:
+            st.dataframe(model_rows, use_container_width=True, hide_index=True)
+    
+    # 외부 서비스별 회로 차단기 상태 (장애 중이면 펼쳐서 표시)
+    with st.sidebar.expander("🩺 외부 서비스 상태", expanded=bool(degraded_services())):
+        states = breaker_states()
+        if states:
+            st.dataframe([{
+                "서비스": state["label"],
+                "상태": BREAKER_STATE_LABELS[state["state"]],
+                "연속 실패": state["failures"],
+                "차단": state["trips"],
+                "요청 생략": state["rejected"],
+                "재시도까지(초)": state["retry_in"],
+                "마지막 오류": state["last_error"]
+            } for state in states], use_container_width=True, hide_index=True)
+        else:
+            st.caption("아직 외부 서비스를 호출하지 않았습니다.")
+    
+    # 기본 기간 캐시 미리 채우기 (예약 스레드는 프로세스당 한 번 시작)
+    get_prewarmer().start(submit_prewarm)
+    with st.sidebar.expander("⏰ 캐시 미리 채우기", expanded=False):
+        render_prewarm_panel()
+    
+    # 과거 기사 백필 (선택한 카테고리, 종료일까지 N일) - 백그라운드 작업으로 실행
+    with st.sidebar.expander("📚 과거 기사 백필", expanded=False):
+        render_backfill_panel(selected_categories, end_date)
+    
     # 선택 요약 표시
     if selected_categories:
         st.sidebar.markdown("### 📋 선택 요약")
@@ -1078,11 +940,27 @@ def main():
         st.sidebar.info(f"**시간**: {start_time.strftime('%H:%M')} ~ {end_time.strftime('%H:%M')}")
         st.sidebar.info(f"**카테고리**: {len(selected_categories)}개 선택")
         
-        # 선택된 카테고리의 총 키워드 수 계산
+        # 선택된 카테고리의 총 키워드 수 / 검색 계획상 API 쿼리 수
         total_keywords = sum(len(KEYWORD_CATEGORIES[cat]) for cat in selected_categories)
-        st.sidebar.info(f"**총 키워드 수**: {total_keywords}개")
+        run_plan = plan_run(
+            {category: KEYWORD_CATEGORIES[category] for category in selected_categories},
+            datetime.combine(start_date, start_time).replace(tzinfo=KST),
+            datetime.combine(end_date, end_time).replace(tzinfo=KST),
+            capacity=DEFAULT_NEWS_COUNT_PER_KEYWORD * 2
+        )
+        st.sidebar.info(f"**총 키워드 수**: {total_keywords}개 → **검색 쿼리**: {len(run_plan['queries'])}개")
+        schedule = schedule_run(run_plan, selected_categories, DEFAULT_NEWS_COUNT_PER_KEYWORD * 2,
+                                get_call_ledger().remaining())
+        render_query_plan(run_plan, schedule)
         
     
+    # 지난 실행에서 보관한 기사 검색
+    if ARCHIVE_SETTINGS["enabled"]:
+        render_archive_search()
+    
+    # 진행 중이거나 완료된 백그라운드 작업 (URL에 작업 ID가 있으면 재접속 시에도 이어서 표시)
+    job_id = st.session_state.get("job_id") or st.query_params.get("job")
+    
     # 메인 컨텐츠
     if st.button("🚀 뉴스 분석 시작", type="primary", use_container_width=True):
         if not selected_categories:
@@ -1093,48 +971,36 @@ def main():
         start_dt = datetime.combine(start_date, start_time).replace(tzinfo=KST)
         end_dt = datetime.combine(end_date, end_time).replace(tzinfo=KST)
         
-        # 진행 상황 표시
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
-        all_results = {}
-        
-        # 카테고리별 분석
-        for i, category in enumerate(selected_categories):
-            status_text.text(f"📊 {category} 카테고리 분석 중...")
-            progress_bar.progress((i + 1) / len(selected_categories))
-            
-            # 해당 카테고리의 키워드들
-            category_keywords = KEYWORD_CATEGORIES[category]
-            
-            # 뉴스 수집
-            with st.spinner(f"{category} 뉴스 수집 중..."):
-                news_list = collect_news_from_naver_api(
-                    category_keywords, 
-                    start_dt, 
-                    end_dt, 
-                    category_name=category,
-                    max_per_keyword=50
-                )
-            
-            if not news_list:
-                st.warning(f"{category} 카테고리에서 수집된 뉴스가 없습니다.")
-                continue
-            
-            # AI 분석
-            with st.spinner(f"{category} AI 분석 중..."):
-                analysis_result = analyze_news_with_ai(news_list, category)
-            
-            all_results[category] = {
-                'collected_news': news_list, # 원본 뉴스 목록
-                'analysis_result': analysis_result
+        if background_mode:
+            params = {
+                "categories": selected_categories,
+                "start_dt": start_dt.isoformat(),
+                "end_dt": end_dt.isoformat(),
+                "dedupe": dedupe_enabled,
+                "fulltext": fulltext_enabled
             }
+            if delta_enabled:
+                # 꺼져 있으면 키를 넣지 않음 (기존/미리 채우기 작업과 같은 작업 키)
+                params["delta"] = True
+            job_id = get_job_runner().submit(params, run_analysis_job)
+            st.session_state["job_id"] = job_id
+            st.query_params["job"] = job_id
+            render_background_job(job_id)
+            return
         
-        # 분석 완료
-        st.success("✅ 모든 카테고리 분석 완료!")
+        tracer = Tracer() if tracing_enabled else None
+        with activate(tracer), maybe_profile(profiling_enabled) as profiler:
+            if streaming_mode:
+                run_streaming_analysis(selected_categories, start_dt, end_dt,
+                                       dedupe=dedupe_enabled, fulltext=fulltext_enabled, delta=delta_enabled)
+            else:
+                run_blocking_analysis(selected_categories, start_dt, end_dt,
+                                      dedupe=dedupe_enabled, fulltext=fulltext_enabled, delta=delta_enabled)
         
-        # 결과 표시
-        display_results(all_results, selected_categories)
+        render_performance_panel(tracer, profiler)
+    
+    elif job_id:
+        render_background_job(job_id)
     
     else:
         # 초기 화면
@@ -1145,127 +1011,760 @@ def main():
         </div>
         """, unsafe_allow_html=True)
 
+def render_query_plan(run_plan, schedule):
+    """카테고리별 검색 계획 / 호출 배분 표시 (실행 전 확인용)"""
+    cut = schedule["planned_calls"] < schedule["full_calls"]
+    with st.sidebar.expander("🧭 검색 계획", expanded=cut):
+        if run_plan["category_queries"] > len(run_plan["queries"]):
+            st.caption(f"카테고리별로 검색하면 {run_plan['category_queries']}건 → 겹치는 검색 공유로 {len(run_plan['queries'])}건")
+        st.caption(f"예상 네이버 호출 {schedule['planned_calls']}회 (오늘 남은 한도 {schedule['quota_remaining']}회, "
+                   f"이번 실행 상한 {schedule['budget']}회) · 수집 순서: {' → '.join(schedule['order'])}")
+        if cut:
+            st.warning(f"호출 한도/수집 제한 시간이 부족해 우선순위가 낮은 카테고리의 검색을 줄입니다 "
+                       f"({schedule['full_calls']}회 → {schedule['planned_calls']}회).")
+            st.dataframe([{key: value for key, value in row.items() if key != "실제 호출"}
+                          for row in call_spend_rows(schedule, {"calls_by_category": {}})],
+                         use_container_width=True, hide_index=True)
+        for category, plan in run_plan["categories"].items():
+            queries = [run_plan["queries"][index] for index in plan["queries"]]
+            st.markdown(f"**{category}** · 키워드 {plan['keywords']}개 → 쿼리 {len(queries)}개")
+            st.markdown("\n".join(
+                f"- `{query['query']}` (예상 {query['expected']:.0f}건)"
+                + (" · 공유" if len(query["categories"]) + len(query["borrowed"]) > 1 else "")
+                for query in queries
+            ))
+            if plan["dropped"]:
+                st.caption("제외: " + ", ".join(f"{item['term']} ⊂ {item['covered_by']}" for item in plan["dropped"]))
+            if plan["borrowed"]:
+                st.caption("다른 카테고리 결과에서: " + ", ".join(f"{item['term']} ⊂ {item['from']}" for item in plan["borrowed"]))
+            if plan["kept"]:
+                st.caption("유지: " + ", ".join(f"{item['term']} ⊂ {item['broader']}" for item in plan["kept"])
+                           + " (넓은 키워드가 결과 상한에 걸렸거나 기록 없음)")
+
+def render_backfill_panel(selected_categories, end_date):
+    """과거 기사 백필 진행 상황 / 시작 - 하루 단위 구간으로 수집해 아카이브에 저장 (backfill.py)"""
+    store = get_backfill_store()
+    latest = store.latest()
+    if latest:
+        progress = latest["progress"]
+        finished = progress[SHARD_DONE] + progress[SHARD_FALLBACK]
+        st.markdown(f"**{latest['params']['start_date']} ~ {latest['params']['end_date']}** · "
+                    f"{BACKFILL_LABELS[latest['status']]} · 기사 {progress['items']}건")
+        st.progress(finished / max(progress["shards"], 1))
+        st.caption(" · ".join(f"{label} {progress[status]}" for status, label in SHARD_LABELS.items()))
+        if latest["message"]:
+            st.caption(latest["message"])
+    
+    ledger = get_call_ledger()
+    st.caption(f"오늘 네이버 호출 {ledger.used()}/{ledger.daily_quota}회 (백필 {ledger.used(CONSUMER_BACKFILL)}회, "
+               f"평소 분석용 {BACKFILL_SETTINGS['quota_reserve']}회는 백필에 쓰지 않음)")
+    days = st.number_input("종료일까지 기간 (일)", min_value=1, max_value=BACKFILL_SETTINGS["max_days"], value=30)
+    if st.button("📚 백필 시작", disabled=not selected_categories or not naver_headers()):
+        # 같은 조건은 하나의 작업/백필을 공유하고, 끝나지 않은 백필은 남은 구간부터 이어서 진행
+        get_job_runner().submit(
+            {"kind": "backfill", "categories": selected_categories, "end_date": end_date.isoformat(), "days": int(days)},
+            run_backfill_job
+        )
+        st.success("백그라운드에서 백필을 시작했습니다. 수집한 기사는 '지난 기사 검색'에서 찾을 수 있습니다.")
+
+def submit_prewarm(params):
+    """캐시 미리 채우기 작업 제출 (prewarm.Prewarmer에서 호출) - 같은 조건의 백그라운드 실행과 작업을 공유"""
+    return get_job_runner().submit(params, run_analysis_job)
+
+def render_prewarm_panel():
+    """캐시 미리 채우기 예약 / 기본 기간 수집 캐시 준비 상황 / 최근 실행 (prewarm.py)"""
+    prewarmer = get_prewarmer()
+    status = prewarmer.status()
+    if status["enabled"]:
+        next_run = status["next_run"]
+        st.markdown(f"예약 {', '.join(status['times'])} · 다음 실행 "
+                    f"{next_run.strftime('%m-%d %H:%M') if next_run else '없음'}"
+                    f"{'' if status['running'] else ' (예약 스레드 중지됨)'}")
+    else:
+        st.caption("예약 실행이 꺼져 있습니다 (켜려면 환경변수 NEWS_PREWARM=1). 수동으로 실행할 수 있습니다.")
+    
+    # 화면 기본 기간의 카테고리별 수집 캐시 (분석 시작 시 바로 사용되는지)
+    start_dt, end_dt = default_window()
+    categories = prewarmer.categories or list(KEYWORD_CATEGORIES)
+    warm = [category for category in categories
+            if news_cache.contains(news_cache_key(KEYWORD_CATEGORIES[category], start_dt, end_dt, category))]
+    st.caption(f"기본 기간({start_dt:%m-%d %H:%M} ~ {end_dt:%m-%d %H:%M}) 수집 캐시: "
+               f"{len(warm)}/{len(categories)}개 카테고리 준비")
+    
+    rows = []
+    for run in status["runs"]:
+        job = get_job_runner().get(run["job_id"], include_result=False) if run["job_id"] else None
+        rows.append({
+            "제출": run["submitted_at"].strftime("%m-%d %H:%M:%S"),
+            "예약": run["slot"] or "수동",
+            "기간 끝": datetime.fromisoformat(run["params"]["end_dt"]).strftime("%m-%d %H:%M"),
+            "범위": "수집" if run["params"].get("collect_only") else "수집+선별",
+            "상태": JOB_STATUS_LABELS.get(job["status"], job["status"]) if job else "제출 실패",
+            "소요(초)": round(job["finished_at"] - job["created_at"], 1) if job and job["finished_at"] else None,
+            "메시지": (job["error"] or job["message"]) if job else run["error"]
+        })
+    if rows:
+        st.dataframe(rows, use_container_width=True, hide_index=True)
+    
+    if st.button("⏰ 지금 미리 채우기", disabled=not naver_headers()):
+        job_id = prewarmer.run_now()
+        if job_id:
+            st.success(f"백그라운드 작업 {job_id}으로 기본 기간을 미리 채웁니다.")
+        else:
+            st.error("미리 채우기 작업을 제출하지 못했습니다.")
+
+def render_archive_search():
+    """아카이브 검색 패널 (예: "삼일PwC 지난 30일", "감사 수주 최근 2주")"""
+    with st.expander("🔎 지난 기사 검색", expanded=False):
+        col1, col2, col3 = st.columns([3, 1, 1])
+        with col1:
+            query = st.text_input("검색어", placeholder="예: 삼일PwC 지난 30일", key="archive_query")
+        with col2:
+            category = st.selectbox("카테고리", options=["전체"] + list(KEYWORD_CATEGORIES.keys()), key="archive_category")
+        with col3:
+            selected_only = st.checkbox("선별 기사만", value=False, key="archive_selected_only")
+        
+        archive = get_archive()
+        if query.strip():
+            started = datetime.now()
+            try:
+                results = archive.search(query, category=None if category == "전체" else category,
+                                         selected_only=selected_only)
+            except Exception as e:
+                st.error(f"아카이브 검색 중 오류: {str(e)}")
+                return
+            elapsed_ms = (datetime.now() - started).total_seconds() * 1000
+            
+            st.caption(f"{len(results)}건 · {elapsed_ms:.0f}ms")
+            if results:
+                st.dataframe([
+                    {
+                        "뉴스제목": row["title"],
+                        "언론사": row["press"],
+                        "발행일": row["pub_date"],
+                        "카테고리": row["categories"],
+                        "선별": "선별됨" if row["selected_runs"] else "제외됨",
+                        "링크": row["url"]
+                    }
+                    for row in results
+                ], use_container_width=True, hide_index=True,
+                    column_config={"링크": st.column_config.LinkColumn("링크")})
+        
+        archive_stats = archive.stats()
+        st.caption(f"보관 기사 {archive_stats['articles']}건 · 실행 {archive_stats['runs']}회"
+                   + ("" if archive_stats["fts"] else " · 전문 색인 없음(LIKE 검색)"))
+
+def iter_analysis_pipeline(selected_categories, start_dt, end_dt, dedupe=True, fulltext=False, delta=False,
+                           on_collect=None, on_token=None):
+    """카테고리별 수집 → 중복 묶기 → AI 분석 파이프라인 (UI와 무관 - 일반/스트리밍 화면과 백그라운드 작업은 이벤트를 받아 표시만 함)
+    
+    이벤트는 type으로 구분하는 딕셔너리:
+        resumed: 체크포인트에서 이어서 진행 (finished: 이미 끝난 카테고리 수)
+        progress: 카테고리 단계 시작 (category, progress 0~1, message)
+        empty: 수집된 기사 없음 (category, progress, message)
+        result: 카테고리 결과 (category, progress, result)
+        done: 실행 완료 (results, summary(검색 수집 요약), schedule)
+    on_collect(category, 수집 건수)와 on_token(category, 누적 응답)은 단계 진행 중 화면 갱신용 (선택).
+    같은 조건의 이전 실행이 중간에 실패/중단되었으면 체크포인트에서 끝난 단계부터 이어서 진행한다.
+    delta면 직전 실행에 없던 새 기사만 AI로 분석하고 선별 변화를 기록한다 (delta.py).
+    """
+    all_results = {}
+    total = len(selected_categories)
+    baselines = load_delta_baselines(selected_categories) if delta else {}
+    # 여러 카테고리에 겹치는 검색은 한 번만 (실행 단위 검색 계획), 수집 결과는 디스크에 내려 둠
+    spool = open_spool()
+    fetcher = create_run_fetcher({category: KEYWORD_CATEGORIES[category] for category in selected_categories},
+                                 start_dt, end_dt, max_per_keyword=50, spool=spool)
+    checkpoint = open_checkpoint(selected_categories, start_dt, end_dt, dedupe, fulltext, delta=delta)
+    if checkpoint.resumed:
+        yield {"type": "resumed", "finished": len(checkpoint.finished_categories())}
+    
+    # 카테고리별 분석 (우선순위 순서 - 호출 한도가 부족해도 중요한 카테고리부터 수집)
+    for i, category in enumerate(priority_order(selected_categories)):
+        # 이전 실행에서 분석까지 끝난 카테고리
+        finished = checkpoint.result(category)
+        if finished:
+            all_results[category] = dict(finished, collected_news=spool_collected(spool, category, finished['collected_news']))
+            yield {"type": "result", "category": category, "progress": (i + 1) / total, "result": all_results[category]}
+            continue
+        
+        # 뉴스 수집 (이전 실행에서 수집까지 끝났으면 재사용)
+        news_list = checkpoint.collected(category)
+        complete = True  # 호출 일정 때문에 잘리지 않은 수집 결과인지 (잘렸으면 체크포인트에 남기지 않음)
+        if news_list is None:
+            yield {"type": "progress", "category": category, "progress": i / total, "message": f"📥 {category} 뉴스 수집 중..."}
+            with span("collect", "pipeline", category=category):
+                news_list = collect_news_cached(
+                    KEYWORD_CATEGORIES[category],
+                    start_dt,
+                    end_dt,
+                    category_name=category,
+                    max_per_keyword=50,
+                    on_progress=(lambda count, category=category: on_collect(category, count)) if on_collect else None,
+                    fetcher=fetcher
+                )
+            complete = not fetcher.truncated(category)
+            checkpoint.save_collected(category, news_list, complete=complete)
+        
+        if not news_list:
+            yield {"type": "empty", "category": category, "progress": (i + 1) / total,
+                   "message": empty_category_message(fetcher, category)}
+            continue
+        
+        # 같은 사건은 대표 기사만, 중요도 점수 상위 기사만 AI에 전달
+        news_list, candidates = prepare_candidates(news_list, category, dedupe=dedupe)
+        baseline = baselines.get(category)
+        if baseline:
+            # 변경분만: 새 후보 + 직전 선별 기사
+            candidates = delta_candidates(news_list, candidates, baseline)
+        
+        # 후보 기사 원문 본문 수집 (선택)
+        if fulltext:
+            yield {"type": "progress", "category": category, "progress": (i + 0.3) / total,
+                   "message": f"📄 {category} 기사 본문 수집 중... ({len(candidates)}건)"}
+            candidates = attach_fulltext(candidates)
+        
+        # AI 분석
+        yield {"type": "progress", "category": category, "progress": (i + 0.5) / total,
+               "message": f"🤖 {category} AI 분석 중... (수집 {len(news_list)}건, 후보 {len(candidates)}건)"}
+        stream = (lambda text, category=category: on_token(category, text)) if on_token else None
+        with span("analyze", "pipeline", category=category):
+            if baseline:
+                analysis_result = analyze_delta(candidates, category, news_list, baseline, on_token=stream)
+            else:
+                analysis_result = analyze_news_cached(candidates, category, on_token=stream)
+        
+        all_results[category] = {
+            'collected_news': spool_collected(spool, category, news_list), # 원본 뉴스 목록 (디스크에 내려 둔 읽기 전용 목록)
+            'analysis_result': analysis_result,
+            'candidate_ids': judged_ids(news_list, candidates, baseline)  # AI가 판단한 기사 ID (아카이브 기록 - 다음 델타 실행의 기준)
+        }
+        checkpoint.save_result(category, all_results[category], complete=complete)
+        yield {"type": "result", "category": category, "progress": (i + 1) / total, "result": all_results[category]}
+    
+    archive_run(all_results, {
+        "categories": selected_categories,
+        "start_dt": start_dt.isoformat(),
+        "end_dt": end_dt.isoformat()
+    })
+    finish_checkpoint(checkpoint, all_results)
+    yield {"type": "done", "results": all_results, "summary": fetcher.summary(), "schedule": fetcher.schedule}
+
+def run_analysis_pipeline(selected_categories, start_dt, end_dt, report=None, dedupe=True, fulltext=False, delta=False):
+    """파이프라인(iter_analysis_pipeline)을 끝까지 실행하고 카테고리별 결과 반환 (일반 모드/백그라운드 작업용)
+    
+    report가 주어지면 report(진행률 0~1, 상태 메시지)로 진행 상황을 알린다.
+    """
+    for event in iter_analysis_pipeline(selected_categories, start_dt, end_dt, dedupe=dedupe, fulltext=fulltext, delta=delta):
+        if event["type"] == "resumed":
+            if report:
+                report(0.0, f"↩️ 이전 실행에서 이어서 진행 (완료된 카테고리 {event['finished']}개)")
+        elif event["type"] == "progress":
+            if report:
+                report(event["progress"], event["message"])
+        elif event["type"] == "empty":
+            notify("warning", event["message"])
+        elif event["type"] == "done":
+            if report:
+                report(1.0, f"✅ 분석 완료 · {format_fetch_summary(event['summary'])}")
+            return event["results"]
+
+def open_checkpoint(selected_categories, start_dt, end_dt, dedupe, fulltext, delta=False):
+    """실행 체크포인트 - 같은 조건의 미완료 실행이 있으면 이어서 (꺼져 있거나 저장소 오류면 기록하지 않는 빈 체크포인트)"""
+    if not CHECKPOINT_SETTINGS["enabled"]:
+        return RunCheckpoint(None, "", {})
+    
+    params = {
+        "categories": selected_categories,
+        "start_dt": start_dt.isoformat(),
+        "end_dt": end_dt.isoformat(),
+        "dedupe": dedupe,
+        "fulltext": fulltext
+    }
+    if delta:
+        # 변경분만 분석한 결과는 전체 분석과 섞이지 않도록 (작업 키와 같이 켜져 있을 때만 키에 넣음)
+        params["delta"] = True
+    try:
+        return get_checkpoint_store().open_run(params)
+    except Exception as e:
+        notify("warning", f"실행 체크포인트를 열 수 없어 이어서 실행 없이 진행합니다: {str(e)}")
+        return RunCheckpoint(None, "", {})
+
+def open_spool():
+    """실행 단위 수집 기사 디스크 저장소 (꺼져 있거나 만들 수 없으면 None - 기사 목록을 메모리에 보관)"""
+    if not SPOOL_SETTINGS["enabled"]:
+        return None
+    try:
+        return NewsSpool()
+    except OSError as e:
+        notify("warning", f"수집 기사 임시 저장소를 만들 수 없어 메모리에 보관합니다: {str(e)}")
+        return None
+
+def spool_collected(spool, category, news_list):
+    """카테고리 수집 목록(중복/순위 표시 포함)을 디스크에 내리고 읽기 전용 목록 반환 (스풀이 없거나 쓰기에 실패하면 그대로)"""
+    if spool is None:
+        return news_list
+    bucket = f"category:{category}"
+    try:
+        spool.extend(bucket, news_list)
+    except OSError:
+        return news_list
+    return spool.view(bucket)
+
+def finish_checkpoint(checkpoint, all_results):
+    """실행 완료 처리 (다음 실행은 새로 수집) - AI 분석 오류가 나거나 대체 소스로 처리한 카테고리가 있으면
+    다시 실행할 때 그 카테고리만 재시도하도록 남겨 둠"""
+    failed = [category for category, result in all_results.items()
+              if 'error' in result['analysis_result'] or is_degraded_result(result)]
+    if failed:
+        if checkpoint.store is not None and not checkpoint.error:
+            notify("info", f"↩️ 분석 오류/대체 처리 카테고리({', '.join(failed)})가 있어 실행 기록을 남겨 둡니다. "
+                   f"같은 조건으로 다시 실행하면 해당 카테고리만 다시 분석합니다.")
+    else:
+        checkpoint.finish()
+    if checkpoint.error:
+        notify("warning", f"실행 체크포인트 저장 중 오류 (중단 시 이어서 실행할 수 없음): {checkpoint.error}")
+
+def archive_run(all_results, params):
+    """수집/선별 결과를 기사 아카이브에 저장 (실패해도 분석 결과 표시는 계속)"""
+    if not ARCHIVE_SETTINGS["enabled"] or not all_results:
+        return
+    
+    # 카테고리 단위로 나눠 저장 (한 번에 전체 실행의 기록을 메모리에 만들지 않음)
+    run_id = None
+    try:
+        for category, result in all_results.items():
+            rows = build_excel_rows(category, result)
+            if rows:
+                candidate_ids = set(result.get('candidate_ids', []))
+                records = [{"news": news, "category": category,
+                            "decision": row["선별여부"], "reason": row["선별/제외이유"],
+                            "candidate": article_id(news) in candidate_ids}
+                           for news, row in zip(result['collected_news'], rows)]
+            else:
+                # 분석 오류 - 수집된 기사만 보관
+                error = result['analysis_result'].get('error', '')
+                records = [{"news": news, "category": category, "decision": DECISION_FAILED, "reason": error}
+                           for news in result['collected_news']]
+            with span("archive.write", "storage", category=category, items=len(records)):
+                run_id = get_archive().record_run(params, records, run_id=run_id)
+    except Exception as e:
+        notify("warning", f"기사 아카이브 저장 중 오류: {str(e)}")
+
+def run_collection_pipeline(selected_categories, start_dt, end_dt, report=None):
+    """카테고리별 수집만 실행 (AI 분석 없이 수집 캐시만 채움 - 캐시 미리 채우기용)
+    
+    Returns:
+        dict: 카테고리 → 수집 기사 수
+    """
+    fetcher = create_run_fetcher({category: KEYWORD_CATEGORIES[category] for category in selected_categories},
+                                 start_dt, end_dt, max_per_keyword=50)
+    counts = {}
+    for i, category in enumerate(priority_order(selected_categories)):
+        if report:
+            report(i / len(selected_categories), f"📊 {category} 뉴스 수집 중...")
+        with span("collect", "pipeline", category=category):
+            news_list = collect_news_cached(
+                KEYWORD_CATEGORIES[category],
+                start_dt,
+                end_dt,
+                category_name=category,
+                max_per_keyword=50,
+                fetcher=fetcher
+            )
+        counts[category] = len(news_list)
+    
+    if report:
+        report(1.0, f"✅ 수집 완료 · {format_fetch_summary(fetcher.summary())}")
+    return counts
+
+def run_analysis_job(params, report):
+    """백그라운드 작업용 파이프라인 진입점 (jobs.JobRunner에서 호출)
+    
+    Returns:
+        dict: results(카테고리별 결과 - 수집만이면 카테고리 → 수집 기사 수), notices(실행 중 알림 - level, message)
+    """
+    start_dt = datetime.fromisoformat(params["start_dt"])
+    end_dt = datetime.fromisoformat(params["end_dt"])
+    with collect_notices() as notices:
+        if params.get("collect_only"):
+            results = run_collection_pipeline(params["categories"], start_dt, end_dt, report=report)
+        else:
+            results = run_analysis_pipeline(params["categories"], start_dt, end_dt, report=report,
+                                            dedupe=params.get("dedupe", True), fulltext=params.get("fulltext", False),
+                                            delta=params.get("delta", False))
+    return {"results": results, "notices": notices}
+
+def render_background_job(job_id):
+    """백그라운드 작업 상태 표시 - 완료되면 결과 표시"""
+    job = get_job_runner().get(job_id)
+    if not job:
+        st.warning(f"작업을 찾을 수 없습니다: {job_id}")
+        return
+    
+    if job["status"] in ACTIVE_STATUSES:
+        render_job_progress(job_id)
+    elif job["status"] == STATUS_DONE:
+        st.success(f"✅ 백그라운드 작업 {job_id} 완료")
+        result = job["result"] or {}
+        render_notices(result.get("notices", []))
+        display_results(result.get("results", {}), job["params"]["categories"])
+    else:
+        st.error(f"백그라운드 작업 {job_id} 실패: {job.get('error') or job.get('message')}")
+        # 같은 조건으로 다시 제출하면 체크포인트에서 끝난 카테고리는 건너뛰고 이어서 실행
+        if st.button("↩️ 이어서 실행", key=f"resume_{job_id}"):
+            new_job_id = get_job_runner().submit(job["params"], run_analysis_job)
+            st.session_state["job_id"] = new_job_id
+            st.query_params["job"] = new_job_id
+            st.rerun()
+
+@st.fragment(run_every=JOB_SETTINGS["poll_interval"])
+def render_job_progress(job_id):
+    """진행 중인 작업을 주기적으로 폴링하여 진행률 표시"""
+    job = get_job_runner().get(job_id)
+    if not job or job["status"] not in ACTIVE_STATUSES:
+        # 작업이 끝나면 전체 화면을 다시 그려 결과 표시
+        st.rerun()
+    
+    st.info(f"🕒 백그라운드 작업 {job_id} 진행 중 - {job['message']}")
+    st.progress(job["progress"])
+    st.caption("브라우저를 닫아도 작업은 계속됩니다. 이 페이지 주소로 다시 접속하면 결과를 볼 수 있습니다.")
+
+def run_blocking_analysis(selected_categories, start_dt, end_dt, dedupe=True, fulltext=False, delta=False):
+    """일반 모드 - 전체 분석이 끝난 뒤 결과를 한 번에 표시"""
+    # 진행 상황 표시
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    
+    def report(progress, message):
+        status_text.text(message)
+        progress_bar.progress(progress)
+    
+    all_results = run_analysis_pipeline(selected_categories, start_dt, end_dt, report=report,
+                                        dedupe=dedupe, fulltext=fulltext, delta=delta)
+    
+    # 분석 완료
+    st.success("✅ 모든 카테고리 분석 완료!")
+    
+    # 결과 표시
+    display_results(all_results, selected_categories)
+
+def render_performance_panel(tracer, profiler):
+    """성능 추적 / 프로파일 결과 패널 (측정하지 않았으면 표시하지 않음)"""
+    if tracer is None and profiler is None:
+        return
+    
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    with st.expander("⏱️ 성능", expanded=False):
+        if tracer is not None:
+            st.markdown("#### 단계별 소요 시간")
+            st.dataframe(tracer.summary(), use_container_width=True, hide_index=True)
+            
+            col1, col2 = st.columns(2)
+            with col1:
+                st.download_button(
+                    label="Chrome trace (JSON)",
+                    data=json.dumps(tracer.to_chrome_trace(), ensure_ascii=False),
+                    file_name=f"news_trace_{stamp}.json",
+                    mime="application/json",
+                    help="chrome://tracing 또는 ui.perfetto.dev 에서 열 수 있습니다."
+                )
+            with col2:
+                st.download_button(
+                    label="OpenTelemetry (OTLP JSON)",
+                    data=json.dumps(tracer.to_otlp_json(), ensure_ascii=False),
+                    file_name=f"news_trace_{stamp}.otlp.json",
+                    mime="application/json",
+                    help="OTLP/HTTP JSON 수집기(예: Jaeger, Tempo)로 전송할 수 있는 형식입니다."
+                )
+        
+        if profiler is not None:
+            st.markdown("#### cProfile (누적 시간 상위 40개)")
+            st.code(profiler.stats_text(), language="text")
+            st.download_button(
+                label="프로파일 (.prof)",
+                data=profiler.dump_bytes(),
+                file_name=f"news_profile_{stamp}.prof",
+                mime="application/octet-stream",
+                help="snakeviz 또는 python -m pstats 로 열 수 있습니다."
+            )
+
+def run_streaming_analysis(selected_categories, start_dt, end_dt, dedupe=True, fulltext=False, delta=False):
+    """스트리밍 모드 - 카테고리별 분석이 끝나는 즉시 결과 카드를 표시 (iter_analysis_pipeline 이벤트 표시)"""
+    st.markdown("## 📊 분석 결과")
+    progress_bar = st.progress(0)
+    
+    # 카테고리별 자리 (수집/분석 상태, AI 응답 스트리밍 → 결과 카드로 교체)
+    slots = {}
+    
+    def category_slot(category):
+        if category not in slots:
+            slot = st.empty()
+            with slot.container():
+                slots[category] = (slot, st.empty(), st.empty())
+        return slots[category]
+    
+    def on_collect(category, count):
+        category_slot(category)[1].info(f"📥 {category} 뉴스 수집 중... {count}건")
+    
+    def on_token(category, text):
+        category_slot(category)[2].markdown(text)
+    
+    all_results, fetch_summary, schedule = {}, None, None
+    for event in iter_analysis_pipeline(selected_categories, start_dt, end_dt, dedupe=dedupe, fulltext=fulltext,
+                                        delta=delta, on_collect=on_collect, on_token=on_token):
+        if event["type"] == "resumed":
+            st.info(f"↩️ 같은 조건의 이전 실행이 중간에 멈춰 이어서 진행합니다 "
+                    f"(완료된 카테고리 {event['finished']}개는 저장된 결과 사용)")
+        elif event["type"] == "progress":
+            category_slot(event["category"])[1].info(event["message"])
+        elif event["type"] == "empty":
+            category_slot(event["category"])[0].warning(event["message"])
+            progress_bar.progress(event["progress"])
+        elif event["type"] == "result":
+            # 분석이 끝난 카테고리는 바로 결과 카드로 교체
+            with category_slot(event["category"])[0].container():
+                display_category_result(event["category"], event["result"])
+            progress_bar.progress(event["progress"])
+        elif event["type"] == "done":
+            all_results, fetch_summary, schedule = event["results"], event["summary"], event["schedule"]
+    
+    st.success("✅ 모든 카테고리 분석 완료!")
+    render_degraded_banner()
+    st.caption(f"🔁 {format_fetch_summary(fetch_summary)}")
+    with st.expander("📈 네이버 호출 계획/실제", expanded=False):
+        st.dataframe(call_spend_rows(schedule, fetch_summary), use_container_width=True, hide_index=True)
+    render_excel_download(iter_excel_rows(all_results, selected_categories))
+
+def render_degraded_banner():
+    """외부 서비스 장애로 대체 처리 중이면 경고 배너 표시"""
+    states = degraded_services()
+    if states:
+        services = ", ".join(f"{state['label']}({BREAKER_STATE_LABELS[state['state']]}"
+                             + (f", {state['retry_in']:.0f}초 후 재시도)" if state['retry_in'] else ")")
+                             for state in states)
+        st.warning(f"⚠️ 외부 서비스 장애로 일부 결과를 대체 소스(Google News, 로컬 아카이브, 중요도 점수)로 처리했습니다: {services}. "
+                   f"같은 조건으로 다시 실행하면 해당 카테고리만 원래 소스로 재시도합니다.")
+
 def display_results(all_results, selected_categories):
     """분석 결과 표시"""
     st.markdown("## 📊 분석 결과")
-    
-    # 전체 결과를 저장할 리스트 (엑셀 다운로드용)
-    all_excel_data = []
+    render_degraded_banner()
     
     for category in selected_categories:
         if category not in all_results:
             continue
-            
-        result = all_results[category]
-        collected_count = len(result['collected_news'])
-        analysis = result['analysis_result']
         
-        # 카테고리별 결과 카드
-        with st.expander(f"🏷️ {category} ", expanded=True):
-            if 'error' in analysis:
-                st.error(f"분석 오류: {analysis['error']}")
-                continue
-            
-            selected_news = analysis.get('selected_news', [])
-            selected_count = analysis.get('selected_count', 0)
-            
+        display_category_result(category, all_results[category])
+    
+    # 엑셀 행은 다운로드 파일을 만들 때 카테고리별로 생성
+    render_excel_download(iter_excel_rows(all_results, selected_categories))
+
+def display_category_result(category, result):
+    """카테고리 하나의 결과 카드 표시"""
+    with span("display.render", "display", category=category):
+        _render_category_card(category, result)
+
+def _render_category_card(category, result):
+    collected_count = len(result['collected_news'])
+    analysis = result['analysis_result']
+    
+    # 카테고리별 결과 카드
+    with st.expander(f"🏷️ {category} ", expanded=True):
+        if 'error' in analysis:
+            st.error(f"분석 오류: {analysis['error']}")
+            return
+        
+        selected_news = analysis.get('selected_news', [])
+        selected_count = analysis.get('selected_count', 0)
+        
+        duplicate_count = sum(1 for news in result['collected_news'] if 'duplicate_of' in news)
+        candidate_count = analysis.get('total_analyzed', collected_count)
+        if candidate_count != collected_count:
+            st.info(f"📥 수집: {collected_count}건  |  🔁 중복: {duplicate_count}건  |  🤖 AI 분석: {candidate_count}건  |  ✅ 선별: {selected_count}건")
+        else:
             st.info(f"📥 수집: {collected_count}건  |  ✅ 선별: {selected_count}건")
-            
-            if selected_news:
-                # 테이블 형태로 표시
-                table_data = []
-                for news in selected_news:
-                    # 원본 뉴스에서 매칭하여 정확한 정보 가져오기
-                    original_news = None
-                    for original in result['collected_news']:
-                        if (news.get('title', '') in original.get('title', '') or 
-                            original.get('title', '') in news.get('title', '')):
-                            original_news = original
-                            break
-                    
-                    # UI용 테이블 데이터 (원본 정보 사용)
-                    table_data.append({
-                        "뉴스제목": news.get('title', '제목 없음'),
-                        "언론사": original_news.get('press', '언론사 정보 없음') if original_news else '언론사 정보 없음',
-                        "날짜": original_news.get('date', '날짜 없음') if original_news else '날짜 없음',
-                        "링크": f"[링크]({news.get('url', '')})" if news.get('url') else '링크 없음'
-                    })
-                
-                # Streamlit 테이블로 표시
-                st.table(table_data)
+        # 네이버 장애로 대체 소스에서 수집한 기사
+        fallback_sources = {}
+        for news in result['collected_news']:
+            if news.get('source'):
+                fallback_sources[news['source']] = fallback_sources.get(news['source'], 0) + 1
+        if fallback_sources:
+            st.caption("🩺 네이버 검색 장애로 대체 수집: " + ", ".join(
+                f"{FALLBACK_SOURCE_LABELS.get(source, source)} {count}건" for source, count in fallback_sources.items()))
+        if 'degraded' in analysis:
+            st.warning(f"⚠️ AI 분석을 사용할 수 없어 중요도 점수로 선별했습니다 ({analysis['degraded']})")
+        elif 'model' in analysis:
+            if analysis['model'] is None:
+                st.caption("🤖 후보가 적어 AI 분석 없이 전체 선택")
+            elif analysis.get('escalated_from'):
+                st.caption(f"🤖 모델: {analysis['model']} ({analysis['escalated_from']} 결과 검증 실패로 재분석)")
             else:
-                st.info("AI 분석 결과 해당 카테고리에서 선별할 만한 뉴스가 없습니다.")
-            
-            # 엑셀용: 모든 수집된 뉴스 포함 (선별되지 않은 뉴스도 포함)
-            all_collected_news = result['collected_news']
-            for news in all_collected_news:
-                # 선별된 뉴스인지 확인
-                is_selected = any(selected.get('title', '') in news.get('title', '') or news.get('title', '') in selected.get('title', '') for selected in selected_news)
-                
-                # 선별 이유 또는 제외 이유 결정
-                if is_selected:
-                    selection_reason = next((selected.get('selection_reason', '') for selected in selected_news if selected.get('title', '') in news.get('title', '') or news.get('title', '') in selected.get('title', '')), '')
-                else:
-                    # 제외된 뉴스의 경우 제외 이유 추정
-                    title = news.get('title', '').lower()
-                    summary = news.get('summary', '').lower()
-                    
-                    # 제외 이유 판단 로직
-                    if any(keyword in title or keyword in summary for keyword in ['야구단', '축구단', 'kbo', '선수', '감독', '구단']):
-                        selection_reason = '스포츠단 관련 기사'
-                    elif any(keyword in title or keyword in summary for keyword in ['출시', '기부', '환경', '캠페인', '사회공헌', '나눔', 'esg']):
-                        selection_reason = '신제품 홍보/사회공헌/ESG/기부 기사'
-                    elif any(keyword in title or keyword in summary for keyword in ['장애', '오류', '버그', '점검', '중단', '실패']):
-                        selection_reason = '단순 시스템 장애/버그/서비스 오류'
-                    elif any(keyword in title or keyword in summary for keyword in ['우수성', '기술력', '성능', '품질', '테스트']):
-                        selection_reason = '기술 성능/품질/테스트 홍보 기사'
-                    elif any(keyword in title or keyword in summary for keyword in ['목표가', '목표주가']):
-                        selection_reason = '목표주가 기사'
-                    elif any(keyword in title or keyword in summary for keyword in ['출신', '경력', '배경']):
-                        selection_reason = '단순 언급/경력 소개/배경 문장'
-                    else:
-                        selection_reason = '관련성 부족 또는 기타 제외 사유'
+                st.caption(f"🤖 모델: {analysis['model']}")
+        
+        delta = analysis.get('delta')
+        if delta:
+            base_time = datetime.fromtimestamp(delta['base_created_at'], KST).strftime('%m-%d %H:%M')
+            st.caption(f"🔄 직전 실행({base_time}) 이후 새 기사 {delta['new_articles']}건 · AI 분석 새 후보 {delta['analyzed_new']}건  |  "
+                       f"🆕 새 선별 {len(delta['new'])}건 · 유지 {len(delta['unchanged'])}건 · 빠짐 {len(delta['dropped'])}건")
+            # 새 선별을 먼저 표시
+            new_ids = set(delta['new'])
+            selected_news = sorted(selected_news, key=lambda news: article_id(news) not in new_ids)
+        
+        if selected_news:
+            # 테이블 형태로 표시
+            table_data = []
+            for news in selected_news:
+                # 원본 뉴스에서 매칭하여 정확한 정보 가져오기
+                original_news = None
+                for original in result['collected_news']:
+                    if (news.get('title', '') in original.get('title', '') or 
+                        original.get('title', '') in news.get('title', '')):
+                        original_news = original
+                        break
                 
-                excel_data = {
-                    "카테고리": category,
-                    "검색키워드": news.get('keyword', '키워드 없음'),
+                # UI용 테이블 데이터 (원본 정보 사용)
+                row = {
                     "뉴스제목": news.get('title', '제목 없음'),
-                    "언론사": news.get('press', '언론사 정보 없음'),
-                    "링크": news.get('url', ''),
-                    "발행일": news.get('date', '날짜 없음'),
-                    "요약": news.get('summary', '요약 없음'),
-                    "선별여부": "선별됨" if is_selected else "제외됨",
-                    "선별/제외이유": selection_reason
+                    "언론사": original_news.get('press', '언론사 정보 없음') if original_news else '언론사 정보 없음',
+                    "날짜": original_news.get('date', '날짜 없음') if original_news else '날짜 없음',
+                    "링크": f"[링크]({news.get('url', '')})" if news.get('url') else '링크 없음'
                 }
-                all_excel_data.append(excel_data)
+                if delta:
+                    row = {"변화": "🆕 새 선별" if article_id(news) in new_ids else "유지", **row}
+                table_data.append(row)
+            
+            # Streamlit 테이블로 표시
+            st.table(table_data)
+        else:
+            st.info("AI 분석 결과 해당 카테고리에서 선별할 만한 뉴스가 없습니다.")
+        
+        # 직전 실행에서 선별됐지만 이번에는 빠진 기사
+        if delta and delta['dropped']:
+            st.markdown("**➖ 빠진 기사 (직전 실행 선별)**")
+            st.table([{
+                "뉴스제목": news['title'],
+                "언론사": news['press'],
+                "날짜": news['date'],
+                "이유": news['reason'],
+                "링크": f"[링크]({news['url']})" if news['url'] else '링크 없음'
+            } for news in delta['dropped']])
+
+def build_excel_rows(category, result):
+    """엑셀용 행 생성: 모든 수집된 뉴스 포함 (선별되지 않은 뉴스도 포함)"""
+    analysis = result['analysis_result']
+    if 'error' in analysis:
+        return []
+    
+    selected_news = analysis.get('selected_news', [])
+    excel_rows = []
     
-    # 엑셀 다운로드 버튼 (결과가 있을 때만 표시)
-    if all_excel_data:
-        st.markdown("---")
-        st.markdown("### 📥 엑셀 다운로드")
+    all_collected_news = result['collected_news']
+    for news in all_collected_news:
+        # 선별된 뉴스인지 확인
+        is_selected = any(selected.get('title', '') in news.get('title', '') or news.get('title', '') in selected.get('title', '') for selected in selected_news)
         
-        # pandas DataFrame 생성
-        import pandas as pd
-        df = pd.DataFrame(all_excel_data)
+        # 선별 이유 또는 제외 이유 결정
+        if is_selected:
+            selection_reason = next((selected.get('selection_reason', '') for selected in selected_news if selected.get('title', '') in news.get('title', '') or news.get('title', '') in selected.get('title', '')), '')
+        else:
+            # 제외된 뉴스의 경우 제외 이유 추정
+            title = news.get('title', '').lower()
+            summary = news.get('summary', '').lower()
+            
+            # 제외 이유 판단 로직
+            if news.get('duplicate_of'):
+                selection_reason = '중복 기사 (같은 사건의 대표 기사로 분석)'
+            elif news.get('rank_cut'):
+                selection_reason = '중요도 점수 순위 밖 (AI 분석 제외)'
+            elif any(keyword in title or keyword in summary for keyword in ['야구단', '축구단', 'kbo', '선수', '감독', '구단']):
+                selection_reason = '스포츠단 관련 기사'
+            elif any(keyword in title or keyword in summary for keyword in ['출시', '기부', '환경', '캠페인', '사회공헌', '나눔', 'esg']):
+                selection_reason = '신제품 홍보/사회공헌/ESG/기부 기사'
+            elif any(keyword in title or keyword in summary for keyword in ['장애', '오류', '버그', '점검', '중단', '실패']):
+                selection_reason = '단순 시스템 장애/버그/서비스 오류'
+            elif any(keyword in title or keyword in summary for keyword in ['우수성', '기술력', '성능', '품질', '테스트']):
+                selection_reason = '기술 성능/품질/테스트 홍보 기사'
+            elif any(keyword in title or keyword in summary for keyword in ['목표가', '목표주가']):
+                selection_reason = '목표주가 기사'
+            elif any(keyword in title or keyword in summary for keyword in ['출신', '경력', '배경']):
+                selection_reason = '단순 언급/경력 소개/배경 문장'
+            else:
+                selection_reason = '관련성 부족 또는 기타 제외 사유'
         
-        # 엑셀 파일 생성
-        from io import BytesIO
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='뉴스분석결과', index=False)
+        excel_rows.append({
+            "카테고리": category,
+            "검색키워드": news.get('keyword', '키워드 없음'),
+            "뉴스제목": news.get('title', '제목 없음'),
+            "언론사": news.get('press', '언론사 정보 없음'),
+            "링크": news.get('url', ''),
+            "발행일": news.get('date', '날짜 없음'),
+            "요약": news.get('summary', '요약 없음'),
+            "선별여부": "선별됨" if is_selected else "제외됨",
+            "선별/제외이유": selection_reason
+        })
+    
+    return excel_rows
+
+def iter_excel_rows(all_results, selected_categories):
+    """엑셀 행을 카테고리 순서대로 생성 (전체 실행의 행 목록을 한 번에 만들지 않음)"""
+    for category in selected_categories:
+        if category in all_results:
+            yield from build_excel_rows(category, all_results[category])
+
+def render_excel_download(excel_rows):
+    """엑셀 다운로드 버튼 표시 (결과가 있을 때만 표시) - excel_rows는 행 딕셔너리의 반복 가능 객체"""
+    excel_rows = iter(excel_rows)
+    first_row = next(excel_rows, None)
+    if first_row is None:
+        return
+    
+    st.markdown("---")
+    st.markdown("### 📥 엑셀 다운로드")
+    
+    with span("excel.build", "display") as excel_span:
+        # 행을 한 줄씩 기록하는 write-only 통합문서 (openpyxl은 엑셀을 만들 때만 불러옴)
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Alignment, Border, Font, Side
         
-        # 파일명 생성 (현재 날짜 포함)
-        from datetime import datetime
-        filename = f"PwC_뉴스분석_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        workbook = Workbook(write_only=True)
+        sheet = workbook.create_sheet('뉴스분석결과')
+        columns = list(first_row)
         
-        # 다운로드 버튼
-        st.download_button(
-            label="📊 엑셀 파일 다운로드",
-            data=output.getvalue(),
-            file_name=filename,
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-            help="선별이유와 검색키워드가 포함된 상세 분석 결과를 엑셀 파일로 다운로드합니다."
-        )
+        # 머리글 서식 (굵게, 가는 테두리, 가운데 정렬)
+        thin = Side(style='thin')
+        header = []
+        for column in columns:
+            cell = WriteOnlyCell(sheet, value=column)
+            cell.font = Font(bold=True)
+            cell.border = Border(left=thin, right=thin, top=thin, bottom=thin)
+            cell.alignment = Alignment(horizontal='center', vertical='top')
+            header.append(cell)
+        sheet.append(header)
+        
+        row_count = 0
+        for row in itertools.chain([first_row], excel_rows):
+            sheet.append([row.get(column) for column in columns])
+            row_count += 1
+        
+        # 엑셀 파일 생성
+        output = BytesIO()
+        workbook.save(output)
+        if excel_span:
+            excel_span.set(rows=row_count)
+    
+    # 파일명 생성 (현재 날짜 포함)
+    filename = f"PwC_뉴스분석_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    
+    # 다운로드 버튼
+    st.download_button(
+        label="📊 엑셀 파일 다운로드",
+        data=output.getvalue(),
+        file_name=filename,
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+        help="선별이유와 검색키워드가 포함된 상세 분석 결과를 엑셀 파일로 다운로드합니다."
+    )
 
 if __name__ == "__main__":
     main()
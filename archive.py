@@ -0,0 +1,345 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+News Archive
+------------
+실행마다 수집·선별된 기사를 보관하는 로컬 SQLite 아카이브.
+기사는 URL 해시 단위로 한 번만 저장하고, 실행별 카테고리/검색키워드/선별 여부는
+run_articles 테이블에 기록한다. 제목·요약은 FTS5(trigram) 색인으로 검색하며,
+FTS5를 쓸 수 없는 SQLite에서는 LIKE 검색으로 대체한다.
+
+    archive.search("삼일PwC 지난 30일")
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+from config import ARCHIVE_SETTINGS, DATA_DIR, KST
+from embeddings import article_id
+
+ARCHIVE_DB_PATH = os.path.join(DATA_DIR, "archive.db")
+
+# 선별 결과
+DECISION_SELECTED = "선별됨"
+DECISION_EXCLUDED = "제외됨"
+DECISION_FAILED = "분석 오류"
+DECISION_COLLECTED = "수집만"  # 백필로 수집만 하고 AI 분석은 하지 않은 기사
+
+# "지난 30일", "최근 2주", "3개월" 등 기간 표현
+_PERIOD_RE = re.compile(r"(?:(?:지난|최근)\s*)?(\d+)\s*(일|주|개월|달)(?:\s*(?:간|동안))?")
+_PERIOD_DAYS = {"일": 1, "주": 7, "개월": 30, "달": 30}
+_RELATIVE_DAYS = {"오늘": 0, "어제": 1}
+
+# trigram 색인은 3글자 이상 검색어만 사용할 수 있음
+_MIN_FTS_TERM = 3
+
+
+def parse_query(query: str, today: Optional[datetime] = None) -> Dict:
+    """
+    검색어에서 기간 표현을 분리.
+
+    Returns:
+        Dict: terms(검색어 목록), since(시작 날짜 'YYYY-MM-DD' 또는 None)
+    """
+    today = (today or datetime.now(KST)).date()
+    since = None
+
+    match = _PERIOD_RE.search(query)
+    if match:
+        since = today - timedelta(days=int(match.group(1)) * _PERIOD_DAYS[match.group(2)])
+        query = query[:match.start()] + " " + query[match.end():]
+    else:
+        for word, days in _RELATIVE_DAYS.items():
+            if word in query:
+                since = today - timedelta(days=days)
+                query = query.replace(word, " ")
+                break
+
+    return {"terms": query.split(), "since": since.isoformat() if since else None}
+
+
+class NewsArchive:
+    """
+    SQLite 기사 아카이브입니다.
+    """
+
+    def __init__(self, db_path: str = ARCHIVE_DB_PATH):
+        """
+        Args:
+            db_path (str): 아카이브 SQLite 파일 경로
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            # 실행 결과 저장(쓰기) 중에도 검색(읽기)이 막히지 않도록 WAL 사용
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS articles (
+                    url_hash TEXT PRIMARY KEY,
+                    url TEXT NOT NULL,
+                    originallink TEXT NOT NULL DEFAULT '',
+                    title TEXT NOT NULL,
+                    summary TEXT NOT NULL DEFAULT '',
+                    press TEXT NOT NULL DEFAULT '',
+                    pub_date TEXT NOT NULL DEFAULT '',
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_date ON articles (pub_date)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    params TEXT NOT NULL,
+                    created_at REAL NOT NULL
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS run_articles (
+                    run_id TEXT NOT NULL,
+                    url_hash TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    keyword TEXT NOT NULL DEFAULT '',
+                    decision TEXT NOT NULL,
+                    reason TEXT NOT NULL DEFAULT '',
+                    candidate INTEGER NOT NULL DEFAULT 0,
+                    PRIMARY KEY (run_id, url_hash, category)
+                )
+            """)
+            # candidate 열이 없던 아카이브 (이전 기록은 후보 여부를 모르므로 0 - 델타 실행에서 새 기사로 취급)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(run_articles)")}
+            if "candidate" not in columns:
+                conn.execute("ALTER TABLE run_articles ADD COLUMN candidate INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_run_articles_hash ON run_articles (url_hash)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_run_articles_category ON run_articles (category, decision)")
+            self.fts_enabled = self._create_fts(conn)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @staticmethod
+    def _create_fts(conn: sqlite3.Connection) -> bool:
+        """제목/요약 전문 색인 (articles와 트리거로 동기화). FTS5 trigram을 쓸 수 없으면 False"""
+        try:
+            conn.execute("""
+                CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+                    title, summary, content='articles', content_rowid='rowid', tokenize='trigram'
+                )
+            """)
+        except sqlite3.OperationalError:
+            return False
+
+        conn.executescript("""
+            CREATE TRIGGER IF NOT EXISTS articles_ai AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts (rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_ad AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, summary)
+                VALUES ('delete', old.rowid, old.title, old.summary);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_au AFTER UPDATE OF title, summary ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, summary)
+                VALUES ('delete', old.rowid, old.title, old.summary);
+                INSERT INTO articles_fts (rowid, title, summary) VALUES (new.rowid, new.title, new.summary);
+            END;
+        """)
+        return True
+
+    def record_run(self, params: Dict, records: Sequence[Dict], run_id: Optional[str] = None) -> str:
+        """
+        한 번의 실행에서 수집된 기사와 선별 결과를 저장.
+
+        Args:
+            params (Dict): 실행 조건 (카테고리, 기간 등)
+            records (Sequence[Dict]): news(뉴스 딕셔너리), category, decision, reason,
+                                      candidate(AI가 판단한 후보인지 - 중복/순위 밖/필터로 빠진 기사는 False)을 가진 목록
+
+        Returns:
+            str: 실행 ID
+        """
+        run_id = run_id or uuid.uuid4().hex[:12]
+        now = time.time()
+        article_rows = {}
+        run_rows = []
+        for record in records:
+            news = record["news"]
+            url_hash = article_id(news)
+            article_rows[url_hash] = (
+                url_hash, news.get("url", ""), news.get("originallink", ""), news.get("title", ""),
+                news.get("summary", ""), news.get("press", ""), news.get("date", ""), now, now
+            )
+            run_rows.append((run_id, url_hash, record["category"], news.get("keyword", ""),
+                             record["decision"], record.get("reason", ""), int(record.get("candidate", False))))
+
+        with self._lock, self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO runs (run_id, params, created_at) VALUES (?, ?, ?)",
+                         (run_id, json.dumps(params, ensure_ascii=False, default=str), now))
+            conn.executemany("""
+                INSERT INTO articles (url_hash, url, originallink, title, summary, press, pub_date, first_seen, last_seen)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url_hash) DO UPDATE SET
+                    last_seen = excluded.last_seen,
+                    originallink = CASE WHEN excluded.originallink != '' THEN excluded.originallink ELSE originallink END
+            """, list(article_rows.values()))
+            conn.executemany("""
+                INSERT OR REPLACE INTO run_articles (run_id, url_hash, category, keyword, decision, reason, candidate)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, run_rows)
+        return run_id
+
+    def known_ids(self, url_hashes: Iterable[str]) -> Set[str]:
+        """이미 보관된 기사 ID (증분 수집에서 새 기사 판별용)"""
+        url_hashes = list(url_hashes)
+        known = set()
+        with self._connect() as conn:
+            for start in range(0, len(url_hashes), 500):
+                chunk = url_hashes[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT url_hash FROM articles WHERE url_hash IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                known.update(row["url_hash"] for row in rows)
+        return known
+
+    def last_run(self, category: str, since: float) -> Optional[Dict]:
+        """
+        카테고리를 AI로 선별한 가장 최근 실행의 기사별 선별 결과 (델타 실행의 기준).
+
+        Args:
+            category (str): 카테고리
+            since (float): 이 시각(epoch 초) 이후의 실행만
+
+        Returns:
+            Optional[Dict]: run_id, created_at,
+                            articles(기사 ID → title, url, press, date, keyword, decision, reason, candidate(AI가 판단한 후보인지))
+        """
+        with self._connect() as conn:
+            run = conn.execute("""
+                SELECT runs.run_id, runs.created_at FROM runs
+                WHERE runs.created_at >= ? AND EXISTS (
+                    SELECT 1 FROM run_articles r WHERE r.run_id = runs.run_id AND r.category = ? AND r.decision = ?
+                )
+                ORDER BY runs.created_at DESC LIMIT 1
+            """, (since, category, DECISION_SELECTED)).fetchone()
+            if not run:
+                return None
+            rows = conn.execute("""
+                SELECT r.url_hash, r.keyword, r.decision, r.reason, r.candidate, a.title, a.url, a.press, a.pub_date AS date
+                FROM run_articles r JOIN articles a ON a.url_hash = r.url_hash
+                WHERE r.run_id = ? AND r.category = ?
+            """, (run["run_id"], category)).fetchall()
+        return {
+            "run_id": run["run_id"],
+            "created_at": run["created_at"],
+            "articles": {row["url_hash"]: dict(row, candidate=bool(row["candidate"])) for row in rows}
+        }
+
+    def search(self, query: str, category: Optional[str] = None, selected_only: bool = False,
+               limit: int = ARCHIVE_SETTINGS["search_limit"]) -> List[Dict]:
+        """
+        보관된 기사 검색 (모든 검색어를 포함하는 기사, 최신순).
+
+        Args:
+            query (str): 검색어 (예: "삼일PwC 지난 30일", "감사 수주 최근 2주")
+            category (Optional[str]): 카테고리 제한
+            selected_only (bool): AI가 선별한 기사만
+            limit (int): 최대 결과 수
+
+        Returns:
+            List[Dict]: 기사 정보와 카테고리, 선별 여부, 마지막 수집 시각
+        """
+        parsed = parse_query(query)
+        where, args = [], []
+
+        fts_terms = [term for term in parsed["terms"] if self.fts_enabled and len(term) >= _MIN_FTS_TERM]
+        like_terms = [term for term in parsed["terms"] if term not in fts_terms]
+        if fts_terms:
+            where.append("a.rowid IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)")
+            args.append(" AND ".join('"' + term.replace('"', '""') + '"' for term in fts_terms))
+        for term in like_terms:
+            where.append("(a.title LIKE ? OR a.summary LIKE ?)")
+            args.extend([f"%{term}%", f"%{term}%"])
+        if parsed["since"]:
+            where.append("a.pub_date >= ?")
+            args.append(parsed["since"])
+        if category:
+            where.append("r.category = ?")
+            args.append(category)
+
+        having = f"HAVING SUM(r.decision = '{DECISION_SELECTED}') > 0" if selected_only else ""
+        sql = f"""
+            SELECT a.url_hash, a.title, a.press, a.pub_date, a.url, a.summary, a.last_seen,
+                   GROUP_CONCAT(DISTINCT r.category) AS categories,
+                   GROUP_CONCAT(DISTINCT r.keyword) AS keywords,
+                   SUM(r.decision = '{DECISION_SELECTED}') AS selected_runs,
+                   COUNT(DISTINCT r.run_id) AS runs
+            FROM articles a JOIN run_articles r ON r.url_hash = a.url_hash
+            {"WHERE " + " AND ".join(where) if where else ""}
+            GROUP BY a.url_hash
+            {having}
+            ORDER BY a.pub_date DESC, a.last_seen DESC
+            LIMIT ?
+        """
+        with self._connect() as conn:
+            rows = conn.execute(sql, [*args, limit]).fetchall()
+        return [dict(row) for row in rows]
+
+    def articles_between(self, terms: Sequence[str], start_date: str, end_date: str,
+                         limit: int = ARCHIVE_SETTINGS["search_limit"]) -> List[Dict]:
+        """
+        검색어 중 하나라도 제목/요약에 포함된 기간 내 기사 (최신순, 네이버 검색 장애 시 대체 소스).
+
+        Args:
+            terms (Sequence[str]): 검색 키워드 (OR 조건)
+            start_date, end_date (str): 발행일 범위 'YYYY-MM-DD' (양 끝 포함)
+            limit (int): 최대 결과 수
+
+        Returns:
+            List[Dict]: title, url, originallink, date, summary, press를 포함한 뉴스 목록
+        """
+        terms = [term for term in terms if term]
+        if not terms:
+            return []
+        match = " OR ".join("a.title LIKE ? OR a.summary LIKE ?" for _ in terms)
+        args = [pattern for term in terms for pattern in (f"%{term}%", f"%{term}%")]
+        sql = f"""
+            SELECT a.title, a.url, a.originallink, a.pub_date AS date, a.summary, a.press
+            FROM articles a
+            WHERE a.pub_date BETWEEN ? AND ? AND ({match})
+            ORDER BY a.pub_date DESC, a.last_seen DESC
+            LIMIT ?
+        """
+        with self._connect() as conn:
+            rows = conn.execute(sql, [start_date, end_date, *args, limit]).fetchall()
+        return [dict(row) for row in rows]
+
+    def stats(self) -> Dict:
+        with self._connect() as conn:
+            articles = conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+            runs = conn.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+        return {"articles": articles, "runs": runs, "fts": self.fts_enabled}
+
+
+_archive: Optional[NewsArchive] = None
+_archive_lock = threading.Lock()
+
+
+def get_archive() -> NewsArchive:
+    """프로세스 전역 아카이브"""
+    global _archive
+    with _archive_lock:
+        if _archive is None:
+            _archive = NewsArchive()
+        return _archive
@@ -0,0 +1,555 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+News Backfill
+-------------
+한 달 정도의 긴 기간을 하루 단위 구간(shard)으로 나눠 과거 기사를 수집하고 아카이브에 저장하는 모듈.
+
+네이버 검색 API는 날짜로 검색할 수 없고 최신순(sort=date) 결과를 start 1000까지만 넘길 수 있으므로
+- 쿼리는 query_planner.plan_run으로 검색 깊이(약 1,100건)를 넘지 않을 만큼만 키워드를 묶고,
+- 쿼리마다 최신 기사부터 검색 깊이 끝까지 넘기면서 그 사이 지나간 날짜 구간을 완료로 기록하며,
+- 검색 깊이로 닿지 않은 날짜 구간(truncated)은 Google News 날짜 검색(after:/before:)으로 보충한다.
+
+쿼리들은 워커 스레드 풀에서 동시에 검색하되, 모든 워커가 하나의 호출 간격과 하루 호출 한도
+(scheduler.CallLedger - 평소 분석 실행 몫을 남긴 만큼)를 나눠 쓴다. 한도에 닿으면 남은 구간을 그대로 두고 멈추며,
+같은 조건으로 다시 실행하면 끝나지 않은 구간부터 이어서 진행한다.
+
+    python -m backfill --categories 삼일PwC 경쟁사 --days 30
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from archive import DECISION_COLLECTED, get_archive
+from circuit_breaker import STATE_CLOSED, CircuitOpenError, get_breaker
+from config import BACKFILL_SETTINGS, DATA_DIR, KEYWORD_CATEGORIES, KST, NAVER_API_SETTINGS
+from jobs import make_job_key
+from normalize import normalize_items
+from query_planner import news_for_category, plan_run
+from scheduler import CONSUMER_BACKFILL, CallLedger, get_call_ledger
+from tracing import span
+
+BACKFILL_DB_PATH = os.path.join(DATA_DIR, "backfill.db")
+
+# 백필 상태
+BACKFILL_RUNNING = "running"
+BACKFILL_PAUSED = "paused"  # 호출 한도, 장애 등으로 남은 구간이 있음 (다시 실행하면 이어서 진행)
+BACKFILL_DONE = "done"
+
+# 구간(쿼리 × 날짜) 상태
+SHARD_PENDING = "pending"
+SHARD_DONE = "done"  # 네이버 검색으로 하루 전체 수집
+SHARD_TRUNCATED = "truncated"  # 네이버 검색 깊이로 닿지 않음 (대체 소스 보충 대기)
+SHARD_FALLBACK = "fallback"  # Google News 날짜 검색으로 보충 (네이버보다 결과가 적을 수 있음)
+
+BACKFILL_LABELS = {
+    BACKFILL_RUNNING: "진행 중",
+    BACKFILL_PAUSED: "일시 중지",
+    BACKFILL_DONE: "완료",
+}
+
+SHARD_LABELS = {
+    SHARD_PENDING: "대기",
+    SHARD_DONE: "네이버 수집",
+    SHARD_TRUNCATED: "검색 깊이 초과",
+    SHARD_FALLBACK: "Google News 보충",
+}
+
+
+class QuotaExceeded(Exception):
+    """백필에 쓸 수 있는 오늘의 네이버 호출 한도를 다 씀"""
+
+
+def day_shards(start_dt: datetime, end_dt: datetime) -> List[Dict]:
+    """
+    수집 기간을 한국 시간 기준 하루 단위 구간으로 나눔 (첫날/마지막 날은 기간에 맞춰 자름).
+
+    Returns:
+        List[Dict]: day('YYYY-MM-DD'), start, end(datetime, end는 포함) - 오래된 날짜부터
+    """
+    shards = []
+    day = start_dt.astimezone(KST).date()
+    while True:
+        day_start = datetime.combine(day, datetime.min.time(), tzinfo=KST)
+        if day_start > end_dt:
+            break
+        day_end = day_start + timedelta(days=1) - timedelta(microseconds=1)
+        shards.append({"day": day.isoformat(), "start": max(day_start, start_dt), "end": min(day_end, end_dt)})
+        day += timedelta(days=1)
+    return shards
+
+
+def _parse_pub_date(pub_date: str) -> Optional[datetime]:
+    try:
+        return parsedate_to_datetime(pub_date)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class BackfillStore:
+    """
+    SQLite 백필 진행 상태 저장소입니다.
+    백필별 검색 계획과 구간별 상태를 기록한다.
+    """
+
+    def __init__(self, db_path: str = BACKFILL_DB_PATH):
+        """
+        Args:
+            db_path (str): 백필 SQLite 파일 경로
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS backfills (
+                    backfill_id TEXT PRIMARY KEY,
+                    backfill_key TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    plan TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    message TEXT NOT NULL DEFAULT '',
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_backfills_key ON backfills (backfill_key, updated_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS shards (
+                    backfill_id TEXT NOT NULL,
+                    query_index INTEGER NOT NULL,
+                    day TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    items INTEGER NOT NULL DEFAULT 0,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (backfill_id, query_index, day)
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def open_backfill(self, params: Dict, make_plan: Callable[[], Dict],
+                      days: Sequence[str]) -> Tuple[str, Dict, Dict[Tuple[int, str], str]]:
+        """
+        같은 조건의 끝나지 않은 백필이 있으면 이어서, 없으면 새로 시작.
+        이어서 진행할 때는 처음 세운 검색 계획을 그대로 사용한다 (구간 번호가 바뀌지 않도록).
+
+        Args:
+            params (Dict): 백필 조건 (카테고리, 기간 - JSON 직렬화 가능)
+            make_plan (Callable): 새로 시작할 때 검색 계획(plan_run 결과)을 만드는 함수
+            days (Sequence[str]): 날짜 구간 ('YYYY-MM-DD')
+
+        Returns:
+            (백필 ID, 검색 계획, {(쿼리 번호, 날짜): 구간 상태})
+        """
+        backfill_key = make_job_key(params)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            row = conn.execute(
+                "SELECT backfill_id, plan FROM backfills WHERE backfill_key = ? AND status != ? AND updated_at >= ? "
+                "ORDER BY updated_at DESC LIMIT 1",
+                (backfill_key, BACKFILL_DONE, now - BACKFILL_SETTINGS["resume_seconds"])
+            ).fetchone()
+            if row is not None:
+                backfill_id, plan = row["backfill_id"], json.loads(row["plan"])
+                conn.execute("UPDATE backfills SET status = ?, updated_at = ? WHERE backfill_id = ?",
+                             (BACKFILL_RUNNING, now, backfill_id))
+                shards = {
+                    (shard["query_index"], shard["day"]): shard["status"]
+                    for shard in conn.execute("SELECT query_index, day, status FROM shards WHERE backfill_id = ?",
+                                              (backfill_id,))
+                }
+                return backfill_id, plan, shards
+
+            backfill_id = uuid.uuid4().hex[:12]
+            plan = make_plan()
+            conn.execute(
+                "INSERT INTO backfills (backfill_id, backfill_key, params, plan, status, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (backfill_id, backfill_key, json.dumps(params, ensure_ascii=False),
+                 json.dumps(plan, ensure_ascii=False), BACKFILL_RUNNING, now, now)
+            )
+            shards = {(index, day): SHARD_PENDING for index in range(len(plan["queries"])) for day in days}
+            conn.executemany(
+                "INSERT INTO shards (backfill_id, query_index, day, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                [(backfill_id, index, day, SHARD_PENDING, now) for index, day in shards]
+            )
+        return backfill_id, plan, shards
+
+    def update_shards(self, backfill_id: str, query_index: int, statuses: Dict[str, str],
+                      items: Dict[str, int]) -> None:
+        """쿼리 하나의 날짜별 구간 상태와 수집 건수 기록 (건수는 누적)"""
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            conn.executemany(
+                "UPDATE shards SET status = ?, items = items + ?, updated_at = ? "
+                "WHERE backfill_id = ? AND query_index = ? AND day = ?",
+                [(status, items.get(day, 0), now, backfill_id, query_index, day) for day, status in statuses.items()]
+            )
+            conn.execute("UPDATE backfills SET updated_at = ? WHERE backfill_id = ?", (now, backfill_id))
+
+    def finish(self, backfill_id: str, status: str, message: str = "") -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("UPDATE backfills SET status = ?, message = ?, updated_at = ? WHERE backfill_id = ?",
+                         (status, message, time.time(), backfill_id))
+
+    def progress(self, backfill_id: str) -> Dict:
+        """
+        Returns:
+            Dict: shards(전체 구간 수), 구간 상태별 수, items(수집 건수)
+        """
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT status, COUNT(*) AS shards, SUM(items) AS items FROM shards WHERE backfill_id = ? GROUP BY status",
+                (backfill_id,)
+            ).fetchall()
+        progress = {status: 0 for status in SHARD_LABELS}
+        progress.update({row["status"]: row["shards"] for row in rows})
+        progress["shards"] = sum(row["shards"] for row in rows)
+        progress["items"] = sum(row["items"] or 0 for row in rows)
+        return progress
+
+    def latest(self) -> Optional[Dict]:
+        """가장 최근 백필 (params, status, message, progress 포함) 또는 None"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT backfill_id, params, status, message, created_at, updated_at FROM backfills "
+                "ORDER BY updated_at DESC LIMIT 1"
+            ).fetchone()
+        if row is None:
+            return None
+        backfill = dict(row)
+        backfill["params"] = json.loads(backfill["params"])
+        backfill["progress"] = self.progress(backfill["backfill_id"])
+        return backfill
+
+
+_store: Optional[BackfillStore] = None
+_store_lock = threading.Lock()
+
+
+def get_backfill_store() -> BackfillStore:
+    """프로세스 전역 백필 저장소"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = BackfillStore()
+        return _store
+
+
+class NaverQuota:
+    """
+    백필 워커들이 함께 쓰는 네이버 호출 간격 / 하루 호출 한도입니다.
+    """
+
+    def __init__(self, ledger: CallLedger, settings: Dict = BACKFILL_SETTINGS):
+        self.ledger = ledger
+        # 오늘 전체 호출 수(분석 실행 포함)가 이 값에 닿으면 멈춤 - 남은 호출은 분석 실행 몫
+        self.limit = ledger.daily_quota - settings["quota_reserve"]
+        self.interval = 1.0 / settings["requests_per_second"]
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+
+    def acquire(self) -> None:
+        """호출 하나를 예약 (간격을 맞춰 대기) - 오늘 한도를 다 썼으면 QuotaExceeded"""
+        if not self.ledger.take(CONSUMER_BACKFILL, self.limit):
+            raise QuotaExceeded(f"오늘 네이버 호출이 백필 한도({self.limit}회)에 닿았습니다.")
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._next_at - now)
+            self._next_at = max(now, self._next_at) + self.interval
+        if wait:
+            time.sleep(wait)
+
+
+class Backfill:
+    """
+    카테고리 묶음 하나의 과거 기사 백필입니다.
+    """
+
+    def __init__(self, categories: Sequence[str], start_dt: datetime, end_dt: datetime,
+                 workers: int = BACKFILL_SETTINGS["workers"], store: Optional[BackfillStore] = None,
+                 fallback: bool = BACKFILL_SETTINGS["fallback"]):
+        """
+        Args:
+            categories (Sequence[str]): 카테고리 이름 (config.KEYWORD_CATEGORIES)
+            start_dt, end_dt (datetime): 수집 기간 (tz-aware, 최대 BACKFILL_SETTINGS["max_days"]일)
+            workers (int): 동시에 검색하는 쿼리 수
+            store (Optional[BackfillStore]): 진행 상태 저장소 (기본값: get_backfill_store())
+            fallback (bool): 네이버 검색 깊이로 닿지 않는 날짜를 Google News로 보충할지
+        """
+        if (end_dt - start_dt).days >= BACKFILL_SETTINGS["max_days"]:
+            raise ValueError(f"백필 기간은 최대 {BACKFILL_SETTINGS['max_days']}일입니다.")
+        self.categories = list(categories)
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+        self.workers = workers
+        self.fallback = fallback
+        self.store = store or get_backfill_store()
+        self.quota = NaverQuota(get_call_ledger())
+        self.days = day_shards(start_dt, end_dt)
+        self.depth = BACKFILL_SETTINGS["max_start"] + BACKFILL_SETTINGS["display"] - 1
+        # 이어서 진행할 백필은 날짜로 찾음 (오늘까지 백필하면 종료 시각이 실행할 때마다 달라짐)
+        self.params = {"categories": self.categories, "start_date": self.days[0]["day"], "end_date": self.days[-1]["day"]}
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self.http_calls = 0
+        self.errors: List[str] = []
+
+    def run(self, report: Optional[Callable[[float, str], None]] = None) -> Dict:
+        """
+        남은 구간 수집 (네이버 검색 → 검색 깊이 초과 날짜는 Google News 보충).
+
+        Args:
+            report (Optional[Callable]): report(진행률, 메시지) - 쿼리/구간 하나가 끝날 때마다 호출
+
+        Returns:
+            Dict: backfill_id, status, message, http_calls, errors, progress(BackfillStore.progress)
+        """
+        self.backfill_id, self.plan, self.shards = self.store.open_backfill(
+            self.params,
+            lambda: plan_run({category: KEYWORD_CATEGORIES[category] for category in self.categories},
+                             self.start_dt, self.end_dt, capacity=self.depth),
+            [shard["day"] for shard in self.days]
+        )
+        message = ""
+        with span("backfill", "collect", backfill_id=self.backfill_id, queries=len(self.plan["queries"]),
+                  days=len(self.days)) as backfill_span:
+            # 1) 네이버 검색 - 예상 결과가 많은(오래 걸리는) 쿼리부터 워커에 배정
+            scans = [index for index in range(len(self.plan["queries"]))
+                     if SHARD_PENDING in self._statuses(index).values()]
+            scans.sort(key=lambda index: -self.plan["queries"][index]["expected"])
+            message = self._run_tasks([(self._scan, (index,)) for index in scans], report) or message
+
+            # 2) 검색 깊이로 닿지 않은 날짜 보충
+            if self.fallback:
+                truncated = [(index, day) for (index, day), status in sorted(self.shards.items())
+                             if status == SHARD_TRUNCATED]
+                message = self._run_tasks([(self._fill, shard) for shard in truncated], report) or message
+
+            progress = self.store.progress(self.backfill_id)
+            remaining = progress[SHARD_PENDING] + (progress[SHARD_TRUNCATED] if self.fallback else 0)
+            status = BACKFILL_PAUSED if remaining else BACKFILL_DONE
+            if not message:
+                if status == BACKFILL_PAUSED:
+                    message = f"남은 구간 {remaining}개 - 다시 실행하면 이어서 진행합니다."
+                elif progress[SHARD_TRUNCATED]:
+                    message = f"네이버 검색 깊이로 닿지 않은 구간 {progress[SHARD_TRUNCATED]}개는 보충하지 않았습니다."
+            self.store.finish(self.backfill_id, status, message)
+            if backfill_span:
+                backfill_span.set(status=status, http_calls=self.http_calls, items=progress["items"])
+
+        if report:
+            report(1.0, f"백필 {'완료' if status == BACKFILL_DONE else '일시 중지'} · 기사 {progress['items']}건")
+        return {"backfill_id": self.backfill_id, "status": status, "message": message,
+                "http_calls": self.http_calls, "errors": self.errors, "progress": progress}
+
+    def _run_tasks(self, tasks: List[Tuple[Callable, tuple]], report: Optional[Callable]) -> str:
+        """작업을 워커 풀에서 실행 - 호출 한도에 닿으면 남은 작업을 시작하지 않고 그 메시지를 반환"""
+        message = ""
+        if not tasks or self._stop.is_set():
+            return message
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="backfill") as pool:
+            futures = [pool.submit(fn, *args) for fn, args in tasks]
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except QuotaExceeded as e:
+                    message = str(e)
+                    self._stop.set()
+                except (CircuitOpenError, requests.RequestException, sqlite3.Error, ValueError) as e:
+                    with self._lock:
+                        self.errors.append(str(e))
+                if report:
+                    progress = self.store.progress(self.backfill_id)
+                    finished = progress[SHARD_DONE] + progress[SHARD_FALLBACK]
+                    report(finished / max(progress["shards"], 1),
+                           f"백필 {finished}/{progress['shards']}개 구간 · 기사 {progress['items']}건")
+        return message
+
+    def _statuses(self, index: int) -> Dict[str, str]:
+        return {shard["day"]: self.shards[(index, shard["day"])] for shard in self.days}
+
+    def _save(self, index: int, news_list: List[Dict]) -> Dict[str, int]:
+        """쿼리 결과를 카테고리별로 아카이브에 저장하고 날짜별 건수 반환"""
+        query = self.plan["queries"][index]
+        records = []
+        for category in {*query["categories"], *query["borrowed"]}:
+            records.extend({"news": news, "category": category, "decision": DECISION_COLLECTED}
+                           for news in news_for_category(query, category, news_list))
+        if records:
+            get_archive().record_run(dict(self.params, kind="backfill"), records, run_id=self.backfill_id)
+        counts: Dict[str, int] = {}
+        for news in news_list:
+            counts[news["date"]] = counts.get(news["date"], 0) + 1
+        return counts
+
+    def _set_statuses(self, index: int, statuses: Dict[str, str], items: Dict[str, int]) -> None:
+        if not statuses:
+            return
+        self.store.update_shards(self.backfill_id, index, statuses, items)
+        with self._lock:
+            for day, status in statuses.items():
+                self.shards[(index, day)] = status
+
+    def _scan(self, index: int) -> None:
+        """
+        쿼리 하나를 최신순으로 검색 깊이 끝까지 넘기며 대기 중인 날짜 구간 수집.
+        지나간 날짜(가장 오래된 결과보다 늦은 날짜)는 중간에 멈춰도 완료로 기록한다.
+        """
+        query = self.plan["queries"][index]
+        pending = [shard for shard in self.days if self.shards[(index, shard["day"])] == SHARD_PENDING]
+        window_start, window_end = pending[0]["start"], pending[-1]["end"]
+        items_by_day: Dict[str, int] = {}
+        oldest: Optional[datetime] = None
+        reached_end = False
+        start = pages = 1
+
+        try:
+            with span("backfill.scan", "collect", query=query["query"]) as scan_span:
+                while not self._stop.is_set():
+                    items = self._naver_page(query["query"], start)
+                    if items:
+                        news_list = normalize_items(items, window_start, window_end, keyword=query["query"])
+                        for day, count in self._save(index, news_list).items():
+                            items_by_day[day] = items_by_day.get(day, 0) + count
+                        oldest = _parse_pub_date(items[-1].get("pubDate", "")) or oldest
+                    # 결과가 끝났거나 기간 시작보다 오래된 기사까지 왔으면 모든 날짜 완료
+                    if len(items) < BACKFILL_SETTINGS["display"] or (oldest and oldest < window_start):
+                        reached_end = True
+                        break
+                    if start >= BACKFILL_SETTINGS["max_start"]:
+                        break
+                    # 마지막 페이지는 start 최댓값에서 시작 (앞 페이지와 겹치는 기사는 아카이브에서 합쳐짐)
+                    start = min(start + len(items), BACKFILL_SETTINGS["max_start"])
+                    pages += 1
+                if scan_span:
+                    scan_span.set(pages=pages, reached_end=reached_end)
+        finally:
+            statuses = {}
+            for shard in pending:
+                if reached_end or (oldest and oldest < shard["start"]):
+                    statuses[shard["day"]] = SHARD_DONE
+                elif start >= BACKFILL_SETTINGS["max_start"] and not self._stop.is_set():
+                    statuses[shard["day"]] = SHARD_TRUNCATED
+            self._set_statuses(index, statuses, items_by_day)
+
+    def _naver_page(self, query: str, start: int) -> List[Dict]:
+        """네이버 검색 한 페이지 - 호출 한도/간격을 지키고 429는 잠시 기다렸다 재시도"""
+        headers = {
+            "X-Naver-Client-Id": NAVER_API_SETTINGS["client_id"],
+            "X-Naver-Client-Secret": NAVER_API_SETTINGS["client_secret"],
+        }
+        params = {"query": query, "display": BACKFILL_SETTINGS["display"], "start": start, "sort": "date"}
+        breaker = get_breaker("naver")
+        for attempt in range(BACKFILL_SETTINGS["rate_limit_retries"] + 1):
+            if not breaker.allow():
+                raise CircuitOpenError("naver", breaker.retry_in())
+            self.quota.acquire()
+            with self._lock:
+                self.http_calls += 1
+            try:
+                response = requests.get(NAVER_API_SETTINGS["base_url"], headers=headers, params=params,
+                                        timeout=NAVER_API_SETTINGS["timeout"])
+            except requests.RequestException as e:
+                breaker.record_failure(e)
+                raise
+            if response.status_code >= 500:
+                error = requests.HTTPError(f"네이버 API 오류: {response.status_code}")
+                breaker.record_failure(error)
+                raise error
+            breaker.record_success()
+            if response.status_code == 429:
+                time.sleep(2 ** attempt)
+                continue
+            if response.status_code != 200:
+                raise requests.HTTPError(f"'{query}' 검색 중 API 오류: {response.status_code}")
+            return response.json().get("items", [])
+        raise requests.HTTPError(f"'{query}' 검색 호출 제한(429)이 계속됩니다.")
+
+    def _fill(self, index: int, day: str) -> None:
+        """검색 깊이로 닿지 않은 날짜 하나를 Google News 날짜 검색으로 보충"""
+        from googlenews import GoogleNews
+
+        if self._stop.is_set():
+            return
+        query = self.plan["queries"][index]
+        shard = next(shard for shard in self.days if shard["day"] == day)
+        next_day = (date.fromisoformat(day) + timedelta(days=1)).isoformat()
+        with span("backfill.fill", "collect", query=query["query"], day=day) as fill_span:
+            items = GoogleNews().search_naver_items(f"{query['query']} after:{day} before:{next_day}", k=self.depth)
+            google_state = get_breaker("google_news").snapshot()
+            if not items and (google_state["state"] != STATE_CLOSED or google_state["failures"]):
+                # Google News 장애(요청 실패)로 못 가져온 날짜는 다음 실행에서 다시 보충
+                return
+            news_list = normalize_items(items, shard["start"], shard["end"], keyword=query["query"])
+            # Google News 링크는 중계 주소라 URL로 언론사를 알 수 없으므로 RSS의 언론사명 사용
+            press_by_link = {item["link"]: item["press"] for item in items}
+            news_list = [dict(news, press=press_by_link.get(news["url"]) or news["press"]) for news in news_list]
+            counts = self._save(index, news_list)
+            if fill_span:
+                fill_span.set(items=len(news_list))
+        self._set_statuses(index, {day: SHARD_FALLBACK}, counts)
+
+
+def backfill_window(end_date: date, days: int) -> Tuple[datetime, datetime]:
+    """end_date까지 days일 (한국 시간, 종료는 현재 시각을 넘지 않음)"""
+    start_dt = datetime.combine(end_date - timedelta(days=days - 1), datetime.min.time(), tzinfo=KST)
+    end_dt = min(datetime.combine(end_date, datetime.max.time(), tzinfo=KST), datetime.now(KST))
+    return start_dt, end_dt
+
+
+def run_backfill_job(params: Dict, report: Callable[[float, str], None]) -> Dict:
+    """백그라운드 작업용 진입점 (jobs.JobRunner에서 호출) - params: categories, end_date('YYYY-MM-DD'), days"""
+    start_dt, end_dt = backfill_window(date.fromisoformat(params["end_date"]), params["days"])
+    return Backfill(params["categories"], start_dt, end_dt).run(report)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="과거 기사 백필 (하루 단위 구간 수집 → 아카이브 저장)")
+    parser.add_argument("--categories", nargs="+", default=list(KEYWORD_CATEGORIES), choices=list(KEYWORD_CATEGORIES))
+    parser.add_argument("--days", type=int, default=30, help="end-date까지 수집할 일수")
+    parser.add_argument("--end-date", type=date.fromisoformat, default=datetime.now(KST).date(),
+                        help="마지막 날짜 YYYY-MM-DD (기본값: 오늘)")
+    parser.add_argument("--workers", type=int, default=BACKFILL_SETTINGS["workers"])
+    parser.add_argument("--no-fallback", action="store_true", help="검색 깊이 초과 날짜를 Google News로 보충하지 않음")
+    args = parser.parse_args(argv)
+
+    if not NAVER_API_SETTINGS["client_id"] or not NAVER_API_SETTINGS["client_secret"]:
+        parser.error("환경변수 NAVER_CLIENT_ID와 NAVER_CLIENT_SECRET을 설정해주세요.")
+
+    start_dt, end_dt = backfill_window(args.end_date, args.days)
+    backfill = Backfill(args.categories, start_dt, end_dt, workers=args.workers, fallback=not args.no_fallback)
+    print(f"백필 {start_dt.date()} ~ {end_dt.date()} · 카테고리 {len(args.categories)}개 · 워커 {args.workers}개")
+    result = backfill.run(lambda progress, message: print(f"  [{progress:5.1%}] {message}"))
+
+    progress = result["progress"]
+    print(f"\n{result['backfill_id']} {result['status']} · 네이버 호출 {result['http_calls']}회 "
+          f"(오늘 전체 {backfill.quota.ledger.used()}/{backfill.quota.limit}) · 기사 {progress['items']}건")
+    print("  " + " · ".join(f"{label} {progress[status]}" for status, label in SHARD_LABELS.items()))
+    if result["message"]:
+        print(f"  {result['message']}")
+    for error in result["errors"][:5]:
+        print(f"  오류: {error}")
+
+
+if __name__ == "__main__":
+    main()
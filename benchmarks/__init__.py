@@ -0,0 +1,2 @@
+# -*- coding: utf-8 -*-
+"""벤치마크 모음 - 저장소 루트에서 python -m benchmarks.<이름> 으로 실행"""
@@ -0,0 +1,98 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+네이버 항목 정규화 마이크로벤치마크.
+기존 방식(항목마다 정규식 컴파일 + replace 체인 + parsedate_to_datetime)과
+normalize.normalize_items의 항목당 비용을 비교한다.
+
+    python -m benchmarks.bench_normalize --sizes 100 1000 10000
+"""
+
+import argparse
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.synth import make_naver_items
+from config import KST
+from normalize import normalize_items
+from press import resolve_press
+
+
+def _legacy_clean_html_entities(text):
+    """변경 전 clean_html_entities (비교 기준)"""
+    if not text:
+        return ""
+    import re
+    clean_text = re.sub(r'<[^>]+>', '', text)
+    clean_text = clean_text.replace('&quot;', '"')
+    clean_text = clean_text.replace('&amp;', '&')
+    clean_text = clean_text.replace('&lt;', '<')
+    clean_text = clean_text.replace('&gt;', '>')
+    clean_text = clean_text.replace('&apos;', "'")
+    clean_text = re.sub(r'\s+', ' ', clean_text).strip()
+    return clean_text
+
+
+def legacy_normalize(items, start_dt, end_dt, keyword):
+    """변경 전 collect_news_from_naver_api의 항목 처리 루프 (비교 기준)"""
+    news = []
+    for item in items:
+        try:
+            date_str = item.get('pubDate', '')
+            if date_str:
+                from email.utils import parsedate_to_datetime
+                pub_date = parsedate_to_datetime(date_str)
+                if pub_date.tzinfo is None:
+                    pub_date = pub_date.replace(tzinfo=timezone.utc).astimezone(KST)
+                else:
+                    pub_date = pub_date.astimezone(KST)
+            else:
+                pub_date = datetime.now(KST)
+        except Exception:
+            pub_date = datetime.now(KST)
+
+        if start_dt <= pub_date <= end_dt:
+            news.append({
+                'title': _legacy_clean_html_entities(item.get('title', '')),
+                'url': item.get('link', ''),
+                'originallink': item.get('originallink', ''),  # 본문 수집용 원문 링크 (normalize_items와 같은 출력)
+                'date': pub_date.strftime('%Y-%m-%d'),
+                'summary': _legacy_clean_html_entities(item.get('description', '')),
+                'keyword': keyword,
+                'press': resolve_press(item.get('link', ''), item.get('originallink')),
+            })
+    return news
+
+
+def _time_per_item(fn, items, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best / max(len(items), 1) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="네이버 항목 정규화 마이크로벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    end_dt = datetime.now(KST)
+    start_dt = end_dt - timedelta(hours=24)
+
+    print(f"{'항목 수':>8} | {'기존 (us/항목)':>14} | {'일괄 (us/항목)':>14} | {'배율':>6}")
+    for size in args.sizes:
+        items = make_naver_items(size, seed=size, end=end_dt)
+        # 결과 동일성 확인
+        assert legacy_normalize(items, start_dt, end_dt, "q") == normalize_items(items, start_dt, end_dt, "q", now=end_dt)
+
+        legacy = _time_per_item(lambda: legacy_normalize(items, start_dt, end_dt, "q"), items, args.repeat)
+        batch = _time_per_item(lambda: normalize_items(items, start_dt, end_dt, "q"), items, args.repeat)
+        print(f"{size:>8} | {legacy:>14.2f} | {batch:>14.2f} | {legacy / batch:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Import Time Budget
+------------------
+`python -X importtime -c "import app"` 를 새 프로세스에서 여러 번 실행해 앱 모듈을 불러오는 시간
+(콜드 스타트)을 측정하고 예산과 비교한다.
+
+- 총 시간: 반복 측정 중 최솟값이 IMPORT_BUDGET["total_ms"] 이하
+- 지연 로딩 대상(openai, pandas 등)은 import app 시점에 불러오지 않아야 함
+
+    python -m benchmarks.importtime               # 측정 + 예산 확인 (초과 시 종료 코드 1)
+    python -m benchmarks.importtime --top 20      # 오래 걸리는 최상위 import 20개
+
+benchmarks.run 도 같은 측정을 결과 파일의 "importtime" 항목으로 기록해 이전 결과와 비교한다.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_BUDGET = {
+    "total_ms": 800,
+    # 처음 사용할 때 불러오는 무거운 패키지 (앱 시작 시 불러오면 예산 위반)
+    "lazy_modules": ["openai", "pandas", "openpyxl", "bs4", "lxml", "sentence_transformers"],
+}
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """-X importtime 출력 파싱 → name, self_ms, cumulative_ms, depth 목록"""
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE_RE.match(line)
+        if match:
+            entries.append({
+                "name": match.group(4),
+                "self_ms": int(match.group(1)) / 1000,
+                "cumulative_ms": int(match.group(2)) / 1000,
+                "depth": len(match.group(3)) // 2,
+            })
+    return entries
+
+
+def measure(module: str = "app", repeats: int = 5) -> Dict:
+    """
+    새 인터프리터에서 module을 불러오는 시간 측정.
+
+    Returns:
+        Dict: total_ms(반복 중 최솟값), runs_ms(각 측정값), top(최솟값 실행의 최상위 import 목록),
+              loaded_lazy(불러오면 안 되는데 불러온 지연 로딩 대상)
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT_DIR + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    runs = []
+    for _ in range(repeats):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=ROOT_DIR, env=env, capture_output=True, text=True
+        )
+        entries = parse_importtime(completed.stderr)
+        target = next((e for e in entries if e["name"] == module and e["depth"] == 0), None)
+        if target is None:
+            raise RuntimeError(f"{module} 불러오기 실패:\n{completed.stderr[-2000:]}")
+        runs.append((target["cumulative_ms"], entries))
+
+    total_ms, entries = min(runs, key=lambda run: run[0])
+    loaded = {entry["name"].split(".")[0] for entry in entries}
+    top = sorted((e for e in entries if e["depth"] == 1), key=lambda e: -e["cumulative_ms"])
+    return {
+        "module": module,
+        "total_ms": round(total_ms, 1),
+        "runs_ms": [round(run[0], 1) for run in runs],
+        "top": [{"name": e["name"], "cumulative_ms": round(e["cumulative_ms"], 1)} for e in top],
+        "loaded_lazy": sorted(loaded & set(IMPORT_BUDGET["lazy_modules"])),
+    }
+
+
+def check_budget(result: Dict) -> List[str]:
+    """예산 위반 항목 목록"""
+    violations = []
+    if result["total_ms"] > IMPORT_BUDGET["total_ms"]:
+        violations.append(f"import {result['module']} {result['total_ms']:.0f}ms > {IMPORT_BUDGET['total_ms']}ms")
+    for name in result["loaded_lazy"]:
+        violations.append(f"지연 로딩 대상 {name}을(를) 시작 시 불러옴")
+    return violations
+
+
+def print_result(result: Dict, top: int = 10) -> None:
+    print(f"\n[importtime] import {result['module']}: {result['total_ms']:.0f}ms "
+          f"(예산 {IMPORT_BUDGET['total_ms']}ms, 측정 {', '.join(f'{ms:.0f}' for ms in result['runs_ms'])})")
+    for entry in result["top"][:top]:
+        print(f"  {entry['name']:<24} {entry['cumulative_ms']:>9.1f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="앱 import 시간 측정 / 예산 확인")
+    parser.add_argument("--module", default="app")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="표시할 최상위 import 수")
+    args = parser.parse_args(argv)
+
+    result = measure(args.module, args.repeats)
+    print_result(result, args.top)
+    violations = check_budget(result)
+    if violations:
+        print("\n예산 초과: " + "; ".join(violations))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LLM 요청 지연 측정
+------------------
+llm_client의 동시 요청 제한, 재시도, hedging을 로컬 모의 서버(mock_server.py)에 대고 확인한다.
+같은 요청 묶음을 hedging 끔/켬으로 각각 보내고 지연 분포(p50/p95/p99)와 재시도/hedging 횟수를 비교한다.
+
+    python -m benchmarks.llm_latency --requests 200 --concurrency 8 \\
+        --server-args "--llm-latency-ms 150 --llm-tail-rate 0.05 --llm-tail-ms 3000 --llm-rate-limit 30"
+    python -m benchmarks.llm_latency --base-url http://127.0.0.1:8765 --stream
+"""
+
+import argparse
+import os
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+def run_batch(client, requests: int, concurrency: int, stream: bool) -> Dict:
+    """requests개 요청을 concurrency개 스레드에서 보내고 지연 분포 반환"""
+    messages = [
+        {"role": "system", "content": "지연 측정"},
+        {"role": "user", "content": "1. 제목: 모의 기사\n   링크: https://example.com/1\n"},
+    ]
+
+    def one(_):
+        started = time.perf_counter()
+        try:
+            client.complete(messages, "gpt-4o-mini", on_token=(lambda text: None) if stream else None)
+            return (time.perf_counter() - started) * 1000, None
+        except Exception as e:
+            return (time.perf_counter() - started) * 1000, type(e).__name__
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(one, range(requests)))
+    latencies = [latency for latency, error in results if error is None]
+    errors: Dict[str, int] = {}
+    for _, error in results:
+        if error:
+            errors[error] = errors.get(error, 0) + 1
+
+    summary = {"total_s": round(time.perf_counter() - started, 2), "ok": len(latencies), "errors": errors}
+    if latencies:
+        summary.update(p50_ms=round(statistics.median(latencies), 1),
+                       p95_ms=round(percentile(latencies, 0.95), 1),
+                       p99_ms=round(percentile(latencies, 0.99), 1),
+                       max_ms=round(max(latencies), 1))
+    summary.update({key: value for key, value in client.stats().items() if key != "p95_ms"})
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="LLM 요청 지연 / hedging 측정 (모의 서버)")
+    parser.add_argument("--base-url", help="실행 중인 모의 서버 주소 (없으면 이 프로세스에서 띄움)")
+    parser.add_argument("--server-args", default="--llm-latency-ms 150 --llm-tail-rate 0.05 --llm-tail-ms 3000",
+                        help="모의 서버 인자 (--base-url이 없을 때)")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8, help="요청을 보내는 스레드 수 (세션 수 흉내)")
+    parser.add_argument("--max-concurrency", type=int, help="llm_client 동시 요청 상한 (기본값 설정 파일)")
+    parser.add_argument("--stream", action="store_true", help="스트리밍 요청 (hedging은 첫 청크 기준)")
+    args = parser.parse_args(argv)
+
+    base_url = args.base_url
+    if not base_url:
+        from mock_server import start_server
+        server = start_server(["--port", "0", *args.server_args.split()], background=True)
+        host, port = server.server_address[:2]
+        base_url = f"http://{host}:{port}"
+
+    from config import LLM_CLIENT_SETTINGS, OPENAI_SETTINGS
+    from llm_client import LLMClient
+    OPENAI_SETTINGS["base_url"] = f"{base_url}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+    print(f"요청 {args.requests}개 · 스레드 {args.concurrency}개 · {'스트리밍' if args.stream else '일반'} · {base_url}")
+    for hedge in (False, True):
+        settings = dict(LLM_CLIENT_SETTINGS, hedge=hedge)
+        if args.max_concurrency:
+            settings["max_concurrency"] = args.max_concurrency
+        client = LLMClient(settings)
+        try:
+            summary = run_batch(client, args.requests, args.concurrency, args.stream)
+        finally:
+            client.close()
+        print(f"\n[hedging {'켬' if hedge else '끔'}]")
+        for key, value in summary.items():
+            print(f"  {key:<16} {value}")
+
+
+if __name__ == "__main__":
+    main()
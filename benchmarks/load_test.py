@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+모의 서버(mock_server.py)를 대상으로 수집/분석 파이프라인을 헤드리스로 실행하는 부하 테스트.
+동시 세션 수만큼 run_analysis_pipeline을 병렬로 돌리고 처리 시간과 서버 측 통계를 출력한다.
+
+    python -m benchmarks.load_test --sessions 4 --categories 삼일PwC 경쟁사
+    python -m benchmarks.load_test --base-url http://127.0.0.1:8765   # 이미 띄운 서버 사용
+"""
+
+import argparse
+import json
+import os
+import statistics
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="모의 서버 대상 파이프라인 부하 테스트")
+    parser.add_argument("--base-url", help="실행 중인 모의 서버 주소 (없으면 내장 서버를 띄움)")
+    parser.add_argument("--sessions", type=int, default=4, help="동시 실행 세션 수")
+    parser.add_argument("--categories", nargs="+", default=["삼일PwC", "경쟁사"])
+    parser.add_argument("--no-cache", action="store_true", help="공유 캐시 저장을 끔 (동시 요청 병합은 유지)")
+    parser.add_argument("--server-args", default="--latency-ms 50 --llm-latency-ms 300 --rate-limit 20",
+                        help="내장 서버 실행 인자")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if not base_url:
+        from mock_server import start_server
+        server = start_server(["--port", "0", *args.server_args.split()], background=True)
+        host, port = server.server_address[:2]
+        base_url = f"http://{host}:{port}"
+
+    # 앱 모듈을 불러오기 전에 엔드포인트와 키를 모의 서버로 지정
+    from config import NAVER_API_SETTINGS, OPENAI_SETTINGS, KST
+    NAVER_API_SETTINGS.update(base_url=f"{base_url}/v1/search/news.json", client_id="mock", client_secret="mock")
+    OPENAI_SETTINGS["base_url"] = f"{base_url}/v1"
+    os.environ.setdefault("OPENAI_API_KEY", "mock")
+
+    import app
+    if args.no_cache:
+        from cache import news_cache, llm_cache
+        news_cache.ttl_seconds = llm_cache.ttl_seconds = -1
+
+    end_dt = datetime.now(KST)
+    start_dt = end_dt - timedelta(days=1)
+
+    def session(index: int) -> float:
+        started = time.perf_counter()
+        app.run_analysis_pipeline(args.categories, start_dt, end_dt)
+        return time.perf_counter() - started
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        durations = list(pool.map(session, range(args.sessions)))
+    total = time.perf_counter() - started
+
+    with urllib.request.urlopen(f"{base_url}/stats") as response:
+        stats = json.load(response)
+
+    print(f"세션 {args.sessions}개 · 카테고리 {', '.join(args.categories)}")
+    print(f"전체 {total:.2f}s · 세션당 중앙값 {statistics.median(durations):.2f}s · 최대 {max(durations):.2f}s")
+    print(f"서버 통계: {json.dumps(stats, ensure_ascii=False)}")
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+실제 네이버 API / OpenAI / Google News 응답을 녹화하여 benchmarks/fixtures 를 갱신한다.
+NAVER_CLIENT_ID, NAVER_CLIENT_SECRET, OPENAI_API_KEY 환경변수가 필요하다.
+
+    python -m benchmarks.record --categories 삼일PwC 경쟁사
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime, time, timedelta
+from unittest import mock
+
+import requests
+
+from benchmarks.replay import FIXTURE_DIR
+from config import KST, NAVER_API_SETTINGS
+from llm_client import reset_llm_client
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="벤치마크 픽스처 녹화")
+    parser.add_argument("--categories", nargs="+", default=["삼일PwC", "경쟁사"])
+    parser.add_argument("--output", default=FIXTURE_DIR)
+    args = parser.parse_args(argv)
+
+    import app
+    import openai
+    from googlenews import GoogleNews
+
+    now = datetime.now(KST)
+    end_dt = datetime.combine(now.date(), time(10, 0)).replace(tzinfo=KST)
+    start_dt = end_dt - timedelta(days=1)
+
+    pages = []
+    completions = {}
+    rss = {}
+    real_get = requests.get
+    real_client = openai.AsyncOpenAI
+    current = {"category": ""}
+
+    def recording_get(url, params=None, **kwargs):
+        response = real_get(url, params=params, **kwargs)
+        if url == NAVER_API_SETTINGS["base_url"] and response.status_code == 200:
+            pages.append({"params": dict(params or {}), "status": 200, "body": response.json()})
+        elif "news.google.com" in url:
+            rss["content"] = response.content
+        return response
+
+    def recording_client(*client_args, **client_kwargs):
+        client = real_client(*client_args, **client_kwargs)
+        real_create = client.chat.completions.create
+
+        async def create(*create_args, **create_kwargs):
+            create_kwargs.pop("stream", None)
+            response = await real_create(*create_args, **create_kwargs)
+            completions[current["category"]] = response.model_dump()
+            return response
+
+        client.chat.completions.create = create
+        return client
+
+    reset_llm_client()
+    with mock.patch("requests.get", recording_get), mock.patch("openai.AsyncOpenAI", recording_client):
+        for category in args.categories:
+            current["category"] = category
+            news_list = app.collect_news_from_naver_api(
+                app.KEYWORD_CATEGORIES[category], start_dt, end_dt, category_name=category
+            )
+            if news_list:
+                _, candidates = app.prepare_candidates(news_list, category)
+                app.analyze_news_with_ai(candidates, category)
+        GoogleNews().search_all_press_unified(args.categories[0], k=100)
+
+    os.makedirs(args.output, exist_ok=True)
+    with open(os.path.join(args.output, "naver_pages.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "recorded_window": {"start_dt": start_dt.isoformat(), "end_dt": end_dt.isoformat()},
+            "pages": pages,
+        }, f, ensure_ascii=False, indent=1)
+    with open(os.path.join(args.output, "chat_completions.json"), "w", encoding="utf-8") as f:
+        json.dump(completions, f, ensure_ascii=False, indent=1)
+    if rss.get("content"):
+        with open(os.path.join(args.output, "google_news.xml"), "wb") as f:
+            f.write(rss["content"])
+
+    print(f"녹화 완료: 네이버 {len(pages)}페이지, chat completion {len(completions)}건 → {args.output}")
+
+
+if __name__ == "__main__":
+    main()
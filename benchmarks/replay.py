@@ -0,0 +1,276 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Replay Transport
+----------------
+벤치마크에서 네이버 검색 API, Google News RSS, OpenAI chat completions를
+로컬 픽스처(또는 합성 데이터)로 재생하는 대체 전송 계층.
+HTTP 호출 수와 토큰 수를 함께 집계한다.
+"""
+
+import json
+import os
+import re
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+from unittest import mock
+
+from benchmarks.synth import make_naver_items
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_PROMPT_ITEM_RE = re.compile(r"^\d+\. 제목: (.*)$\n(?:.*\n)*?^\s+링크: (\S*)$", re.MULTILINE)
+
+
+def load_fixtures(fixture_dir: str = FIXTURE_DIR) -> Dict:
+    """픽스처 디렉터리의 네이버 페이지, RSS, chat completion 로드"""
+    with open(os.path.join(fixture_dir, "naver_pages.json"), encoding="utf-8") as f:
+        naver = json.load(f)
+    with open(os.path.join(fixture_dir, "chat_completions.json"), encoding="utf-8") as f:
+        completions = json.load(f)
+    with open(os.path.join(fixture_dir, "google_news.xml"), "rb") as f:
+        rss = f.read()
+    return {"naver": naver, "completions": completions, "rss": rss}
+
+
+@lru_cache(maxsize=1)
+def _token_encoder():
+    """tiktoken 인코더 (인코딩 파일을 받을 수 없으면 None)"""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding("o200k_base")
+    except Exception:
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """토큰 수 추정 - tiktoken 인코딩이 있으면 사용, 없으면 글자 수 기반 근사"""
+    encoder = _token_encoder()
+    if encoder is not None:
+        return len(encoder.encode(text))
+    # 한국어 위주 텍스트 기준 근사치
+    return max(1, int(len(text) / 1.6))
+
+
+class FakeResponse:
+    """requests.Response 대용"""
+
+    def __init__(self, status_code: int = 200, body: Optional[Dict] = None, content: bytes = b""):
+        self.status_code = status_code
+        self._body = body
+        self.content = content if content else json.dumps(body or {}, ensure_ascii=False).encode("utf-8")
+        self.text = self.content.decode("utf-8")
+        self.headers = {}
+
+    def json(self):
+        return self._body if self._body is not None else json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            import requests
+            raise requests.HTTPError(f"{self.status_code} Error", response=self)
+
+
+class _AsyncChunks:
+    """스트리밍 응답 (AsyncStream 대용)"""
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def close(self):
+        pass
+
+
+class ReplayTransport:
+    """
+    requests.get / openai.AsyncOpenAI 를 대체하는 재생기입니다.
+    """
+
+    def __init__(self, fixtures: Optional[Dict] = None, synthetic_per_query: int = 0, seed: int = 0,
+                 synthetic_end: Optional[datetime] = None, synthetic_span_hours: int = 48,
+                 cache_synthetic: bool = True):
+        """
+        Args:
+            fixtures (Optional[Dict]): load_fixtures() 결과. 없으면 합성 데이터만 사용
+            synthetic_per_query (int): 0보다 크면 쿼리마다 이 개수의 합성 기사를 페이지로 나누어 제공
+            seed (int): 합성 데이터 시드
+            synthetic_end (Optional[datetime]): 합성 기사 발행일의 기준 시각
+            synthetic_span_hours (int): 합성 기사 발행일이 분포하는 기간 (synthetic_end 이전, 시간)
+            cache_synthetic (bool): 쿼리별 합성 기사를 보관해 다음 페이지에 재사용 (False면 페이지마다 다시 생성 -
+                                    메모리 측정에 재생기 보관분이 섞이지 않음)
+        """
+        self.fixtures = fixtures or {}
+        self.synthetic_per_query = synthetic_per_query
+        self.seed = seed
+        self.synthetic_end = synthetic_end
+        self.synthetic_span_hours = synthetic_span_hours
+        self.cache_synthetic = cache_synthetic
+
+        self._pages: Dict[tuple, Dict] = {}
+        self._recorded_items: List[Dict] = []
+        for page in self.fixtures.get("naver", {}).get("pages", []):
+            params = page["params"]
+            self._pages[(params["query"], int(params.get("start", 1)))] = page
+            self._recorded_items.extend(page["body"].get("items", []))
+        self._synthetic_cache: Dict[str, List[Dict]] = {}
+        self._seen_prompts: List[str] = []
+
+        self.current_category = ""
+        self.reset_counters()
+
+    def reset_counters(self):
+        self.http_calls = 0
+        self.http_calls_by_host: Dict[str, int] = {}
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cached_tokens = 0
+        self.llm_calls = 0
+
+    def _count(self, host: str):
+        self.http_calls += 1
+        self.http_calls_by_host[host] = self.http_calls_by_host.get(host, 0) + 1
+
+    # ---- HTTP ----
+
+    def get(self, url, params=None, headers=None, timeout=None, **kwargs):
+        if "news.google.com" in url:
+            self._count("news.google.com")
+            return FakeResponse(content=self.fixtures.get("rss", b"<rss><channel></channel></rss>"))
+
+        self._count("openapi.naver.com")
+        params = params or {}
+        return FakeResponse(body=self._naver_page(params["query"], int(params.get("start", 1)),
+                                                  int(params.get("display", 10))))
+
+    def _naver_page(self, query: str, start: int, display: int) -> Dict:
+        """쿼리/페이지에 해당하는 네이버 응답 본문 생성"""
+        if self.synthetic_per_query:
+            items = self._synthetic_cache.get(query)
+            if items is None:
+                items = make_naver_items(self.synthetic_per_query,
+                                         seed=zlib.crc32(f"{self.seed}:{query}".encode("utf-8")),
+                                         end=self.synthetic_end, span_hours=self.synthetic_span_hours)
+                if self.cache_synthetic:
+                    self._synthetic_cache[query] = items
+        elif (query, start) in self._pages:
+            return self._pages[(query, start)]["body"]
+        elif start == 1:
+            # 녹화되지 않은 쿼리: 녹화된 기사 중 검색어가 제목에 포함된 기사로 응답
+            terms = [t.strip().lower() for t in query.split(" OR ") if t.strip()]
+            items = [item for item in self._recorded_items
+                     if any(t in _TAG_RE.sub("", item["title"]).lower() for t in terms)]
+        else:
+            items = []
+
+        page = items[start - 1:start - 1 + display]
+        return {"total": len(items), "start": start, "display": len(page), "items": page}
+
+    # ---- OpenAI ----
+
+    def openai_client(self, *args, **kwargs):
+        """openai.AsyncOpenAI(...) 대체 생성자"""
+        transport = self
+
+        async def create(model=None, messages=None, stream=False, stream_options=None, **kw):
+            response = transport._chat_completion(model, messages or [], stream,
+                                                  include_usage=bool((stream_options or {}).get("include_usage")))
+            return _AsyncChunks(response) if stream else response
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    def _chat_completion(self, model, messages, stream, include_usage=False):
+        self._count("api.openai.com")
+        self.llm_calls += 1
+        prompt = "\n".join(m.get("content", "") for m in messages)
+
+        canned = self.fixtures.get("completions", {}).get(self.current_category)
+        if canned and not self.synthetic_per_query:
+            content = canned["choices"][0]["message"]["content"]
+            usage = dict(canned["usage"])
+        else:
+            content = self._synthesize_selection(prompt)
+            usage = {"prompt_tokens": count_tokens(prompt), "completion_tokens": count_tokens(content),
+                     "prompt_tokens_details": {"cached_tokens": self._cached_prefix_tokens(prompt)}}
+
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.completion_tokens += usage.get("completion_tokens", 0)
+        self.cached_tokens += (usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)
+
+        usage_ns = SimpleNamespace(
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", 0),
+            total_tokens=usage.get("prompt_tokens", 0) + usage.get("completion_tokens", 0),
+            prompt_tokens_details=SimpleNamespace(
+                cached_tokens=(usage.get("prompt_tokens_details") or {}).get("cached_tokens", 0)),
+        )
+
+        if stream:
+            chunks = [
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content[i:i + 8]))], usage=None)
+                for i in range(0, len(content), 8)
+            ]
+            if include_usage:
+                chunks.append(SimpleNamespace(choices=[], usage=usage_ns))
+            return iter(chunks)
+
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=usage_ns,
+            model=model,
+        )
+
+    def _cached_prefix_tokens(self, prompt: str) -> int:
+        """OpenAI 자동 프롬프트 캐싱 흉내 - 이전 요청과 같은 prefix가 1024토큰 이상이면 128토큰 단위로 캐시 적중"""
+        shared = max((len(os.path.commonprefix([prompt, seen])) for seen in self._seen_prompts), default=0)
+        self._seen_prompts.append(prompt)
+        tokens = count_tokens(prompt[:shared]) if shared else 0
+        if tokens < 1024:
+            return 0
+        return 1024 + (tokens - 1024) // 128 * 128
+
+    @staticmethod
+    def _synthesize_selection(prompt: str, count: int = 3) -> str:
+        """프롬프트의 기사 목록에서 앞쪽 기사 몇 건을 선별한 것처럼 응답 생성"""
+        lines = []
+        for i, match in enumerate(_PROMPT_ITEM_RE.finditer(prompt), 1):
+            if i > count:
+                break
+            lines.append(f"{i}. {match.group(1)}\n   선별 이유: 벤치마크 합성 응답\n   링크: {match.group(2)}\n")
+        return "\n".join(lines) or "선별된 뉴스 없음"
+
+    @contextmanager
+    def patched(self):
+        """requests.get, openai.AsyncOpenAI, time.sleep 을 재생기로 교체 (sleep은 실제로 쉬지 않고 합계만 기록)
+
+        전역 LLM 클라이언트는 AsyncOpenAI를 한 번만 만들므로 들어갈 때와 나올 때 초기화한다.
+        """
+        from llm_client import reset_llm_client
+
+        self.slept_seconds = 0.0
+
+        def fake_sleep(seconds):
+            self.slept_seconds += seconds
+
+        reset_llm_client()
+        try:
+            with mock.patch("requests.get", self.get), \
+                    mock.patch("openai.AsyncOpenAI", self.openai_client), \
+                    mock.patch("time.sleep", fake_sleep):
+                yield self
+        finally:
+            reset_llm_client()
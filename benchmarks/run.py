@@ -0,0 +1,405 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark Harness
+-----------------
+수집(collect) → Google News → 중복 묶기/사전 순위(dedupe) → AI 분석(analyze) → 응답 파싱(parse) → 결과 표시(display)
+단계별로 실행 시간, 최대 메모리, HTTP 호출 수, 토큰 수를 측정한다.
+네트워크 대신 benchmarks/fixtures의 녹화 데이터 또는 합성 데이터를 재생한다.
+
+    python -m benchmarks.run                         # 픽스처 + 1k + 10k
+    python -m benchmarks.run --scales 100k           # 10만 건 합성 데이터
+    python -m benchmarks.run --compare latest        # 직전 결과와 비교 (회귀 시 종료 코드 1)
+    python -m benchmarks.run --scales backfill       # 7일 × 여러 카테고리 수집 (실행 전체 최대/보관 메모리)
+    python -m benchmarks.run --scales backfill --no-spool   # 수집 기사를 메모리에 보관하는 경우와 비교
+
+앱 import 시간(콜드 스타트)도 함께 측정해 benchmarks/importtime.py의 예산과 비교한다 (--no-importtime으로 생략).
+
+결과는 benchmarks/results/<시각>.json 에 저장된다.
+"""
+
+import argparse
+import glob
+import json
+import math
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from benchmarks import importtime
+from benchmarks.replay import ReplayTransport, load_fixtures
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+SCALES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+
+# 여러 날짜/카테고리를 한 번에 수집하는 실행 (카테고리가 늘어도 보관 메모리가 일정한지 확인)
+BACKFILL = {"categories": ["삼일PwC", "경쟁사", "M&A", "인사동정", "경제"], "days": 7, "per_query": 400}
+
+# 합성 데이터 실행에 사용하는 카테고리 (쿼리 수가 적어 기사 수를 맞추기 쉬움)
+SYNTHETIC_CATEGORY = "삼일PwC"
+
+# 비교 시 회귀로 간주할 지표
+COMPARED_METRICS = ("wall_s", "peak_mb", "http_calls", "prompt_tokens")
+
+
+class StageRecorder:
+    """단계별 지표 수집기"""
+
+    def __init__(self, transport: ReplayTransport, trace_memory: bool = True):
+        self.transport = transport
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict] = {}
+        self.run_peak = 0
+
+    def current(self) -> int:
+        """지금 추적 중인 메모리 (앞 단계의 결과처럼 실행 끝까지 보관되는 것 포함)"""
+        return tracemalloc.get_traced_memory()[0] if self.trace_memory else 0
+
+    @contextmanager
+    def stage(self, name: str, items: int = 0):
+        transport = self.transport
+        calls_before = transport.http_calls
+        prompt_before = transport.prompt_tokens
+        completion_before = transport.completion_tokens
+        cached_before = transport.cached_tokens
+
+        # tracemalloc은 실행 전체에서 켜 두고, 단계 최대 메모리는 단계 시작 시점보다 늘어난 양으로 측정
+        base = 0
+        if self.trace_memory:
+            base = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - started
+            peak = 0
+            if self.trace_memory:
+                _, absolute = tracemalloc.get_traced_memory()
+                self.run_peak = max(self.run_peak, absolute)
+                peak = absolute - base
+
+            metrics = self.stages.setdefault(name, {
+                "wall_s": 0.0, "peak_mb": 0.0, "http_calls": 0,
+                "prompt_tokens": 0, "completion_tokens": 0, "cached_tokens": 0, "items": 0,
+            })
+            metrics["wall_s"] += wall
+            metrics["peak_mb"] = max(metrics["peak_mb"], peak / 1024 / 1024)
+            metrics["http_calls"] += transport.http_calls - calls_before
+            metrics["prompt_tokens"] += transport.prompt_tokens - prompt_before
+            metrics["completion_tokens"] += transport.completion_tokens - completion_before
+            metrics["cached_tokens"] += transport.cached_tokens - cached_before
+            metrics["items"] += items
+
+
+def run_pipeline(transport: ReplayTransport, categories: List[str], start_dt: datetime, end_dt: datetime,
+                 max_per_keyword: int, trace_memory: bool, with_google: bool, use_spool: bool = True) -> Dict:
+    """재생 전송 계층 위에서 파이프라인 단계를 순서대로 실행하고 단계별 지표 반환
+
+    trace_memory면 단계별 최대 메모리와 함께 실행 전체의 최대 메모리(peak_mb)와, 카테고리 분석이 끝날 때마다
+    결과로 보관 중인 메모리(retained_mb_by_category, 마지막 값이 retained_mb)를 기록한다.
+    보관 메모리에는 프로세스 전역 벡터 캐시(embedding_cache_mb, 상한 있음)가 포함된다.
+    """
+    import app
+    from embeddings import embedding_store
+    from googlenews import GoogleNews
+    from scheduler import CallLedger, reset_call_ledger
+    from spool import NewsSpool
+
+    recorder = StageRecorder(transport, trace_memory=trace_memory)
+    all_results = {}
+    retained = []
+
+    # 재생 호출이 실제 하루 호출 기록(DATA_DIR/naver_calls.db)에 쌓이지 않고, 실행마다 같은 남은 한도로 계획하도록 임시 기록 사용
+    ledger_dir = tempfile.mkdtemp(prefix="news-bench-")
+    reset_call_ledger(CallLedger(os.path.join(ledger_dir, "naver_calls.db")))
+    if trace_memory:
+        tracemalloc.start()
+    try:
+        with transport.patched():
+            run_start = recorder.current()
+            # 앱과 같이 실행 단위로 검색 계획을 세워 겹치는 검색은 한 번만, 수집 결과는 디스크에 내려 둠
+            spool = NewsSpool() if use_spool else None
+            fetcher = app.create_run_fetcher({category: app.KEYWORD_CATEGORIES[category] for category in categories},
+                                             start_dt, end_dt, max_per_keyword=max_per_keyword, spool=spool)
+            for category in categories:
+                transport.current_category = category
+
+                news_list = []
+                with recorder.stage("collect"):
+                    news_list = app.collect_news_from_naver_api(
+                        app.KEYWORD_CATEGORIES[category], start_dt, end_dt,
+                        category_name=category, max_per_keyword=max_per_keyword, fetcher=fetcher
+                    )
+                recorder.stages["collect"]["items"] += len(news_list)
+                if not news_list:
+                    continue
+
+                with recorder.stage("dedupe", items=len(news_list)):
+                    news_list, candidates = app.prepare_candidates(news_list, category)
+
+                with recorder.stage("analyze", items=len(candidates)):
+                    analysis = app.analyze_news_with_ai(candidates, category)
+
+                # 파싱 단계만 따로 측정 (analyze에 포함된 파싱과 동일한 입력)
+                response_text = "\n".join(
+                    f"{i}. {news.get('title', '')}\n   선별 이유: {news.get('selection_reason', '')}\n   링크: {news.get('url', '')}"
+                    for i, news in enumerate(analysis.get("selected_news", []), 1)
+                )
+                with recorder.stage("parse", items=len(news_list)):
+                    app.parse_ai_response(response_text, news_list)
+
+                all_results[category] = {"collected_news": app.spool_collected(spool, category, news_list),
+                                         "analysis_result": analysis}
+                news_list = candidates = None
+                retained.append(recorder.current() - run_start)
+
+            with recorder.stage("display", items=sum(len(r["collected_news"]) for r in all_results.values())):
+                app.display_results(all_results, categories)
+
+            if with_google:
+                with recorder.stage("google_news"):
+                    results = GoogleNews().search_all_press_unified("삼일PwC", k=100)
+                recorder.stages["google_news"]["items"] = len(results)
+            run_peak = recorder.run_peak - run_start
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        reset_call_ledger()
+        shutil.rmtree(ledger_dir, ignore_errors=True)
+
+    summary = {
+        "stages": recorder.stages,
+        "totals": {
+            "wall_s": sum(m["wall_s"] for m in recorder.stages.values()),
+            "http_calls": transport.http_calls,
+            "http_calls_by_host": transport.http_calls_by_host,
+            "prompt_tokens": transport.prompt_tokens,
+            "completion_tokens": transport.completion_tokens,
+            "cached_tokens": transport.cached_tokens,
+            "skipped_sleep_s": round(transport.slept_seconds, 2),
+            "spool": use_spool,
+            "embedding_cache_mb": round(embedding_store.size_bytes / 1024 / 1024, 2),
+        },
+    }
+    if trace_memory:
+        summary["totals"].update(
+            peak_mb=round(run_peak / 1024 / 1024, 2),
+            retained_mb=round(retained[-1] / 1024 / 1024, 2) if retained else 0.0,
+            retained_mb_by_category=[round(value / 1024 / 1024, 2) for value in retained],
+        )
+    return summary
+
+
+def run_fixture_scale(trace_memory: bool, use_spool: bool = True) -> Dict:
+    """녹화된 픽스처 재생"""
+    fixtures = load_fixtures()
+    window = fixtures["naver"]["recorded_window"]
+    transport = ReplayTransport(fixtures)
+    categories = [c for c in fixtures["completions"].keys()]
+    return run_pipeline(
+        transport, categories,
+        datetime.fromisoformat(window["start_dt"]), datetime.fromisoformat(window["end_dt"]),
+        max_per_keyword=50, trace_memory=trace_memory, with_google=True, use_spool=use_spool
+    )
+
+
+def run_synthetic_scale(total: int, trace_memory: bool, use_spool: bool = True) -> Dict:
+    """합성 기사 total건 규모로 실행 (한 카테고리의 쿼리들에 고르게 분배)"""
+    import app
+
+    end_dt = datetime.now(app.KST).replace(microsecond=0)
+    start_dt = end_dt - timedelta(hours=48)
+
+    from query_planner import plan_queries
+    # 쿼리 수는 검색 계획 기준 (중복/포함 키워드 제외)
+    plan = plan_queries(app.KEYWORD_CATEGORIES[SYNTHETIC_CATEGORY], SYNTHETIC_CATEGORY, start_dt, end_dt,
+                        capacity=app.DEFAULT_NEWS_COUNT_PER_KEYWORD * 2)
+    query_count = len(plan["queries"])
+    per_query = math.ceil(total / query_count)
+    transport = ReplayTransport(synthetic_per_query=per_query, seed=total, synthetic_end=end_dt)
+    return run_pipeline(
+        transport, [SYNTHETIC_CATEGORY], start_dt, end_dt,
+        max_per_keyword=math.ceil(per_query / 2), trace_memory=trace_memory, with_google=False, use_spool=use_spool
+    )
+
+
+def run_backfill_scale(trace_memory: bool, use_spool: bool = True) -> Dict:
+    """BACKFILL["days"]일 기간을 여러 카테고리로 한 번에 수집 (쿼리마다 BACKFILL["per_query"]건)"""
+    import app
+
+    end_dt = datetime.now(app.KST).replace(microsecond=0)
+    start_dt = end_dt - timedelta(days=BACKFILL["days"])
+    per_query = BACKFILL["per_query"]
+    # 재생기가 합성 기사를 보관하면 그 메모리가 보관 메모리에 섞이므로 페이지마다 다시 생성
+    transport = ReplayTransport(synthetic_per_query=per_query, seed=per_query, synthetic_end=end_dt,
+                                synthetic_span_hours=BACKFILL["days"] * 24, cache_synthetic=False)
+    return run_pipeline(
+        transport, BACKFILL["categories"], start_dt, end_dt,
+        max_per_keyword=math.ceil(per_query / 2), trace_memory=trace_memory, with_google=False, use_spool=use_spool
+    )
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"],
+                                       stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def save_results(results: Dict, path: Optional[str] = None) -> str:
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = path or os.path.join(RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, ensure_ascii=False, indent=2)
+    return path
+
+
+def resolve_baseline(compare: str, exclude: Optional[str] = None) -> Optional[str]:
+    """--compare 인자 해석 ('latest'면 가장 최근 결과 파일)"""
+    if compare != "latest":
+        return compare
+    candidates = sorted(p for p in glob.glob(os.path.join(RESULTS_DIR, "*.json")) if p != exclude)
+    return candidates[-1] if candidates else None
+
+
+def compare_results(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """기준 결과 대비 지표 변화 출력, 회귀 항목 목록 반환"""
+    regressions = []
+    print(f"\n기준: {baseline['meta']['timestamp']} ({baseline['meta']['git']})")
+    print(f"{'규모/단계':<22} {'지표':<14} {'기준':>12} {'현재':>12} {'변화':>8}")
+    if "importtime" in current and "importtime" in baseline:
+        before, after = baseline["importtime"]["total_ms"], current["importtime"]["total_ms"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        # 프로세스 시작 편차를 고려해 50ms 미만의 증가는 회귀로 보지 않음
+        if change > threshold and after - before >= 50:
+            flag = " ▲"
+            regressions.append("importtime/total_ms")
+        print(f"{'importtime':<22} {'total_ms':<14} {before:>12.1f} {after:>12.1f} {change:>+7.0%}{flag}")
+    for scale, run in current["runs"].items():
+        base_run = baseline["runs"].get(scale)
+        if not base_run:
+            continue
+        # 실행 전체 최대 메모리 (이전 결과에 없으면 비교하지 않음)
+        before, after = base_run["totals"].get("peak_mb"), run["totals"].get("peak_mb")
+        if before and after:
+            change = (after - before) / before
+            flag = ""
+            if change > threshold:
+                flag = " ▲"
+                regressions.append(f"{scale}/run/peak_mb")
+            print(f"{scale + '/run':<22} {'peak_mb':<14} {before:>12.3f} {after:>12.3f} {change:>+7.0%}{flag}")
+        for stage, metrics in run["stages"].items():
+            base_metrics = base_run["stages"].get(stage)
+            if not base_metrics:
+                continue
+            for metric in COMPARED_METRICS:
+                before, after = base_metrics.get(metric, 0), metrics.get(metric, 0)
+                if not before and not after:
+                    continue
+                change = (after - before) / before if before else float("inf")
+                flag = ""
+                # 시간 측정은 짧은 단계에서 잡음이 크므로 50ms 미만은 회귀로 보지 않음
+                noisy = metric == "wall_s" and max(before, after) < 0.05
+                if change > threshold and not noisy:
+                    flag = " ▲"
+                    regressions.append(f"{scale}/{stage}/{metric}")
+                print(f"{scale + '/' + stage:<22} {metric:<14} {before:>12.3f} {after:>12.3f} {change:>+7.0%}{flag}")
+    return regressions
+
+
+def print_summary(results: Dict) -> None:
+    if "importtime" in results:
+        importtime.print_result(results["importtime"])
+    for scale, run in results["runs"].items():
+        totals = run["totals"]
+        print(f"\n[{scale}] 총 {totals['wall_s']:.2f}s · HTTP {totals['http_calls']}회 "
+              f"· 토큰 {totals['prompt_tokens']}+{totals['completion_tokens']} "
+              f"(캐시 {totals['cached_tokens']}) · 생략된 sleep {totals['skipped_sleep_s']}s")
+        if "peak_mb" in totals:
+            print(f"  실행 최대 메모리 {totals['peak_mb']:.1f}MB · 보관 메모리 {totals['retained_mb']:.1f}MB "
+                  f"(카테고리별 {totals['retained_mb_by_category']}, 벡터 캐시 {totals['embedding_cache_mb']:.1f}MB 포함) "
+                  f"· 스풀 {'사용' if totals.get('spool') else '안 함'}")
+        print(f"  {'단계':<12} {'시간(s)':>9} {'메모리(MB)':>11} {'HTTP':>6} {'토큰(in)':>9} {'건수':>8}")
+        for stage, m in run["stages"].items():
+            print(f"  {stage:<12} {m['wall_s']:>9.3f} {m['peak_mb']:>11.1f} {m['http_calls']:>6} "
+                  f"{m['prompt_tokens']:>9} {m['items']:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="뉴스 분석 파이프라인 벤치마크")
+    parser.add_argument("--scales", nargs="+", default=["fixtures", "1k", "10k"],
+                        choices=["fixtures", *SCALES.keys(), "backfill"])
+    parser.add_argument("--no-memory", action="store_true", help="tracemalloc 없이 시간만 측정")
+    parser.add_argument("--no-spool", action="store_true", help="수집 기사를 디스크에 내리지 않고 메모리에 보관 (비교용)")
+    parser.add_argument("--output", help="결과 저장 경로 (기본값: benchmarks/results/<시각>.json)")
+    parser.add_argument("--compare", help="비교할 기준 결과 파일 또는 'latest'")
+    parser.add_argument("--threshold", type=float, default=0.2, help="회귀로 간주할 증가율 (기본값: 0.2)")
+    parser.add_argument("--no-importtime", action="store_true", help="앱 import 시간(콜드 스타트) 측정 생략")
+    args = parser.parse_args(argv)
+
+    # 재생 모드에서는 실제 키가 필요 없음
+    from config import NAVER_API_SETTINGS
+    NAVER_API_SETTINGS["client_id"] = NAVER_API_SETTINGS["client_id"] or "benchmark"
+    NAVER_API_SETTINGS["client_secret"] = NAVER_API_SETTINGS["client_secret"] or "benchmark"
+    # 검색 계획이 실행마다 달라지지 않도록 키워드 결과 수 기록을 저장/재사용하지 않음
+    from config import QUERY_PLANNER_SETTINGS
+    from query_planner import reset_query_stats
+    QUERY_PLANNER_SETTINGS["stats_path"] = None
+
+    baseline_path = resolve_baseline(args.compare) if args.compare else None
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "git": git_revision(),
+            "python": platform.python_version(),
+            "trace_memory": not args.no_memory,
+            "spool": not args.no_spool,
+        },
+        "runs": {},
+    }
+    # 다른 측정보다 먼저 (새 프로세스에서 측정하므로 순서와 무관하지만 결과 표시 순서 유지)
+    if not args.no_importtime:
+        results["importtime"] = importtime.measure()
+    for scale in args.scales:
+        # 앞서 실행한 스케일에서 배운 예상 결과 수가 다음 스케일의 검색 계획에 섞이지 않도록 스케일마다 새 기록으로 시작
+        reset_query_stats()
+        if scale == "fixtures":
+            results["runs"][scale] = run_fixture_scale(not args.no_memory, use_spool=not args.no_spool)
+        elif scale == "backfill":
+            results["runs"][scale] = run_backfill_scale(not args.no_memory, use_spool=not args.no_spool)
+        else:
+            results["runs"][scale] = run_synthetic_scale(SCALES[scale], not args.no_memory, use_spool=not args.no_spool)
+
+    print_summary(results)
+    path = save_results(results, args.output)
+    print(f"\n결과 저장: {path}")
+
+    regressions = []
+    if baseline_path:
+        with open(baseline_path, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.threshold)
+    if "importtime" in results:
+        regressions.extend(importtime.check_budget(results["importtime"]))
+    if regressions:
+        print(f"\n회귀 감지: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
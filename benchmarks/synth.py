@@ -0,0 +1,48 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Synthetic Data
+--------------
+벤치마크용 네이버 검색 API 항목 생성기.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+from config import KST
+
+_PRESS_HOSTS = [
+    "www.chosun.com", "www.joongang.co.kr", "www.donga.com", "www.hankyung.com",
+    "www.mk.co.kr", "www.yna.co.kr", "www.edaily.co.kr", "www.asiae.co.kr",
+    "www.newspim.com", "www.newsis.com", "biz.heraldcorp.com", "www.thebell.co.kr",
+    "news.mt.co.kr", "www.fnnews.com", "www.localnews.kr", "it.chosun.com",
+]
+_SUBJECTS = ["삼성전자", "SK하이닉스", "현대차", "LG에너지솔루션", "삼일PwC", "삼정KPMG", "포스코", "롯데"]
+_EVENTS = ["실적 발표", "영업이익 증가", "M&A 추진", "회계감리 결과", "신규 투자", "IPO 준비", "CEO 선임", "구조조정"]
+
+
+def make_naver_items(n: int, seed: int = 0, end: Optional[datetime] = None,
+                     span_hours: int = 48) -> List[Dict]:
+    """
+    네이버 검색 API 응답 형식의 항목 n개 생성.
+    제목/요약에는 <b> 태그와 HTML 엔티티가 섞여 있고, 발행일은 end 이전 span_hours 안에 분포한다.
+    """
+    rng = random.Random(seed)
+    end = end or datetime.now(KST)
+
+    items = []
+    for i in range(n):
+        subject = rng.choice(_SUBJECTS)
+        event = rng.choice(_EVENTS)
+        host = rng.choice(_PRESS_HOSTS)
+        pub = end - timedelta(minutes=rng.randint(0, span_hours * 60))
+        items.append({
+            "title": f"<b>{subject}</b>, &quot;{event}&quot; &amp; 시장 반응 #{i}",
+            "originallink": f"https://{host}/article/{seed}/{i}",
+            "link": f"https://n.news.naver.com/mnews/article/{rng.randint(1, 450):03d}/{i:010d}",
+            "description": f"{subject}가 {event} 관련 &lt;공시&gt;를 냈다.  업계는   <b>{event}</b>에 주목하고 있다.",
+            "pubDate": pub.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+        })
+    return items
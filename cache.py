@@ -0,0 +1,214 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Shared Cache
+------------
+모든 Streamlit 세션이 공유하는 프로세스 전역 캐시.
+수집된 기사와 AI 선별 결과를 저장하며, 동일한 요청이 동시에 들어오면
+하나의 계산만 수행하고 나머지는 그 결과를 기다린다 (single-flight).
+항목 수/메모리 상한을 넘으면 가장 오래 사용되지 않은 항목부터 제거한다.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from config import CACHE_SETTINGS
+
+
+def make_cache_key(*parts: Any) -> str:
+    """임의의 (JSON 직렬화 가능한) 값들로 고정 길이 캐시 키 생성"""
+    raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def estimate_size(value: Any) -> int:
+    """캐시 값의 대략적인 메모리 크기 (바이트)"""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+    except (TypeError, ValueError):
+        return 1024
+
+
+class _Flight:
+    """진행 중인 계산 (single-flight 대기용)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+
+
+class SharedCache:
+    """
+    LRU + TTL 기반의 스레드 안전 캐시입니다.
+    """
+
+    def __init__(self, name: str, max_entries: int, max_bytes: int, ttl_seconds: float):
+        """
+        Args:
+            name (str): 캐시 이름 (지표 표시용)
+            max_entries (int): 최대 항목 수
+            max_bytes (int): 최대 메모리 크기 (estimate_size 기준)
+            ttl_seconds (float): 항목 유효 시간 (초)
+        """
+        self.name = name
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()  # key -> (value, size, expires_at)
+        self._inflight: Dict[Hashable, _Flight] = {}
+        self._size = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.shared_waits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """캐시된 값 조회 (없거나 만료되면 default)"""
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """값 저장 (ttl_seconds가 없으면 캐시 기본 유효 시간)"""
+        with self._lock:
+            self._store(key, value, ttl_seconds)
+
+    def contains(self, key: Hashable) -> bool:
+        """유효한 값이 있는지 확인 (적중률 지표와 LRU 순서에 영향 없음)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[2] >= time.monotonic()
+
+    def get_or_compute(self, key: Hashable, compute_fn: Callable[[], Any],
+                       should_cache: Optional[Callable[[Any], bool]] = None,
+                       ttl_seconds: Optional[float] = None) -> Any:
+        """
+        캐시된 값을 반환하고, 없으면 compute_fn()으로 계산합니다.
+        같은 키의 계산이 이미 진행 중이면 새로 계산하지 않고 그 결과를 기다립니다.
+
+        Args:
+            key (Hashable): 캐시 키
+            compute_fn (Callable[[], Any]): 값을 계산하는 함수
+            should_cache (Optional[Callable[[Any], bool]]): False를 반환하면 결과를 저장하지 않음
+                (빈 결과나 오류 결과를 캐시하지 않을 때 사용)
+            ttl_seconds (Optional[float]): 이 항목의 유효 시간 (없으면 캐시 기본값)
+
+        Returns:
+            Any: 캐시된 값 또는 계산 결과
+        """
+        with self._lock:
+            found, value = self._lookup(key)
+            if found:
+                self.hits += 1
+                return value
+
+            flight = self._inflight.get(key)
+            if flight is None:
+                # 이 호출이 계산을 맡는다
+                self.misses += 1
+                flight = _Flight()
+                self._inflight[key] = flight
+                leader = True
+            else:
+                self.shared_waits += 1
+                leader = False
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = compute_fn()
+            flight.value = value
+            with self._lock:
+                if should_cache is None or should_cache(value):
+                    self._store(key, value, ttl_seconds)
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.done.set()
+
+    def _lookup(self, key: Hashable) -> tuple:
+        """락을 잡은 상태에서 호출 - (found, value)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+
+        value, size, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self._size -= size
+            self.expirations += 1
+            return False, None
+
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None) -> None:
+        """락을 잡은 상태에서 호출 - 저장 후 상한 초과분 제거"""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= old[1]
+
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = (value, size, time.monotonic() + ttl)
+        self._size += size
+
+        while self._entries and (len(self._entries) > self.max_entries or self._size > self.max_bytes):
+            _, (_, evicted_size, _) = self._entries.popitem(last=False)
+            self._size -= evicted_size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """모든 항목 제거 (지표는 유지)"""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """적중률 등 캐시 지표"""
+        with self._lock:
+            # 진행 중인 계산을 기다려 받은 경우도 재계산 없이 처리된 것으로 본다
+            served = self.hits + self.shared_waits
+            lookups = served + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self._entries),
+                "size_bytes": self._size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared_waits": self.shared_waits,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": served / lookups if lookups else 0.0,
+                "inflight": len(self._inflight),
+            }
+
+
+# 프로세스 전역 캐시 인스턴스 (모든 세션 공유)
+news_cache = SharedCache("news", **CACHE_SETTINGS["news"])
+llm_cache = SharedCache("llm", **CACHE_SETTINGS["llm"])
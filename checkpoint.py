@@ -0,0 +1,227 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Run Checkpoints
+---------------
+분석 실행의 카테고리별 진행 상태를 로컬 SQLite에 저장하여, 실행이 중간에 실패하거나
+세션이 끊겨도 같은 조건으로 다시 실행하면 끝난 단계부터 이어서 진행하도록 한다.
+
+카테고리마다 두 단계를 기록한다.
+- collected: 수집된 기사 목록 (있으면 네이버 수집을 건너뜀)
+- analyzed: 중복 묶기/AI 분석까지 끝난 결과 (있으면 카테고리 전체를 건너뜀)
+
+AI 분석이 오류로 끝난 카테고리는 analyzed로 기록하지 않으므로 다시 실행할 때 분석만 재시도한다.
+실행이 끝까지 완료되면 단계 기록을 지우고 다음 실행은 처음부터 새로 수집한다.
+
+    checkpoint = get_checkpoint_store().open_run(params)
+    checkpoint.result("삼일PwC")  # 이전 실행에서 끝난 결과 또는 None
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+from config import CHECKPOINT_SETTINGS, DATA_DIR
+from jobs import make_job_key
+
+CHECKPOINT_DB_PATH = os.path.join(DATA_DIR, "checkpoints.db")
+
+# 실행 상태
+RUN_ACTIVE = "running"
+RUN_DONE = "done"
+
+# 카테고리별 단계
+STAGE_COLLECTED = "collected"
+STAGE_ANALYZED = "analyzed"
+
+
+class RunCheckpoint:
+    """
+    실행 하나의 카테고리별 체크포인트입니다.
+    """
+
+    def __init__(self, store: Optional["CheckpointStore"], run_id: str, stages: Dict[str, Dict[str, object]]):
+        """
+        Args:
+            store (Optional[CheckpointStore]): 저장소 (None이면 기록하지 않는 빈 체크포인트)
+            run_id (str): 실행 ID
+            stages (Dict): 이전 실행에서 끝난 카테고리별 단계
+        """
+        self.store = store
+        self.run_id = run_id
+        self._stages = stages
+        self.error: Optional[str] = None
+
+    @property
+    def resumed(self) -> bool:
+        """이전 실행에서 끝난 단계가 있는지"""
+        return bool(self._stages)
+
+    def finished_categories(self) -> List[str]:
+        return [category for category, stages in self._stages.items() if STAGE_ANALYZED in stages]
+
+    def collected(self, category: str) -> Optional[List[Dict]]:
+        """이전 실행에서 수집한 기사 목록 (수집 전이면 None)"""
+        return self._stages.get(category, {}).get(STAGE_COLLECTED)
+
+    def result(self, category: str) -> Optional[Dict]:
+        """이전 실행에서 분석까지 끝난 결과 (collected_news, analysis_result) 또는 None"""
+        return self._stages.get(category, {}).get(STAGE_ANALYZED)
+
+    def save_collected(self, category: str, news_list: List[Dict], complete: bool = True) -> None:
+        """수집 결과 저장 - 대체 소스(source 표시)로 수집했거나 호출 일정 때문에 잘린(complete=False) 목록은
+        다음 실행에서 다시 수집하도록 저장하지 않음"""
+        if not complete or any(news.get('source') for news in news_list):
+            return
+        self._save(category, STAGE_COLLECTED, news_list)
+
+    def save_result(self, category: str, result: Dict, complete: bool = True) -> None:
+        """분석 결과 저장 - 분석 오류나 대체 처리(degraded, 대체 소스 수집)로 끝났거나 잘린 수집 목록(complete=False)으로
+        분석한 결과는 다음 실행에서 재시도하도록 저장하지 않음"""
+        if not complete:
+            return
+        analysis = result.get('analysis_result', {})
+        if 'error' in analysis or 'degraded' in analysis:
+            return
+        if any(news.get('source') for news in result.get('collected_news', [])):
+            return
+        self._save(category, STAGE_ANALYZED, result)
+
+    def _save(self, category: str, stage: str, payload) -> None:
+        """단계 기록 - 저장에 실패하면 이후 기록을 멈추고 오류만 남김 (분석은 계속)"""
+        self._stages.setdefault(category, {})[stage] = payload
+        if self.store is None or self.error:
+            return
+        try:
+            self.store.save_stage(self.run_id, category, stage, payload)
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            self.error = str(e)
+
+    def finish(self) -> None:
+        """실행 완료 - 단계 기록 삭제 (다음 실행은 새로 수집)"""
+        if self.store is None:
+            return
+        try:
+            self.store.finish_run(self.run_id)
+        except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+            self.error = str(e)
+
+
+class CheckpointStore:
+    """
+    SQLite 실행 체크포인트 저장소입니다.
+    """
+
+    def __init__(self, db_path: str = CHECKPOINT_DB_PATH, resume_seconds: int = CHECKPOINT_SETTINGS["resume_seconds"]):
+        """
+        Args:
+            db_path (str): 체크포인트 SQLite 파일 경로
+            resume_seconds (int): 마지막 기록 후 이 시간이 지난 미완료 실행은 이어서 진행하지 않음
+        """
+        self.db_path = db_path
+        self.resume_seconds = resume_seconds
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    run_id TEXT PRIMARY KEY,
+                    run_key TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_runs_key ON runs (run_key, updated_at)")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS stages (
+                    run_id TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    stage TEXT NOT NULL,
+                    payload TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (run_id, category, stage)
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def open_run(self, params: Dict) -> RunCheckpoint:
+        """
+        같은 조건의 미완료 실행이 있으면 이어서, 없으면 새 실행 시작.
+
+        Args:
+            params (Dict): 실행 조건 (카테고리, 기간, 옵션 - JSON 직렬화 가능)
+
+        Returns:
+            RunCheckpoint: 카테고리별 체크포인트
+        """
+        run_key = make_job_key(params)
+        now = time.time()
+        with self._lock, self._connect() as conn:
+            self._prune(conn, now)
+            row = conn.execute(
+                "SELECT run_id FROM runs WHERE run_key = ? AND status = ? AND updated_at >= ? "
+                "ORDER BY updated_at DESC LIMIT 1",
+                (run_key, RUN_ACTIVE, now - self.resume_seconds)
+            ).fetchone()
+            if row is None:
+                run_id = uuid.uuid4().hex[:12]
+                conn.execute(
+                    "INSERT INTO runs (run_id, run_key, params, status, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (run_id, run_key, json.dumps(params, ensure_ascii=False), RUN_ACTIVE, now, now)
+                )
+                return RunCheckpoint(self, run_id, {})
+
+            run_id = row["run_id"]
+            stages: Dict[str, Dict[str, object]] = {}
+            for stage in conn.execute("SELECT category, stage, payload FROM stages WHERE run_id = ?", (run_id,)):
+                stages.setdefault(stage["category"], {})[stage["stage"]] = json.loads(stage["payload"])
+        return RunCheckpoint(self, run_id, stages)
+
+    def save_stage(self, run_id: str, category: str, stage: str, payload) -> None:
+        now = time.time()
+        # 디스크에 내려 둔 기사 목록(spool.SpooledNews)은 목록으로 저장
+        data = json.dumps(payload, ensure_ascii=False, default=list)
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO stages (run_id, category, stage, payload, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (run_id, category, stage, data, now)
+            )
+            conn.execute("UPDATE runs SET updated_at = ? WHERE run_id = ?", (now, run_id))
+
+    def finish_run(self, run_id: str) -> None:
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM stages WHERE run_id = ?", (run_id,))
+            conn.execute("UPDATE runs SET status = ?, updated_at = ? WHERE run_id = ?", (RUN_DONE, time.time(), run_id))
+
+    def _prune(self, conn: sqlite3.Connection, now: float) -> None:
+        """이어서 진행할 수 없게 된 오래된 실행의 단계 기록 삭제"""
+        expired = now - self.resume_seconds
+        conn.execute("DELETE FROM stages WHERE run_id IN (SELECT run_id FROM runs WHERE updated_at < ?)", (expired,))
+        conn.execute("DELETE FROM runs WHERE updated_at < ?", (now - CHECKPOINT_SETTINGS["retention_seconds"],))
+
+
+_store: Optional[CheckpointStore] = None
+_store_lock = threading.Lock()
+
+
+def get_checkpoint_store() -> CheckpointStore:
+    """프로세스 전역 체크포인트 저장소"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CheckpointStore()
+        return _store
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Circuit Breaker
+---------------
+외부 서비스(네이버 검색, Google News, OpenAI)별 회로 차단기.
+연속 실패가 failure_threshold번 쌓이면 회로를 열어(open) reset_seconds 동안 요청을 보내지 않고
+바로 실패시킨다. 시간이 지나면 요청 하나만 시험 삼아 보내(half-open) 성공하면 다시 닫는다.
+장애 중에 키워드마다 제한 시간을 다 기다리지 않고, 호출하는 쪽은 대체 소스로 넘어간다.
+allow()가 True를 준 요청은 끝나면 record_success/record_failure/release 중 하나를 반드시 호출한다
+(429처럼 서비스가 응답은 한 경우는 성공, 취소처럼 결과를 알 수 없으면 release).
+
+    breaker = get_breaker("naver")
+    if not breaker.allow():
+        raise CircuitOpenError("naver", breaker.retry_in())
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from config import CIRCUIT_BREAKER_SETTINGS
+
+# 회로 상태
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+# 표시용 서비스 이름
+SERVICE_LABELS = {
+    "naver": "네이버 검색",
+    "google_news": "Google News",
+    "openai": "OpenAI",
+}
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 요청을 보내지 않음"""
+
+    def __init__(self, service: str, retry_in: float = 0.0):
+        self.service = service
+        self.retry_in = retry_in
+        super().__init__(f"{SERVICE_LABELS.get(service, service)} 장애로 요청 차단 중 ({retry_in:.0f}초 후 재시도)")
+
+
+class CircuitBreaker:
+    """
+    서비스 하나의 회로 차단기입니다.
+    """
+
+    def __init__(self, service: str, failure_threshold: int, reset_seconds: float):
+        """
+        Args:
+            service (str): 서비스 이름
+            failure_threshold (int): 회로를 여는 연속 실패 수
+            reset_seconds (float): 회로를 연 뒤 시험 요청을 보내기까지의 시간 (초)
+        """
+        self.service = service
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self.state = STATE_CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_error = ""
+        self.trips = 0
+        self.rejected = 0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """요청을 보내도 되는지 (열려 있으면 False, 시험 요청은 한 번에 하나만 허용)"""
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = STATE_HALF_OPEN
+                self._probing = False
+            if self.state == STATE_HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = STATE_CLOSED
+            self.failures = 0
+            self._probing = False
+
+    def record_failure(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.failures += 1
+            if error is not None:
+                self.last_error = str(error)[:200]
+            if self.state == STATE_HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != STATE_OPEN:
+                    self.trips += 1
+                self.state = STATE_OPEN
+                self.opened_at = time.monotonic()
+                self._probing = False
+
+    def release(self) -> None:
+        """결과를 알 수 없이 끝난 요청 (취소 등) - 상태는 그대로 두고 시험 요청 자리만 반납"""
+        with self._lock:
+            self._probing = False
+
+    def retry_in(self) -> float:
+        """시험 요청까지 남은 시간 (초, 닫혀 있으면 0)"""
+        with self._lock:
+            if self.state != STATE_OPEN:
+                return 0.0
+            return max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+
+    def snapshot(self) -> Dict:
+        retry_in = self.retry_in()
+        with self._lock:
+            return {
+                "service": self.service,
+                "label": SERVICE_LABELS.get(self.service, self.service),
+                "state": self.state,
+                "failures": self.failures,
+                "trips": self.trips,
+                "rejected": self.rejected,
+                "retry_in": round(retry_in, 1),
+                "last_error": self.last_error,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(service: str) -> CircuitBreaker:
+    """프로세스 전역 서비스별 회로 차단기 (모든 세션/작업이 공유)"""
+    with _breakers_lock:
+        breaker = _breakers.get(service)
+        if breaker is None:
+            settings = CIRCUIT_BREAKER_SETTINGS.get(service, CIRCUIT_BREAKER_SETTINGS["default"])
+            breaker = CircuitBreaker(service, **settings)
+            _breakers[service] = breaker
+        return breaker
+
+
+def breaker_states() -> List[Dict]:
+    """생성된 모든 회로 차단기 상태"""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return [breaker.snapshot() for breaker in breakers]
+
+
+def degraded_services() -> List[Dict]:
+    """열려 있거나 시험 중인 서비스 상태"""
+    return [state for state in breaker_states() if state["state"] != STATE_CLOSED]
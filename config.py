@@ -9,13 +9,19 @@ Centralizing these variables makes maintenance easier and ensures consistency.
 """
 
 import os
+from datetime import timedelta, timezone
+
+# 한국 시간대
+KST = timezone(timedelta(hours=9))
 
 # 네이버 뉴스 API 설정 (환경변수에서 가져옴)
 NAVER_API_SETTINGS = {
     "client_id": os.getenv('NAVER_CLIENT_ID', ''),  # 환경변수에서 Client ID
     "client_secret": os.getenv('NAVER_CLIENT_SECRET', ''),  # 환경변수에서 Client Secret
-    "base_url": "https://openapi.naver.com/v1/search/news.json",
+    "base_url": os.getenv('NAVER_API_BASE_URL', "https://openapi.naver.com/v1/search/news.json"),  # 모의 서버 사용 시 변경
     "max_results_per_keyword": 50,  # 키워드당 최대 검색 결과 수
+    "timeout": 10,  # 요청 1회 제한 시간 (초)
+    "daily_quota": 25000,  # 하루 호출 한도 (모든 실행과 백필이 나눠 씀)
     "sort": "date"  # 정렬 방식: date(최신순), sim(정확도순)
 }
 
@@ -23,7 +29,7 @@ NAVER_API_SETTINGS = {
 KEYWORD_CATEGORIES = {
     "삼일PwC": ["삼일PWC", "삼일회계법인", "삼일", "PWC", "PwC", "삼일PwC"],
     "회계업계_일반": ["IFRS", "회계기준", "회계감독", "금감원", "금융감독원", "회계법인", "외부감사", "지정감사", "공인회계사"],
-    "주요기업": ["삼성", "SK", "현대차", "LG", "포스코", "롯데", "삼성전자","현대" "현대모비스"],
+    "주요기업": ["삼성", "SK", "현대차", "LG", "포스코", "롯데", "삼성전자", "현대", "현대모비스"],
     "산업동향": ["반도체", "배터리", "자동차", "철강", "석유화학", "조선", "건설", "바이오", "방산", "디스플레이", "AI", "에너지", "실적", "영업이익", "흑자", "적자", "투자", "수출", "수입", "구조조정", "폐업", "증설", "공장", "생산", "위기", "불황", "회복", "호황", "성장", "경쟁력", "추격", "역전", "도태", "생존", "관세", "보조금", "규제", "지원", "과징금", "IRA", "탄소", "ESG", "인허가", "R&D", "특허", "임상", "신약", "차세대", "친환경", "전기차", "수소", "원전", "재생에너지"],
     "경쟁사": ["한영EY", "삼정KPMG", "Deloitte", "안진회계법인", "한영회계법인", "삼정회계법인", "안진", "삼정"],
     "M&A": ["M&A", "IPO", "상장", "인수", "매각", "합병", "분할"],
@@ -33,6 +39,18 @@ KEYWORD_CATEGORIES = {
     "세제정책": ["법인세", "소득세", "상속세", "증여세", "디지털세", "세법", "조세", "세제", "과세", "세무조사", "세무진단", "세금", "가업승계", "세제정책"],
 }
 
+# 유효언론사 목록 정의 (삼일PwC, 경쟁사 제외한 카테고리에서 사용)
+VALID_PRESS = {
+    # 대형 언론사 (최우선)
+    "조선일보": 1, "중앙일보": 2, "동아일보": 3,
+    "한국경제": 4, "매일경제": 5, "연합뉴스": 6,
+    # 전문 경제지 (우선)
+    "이데일리": 7, "아시아경제": 8, "뉴스핌": 9, "뉴시스": 10,
+    "헤럴드경제": 11, "더벨": 12, "비즈니스포스트": 13, "머니투데이": 14,
+    # 기타 유효언론사
+    "KBS": 15, "경향신문": 16, "노컷뉴스": 17, "데일리안": 18, "뉴스1": 19, "매경이코노미": 20
+}
+
 # AI 분석 프롬프트는 app.py에서 직접 정의 (자유 텍스트 응답 방식)
 
 # GPT 모델 설정
@@ -43,12 +61,232 @@ GPT_MODELS = {
     "gpt-3.5-turbo": "아주 저렴, 간단한 분류 작업에 적당"
 }
 
+# OpenAI API 설정 (base_url이 None이면 공식 엔드포인트, 모의 서버 사용 시 http://127.0.0.1:8765/v1)
+OPENAI_SETTINGS = {
+    "base_url": os.getenv('OPENAI_BASE_URL') or None
+}
+
 # 기본 GPT 모델
 DEFAULT_GPT_MODEL = "gpt-4o-mini"
 
+# AI 선별 모델 라우팅 (model_router.py)
+MODEL_ROUTING_SETTINGS = {
+    "default_model": DEFAULT_GPT_MODEL,
+    "cheap_model": "gpt-4o-mini",  # 소규모 카테고리용 (가장 저렴하고 빠른 모델)
+    "strong_model": "gpt-4o",  # 검증 실패 시 다시 요청할 모델
+    "category_models": {  # 카테고리별 지정 모델 (선별 품질이 가장 중요한 카테고리)
+        "삼일PwC": "gpt-4o",
+        "경쟁사": "gpt-4o"
+    },
+    "small_max_candidates": 10,  # 후보가 이 이하면 cheap_model
+    "skip_llm_max": 2,  # 후보가 이 이하면 AI 호출 없이 전체 선택 (프롬프트의 최소 선별 수)
+    "escalate": True,
+    "min_selected": 2,  # 검증: 최소 선별 수 (후보가 더 적으면 후보 수)
+    "require_resolvable_links": True,  # 검증: 선별 기사의 링크가 후보 목록에 있어야 함
+    "pricing": {  # USD / 100만 토큰 (cached_input: 프롬프트 캐싱으로 재사용된 입력 토큰 단가)
+        "gpt-4o": {"input": 2.5, "cached_input": 1.25, "output": 10.0},
+        "gpt-4-turbo": {"input": 10.0, "output": 30.0},
+        "gpt-4o-mini": {"input": 0.15, "cached_input": 0.075, "output": 0.6},
+        "gpt-3.5-turbo": {"input": 0.5, "output": 1.5}
+    }
+}
+
+# AI 요청 실행 (llm_client.py) - 프로세스 전역 AsyncOpenAI 클라이언트
+LLM_CLIENT_SETTINGS = {
+    "max_concurrency": 4,  # 동시에 보내는 chat completion 수 (모든 세션/작업 합계)
+    "attempt_timeout": 60,  # 요청 1회 제한 시간 (초)
+    "deadline": 120,  # 재시도/hedging을 포함한 요청 전체 제한 시간 (초)
+    "max_retries": 3,  # 429/타임아웃/연결 오류/5xx 재시도 횟수
+    "backoff_base": 1.0,  # 재시도 대기 (초, 시도마다 2배 + jitter, Retry-After가 더 길면 그 값)
+    "backoff_max": 20.0,
+    "hedge": True,  # 응답이 p95 지연 안에 오지 않으면 같은 요청을 한 번 더 보내고 먼저 온 응답 사용
+    "hedge_percentile": 0.95,
+    "hedge_min_samples": 20,  # 모델별 지연 표본이 이만큼 쌓여야 hedging 시작
+    "hedge_min_ms": 1000,  # hedging 대기 하한 (ms)
+    "latency_window": 200  # 모델별로 보관할 최근 지연 표본 수
+}
+
+# 외부 서비스별 회로 차단기 (circuit_breaker.py) - 연속 실패 시 한동안 요청을 보내지 않고 대체 소스 사용
+CIRCUIT_BREAKER_SETTINGS = {
+    "naver": {"failure_threshold": 3, "reset_seconds": 120},  # 타임아웃/연결 오류/5xx 연속 3회
+    "google_news": {"failure_threshold": 3, "reset_seconds": 300},
+    "openai": {"failure_threshold": 3, "reset_seconds": 120},  # 재시도까지 모두 실패한 요청 연속 3회
+    "default": {"failure_threshold": 5, "reset_seconds": 120}
+}
+
 # 기본 뉴스 수집 개수 (키워드당)
 DEFAULT_NEWS_COUNT_PER_KEYWORD = 50
 
+# 로컬 데이터 저장 경로 (작업 DB 등)
+DATA_DIR = os.getenv('NEWS_DATA_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.news_data'))
+
+# 언론사 매핑 데이터 파일 (도메인/네이버 oid → 언론사명, 코드 수정 없이 확장 가능)
+PRESS_MAP_PATH = os.getenv('PRESS_MAP_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'press_map.json'))
+
+# 네이버 검색 계획 (query_planner.py) - 키워드 중복/포함 관계 정리 후 예상 결과 수에 맞춰 OR로 묶기
+QUERY_PLANNER_SETTINGS = {
+    "stats_path": os.path.join(DATA_DIR, 'query_stats.json'),  # 키워드별 과거 결과 수 (None이면 저장하지 않음)
+    "max_terms": {  # 한 쿼리에 OR로 묶을 최대 키워드 수
+        "default": 5
+    },
+    "unknown_share": {  # 기록이 없는 키워드의 예상 결과 수 (쿼리 상한 대비 비율)
+        "삼일PwC": 1.0,  # 기록이 쌓이기 전에는 개별 검색
+        "경쟁사": 1.0,
+        "default": 0.4  # 기록이 쌓이기 전에는 2개씩 묶음
+    },
+    "fill_ratio": 0.8,  # 예상 결과 수가 쿼리 상한의 이 비율을 넘지 않도록 묶음
+    "ewma_alpha": 0.5  # 결과 수 이동평균에서 최근 실행 비중
+}
+
+# 백그라운드 작업 설정
+JOB_SETTINGS = {
+    "max_workers": 2,  # 동시에 실행할 분석 작업 수
+    "reuse_seconds": 600,  # 완료된 동일 작업 결과를 재사용하는 시간 (초)
+    "poll_interval": 2  # UI 상태 갱신 주기 (초)
+}
+
+# 카테고리 수집 순서 / 네이버 호출 배분 (scheduler.py)
+SCHEDULER_SETTINGS = {
+    "priority": ["삼일PwC", "경쟁사", "회계업계_일반", "M&A", "인사동정", "주요기업", "금융", "세제정책", "경제", "산업동향"],  # 수집 우선순위 (먼저 수집, 한도가 부족하면 뒤에서부터 줄임)
+    "deadline_seconds": 120,  # 실행 하나의 네이버 수집 제한 시간 (초)
+    "seconds_per_call": 0.3,  # 네이버 호출 1회 예상 시간 (응답 + 호출 간격, 초)
+    "min_pages": 1  # 검색 깊이를 줄일 때 쿼리당 최소 페이지 수
+}
+
+# 실행 체크포인트 (checkpoint.py) - 카테고리별 수집/분석 결과를 저장해 실패/중단 후 이어서 실행
+CHECKPOINT_SETTINGS = {
+    "enabled": True,
+    "resume_seconds": 6 * 3600,  # 마지막 기록 후 이 시간 안에 같은 조건으로 다시 실행하면 이어서 진행
+    "retention_seconds": 7 * 24 * 3600  # 실행 기록 보관 기간
+}
+
+# 실행 중 수집 기사 디스크 임시 저장 (spool.py) - 여러 날짜/카테고리를 수집해도 메모리 사용량을 일정하게 유지
+SPOOL_SETTINGS = {
+    "enabled": True,
+    "dir": os.path.join(DATA_DIR, 'spool'),
+    "stale_seconds": 24 * 3600  # 비정상 종료로 남은 스풀 디렉터리를 정리하는 기준 (초)
+}
+
+# 과거 기사 백필 (backfill.py) - 긴 기간을 하루 단위 구간으로 나눠 수집해 아카이브에 저장
+BACKFILL_SETTINGS = {
+    "max_days": 31,  # 한 번에 백필할 수 있는 최대 기간 (일)
+    "workers": 4,  # 동시에 검색하는 쿼리 수
+    "max_start": 1000,  # 네이버 검색 API start 최댓값 (쿼리 하나로 닿을 수 있는 깊이)
+    "display": 100,  # 네이버 검색 API display 최댓값
+    "quota_reserve": 5000,  # 평소 분석 실행을 위해 남겨 두는 하루 호출 수
+    "requests_per_second": 8,  # 모든 워커를 합친 네이버 호출 간격
+    "rate_limit_retries": 3,  # 429 응답 재시도 횟수 (간격은 1, 2, 4초)
+    "fallback": True,  # 네이버 검색 깊이로 닿지 않는 날짜는 Google News 날짜 검색으로 보충
+    "resume_seconds": 7 * 24 * 3600  # 이 기간 안에 같은 조건으로 다시 실행하면 남은 구간부터 이어서 진행
+}
+
+# 캐시 미리 채우기 (기본 기간의 수집/AI 선별을 분석가가 실행하기 전에 예약 실행)
+PREWARM_SETTINGS = {
+    "enabled": os.getenv('NEWS_PREWARM', '0') == '1',  # 예약 실행 (NEWS_PREWARM=1일 때만 - 평일마다 전체 카테고리 AI 선별 비용이 들므로 기본값은 꺼짐)
+    "window_time": "10:00",  # 화면의 기본 분석 기간 기준 시각 (어제 ~ 오늘 이 시각, 한국 시간)
+    "times": ["09:50", "10:01"],  # 실행 시각 (기준 시각 전 실행은 기간을 실행 시각까지로 자름, 10:01은 네이버 색인 지연 고려)
+    "weekdays": [0, 1, 2, 3, 4],  # 실행 요일 (월=0)
+    "categories": None,  # 미리 채울 카테고리 (None이면 화면 기본값과 같은 전체 카테고리)
+    "analyze": True,  # AI 선별까지 실행 (False면 수집 캐시만 채움)
+    "history": 20  # 화면에 표시할 최근 실행 수
+}
+
+# 공유 캐시 설정 (모든 세션이 공유하는 프로세스 전역 캐시)
+CACHE_SETTINGS = {
+    "closed_window_ttl_seconds": 3 * 3600,  # 이미 끝난 기간의 수집 결과 보관 시간 (늦게 색인되는 기사 외에는 바뀌지 않음)
+    "news": {  # 수집된 기사 (카테고리 + 기간 단위)
+        "max_entries": 200,
+        "max_bytes": 200 * 1024 * 1024,
+        "ttl_seconds": 600
+    },
+    "llm": {  # AI 선별 결과 (기사 목록 + 카테고리 단위)
+        "max_entries": 500,
+        "max_bytes": 50 * 1024 * 1024,
+        "ttl_seconds": 6 * 3600
+    }
+}
+
+# 의미 기반 중복 기사 묶기 (AI 분석 전 로컬에서 수행)
+EMBEDDING_SETTINGS = {
+    "enabled": True,
+    "backend": os.getenv('NEWS_EMBEDDING_BACKEND', 'hashed'),  # "hashed" 또는 "sentence-transformers"
+    "model": "snunlp/KR-SBERT-V40K-klueNLI-augSTS",  # sentence-transformers 사용 시 모델
+    "dim": 1024,  # 해시 벡터 차원
+    "batch_size": 256,
+    "threshold": {  # 같은 기사로 볼 코사인 유사도
+        "hashed": 0.45,
+        "sentence-transformers": 0.8
+    },
+    "cache_entries": 50000,  # 기사별 벡터 캐시 상한
+    "cache_max_bytes": 32 * 1024 * 1024  # 벡터 캐시 메모리 상한 (해시 벡터 1개 4KB → 약 8천 건)
+}
+
+# 기사 본문 수집 (AI 분석 후보의 원문을 내려받아 본문 발췌를 프롬프트에 추가)
+FULLTEXT_SETTINGS = {
+    "enabled": False,
+    "cache_dir": os.path.join(DATA_DIR, 'fulltext'),
+    "max_workers": 8,  # 전체 동시 다운로드 수
+    "per_domain": 2,  # 언론사 도메인별 동시 연결 수
+    "connect_timeout": 3,
+    "read_timeout": 6,
+    "max_bytes": 3 * 1024 * 1024,  # 기사 한 건의 최대 다운로드 크기
+    "fresh_seconds": 6 * 3600,  # 이 시간 안에 확인한 기사는 재검증 없이 캐시 사용
+    "excerpt_chars": 600,  # 프롬프트에 넣을 본문 길이
+    "user_agent": "Mozilla/5.0 (compatible; PwC-News-Analyzer/1.0)",
+    "proxy": os.getenv('FULLTEXT_PROXY') or None  # 본문 요청용 HTTP 프록시 (모의 서버 테스트 시 지정)
+}
+
+# 기사 아카이브 (실행마다 수집/선별된 기사를 DATA_DIR/archive.db에 보관하고 검색)
+ARCHIVE_SETTINGS = {
+    "enabled": True,
+    "search_limit": 200  # 검색 결과 최대 건수
+}
+
+# 변경분만 분석 (직전 실행 대비 새 기사만 AI 분석, 기사 아카이브의 실행 기록을 기준으로 사용)
+DELTA_SETTINGS = {
+    "max_age_seconds": 24 * 3600  # 이 시간 안의 직전 실행만 기준으로 사용 (더 오래되면 전체 분석)
+}
+
+# AI 분석 전 로컬 중요도 점수 (ranking.py)
+# 점수 = 키워드 분류 가중치 합 + 주제(회사명) 관련성 + 언론사 순위 + 최신성
+RANKING_SETTINGS = {
+    "top_n": {  # AI에 보낼 카테고리별 최대 기사 수
+        "삼일PwC": 40,
+        "경쟁사": 40,
+        "default": 30
+    },
+    "weights": {
+        "keyword": 1.0,
+        "subject": 1.0,
+        "press": 2.0,  # 1위 언론사 2.0점 → 순위가 낮을수록 감소, 유효언론사 외 0점
+        "recency": 1.0  # 최신 기사 1.0점 → half_life_days마다 절반
+    },
+    "title_weight": 2.0,  # 제목에서 발견된 키워드는 요약보다 가중
+    "half_life_days": 1.0,
+    "keyword_classes": {  # 일반 프롬프트의 우선순위 기준 (음수는 제외 대상)
+        "실적": {"weight": 3.0, "terms": ["실적", "매출", "영업이익", "영업익", "순이익", "배당", "재무제표", "흑자", "적자"]},
+        "회계감사": {"weight": 3.0, "terms": ["회계", "감사의견", "외부감사", "감리", "내부회계", "회계처리", "회계법인"]},
+        "기업구조": {"weight": 2.0, "terms": ["인수", "합병", "m&a", "매각", "지분", "자회사", "분할", "조직 개편", "조직개편"]},
+        "전략": {"weight": 1.5, "terms": ["신사업", "투자", "계약", "수주", "공급망", "전략", "진출"]},
+        "제외": {"weight": -3.0, "terms": ["야구단", "축구단", "구단", "kbo", "프로야구", "기부", "사회공헌", "캠페인", "나눔",
+                                         "목표가", "목표주가", "접속 오류", "서비스 오류", "버그", "점검 중"]},
+        "행사": {"weight": -1.5, "terms": ["세미나", "워크숍", "출시"], "skip_categories": ["삼일PwC", "경쟁사"]}
+    },
+    "subject_terms": {  # 회사 자체가 주제인 카테고리의 관련성 키워드 (소문자)
+        "삼일PwC": {"label": "삼일PwC", "weight": 3.0,
+                   "terms": ["삼일pwc", "삼일회계법인", "삼일 pwc", "삼일 회계법인", "삼일p&c", "삼일 p&c", "삼일회계", "삼일 회계"]},
+        "경쟁사": {"label": "경쟁사", "weight": 3.0,
+                 "terms": ["삼정kpmg", "삼정 kpmg", "삼정회계법인", "삼정 회계법인", "삼정회계", "딜로이트안진", "딜로이트 안진",
+                           "안진회계법인", "안진 회계법인", "안진회계", "한영ey", "한영 ey", "한영회계법인", "한영 회계법인", "한영회계",
+                           "kpmg", "deloitte", "ernst", "pricewaterhouse"]}
+    },
+    "fallback_count": {  # AI가 한 건도 선별하지 않았을 때 자동 선택 수
+        "삼일PwC": 2,
+        "경쟁사": 2,
+        "default": 1
+    }
+}
+
 # 이메일 설정 (간소화)
 EMAIL_SETTINGS = {
     "from": "kr_client_and_market@pwc.com",
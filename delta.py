@@ -0,0 +1,161 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Delta Runs
+----------
+같은 카테고리의 직전 실행(기사 아카이브에 기록된 기사 ID와 선별 결과) 대비 바뀐 부분만 분석하는 모듈.
+
+- AI에는 직전 실행에서 AI가 판단하지 않은 후보(새 기사, 또는 직전에는 중복/순위 밖이라 AI에 보내지 않은 기사)와,
+  직전 실행의 선별 기사 중 이번에도 수집된 기사만 보낸다.
+  직전 선별 기사를 함께 보내므로 프롬프트의 선별 수 기준(최소/최대)이 새 기사끼리만 적용되지 않고,
+  새 기사가 더 중요하면 직전 선별 기사를 밀어낼 수 있다.
+- 새 후보가 없으면 AI를 호출하지 않고 직전 선별을 그대로 유지한다.
+- 결과의 delta에 새 선별 / 유지 / 빠짐(다시 선별되지 않았거나 기간에서 벗어난 직전 선별)을 기록한다.
+
+    baseline = load_baseline(category)
+    candidates = delta_candidates(news_list, candidates, baseline)
+    ...analysis = analyze(candidates) if has_new_articles(candidates, baseline) else carried_selection(candidates, baseline)
+    analysis["delta"] = summarize_delta(analysis, news_list, candidates, baseline)
+    candidate_ids = judged_ids(news_list, candidates, baseline)  # 아카이브에 AI 판단 후보로 기록 (다음 델타 실행의 기준)
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence, Set
+
+from archive import get_archive, DECISION_SELECTED
+from config import DELTA_SETTINGS
+from embeddings import article_id
+
+# 직전 선별 기사가 빠진 이유
+DROPPED_OUT_OF_WINDOW = "기간 밖"
+DROPPED_OUTRANKED = "새 기사와 비교해 제외"
+
+
+def load_baseline(category: str, now: Optional[float] = None) -> Optional[Dict]:
+    """
+    델타 실행의 기준 - max_age_seconds 안에서 카테고리를 AI로 선별한 가장 최근 실행.
+
+    Returns:
+        Optional[Dict]: NewsArchive.last_run 결과 (없으면 None - 전체 분석)
+    """
+    since = (now or time.time()) - DELTA_SETTINGS["max_age_seconds"]
+    return get_archive().last_run(category, since)
+
+
+def _previous_picks(baseline: Dict) -> List[str]:
+    return [url_hash for url_hash, article in baseline["articles"].items() if article["decision"] == DECISION_SELECTED]
+
+
+def _judged(baseline: Dict) -> Set[str]:
+    """직전 실행에서 AI가 판단한 기사 ID - 후보로 보냈거나 선별된 기사 (수집만 되고 중복/순위 밖/필터로 AI에 보내지 않은 기사는 제외)"""
+    return {url_hash for url_hash, article in baseline["articles"].items()
+            if article["candidate"] or article["decision"] == DECISION_SELECTED}
+
+
+def delta_candidates(news_list: Sequence[Dict], candidates: Sequence[Dict], baseline: Dict) -> List[Dict]:
+    """
+    AI에 보낼 후보 - 이번에도 수집된 직전 선별 기사 + 직전 실행에서 AI가 판단하지 않은 후보.
+
+    Args:
+        news_list (Sequence[Dict]): 이번 실행의 카테고리 수집 목록 (중복/순위 표시 포함)
+        candidates (Sequence[Dict]): 중요도 점수 상위 후보 (prepare_candidates 결과)
+        baseline (Dict): load_baseline 결과
+
+    Returns:
+        List[Dict]: 후보 목록 (직전 선별 기사가 앞)
+    """
+    picks = set(_previous_picks(baseline))
+    judged = _judged(baseline)
+    kept, added = [], set()
+    for news in news_list:
+        url_hash = article_id(news)
+        if url_hash in picks and url_hash not in added:
+            kept.append(news)
+            added.add(url_hash)
+    new = [news for news in candidates if article_id(news) not in judged]
+    return kept + new
+
+
+def has_new_articles(candidates: Sequence[Dict], baseline: Dict) -> bool:
+    """후보 중 직전 실행에서 AI가 판단하지 않은 기사가 있는지 (없으면 AI 호출 없이 직전 선별 유지)"""
+    judged = _judged(baseline)
+    return any(article_id(news) not in judged for news in candidates)
+
+
+def carried_selection(candidates: Sequence[Dict], baseline: Dict) -> Dict:
+    """새 후보가 없을 때의 분석 결과 - 이번에도 수집된 직전 선별 기사를 그대로 선별 (선별 이유도 직전 실행 것)"""
+    selected_news = [{
+        "title": news.get("title", "제목 없음"),
+        "url": news.get("url", ""),
+        "date": news.get("date", ""),
+        "keyword": news.get("keyword", ""),
+        "press_analysis": news.get("press", "언론사 정보 없음"),
+        "selection_reason": baseline["articles"][article_id(news)]["reason"] or "직전 실행 선별 유지",
+        "importance": "보통"
+    } for news in candidates]
+    return {
+        "selected_news": selected_news,
+        "total_analyzed": 0,
+        "selected_count": len(selected_news)
+    }
+
+
+def summarize_delta(analysis: Dict, news_list: Sequence[Dict], candidates: Sequence[Dict], baseline: Dict) -> Dict:
+    """
+    직전 실행 대비 선별 변화.
+
+    Returns:
+        Dict: base_run_id, base_created_at, new_articles(새로 수집된 기사 수),
+              analyzed_new(AI에 보낸 후보 중 직전 실행에서 판단하지 않은 기사 수),
+              new / unchanged(선별 기사 ID), dropped(빠진 직전 선별 - title, url, press, date, reason)
+    """
+    previous = _previous_picks(baseline)
+    previous_set = set(previous)
+    judged = _judged(baseline)
+    selected = [article_id(news) for news in analysis.get("selected_news", [])]
+    selected_set = set(selected)
+    collected = {article_id(news) for news in news_list}
+
+    dropped = []
+    for url_hash in previous:
+        if url_hash in selected_set:
+            continue
+        article = baseline["articles"][url_hash]
+        dropped.append({
+            "title": article["title"],
+            "url": article["url"],
+            "press": article["press"],
+            "date": article["date"],
+            "reason": DROPPED_OUTRANKED if url_hash in collected else DROPPED_OUT_OF_WINDOW
+        })
+
+    return {
+        "base_run_id": baseline["run_id"],
+        "base_created_at": baseline["created_at"],
+        "new_articles": sum(1 for url_hash in collected if url_hash not in baseline["articles"]),
+        "analyzed_new": sum(1 for news in candidates if article_id(news) not in judged),
+        "new": [url_hash for url_hash in selected if url_hash not in previous_set],
+        "unchanged": [url_hash for url_hash in selected if url_hash in previous_set],
+        "dropped": dropped
+    }
+
+
+def judged_ids(news_list: Sequence[Dict], candidates: Sequence[Dict], baseline: Optional[Dict] = None) -> List[str]:
+    """
+    이번 실행에서 AI가 판단한 것으로 기록할 기사 ID (아카이브 run_articles.candidate - 다음 델타 실행의 기준).
+
+    Args:
+        news_list (Sequence[Dict]): 이번 실행의 카테고리 수집 목록
+        candidates (Sequence[Dict]): AI에 보낸 후보 (새 후보가 없어 직전 선별을 유지했으면 유지한 기사)
+        baseline (Optional[Dict]): 델타 실행이면 load_baseline 결과 - 직전 실행에서 판단한 기사 중 이번에도
+                                   수집된 기사도 판단한 것으로 이어서 기록 (다음 실행에서 다시 보내지 않도록)
+
+    Returns:
+        List[str]: 기사 ID 목록
+    """
+    ids = {article_id(news) for news in candidates}
+    if baseline:
+        judged = _judged(baseline)
+        ids.update(url_hash for url_hash in (article_id(news) for news in news_list) if url_hash in judged)
+    return sorted(ids)
@@ -0,0 +1,303 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Story Embeddings
+----------------
+기사 제목/요약을 벡터로 바꿔 같은 사건을 다룬 기사를 묶는 모듈.
+기본은 외부 모델 없이 동작하는 해시 문자 n-gram 벡터이며,
+sentence-transformers가 설치되어 있으면 로컬 문장 임베딩 모델을 쓸 수 있다.
+기사별 벡터는 기사 ID(URL 해시) 단위로 캐시하므로 같은 기사를 다시 계산하지 않는다.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import EMBEDDING_SETTINGS
+from tracing import span
+
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+# 64비트 곱셈 해시 상수 (피보나치 해싱)
+_HASH_MULT = np.uint64(0x9E3779B97F4A7C15)
+_NGRAM_BASE = np.uint64(0x10FFFF + 1)
+
+
+def article_id(news: Dict) -> str:
+    """기사 ID - URL(없으면 제목)의 해시"""
+    source = news.get("url") or news.get("title", "")
+    return hashlib.sha1(source.encode("utf-8")).hexdigest()[:16]
+
+
+class HashedNgramEncoder:
+    """
+    문자 2-gram/3-gram을 고정 크기 벡터에 해싱하는 인코더입니다.
+    띄어쓰기·조사·문장부호가 달라도 같은 단어 조각을 공유하면 가까운 벡터가 된다.
+    """
+
+    def __init__(self, dim: int = 1024, ngram_sizes: Sequence[int] = (2, 3), title_weight: float = 2.0):
+        """
+        Args:
+            dim (int): 벡터 차원 (2의 거듭제곱)
+            ngram_sizes (Sequence[int]): 사용할 문자 n-gram 길이
+            title_weight (float): 요약 대비 제목 가중치
+        """
+        if dim & (dim - 1):
+            raise ValueError("dim은 2의 거듭제곱이어야 합니다.")
+        self.dim = dim
+        self.ngram_sizes = tuple(ngram_sizes)
+        self.title_weight = title_weight
+        self.name = f"hashed-{dim}"
+        self._shift = np.uint64(64 - dim.bit_length() + 1)
+
+    def _counts(self, texts: Sequence[str]) -> np.ndarray:
+        """텍스트 묶음의 n-gram 해시 빈도 행렬 (문서 수 x dim)"""
+        # 공백/문장부호는 0(경계)으로 바꾸고 문서 사이에도 경계를 넣어 한 배열로 처리
+        cleaned = [_NON_WORD_RE.sub("\x00", text.lower()) for text in texts]
+        codes = np.frombuffer("\x00".join(cleaned).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        # 각 문자가 속한 문서 번호 (문서 경계 문자는 이전 문서에 속하지만 n-gram에서 제외됨)
+        lengths = np.fromiter((len(text) + 1 for text in cleaned), dtype=np.int64, count=len(cleaned))
+        rows = np.repeat(np.arange(len(cleaned)), lengths)[:len(codes)]
+
+        flat = np.zeros(len(cleaned) * self.dim, dtype=np.float64)
+        for n in self.ngram_sizes:
+            if len(codes) < n:
+                continue
+            width = len(codes) - n + 1
+            gram = np.zeros(width, dtype=np.uint64)
+            valid = np.ones(width, dtype=bool)
+            for k in range(n):
+                window = codes[k:k + width]
+                gram = gram * _NGRAM_BASE + window
+                valid &= window != 0
+            hashed = (gram + np.uint64(n)) * _HASH_MULT
+            index = (hashed >> self._shift).astype(np.int64)
+            # 해시의 한 비트로 부호를 정해 충돌로 인한 편향을 줄임
+            sign = np.where(hashed & np.uint64(1 << 20), 1.0, -1.0)
+            flat += np.bincount(rows[:width][valid] * self.dim + index[valid],
+                                weights=sign[valid], minlength=flat.size)
+        return flat.reshape(len(cleaned), self.dim)
+
+    def encode(self, titles: Sequence[str], summaries: Sequence[str]) -> np.ndarray:
+        """제목/요약 쌍을 n-gram 빈도 벡터(float32, 정규화 전)로 변환"""
+        return (self.title_weight * self._counts(titles) + self._counts(summaries)).astype(np.float32)
+
+    def finalize(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        묶음 단위 IDF 가중 후 L2 정규화.
+        검색 키워드나 언론사 상투 문구처럼 묶음 전체에 흔한 n-gram의 영향을 줄인다.
+        """
+        document_freq = np.count_nonzero(vectors, axis=0)
+        idf = np.log((1 + len(vectors)) / (1 + document_freq)).astype(np.float32) + 1.0
+        weighted = vectors * idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return weighted / norms
+
+
+class SentenceTransformerEncoder:
+    """
+    sentence-transformers 로컬 모델 인코더입니다 (CPU에서도 동작).
+    """
+
+    def __init__(self, model_name: str, batch_size: int = 64):
+        # 선택 의존성 (torch 포함) - 이 백엔드를 쓸 때만 불러옴
+        from sentence_transformers import SentenceTransformer
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.batch_size = batch_size
+        self.name = f"st:{model_name}"
+
+    def encode(self, titles: Sequence[str], summaries: Sequence[str]) -> np.ndarray:
+        texts = [f"{title}. {summary}" for title, summary in zip(titles, summaries)]
+        return self.model.encode(texts, batch_size=self.batch_size, normalize_embeddings=True,
+                                 convert_to_numpy=True, show_progress_bar=False).astype(np.float32)
+
+    def finalize(self, vectors: np.ndarray) -> np.ndarray:
+        return vectors
+
+
+class EmbeddingStore:
+    """
+    기사 ID별 벡터를 보관하는 스레드 안전 LRU 캐시입니다.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_entries (int): 보관할 최대 벡터 수
+            max_bytes (Optional[int]): 벡터 메모리 합계 상한 (None이면 개수로만 제한)
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, encoder_name: str, ids: Sequence[str]) -> List[Optional[np.ndarray]]:
+        with self._lock:
+            found = []
+            for item_id in ids:
+                vector = self._entries.get((encoder_name, item_id))
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self._entries.move_to_end((encoder_name, item_id))
+                    self.hits += 1
+                found.append(vector)
+            return found
+
+    def put_many(self, encoder_name: str, ids: Sequence[str], vectors: np.ndarray) -> None:
+        with self._lock:
+            for item_id, vector in zip(ids, vectors):
+                # 행 view를 그대로 두면 묶음 전체 행렬이 캐시에서 빠질 때까지 해제되지 않으므로 복사해서 보관
+                vector = vector.copy()
+                previous = self._entries.pop((encoder_name, item_id), None)
+                if previous is not None:
+                    self.size_bytes -= previous.nbytes
+                self._entries[(encoder_name, item_id)] = vector
+                self.size_bytes += vector.nbytes
+            while self._entries and (len(self._entries) > self.max_entries
+                                     or (self.max_bytes is not None and self.size_bytes > self.max_bytes)):
+                _, evicted = self._entries.popitem(last=False)
+                self.size_bytes -= evicted.nbytes
+
+    def stats(self) -> Dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {"entries": len(self._entries), "size_bytes": self.size_bytes, "hits": self.hits,
+                    "misses": self.misses, "hit_rate": self.hits / total if total else 0.0}
+
+
+_encoder_lock = threading.Lock()
+_encoders: Dict[str, object] = {}
+embedding_store = EmbeddingStore(EMBEDDING_SETTINGS["cache_entries"], EMBEDDING_SETTINGS["cache_max_bytes"])
+
+
+def get_encoder(backend: Optional[str] = None):
+    """
+    설정된 인코더를 반환 (프로세스당 한 번 생성).
+    sentence-transformers가 없거나 모델을 불러올 수 없으면 해시 인코더를 사용한다.
+    """
+    backend = backend or EMBEDDING_SETTINGS["backend"]
+    with _encoder_lock:
+        if backend not in _encoders:
+            encoder = None
+            if backend == "sentence-transformers":
+                try:
+                    encoder = SentenceTransformerEncoder(EMBEDDING_SETTINGS["model"], EMBEDDING_SETTINGS["batch_size"])
+                except ImportError:
+                    print("sentence-transformers가 설치되어 있지 않아 해시 인코더 사용")
+                except Exception as e:
+                    print(f"임베딩 모델 로드 실패, 해시 인코더 사용: {e}")
+            _encoders[backend] = encoder or HashedNgramEncoder(EMBEDDING_SETTINGS["dim"])
+        return _encoders[backend]
+
+
+def default_threshold(encoder) -> float:
+    """인코더 종류별 '같은 기사'로 볼 코사인 유사도 기준"""
+    thresholds = EMBEDDING_SETTINGS["threshold"]
+    return thresholds["hashed"] if isinstance(encoder, HashedNgramEncoder) else thresholds["sentence-transformers"]
+
+
+def embed_news(news_list: Sequence[Dict], encoder=None) -> np.ndarray:
+    """
+    기사 목록의 벡터 행렬 (기사 수 x 차원). 캐시에 없는 기사만 배치로 계산한다.
+    해시 인코더의 경우 정규화 전 빈도 벡터이므로 비교 전에 encoder.finalize를 거쳐야 한다.
+    """
+    encoder = encoder or get_encoder()
+    ids = [article_id(news) for news in news_list]
+    cached = embedding_store.get_many(encoder.name, ids)
+    missing = [i for i, vector in enumerate(cached) if vector is None]
+
+    batch_size = EMBEDDING_SETTINGS["batch_size"]
+    for start in range(0, len(missing), batch_size):
+        batch = missing[start:start + batch_size]
+        vectors = encoder.encode([news_list[i].get("title", "") for i in batch],
+                                 [news_list[i].get("summary", "") for i in batch])
+        embedding_store.put_many(encoder.name, [ids[i] for i in batch], vectors)
+        for i, vector in zip(batch, vectors):
+            cached[i] = vector
+
+    if not cached:
+        return np.zeros((0, getattr(encoder, "dim", 1)), dtype=np.float32)
+    return np.vstack(cached)
+
+
+def neighbor_lists(vectors: np.ndarray, threshold: float, block_size: int = 1024) -> List[np.ndarray]:
+    """각 기사와 코사인 유사도가 threshold 이상인 기사 번호 (블록 단위 행렬곱)"""
+    neighbors = []
+    for start in range(0, len(vectors), block_size):
+        similarity = vectors[start:start + block_size] @ vectors.T
+        rows, cols = np.nonzero(similarity >= threshold)
+        split_at = np.searchsorted(rows, np.arange(1, similarity.shape[0]))
+        neighbors.extend(np.split(cols, split_at))
+    return neighbors
+
+
+def cluster_news(news_list: Sequence[Dict], threshold: Optional[float] = None,
+                 priority: Optional[Callable[[Dict], object]] = None, encoder=None) -> List[List[int]]:
+    """
+    같은 사건을 다룬 기사끼리 묶기.
+    priority 순서(작을수록 우선)로 아직 묶이지 않은 기사를 대표로 정하고, 대표와 유사한
+    기사를 같은 묶음에 넣는다 (대표 기준이므로 A~B~C로 이어지는 연쇄 병합이 없다).
+
+    Returns:
+        List[List[int]]: 기사 번호 묶음 목록 (각 묶음의 첫 번호가 대표)
+    """
+    if not news_list:
+        return []
+    encoder = encoder or get_encoder()
+    threshold = default_threshold(encoder) if threshold is None else threshold
+
+    with span("dedupe.embed", "dedupe", items=len(news_list), encoder=encoder.name):
+        vectors = encoder.finalize(embed_news(news_list, encoder))
+    with span("dedupe.search", "dedupe", items=len(news_list)):
+        neighbors = neighbor_lists(vectors, threshold)
+
+    order = sorted(range(len(news_list)), key=lambda i: priority(news_list[i])) if priority else range(len(news_list))
+    assigned = np.zeros(len(news_list), dtype=bool)
+    clusters = []
+    for leader in order:
+        if assigned[leader]:
+            continue
+        members = neighbors[leader][~assigned[neighbors[leader]]]
+        assigned[members] = True
+        assigned[leader] = True
+        clusters.append([leader] + [int(m) for m in members if m != leader])
+    return clusters
+
+
+def dedupe_news(news_list: Sequence[Dict], threshold: Optional[float] = None,
+                priority: Optional[Callable[[Dict], object]] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    의미상 중복 기사 제거.
+
+    Args:
+        news_list (Sequence[Dict]): 수집된 뉴스 목록
+        threshold (Optional[float]): 코사인 유사도 기준 (기본값: 인코더별 설정값)
+        priority (Optional[Callable]): 대표 기사 선택 기준 (작을수록 우선)
+
+    Returns:
+        Tuple[List[Dict], List[Dict]]: (story_id·duplicate_of가 표시된 전체 목록, 대표 기사 목록)
+            대표 기사에는 같은 사건 기사 수(story_size)가 표시되며, 두 목록 모두 원래 순서를 유지한다.
+    """
+    clusters = cluster_news(news_list, threshold=threshold, priority=priority)
+    annotated = [dict(news) for news in news_list]
+    for story_id, members in enumerate(clusters):
+        leader = annotated[members[0]]
+        leader["story_id"] = story_id
+        leader["story_size"] = len(members)
+        for member in members[1:]:
+            annotated[member]["story_id"] = story_id
+            annotated[member]["duplicate_of"] = leader.get("url", "")
+
+    representatives = [news for news in annotated if "duplicate_of" not in news]
+    return annotated, representatives
@@ -0,0 +1,293 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Article Full Text
+-----------------
+AI 분석 후보 기사의 원문(originallink)을 동시에 내려받아 본문만 추출하는 모듈.
+추출한 본문은 내용 해시 기준으로 디스크에 저장하고(같은 본문은 한 번만 저장),
+URL별로 ETag/Last-Modified를 기록해 두었다가 조건부 요청으로 재검증하므로
+같은 기사를 다시 내려받지 않는다. 언론사 도메인별 동시 연결 수와 타임아웃을 제한한다.
+"""
+
+import contextvars
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+from config import FULLTEXT_SETTINGS
+from tracing import span
+
+# 본문이 아닌 영역 (광고, 메뉴, 관련기사 등)
+_BOILERPLATE_TAGS = ["script", "style", "noscript", "iframe", "header", "footer", "nav", "aside", "form", "button", "figure"]
+_BOILERPLATE_ATTR_RE = re.compile(r"(comment|related|recommend|share|sns|banner|copyright|reporter|footer|menu|^nav|^ads?$|^ad[-_]|advert)", re.I)
+
+# 주요 언론사/네이버 뉴스의 본문 영역 (앞에서부터 시도)
+_BODY_SELECTORS = [
+    "#dic_area", "#newsct_article", "#articleBodyContents", "[itemprop=articleBody]",
+    "#article-view-content-div", "#articletxt", ".article_body", ".news_cnt_detail_wrap", "article",
+]
+_MIN_BODY_CHARS = 200
+_SPACE_RE = re.compile(r"[ \t ]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+
+def extract_main_text(html: str) -> str:
+    """
+    HTML에서 기사 본문 텍스트 추출.
+    알려진 본문 영역이 있으면 사용하고, 없으면 <p> 텍스트가 가장 많은 요소를 본문으로 본다.
+    """
+    # BeautifulSoup은 본문 수집을 켰을 때만 필요하므로 처음 사용할 때 불러옴 (앱 시작 시간 단축)
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    for tag in soup(_BOILERPLATE_TAGS):
+        tag.decompose()
+    for tag in soup.find_all(attrs={"class": _BOILERPLATE_ATTR_RE}):
+        if tag.name not in ("body", "html", "article"):
+            tag.decompose()
+
+    body = None
+    for selector in _BODY_SELECTORS:
+        found = soup.select_one(selector)
+        if found and len(found.get_text(strip=True)) >= _MIN_BODY_CHARS:
+            body = found
+            break
+
+    if body is None:
+        # 문단 텍스트 밀도가 가장 높은 부모 요소
+        totals: Dict[int, int] = {}
+        parents = {}
+        for paragraph in soup.find_all("p"):
+            parent = paragraph.parent
+            if parent is None:
+                continue
+            totals[id(parent)] = totals.get(id(parent), 0) + len(paragraph.get_text(strip=True))
+            parents[id(parent)] = parent
+        if totals:
+            body = parents[max(totals, key=totals.get)]
+
+    if body is None:
+        body = soup.body or soup
+
+    text = body.get_text("\n", strip=True)
+    text = _SPACE_RE.sub(" ", text)
+    return _BLANK_LINES_RE.sub("\n", text).strip()
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class ArticleStore:
+    """
+    본문 디스크 캐시입니다.
+    objects/<해시 앞 2자리>/<sha256>.txt 에 본문을, urls/<URL 해시>.json 에 검증 정보를 저장한다.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _url_path(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.root, "urls", digest[:2], f"{digest}.json")
+
+    def _object_path(self, content_hash: str) -> str:
+        return os.path.join(self.root, "objects", content_hash[:2], f"{content_hash}.txt")
+
+    def entry(self, url: str) -> Optional[Dict]:
+        """URL의 검증 정보 (etag, last_modified, content_hash, checked_at)"""
+        try:
+            with open(self._url_path(url), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def text(self, entry: Dict) -> Optional[str]:
+        try:
+            with open(self._object_path(entry["content_hash"]), encoding="utf-8") as f:
+                return f.read()
+        except (OSError, KeyError):
+            return None
+
+    def save(self, url: str, text: str, etag: Optional[str], last_modified: Optional[str]) -> Dict:
+        data = text.encode("utf-8")
+        content_hash = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(content_hash)
+        if not os.path.exists(object_path):
+            _atomic_write(object_path, data)
+        entry = {"url": url, "etag": etag, "last_modified": last_modified,
+                 "content_hash": content_hash, "checked_at": time.time()}
+        _atomic_write(self._url_path(url), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+        return entry
+
+    def touch(self, url: str, entry: Dict) -> None:
+        """304 응답 등으로 재검증된 시각 갱신"""
+        entry = dict(entry, checked_at=time.time())
+        _atomic_write(self._url_path(url), json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+
+class FullTextFetcher:
+    """
+    도메인별 동시 연결 제한이 있는 본문 수집기입니다 (프로세스 전역으로 하나 사용).
+    """
+
+    def __init__(self, settings: Dict = FULLTEXT_SETTINGS):
+        self.settings = settings
+        self.store = ArticleStore(settings["cache_dir"])
+        self._local = threading.local()
+        self._domain_lock = threading.Lock()
+        self._domain_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._stats_lock = threading.Lock()
+        self.stats = {"fresh": 0, "revalidated": 0, "downloaded": 0, "failed": 0}
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers["User-Agent"] = self.settings["user_agent"]
+            if self.settings.get("proxy"):
+                session.proxies = {"http": self.settings["proxy"], "https": self.settings["proxy"]}
+            self._local.session = session
+        return session
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._domain_lock:
+            if host not in self._domain_slots:
+                self._domain_slots[host] = threading.BoundedSemaphore(self.settings["per_domain"])
+            return self._domain_slots[host]
+
+    def _count(self, key: str) -> None:
+        with self._stats_lock:
+            self.stats[key] += 1
+
+    def fetch(self, url: str) -> Optional[str]:
+        """
+        기사 본문 반환 (실패 시 캐시된 본문, 그것도 없으면 None).
+        fresh_seconds 안에 확인한 기사는 요청 없이, 그 이후에는 조건부 요청으로 재검증한다.
+        """
+        entry = self.store.entry(url)
+        if entry and time.time() - entry.get("checked_at", 0) < self.settings["fresh_seconds"]:
+            text = self.store.text(entry)
+            if text is not None:
+                self._count("fresh")
+                return text
+
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        host = urlparse(url).hostname or ""
+        try:
+            with self._slot(host), span("fulltext.request", "http", host=host) as request_span:
+                response = self._session().get(
+                    url, headers=headers, stream=True,
+                    timeout=(self.settings["connect_timeout"], self.settings["read_timeout"])
+                )
+                with response:
+                    if request_span:
+                        request_span.set(status=response.status_code)
+                    if response.status_code == 304 and entry:
+                        text = self.store.text(entry)
+                        if text is not None:
+                            self.store.touch(url, entry)
+                            self._count("revalidated")
+                            return text
+                    response.raise_for_status()
+                    body = self._read_limited(response)
+        except requests.RequestException:
+            self._count("failed")
+            return self.store.text(entry) if entry else None
+
+        with span("fulltext.extract", "fulltext"):
+            text = extract_main_text(body)
+        if not text:
+            self._count("failed")
+            return None
+        self.store.save(url, text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        self._count("downloaded")
+        return text
+
+    def _read_limited(self, response: requests.Response) -> str:
+        """max_bytes까지만 읽어 문자열로 변환 (charset이 없으면 내용으로 추정)"""
+        chunks, size = [], 0
+        for chunk in response.iter_content(64 * 1024):
+            chunks.append(chunk)
+            size += len(chunk)
+            if size >= self.settings["max_bytes"]:
+                break
+        raw = b"".join(chunks)
+        encoding = response.encoding
+        if not encoding or encoding.lower() == "iso-8859-1":
+            encoding = requests.utils.get_encodings_from_content(raw[:4096].decode("ascii", "ignore"))
+            encoding = encoding[0] if encoding else "utf-8"
+        return raw.decode(encoding, errors="replace")
+
+    def fetch_many(self, urls: Iterable[str]) -> Dict[str, Optional[str]]:
+        """여러 기사 본문을 동시에 수집 (중복 URL은 한 번만)"""
+        unique = list(dict.fromkeys(url for url in urls if url))
+        if not unique:
+            return {}
+        # 작업 스레드에서도 현재 추적(span) 컨텍스트를 이어서 사용
+        contexts = [contextvars.copy_context() for _ in unique]
+        with ThreadPoolExecutor(max_workers=min(self.settings["max_workers"], len(unique))) as pool:
+            texts = pool.map(lambda context, url: context.run(self.fetch, url), contexts, unique)
+            return dict(zip(unique, texts))
+
+
+_fetcher: Optional[FullTextFetcher] = None
+_fetcher_lock = threading.Lock()
+
+
+def get_fetcher() -> FullTextFetcher:
+    global _fetcher
+    with _fetcher_lock:
+        if _fetcher is None:
+            _fetcher = FullTextFetcher()
+        return _fetcher
+
+
+def article_url(news: Dict) -> str:
+    """본문을 받을 주소 - 언론사 원문(originallink) 우선, 없으면 네이버 링크"""
+    return news.get("originallink") or news.get("url", "")
+
+
+def attach_fulltext(news_list: List[Dict]) -> List[Dict]:
+    """
+    후보 기사에 본문(body)을 붙인 사본 목록 반환. 본문을 받지 못한 기사는 그대로 둔다.
+    """
+    with span("fulltext", "pipeline", items=len(news_list)) as fulltext_span:
+        texts = get_fetcher().fetch_many(article_url(news) for news in news_list)
+        enriched = [dict(news, body=texts[article_url(news)]) if texts.get(article_url(news)) else news
+                    for news in news_list]
+        if fulltext_span:
+            fulltext_span.set(with_body=sum(1 for news in enriched if "body" in news))
+    return enriched
+
+
+def body_excerpt(news: Dict) -> str:
+    """프롬프트에 넣을 본문 앞부분 (본문이 없으면 빈 문자열)"""
+    body = news.get("body", "")
+    limit = FULLTEXT_SETTINGS["excerpt_chars"]
+    return body[:limit].replace("\n", " ") + ("…" if len(body) > limit else "")
@@ -5,6 +5,8 @@ from typing import List, Dict, Optional
 import re
 from datetime import datetime
 
+from circuit_breaker import get_breaker
+
 
 class GoogleNews:
     """
@@ -50,6 +52,32 @@ class GoogleNews:
         # 통합 검색만 사용 (순차 검색 제거)
         return self.search_all_press_unified(keywords_query, k)
 
+    def search_naver_items(self, keywords_query: str, k: int = 100) -> List[Dict[str, str]]:
+        """
+        OR 검색 결과를 네이버 검색 API 항목 형태로 변환합니다 (제목 끝의 ' - 언론사' 제거).
+
+        Args:
+            keywords_query (str): "키워드1 OR 키워드2" 형태의 쿼리 (after:/before: 날짜 연산자 사용 가능)
+            k (int): 검색할 뉴스의 최대 개수 (기본값: 100)
+
+        Returns:
+            List[Dict[str, str]]: title, link, originallink, description, pubDate, press를 포함한 항목 리스트
+        """
+        items = []
+        for entry in self.search_by_keywords_or(keywords_query, k=k):
+            title, press = entry["content"], entry["press"]
+            if title.endswith(f" - {press}"):
+                title = title[:-len(press) - 3]
+            items.append({
+                "title": title,
+                "link": entry["url"],
+                "originallink": "",
+                "description": "",
+                "pubDate": entry["date"],
+                "press": press
+            })
+        return items
+
     def search_all_press_unified(self, keywords_query: str, k: int = 200) -> List[Dict[str, str]]:
         """
         전체 언론사에서 한번에 검색하여 빠른 수집 (GPT로 유효 언론사 필터링 예정)
@@ -63,6 +91,12 @@ class GoogleNews:
         """
         print(f"전체 언론사에서 통합 검색 시작: {keywords_query}")
         
+        # 연속 실패로 회로가 열려 있으면 요청하지 않음
+        breaker = get_breaker("google_news")
+        if not breaker.allow():
+            print(f"Google News 장애로 검색 생략 ({breaker.retry_in():.0f}초 후 재시도)")
+            return []
+        
         try:
             # 전체 언론사에서 OR 검색 URL 생성
             encoded_query = quote(keywords_query)
@@ -71,7 +105,15 @@ class GoogleNews:
             print(f"검색 URL: {url}")
             
             # 뉴스 데이터 파싱
-            response = requests.get(url, timeout=15)  # 타임아웃 증가
+            try:
+                response = requests.get(url, timeout=15)  # 타임아웃 증가
+            except requests.RequestException as e:
+                breaker.record_failure(e)
+                raise
+            if response.status_code >= 500:
+                breaker.record_failure(requests.HTTPError(f"HTTP {response.status_code}"))
+            else:
+                breaker.record_success()
             response.raise_for_status()
             
             soup = BeautifulSoup(response.content, 'xml')
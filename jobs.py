@@ -0,0 +1,220 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Background Jobs
+---------------
+Streamlit 세션과 분리된 로컬 백그라운드 작업 실행기.
+수집/분석 파이프라인을 워커 스레드 풀에서 실행하고, 작업 상태·진행률·결과를
+SQLite 작업 테이블에 기록하여 브라우저 연결이 끊겨도 작업이 계속되도록 한다.
+같은 조건(카테고리 + 기간)의 요청은 하나의 작업을 공유한다.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from config import DATA_DIR, JOB_SETTINGS
+
+JOB_DB_PATH = os.path.join(DATA_DIR, "jobs.db")
+
+# 작업 상태
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+STATUS_INTERRUPTED = "interrupted"
+
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING)
+FINISHED_STATUSES = (STATUS_DONE, STATUS_FAILED, STATUS_INTERRUPTED)
+
+
+def make_job_key(params: Dict) -> str:
+    """작업 파라미터로 공유 키 생성 (카테고리 순서와 무관)"""
+    normalized = dict(params)
+    if "categories" in normalized:
+        normalized["categories"] = sorted(normalized["categories"])
+    raw = json.dumps(normalized, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class JobRunner:
+    """
+    SQLite 작업 테이블 기반의 로컬 워커 풀입니다.
+    """
+
+    def __init__(self, db_path: str = JOB_DB_PATH, max_workers: int = JOB_SETTINGS["max_workers"]):
+        """
+        Args:
+            db_path (str): 작업 테이블 SQLite 파일 경로
+            max_workers (int): 동시에 실행할 작업 수
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="news-job")
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jobs (
+                    job_id TEXT PRIMARY KEY,
+                    job_key TEXT NOT NULL,
+                    params TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT NOT NULL DEFAULT '',
+                    result TEXT,
+                    error TEXT,
+                    created_at REAL NOT NULL,
+                    updated_at REAL NOT NULL,
+                    finished_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_key ON jobs (job_key, created_at)")
+            # 이전 프로세스에서 실행 중이던 작업은 더 이상 진행되지 않으므로 중단 처리
+            conn.execute(
+                "UPDATE jobs SET status = ?, message = ?, updated_at = ? WHERE status IN (?, ?)",
+                (STATUS_INTERRUPTED, "서버 재시작으로 작업이 중단되었습니다.", time.time(), *ACTIVE_STATUSES)
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def submit(self, params: Dict, pipeline_fn: Callable) -> str:
+        """
+        작업을 등록하고 워커 풀에서 실행합니다. 같은 키의 작업이 진행 중이거나
+        최근에 완료되었으면 새 작업을 만들지 않고 기존 작업 ID를 반환합니다.
+
+        Args:
+            params (Dict): JSON 직렬화 가능한 작업 파라미터
+            pipeline_fn (Callable): pipeline_fn(params, report) 형태의 실행 함수.
+                report(progress, message)로 진행 상황을 보고하고 결과 딕셔너리를 반환
+
+        Returns:
+            str: 작업 ID
+        """
+        job_key = make_job_key(params)
+        now = time.time()
+
+        with self._lock:
+            existing = self._find_shareable(job_key, now)
+            if existing:
+                return existing
+
+            job_id = uuid.uuid4().hex[:12]
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, job_key, params, status, message, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, job_key, json.dumps(params, ensure_ascii=False), STATUS_QUEUED,
+                     "대기 중", now, now)
+                )
+
+        self._executor.submit(self._run, job_id, params, pipeline_fn)
+        return job_id
+
+    def _find_shareable(self, job_key: str, now: float) -> Optional[str]:
+        """공유 가능한 기존 작업 (진행 중 또는 재사용 기간 내 완료) 검색"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT job_id, status, finished_at FROM jobs WHERE job_key = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (job_key,)
+            ).fetchone()
+
+        if not row:
+            return None
+        if row["status"] in ACTIVE_STATUSES:
+            return row["job_id"]
+        if row["status"] == STATUS_DONE and now - (row["finished_at"] or 0) <= JOB_SETTINGS["reuse_seconds"]:
+            return row["job_id"]
+        return None
+
+    def _run(self, job_id: str, params: Dict, pipeline_fn: Callable) -> None:
+        """워커 스레드에서 파이프라인 실행"""
+        self._update(job_id, status=STATUS_RUNNING, message="실행 중")
+
+        def report(progress: float, message: str = "") -> None:
+            self._update(job_id, progress=max(0.0, min(1.0, progress)), message=message)
+
+        try:
+            result = pipeline_fn(params, report)
+            self._update(
+                job_id,
+                status=STATUS_DONE,
+                progress=1.0,
+                message="완료",
+                result=json.dumps(result, ensure_ascii=False, default=list),  # 스풀 기사 목록(SpooledNews)은 목록으로 저장
+                finished_at=time.time()
+            )
+        except Exception as e:
+            self._update(
+                job_id,
+                status=STATUS_FAILED,
+                message="실패",
+                error=str(e),
+                finished_at=time.time()
+            )
+
+    def _update(self, job_id: str, **fields) -> None:
+        fields["updated_at"] = time.time()
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._connect() as conn:
+            conn.execute(f"UPDATE jobs SET {columns} WHERE job_id = ?", (*fields.values(), job_id))
+
+    def get(self, job_id: str, include_result: bool = True) -> Optional[Dict]:
+        """
+        작업 상태 조회.
+
+        Args:
+            job_id (str): 작업 ID
+            include_result (bool): False면 결과 본문을 읽지 않음 (상태만 표시할 때)
+
+        Returns:
+            Optional[Dict]: job_id, status, progress, message, params, result, error 등을 포함한 딕셔너리
+        """
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if not row:
+            return None
+
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if include_result and job["result"] else None
+        return job
+
+    def list_recent(self, limit: int = 10) -> List[Dict]:
+        """최근 작업 목록 (결과 본문 제외)"""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT job_id, status, progress, message, params, created_at, finished_at "
+                "FROM jobs ORDER BY created_at DESC LIMIT ?",
+                (limit,)
+            ).fetchall()
+        jobs = []
+        for row in rows:
+            job = dict(row)
+            job["params"] = json.loads(job["params"])
+            jobs.append(job)
+        return jobs
+
+
+_runner: Optional[JobRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner() -> JobRunner:
+    """프로세스 전역 JobRunner (모든 Streamlit 세션이 공유)"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
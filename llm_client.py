@@ -0,0 +1,371 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LLM Client
+----------
+chat completion 요청을 보내는 비동기 실행 계층.
+프로세스 전역 AsyncOpenAI 클라이언트 하나를 전용 이벤트 루프 스레드에서 돌리고,
+Streamlit 스크립트(동기 코드)에서는 complete()로 결과를 기다린다.
+
+- 동시 요청 수 제한 (모든 세션/백그라운드 작업 합계, asyncio.Semaphore)
+- 요청별 제한 시간 (재시도와 hedging을 포함한 전체 deadline)
+- 429/타임아웃/연결 오류/5xx 재시도 (지수 backoff + jitter, Retry-After 존중)
+- hedging: 응답(스트리밍은 첫 청크)이 모델별 p95 지연을 넘도록 오지 않으면 같은 요청을 한 번 더 보내고
+  먼저 도착한 쪽을 사용
+- 회로 차단기: 재시도까지 모두 실패한 요청이 이어지면 한동안 요청을 보내지 않고 CircuitOpenError로 바로 실패
+
+    result = get_llm_client().complete(messages, model="gpt-4o-mini")
+    result["text"], result["usage"], result["hedged"]
+"""
+
+import asyncio
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+from circuit_breaker import CircuitBreaker, CircuitOpenError, get_breaker
+from config import LLM_CLIENT_SETTINGS, OPENAI_SETTINGS
+
+
+class LLMTimeoutError(Exception):
+    """재시도/hedging을 포함한 요청 제한 시간 초과"""
+
+
+def _default_client_factory(settings: Dict):
+    """AsyncOpenAI 클라이언트 생성 (재시도는 이 모듈이 직접 하므로 SDK 재시도는 끔)"""
+    import openai
+    return openai.AsyncOpenAI(
+        api_key=os.getenv('OPENAI_API_KEY'),
+        base_url=OPENAI_SETTINGS["base_url"],
+        timeout=settings["attempt_timeout"],
+        max_retries=0
+    )
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """429 응답의 Retry-After 헤더 (초)"""
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _is_retryable(error: Exception) -> bool:
+    import openai
+    return isinstance(error, (openai.RateLimitError, openai.APITimeoutError,
+                              openai.APIConnectionError, openai.InternalServerError))
+
+
+def _percentile(samples: List[float], ratio: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * ratio))]
+
+
+class _Opened:
+    """응답을 받기 시작한 요청 (스트리밍이면 첫 청크까지 받은 상태)"""
+
+    def __init__(self, response, iterator=None, first=None):
+        self.response = response
+        self.iterator = iterator
+        self.first = first
+        self.hedged = False
+
+
+class LLMClient:
+    """
+    비동기 chat completion 실행기입니다.
+    """
+
+    def __init__(self, settings: Dict = LLM_CLIENT_SETTINGS, client_factory: Optional[Callable] = None,
+                 breaker: Optional[CircuitBreaker] = None):
+        """
+        Args:
+            settings (Dict): 동시 요청 수, 제한 시간, 재시도, hedging 설정
+            client_factory (Optional[Callable]): settings를 받아 AsyncOpenAI 호환 클라이언트를 만드는 함수
+            breaker (Optional[CircuitBreaker]): 회로 차단기 (기본값: 프로세스 전역 "openai" 차단기)
+        """
+        self.settings = settings
+        self._client_factory = client_factory or _default_client_factory
+        self.breaker = breaker or get_breaker("openai")
+        self._client = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._latencies: Dict[tuple, deque] = {}
+        self._lock = threading.Lock()
+        self.counters = {"requests": 0, "attempts": 0, "retries": 0, "hedged": 0,
+                         "hedge_wins": 0, "timeouts": 0, "failures": 0, "rejected": 0}
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="llm-client", daemon=True)
+        self._thread.start()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.counters[key] += 1
+
+    # ---- 지연 시간 / hedging ----
+
+    def _record_latency(self, model: str, stream: bool, latency_ms: float) -> None:
+        with self._lock:
+            samples = self._latencies.setdefault((model, stream), deque(maxlen=self.settings["latency_window"]))
+            samples.append(latency_ms)
+
+    def hedge_delay_ms(self, model: str, stream: bool) -> Optional[float]:
+        """hedging 요청을 보내기 전 기다릴 시간 (표본이 부족하거나 hedging을 끄면 None)"""
+        if not self.settings["hedge"]:
+            return None
+        with self._lock:
+            samples = list(self._latencies.get((model, stream), ()))
+        if len(samples) < self.settings["hedge_min_samples"]:
+            return None
+        return max(_percentile(samples, self.settings["hedge_percentile"]), self.settings["hedge_min_ms"])
+
+    # ---- 이벤트 루프 안에서 실행 ----
+
+    async def _open(self, messages: List[Dict], model: str, stream: bool) -> _Opened:
+        """요청 1회 - 세마포어를 잡고 응답(스트리밍이면 첫 청크)을 받을 때까지 대기.
+        성공하면 세마포어는 _consume이 반납한다."""
+        await self._semaphore.acquire()
+        try:
+            self._count("attempts")
+            started = time.perf_counter()
+            kwargs = {"stream_options": {"include_usage": True}} if stream else {}
+            response = await self._client.chat.completions.create(
+                model=model, messages=messages, temperature=0.3, stream=stream, **kwargs
+            )
+            opened = _Opened(response)
+            if stream:
+                opened.iterator = response.__aiter__()
+                try:
+                    opened.first = await opened.iterator.__anext__()
+                except StopAsyncIteration:
+                    opened.first = None
+            self._record_latency(model, stream, (time.perf_counter() - started) * 1000)
+            return opened
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    async def _discard(self, opened: _Opened) -> None:
+        """hedging에서 진 응답 정리"""
+        try:
+            close = getattr(opened.response, "close", None)
+            if opened.iterator is not None and close is not None:
+                await close()
+        finally:
+            self._semaphore.release()
+
+    async def _race(self, messages: List[Dict], model: str, stream: bool) -> _Opened:
+        """첫 요청이 p95 지연 안에 응답하지 않으면 hedging 요청을 보내고 먼저 응답한 쪽 반환"""
+        primary = asyncio.ensure_future(self._open(messages, model, stream))
+        pending = {primary}
+        try:
+            delay_ms = self.hedge_delay_ms(model, stream)
+            if delay_ms is None:
+                return await primary
+            done, pending = await asyncio.wait(pending, timeout=delay_ms / 1000)
+            if done:
+                return primary.result()
+            if self._semaphore.locked():
+                # 동시 요청 상한에 걸려 있으면 hedging 요청도 대기열에 서므로 보내지 않음
+                return await primary
+
+            self._count("hedged")
+            hedge = asyncio.ensure_future(self._open(messages, model, stream))
+            pending.add(hedge)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded:
+                    winner = primary if primary in succeeded else succeeded[0]
+                    for task in succeeded:
+                        if task is not winner:
+                            await self._discard(task.result())
+                    if winner is hedge:
+                        self._count("hedge_wins")
+                    opened = winner.result()
+                    opened.hedged = True
+                    return opened
+                error = next(iter(done)).exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _consume(self, opened: _Opened, stream: bool, on_text: Optional[Callable]) -> Dict:
+        """응답 본문/토큰 사용량 수집 (스트리밍이면 누적 텍스트를 on_text로 전달)"""
+        try:
+            if not stream:
+                return {"text": opened.response.choices[0].message.content,
+                        "usage": getattr(opened.response, "usage", None)}
+
+            text, usage = "", None
+            chunk = opened.first
+            while chunk is not None:
+                if getattr(chunk, "usage", None):
+                    usage = chunk.usage
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        text += delta
+                        if on_text:
+                            on_text(text)
+                try:
+                    chunk = await opened.iterator.__anext__()
+                except StopAsyncIteration:
+                    chunk = None
+            return {"text": text, "usage": usage}
+        finally:
+            self._semaphore.release()
+
+    async def _attempts(self, messages: List[Dict], model: str, stream: bool,
+                        on_text: Optional[Callable], deadline: float) -> Dict:
+        """재시도 루프 (대기 후 deadline을 넘기게 되면 재시도하지 않음)"""
+        if self._client is None:
+            self._client = self._client_factory(self.settings)
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.settings["max_concurrency"])
+
+        attempt = 0
+        while True:
+            try:
+                opened = await self._race(messages, model, stream)
+                result = await self._consume(opened, stream, on_text)
+                result.update(attempts=attempt + 1, hedged=opened.hedged)
+                return result
+            except Exception as e:
+                attempt += 1
+                if not _is_retryable(e) or attempt > self.settings["max_retries"]:
+                    raise
+                backoff = min(self.settings["backoff_max"], self.settings["backoff_base"] * 2 ** (attempt - 1))
+                delay = max(_retry_after(e) or 0, random.uniform(0, backoff))
+                if time.monotonic() + delay >= deadline:
+                    raise
+                self._count("retries")
+                await asyncio.sleep(delay)
+
+    async def _run(self, messages: List[Dict], model: str, stream: bool,
+                   on_text: Optional[Callable], timeout: float) -> Dict:
+        if not self.breaker.allow():
+            self._count("rejected")
+            raise CircuitOpenError(self.breaker.service, self.breaker.retry_in())
+        self._count("requests")
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(
+                self._attempts(messages, model, stream, on_text, time.monotonic() + timeout), timeout
+            )
+        except asyncio.TimeoutError:
+            self._count("timeouts")
+            error = LLMTimeoutError(f"AI 응답 제한 시간 {timeout:.0f}초 초과 ({model})")
+            self.breaker.record_failure(error)
+            raise error
+        except Exception as e:
+            self._count("failures")
+            # 요청 자체가 잘못된 경우(400 등)는 서비스 장애가 아니므로 회로에 반영하지 않음
+            if _is_retryable(e):
+                self.breaker.record_failure(e)
+            else:
+                self.breaker.record_success()
+            raise
+        except BaseException:
+            self.breaker.release()
+            raise
+        self.breaker.record_success()
+        result.update(model=model, latency_ms=(time.perf_counter() - started) * 1000)
+        return result
+
+    # ---- 동기 코드에서 호출 ----
+
+    def complete(self, messages: List[Dict], model: str, on_token: Optional[Callable] = None,
+                 timeout: Optional[float] = None) -> Dict:
+        """
+        chat completion 요청 후 결과를 기다림.
+
+        Args:
+            messages (List[Dict]): chat completion messages
+            model (str): 모델 이름
+            on_token (Optional[Callable]): 주어지면 스트리밍으로 받으며, 호출한 스레드에서 누적 텍스트로 호출
+            timeout (Optional[float]): 전체 제한 시간 (초, 기본값 settings["deadline"])
+
+        Returns:
+            Dict: text, usage(토큰 사용량 또는 None), model, latency_ms, attempts, hedged
+        """
+        timeout = timeout or self.settings["deadline"]
+        stream = on_token is not None
+        updates: "queue.Queue[str]" = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._run(messages, model, stream, updates.put if stream else None, timeout), self._loop
+        )
+        if not stream:
+            return future.result()
+
+        try:
+            # on_token(Streamlit 출력)은 스크립트 스레드에서 호출해야 하므로 큐로 넘겨받아 최신 텍스트만 전달
+            while not future.done() or not updates.empty():
+                try:
+                    text = updates.get(timeout=0.05)
+                except queue.Empty:
+                    continue
+                while not updates.empty():
+                    text = updates.get_nowait()
+                on_token(text)
+        except BaseException:
+            future.cancel()
+            raise
+        return future.result()
+
+    def stats(self) -> Dict:
+        """요청/재시도/hedging 횟수와 모델별 p95 지연"""
+        with self._lock:
+            counters = dict(self.counters)
+            p95 = {
+                f"{model}{' (stream)' if stream else ''}": round(_percentile(list(samples), 0.95), 1)
+                for (model, stream), samples in self._latencies.items() if samples
+            }
+        counters["p95_ms"] = p95
+        counters["max_concurrency"] = self.settings["max_concurrency"]
+        return counters
+
+    def close(self) -> None:
+        """이벤트 루프 종료 (벤치마크에서 클라이언트를 바꿀 때 사용)"""
+        async def _close():
+            close = getattr(self._client, "close", None)
+            if close is not None:
+                await close()
+
+        try:
+            asyncio.run_coroutine_threadsafe(_close(), self._loop).result(timeout=5)
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+
+
+_llm_client: Optional[LLMClient] = None
+_llm_client_lock = threading.Lock()
+
+
+def get_llm_client() -> LLMClient:
+    """프로세스 전역 LLM 클라이언트"""
+    global _llm_client
+    with _llm_client_lock:
+        if _llm_client is None:
+            _llm_client = LLMClient()
+        return _llm_client
+
+
+def reset_llm_client() -> None:
+    """전역 클라이언트 종료 - 다음 get_llm_client()가 새 AsyncOpenAI 클라이언트를 만든다"""
+    global _llm_client
+    with _llm_client_lock:
+        client, _llm_client = _llm_client, None
+    if client is not None:
+        client.close()
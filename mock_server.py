@@ -0,0 +1,426 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Mock Server
+-----------
+부하 테스트용 로컬 대체 서버.
+네이버 뉴스 검색 API(query/display/start/sort 페이지네이션, 429 제한, 지연 주입)와
+최소한의 OpenAI chat completions 엔드포인트(stream 포함)를 제공한다.
+--local-articles 사용 시 기사 원문 주소를 http로 내보내고, 이 서버를 HTTP 프록시로 지정한
+본문 수집 요청(FULLTEXT_PROXY)에 ETag/Last-Modified 조건부 요청을 지원하는 기사 페이지로 응답한다.
+
+    python mock_server.py --port 8765 --latency-ms 80 --rate-limit 10
+
+앱 또는 헤드리스 실행을 이 서버로 연결하려면:
+
+    NAVER_API_BASE_URL=http://127.0.0.1:8765/v1/search/news.json \\
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 \\
+    NAVER_CLIENT_ID=mock NAVER_CLIENT_SECRET=mock OPENAI_API_KEY=mock \\
+    streamlit run app.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from config import KST
+
+NAVER_PATH = "/v1/search/news.json"
+CHAT_PATH = "/v1/chat/completions"
+ARTICLE_PATH = "/article/"
+
+# 네이버 검색 API 제한 (display 최대 100, start 최대 1000)
+MAX_DISPLAY = 100
+MAX_START = 1000
+
+_PROMPT_ITEM_RE = re.compile(r"^\d+\. 제목: (.*)$\n(?:.*\n)*?^\s+링크: (\S*)$", re.MULTILINE)
+_PRESS_HOSTS = [
+    "www.chosun.com", "www.joongang.co.kr", "www.donga.com", "www.hankyung.com", "www.mk.co.kr",
+    "www.yna.co.kr", "www.edaily.co.kr", "www.asiae.co.kr", "www.newsis.com", "news.mt.co.kr",
+]
+
+
+class TokenBucket:
+    """초당 요청 수 제한 (rate가 0이면 제한 없음)"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+
+class MockState:
+    """서버 설정과 요청 통계 (모든 핸들러 스레드가 공유)"""
+
+    def __init__(self, args):
+        self.latency_ms = args.latency_ms
+        self.jitter_ms = args.jitter_ms
+        self.llm_latency_ms = args.llm_latency_ms
+        self.llm_tail_rate = args.llm_tail_rate
+        self.llm_tail_ms = args.llm_tail_ms
+        self.error_rate = args.error_rate
+        self.results_per_query = args.results_per_query
+        self.window_hours = args.window_hours
+        self.naver_limiter = TokenBucket(args.rate_limit)
+        self.llm_limiter = TokenBucket(args.llm_rate_limit)
+        self.seed = args.seed
+        self.article_latency_ms = args.article_latency_ms
+        self.local_articles = args.local_articles
+
+        self._lock = threading.Lock()
+        self.stats = {"naver_requests": 0, "naver_throttled": 0, "chat_requests": 0,
+                      "chat_throttled": 0, "chat_slow": 0, "article_requests": 0, "article_not_modified": 0, "errors": 0}
+
+    def count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def sleep_latency(self, base_ms: int) -> None:
+        delay = base_ms + (random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0)
+        if delay > 0:
+            time.sleep(delay / 1000)
+
+    def naver_items(self, query: str) -> List[Dict]:
+        """쿼리별로 결정적인 기사 목록 생성 (최신순)"""
+        rng = random.Random(zlib.crc32(f"{self.seed}:{query}".encode("utf-8")))
+        now = datetime.now(KST).replace(microsecond=0)
+        terms = [t.strip() for t in query.split(" OR ") if t.strip()] or [query]
+
+        items = []
+        for i in range(self.results_per_query):
+            term = terms[i % len(terms)]
+            host = rng.choice(_PRESS_HOSTS)
+            aid = rng.randint(10 ** 9, 10 ** 10 - 1)
+            pub = now - timedelta(seconds=int((i + rng.random()) * self.window_hours * 3600 / self.results_per_query))
+            items.append({
+                "title": f"<b>{term}</b> 관련 주요 소식 #{i + 1} &quot;모의 기사&quot;",
+                "originallink": f"{'http' if self.local_articles else 'https'}://{host}{ARTICLE_PATH}{aid}",
+                "link": f"https://n.news.naver.com/mnews/article/{rng.randint(1, 450):03d}/{aid:010d}",
+                "description": f"<b>{term}</b>에 대한 모의 기사 요약입니다. 실적 &amp; 투자 동향을 다룹니다.",
+                "pubDate": pub.strftime("%a, %d %b %Y %H:%M:%S +0900"),
+            })
+        return items
+
+
+def article_page(host: str, aid: str) -> Dict:
+    """기사 페이지 HTML과 검증 정보 (메뉴/관련기사/광고 등 본문 외 영역 포함)"""
+    rng = random.Random(zlib.crc32(f"{host}/{aid}".encode("utf-8")))
+    paragraphs = "\n".join(
+        f"<p>{host} 모의 기사 {aid}의 본문 {i + 1}번째 문단입니다. 실적과 투자 계획, 회계 처리 변경에 대한 "
+        f"설명이 이어집니다. 관계자는 \"시장 상황을 지켜보고 있다\"고 밝혔다. (지표 {rng.randint(1, 999)})</p>"
+        for i in range(5)
+    )
+    html = f"""<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>모의 기사 {aid}</title><script>var ad = 1;</script></head>
+<body>
+<header><nav><a href="/">홈</a> <a href="/economy">경제</a> <a href="/society">사회</a></nav></header>
+<div class="ad-top">광고 영역</div>
+<div id="container">
+  <h1>모의 기사 {aid}</h1>
+  <div class="article_body">
+{paragraphs}
+  </div>
+  <div class="related_news"><p>관련 기사: 다른 모의 기사 제목이 여기에 나열됩니다.</p></div>
+</div>
+<footer><p>Copyright {host}. All rights reserved.</p></footer>
+</body></html>"""
+    modified = datetime(2025, 1, 1, tzinfo=KST) + timedelta(minutes=zlib.crc32(aid.encode()) % 100000)
+    return {
+        "body": html.encode("utf-8"),
+        "etag": f'"{zlib.crc32(html.encode("utf-8")):08x}"',
+        "last_modified": formatdate(modified.timestamp(), usegmt=True),
+    }
+
+
+def build_handler(state: MockState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):  # 요청마다 로그를 남기지 않음
+            pass
+
+        def handle(self):
+            # hedging에서 진 요청처럼 클라이언트가 먼저 끊은 연결은 오류로 남기지 않음
+            try:
+                super().handle()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+        def _send_json(self, status: int, body: Dict, headers: Optional[Dict] = None) -> None:
+            payload = json.dumps(body, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(payload)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def _maybe_fail(self) -> bool:
+            if state.error_rate and random.random() < state.error_rate:
+                state.count("errors")
+                self._send_json(500, {"errorMessage": "Mock internal error", "errorCode": "SE99"})
+                return True
+            return False
+
+        def do_GET(self):
+            parsed = urlparse(self.path)
+            if parsed.path == "/stats":
+                self._send_json(200, state.stats)
+                return
+            if parsed.netloc:
+                # 프록시 형식 요청 (GET http://언론사/article/<id>)
+                self._send_article(parsed.netloc, parsed.path)
+                return
+            if parsed.path != NAVER_PATH:
+                self._send_json(404, {"errorMessage": "Not found"})
+                return
+
+            state.count("naver_requests")
+            if not state.naver_limiter.allow():
+                state.count("naver_throttled")
+                self._send_json(429, {"errorMessage": "Rate limit exceeded.", "errorCode": "012"},
+                                headers={"Retry-After": "1"})
+                return
+
+            state.sleep_latency(state.latency_ms)
+            if self._maybe_fail():
+                return
+
+            params = parse_qs(parsed.query)
+            query = params.get("query", [""])[0]
+            try:
+                display = int(params.get("display", ["10"])[0])
+                start = int(params.get("start", ["1"])[0])
+            except ValueError:
+                self._send_json(400, {"errorMessage": "Invalid display/start value", "errorCode": "SE02"})
+                return
+            sort = params.get("sort", ["sim"])[0]
+
+            if not query:
+                self._send_json(400, {"errorMessage": "Incorrect query request (query)", "errorCode": "SE01"})
+                return
+            if not 1 <= display <= MAX_DISPLAY or not 1 <= start <= MAX_START:
+                self._send_json(400, {"errorMessage": "Invalid display/start value", "errorCode": "SE02"})
+                return
+            if sort not in ("sim", "date"):
+                self._send_json(400, {"errorMessage": "Invalid sort value", "errorCode": "SE04"})
+                return
+
+            items = state.naver_items(query)
+            if sort == "sim":
+                items = sorted(items, key=lambda item: zlib.crc32(item["link"].encode()))
+            page = items[start - 1:start - 1 + display]
+            self._send_json(200, {
+                "lastBuildDate": datetime.now(KST).strftime("%a, %d %b %Y %H:%M:%S +0900"),
+                "total": len(items),
+                "start": start,
+                "display": len(page),
+                "items": page,
+            })
+
+        def _send_article(self, host: str, path: str) -> None:
+            aid = path[len(ARTICLE_PATH):] if path.startswith(ARTICLE_PATH) else ""
+            if not aid:
+                self._send_json(404, {"errorMessage": "Not found"})
+                return
+            state.count("article_requests")
+            state.sleep_latency(state.article_latency_ms)
+            page = article_page(host, aid)
+            headers = {"ETag": page["etag"], "Last-Modified": page["last_modified"]}
+            if (self.headers.get("If-None-Match") == page["etag"]
+                    or self.headers.get("If-Modified-Since") == page["last_modified"]):
+                state.count("article_not_modified")
+                self.send_response(304)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(page["body"])))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(page["body"])
+
+        def do_POST(self):
+            if urlparse(self.path).path != CHAT_PATH:
+                self._send_json(404, {"error": {"message": "Not found"}})
+                return
+
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+
+            state.count("chat_requests")
+            if not state.llm_limiter.allow():
+                state.count("chat_throttled")
+                self._send_json(429, {"error": {"message": "Rate limit reached", "type": "requests",
+                                                "code": "rate_limit_exceeded"}},
+                                headers={"Retry-After": "1"})
+                return
+
+            latency_ms = state.llm_latency_ms
+            if state.llm_tail_rate and random.random() < state.llm_tail_rate:
+                state.count("chat_slow")
+                latency_ms += state.llm_tail_ms
+            state.sleep_latency(latency_ms)
+            if self._maybe_fail():
+                return
+
+            prompt = "\n".join(str(m.get("content", "")) for m in request.get("messages", []))
+            content = synthesize_selection(prompt)
+            prompt_tokens = max(1, int(len(prompt) / 1.6))
+            completion_tokens = max(1, int(len(content) / 1.6))
+            usage = {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "prompt_tokens_details": {"cached_tokens": 0},
+            }
+            model = request.get("model", "gpt-4o-mini")
+            created = int(time.time())
+
+            if request.get("stream"):
+                self._stream_completion(model, created, content, usage,
+                                        include_usage=(request.get("stream_options") or {}).get("include_usage"))
+                return
+
+            self._send_json(200, {
+                "id": f"chatcmpl-mock{created}",
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": usage,
+            })
+
+        def _stream_completion(self, model: str, created: int, content: str, usage: Dict,
+                               include_usage: bool) -> None:
+            """server-sent events 형식으로 토큰 단위 전송"""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+
+            def event(delta: Dict, finish_reason=None, usage_body=None) -> bytes:
+                chunk = {
+                    "id": f"chatcmpl-mock{created}", "object": "chat.completion.chunk",
+                    "created": created, "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}] if delta is not None else [],
+                }
+                if usage_body is not None:
+                    chunk["usage"] = usage_body
+                return f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8")
+
+            self.wfile.write(event({"role": "assistant", "content": ""}))
+            for i in range(0, len(content), 8):
+                self.wfile.write(event({"content": content[i:i + 8]}))
+                self.wfile.flush()
+                time.sleep(0.005)
+            self.wfile.write(event({}, finish_reason="stop"))
+            if include_usage:
+                self.wfile.write(event(None, usage_body=usage))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.wfile.flush()
+
+    return Handler
+
+
+def synthesize_selection(prompt: str, count: int = 3) -> str:
+    """프롬프트의 기사 목록에서 앞쪽 기사 몇 건을 선별한 것처럼 응답 생성"""
+    lines = []
+    for i, match in enumerate(_PROMPT_ITEM_RE.finditer(prompt), 1):
+        if i > count:
+            break
+        lines.append(f"{i}. {match.group(1)}\n   선별 이유: 모의 서버 응답\n   링크: {match.group(2)}\n")
+    return "\n".join(lines) or "선별된 뉴스 없음"
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="네이버 뉴스 API / OpenAI 모의 서버")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=int, default=50, help="네이버 응답 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=int, default=0, help="지연 편차 (±ms)")
+    parser.add_argument("--llm-latency-ms", type=int, default=800, help="chat completion 응답 지연 (ms)")
+    parser.add_argument("--llm-tail-rate", type=float, default=0.0, help="chat 응답이 느려질 확률 (0~1, hedging 확인용)")
+    parser.add_argument("--llm-tail-ms", type=int, default=3000, help="느린 chat 응답에 더할 지연 (ms)")
+    parser.add_argument("--rate-limit", type=float, default=10, help="네이버 초당 허용 요청 수 (0이면 무제한)")
+    parser.add_argument("--llm-rate-limit", type=float, default=0, help="chat 초당 허용 요청 수 (0이면 무제한)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 오류를 낼 확률 (0~1)")
+    parser.add_argument("--results-per-query", type=int, default=300, help="쿼리별 전체 기사 수")
+    parser.add_argument("--window-hours", type=int, default=48, help="기사 발행일 분포 범위 (시간)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--local-articles", action="store_true",
+                        help="originallink를 http로 내보내고 프록시 요청에 기사 페이지로 응답 (본문 수집 테스트용)")
+    parser.add_argument("--article-latency-ms", type=int, default=30, help="기사 페이지 응답 지연 (ms)")
+    return parser
+
+
+def start_server(argv=None, background: bool = False) -> ThreadingHTTPServer:
+    """
+    모의 서버 실행.
+
+    Args:
+        argv: 명령행 인자 목록 (build_arg_parser 참고)
+        background (bool): True면 데몬 스레드에서 실행하고 바로 반환 (부하 테스트 스크립트용)
+
+    Returns:
+        ThreadingHTTPServer: 실행 중인 서버 (server.server_address로 포트 확인)
+    """
+    args = build_arg_parser().parse_args(argv)
+    state = MockState(args)
+    server = ThreadingHTTPServer((args.host, args.port), build_handler(state))
+    server.daemon_threads = True
+    server.state = state
+
+    if background:
+        threading.Thread(target=server.serve_forever, daemon=True, name="mock-server").start()
+        return server
+
+    host, port = server.server_address[:2]
+    print(f"모의 서버 실행 중: http://{host}:{port}")
+    print(f"  NAVER_API_BASE_URL=http://{host}:{port}{NAVER_PATH}")
+    print(f"  OPENAI_BASE_URL=http://{host}:{port}/v1")
+    if args.local_articles:
+        print(f"  FULLTEXT_PROXY=http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return server
+
+
+if __name__ == "__main__":
+    start_server()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Model Routing
+-------------
+카테고리/후보 수에 따라 AI 선별에 사용할 GPT 모델을 고르고,
+저렴한 모델의 결과가 검증을 통과하지 못하면 더 강한 모델로 다시 요청(escalation)하는 모듈.
+모델별 호출 수, 지연 시간, 토큰, 비용을 프로세스 전역으로 집계한다.
+
+    route = route_model("삼일PwC", candidate_count=32)
+    route["model"], route["escalate_to"], route["reason"]
+"""
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from config import DEFAULT_GPT_MODEL, MODEL_ROUTING_SETTINGS
+
+
+def route_model(category_name: str, candidate_count: int, settings: Dict = MODEL_ROUTING_SETTINGS) -> Dict:
+    """
+    AI 선별에 사용할 모델 결정.
+
+    Args:
+        category_name (str): 카테고리 이름
+        candidate_count (int): AI에 보낼 후보 기사 수
+
+    Returns:
+        Dict: model(None이면 AI 호출 없이 후보 전체 선택), escalate_to(검증 실패 시 다시 요청할 모델 또는 None),
+              reason(선택 이유)
+    """
+    if candidate_count <= settings["skip_llm_max"]:
+        # 프롬프트가 최소 선별 수 이상을 요구하므로 후보가 그 이하면 AI 결과도 전체 선택과 같음
+        return {"model": None, "escalate_to": None, "reason": f"후보 {candidate_count}건 이하 - 전체 선택"}
+
+    strong = settings["strong_model"]
+    if category_name in settings["category_models"]:
+        model = settings["category_models"][category_name]
+        reason = "카테고리 지정 모델"
+    elif candidate_count <= settings["small_max_candidates"]:
+        model = settings["cheap_model"]
+        reason = f"후보 {candidate_count}건 (소규모)"
+    else:
+        model = settings["default_model"] or DEFAULT_GPT_MODEL
+        reason = "기본 모델"
+    return {"model": model, "escalate_to": strong if settings["escalate"] and model != strong else None,
+            "reason": reason}
+
+
+def validate_selection(parsed_result: Dict, candidates: Sequence[Dict],
+                       settings: Dict = MODEL_ROUTING_SETTINGS) -> List[str]:
+    """
+    선별 결과 검증 - 문제 목록 반환 (비어 있으면 통과).
+
+    - 선별 수가 min_selected(후보 수가 더 적으면 후보 수) 미만
+    - 후보 목록에 없는 링크를 선별 (AI가 링크를 지어냈거나 잘못 옮김)
+    """
+    problems = []
+    selected = parsed_result.get("selected_news", [])
+    required = min(settings["min_selected"], len(candidates))
+    if len(selected) < required:
+        problems.append(f"선별 {len(selected)}건 (최소 {required}건)")
+
+    if settings["require_resolvable_links"]:
+        candidate_urls = {url for news in candidates for url in (news.get("url"), news.get("originallink")) if url}
+        unresolved = [news for news in selected if news.get("url", "") not in candidate_urls]
+        if unresolved:
+            problems.append(f"확인할 수 없는 링크 {len(unresolved)}건")
+    return problems
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0,
+                  settings: Dict = MODEL_ROUTING_SETTINGS) -> Optional[float]:
+    """요청 비용 (USD, 가격 정보가 없는 모델은 None). 캐시된 입력 토큰은 cached_input 단가 적용"""
+    price = settings["pricing"].get(model)
+    if price is None:
+        return None
+    cached_price = price.get("cached_input", price["input"])
+    return ((prompt_tokens - cached_tokens) * price["input"] + cached_tokens * cached_price
+            + completion_tokens * price["output"]) / 1_000_000
+
+
+class ModelStats:
+    """
+    모델별 호출 지표 집계입니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._models: Dict[str, Dict] = {}
+        self.escalations = 0
+        self.skipped = 0
+
+    def record(self, model: str, latency_ms: float, prompt_tokens: Optional[int] = None,
+               completion_tokens: Optional[int] = None, cached_tokens: Optional[int] = None) -> None:
+        """chat completion 한 번 기록 (토큰 사용량을 받지 못했으면 None)"""
+        cost = None
+        cached_tokens = cached_tokens or 0
+        if prompt_tokens is not None and completion_tokens is not None:
+            cost = estimate_cost(model, prompt_tokens, completion_tokens, cached_tokens)
+        with self._lock:
+            entry = self._models.setdefault(model, {
+                "calls": 0, "latency_ms": 0.0, "max_latency_ms": 0.0,
+                "prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0, "unmetered": 0,
+            })
+            entry["calls"] += 1
+            entry["latency_ms"] += latency_ms
+            entry["max_latency_ms"] = max(entry["max_latency_ms"], latency_ms)
+            if cost is None:
+                entry["unmetered"] += 1
+            else:
+                entry["prompt_tokens"] += prompt_tokens
+                entry["cached_tokens"] += cached_tokens
+                entry["completion_tokens"] += completion_tokens
+                entry["cost_usd"] += cost
+
+    def record_escalation(self) -> None:
+        with self._lock:
+            self.escalations += 1
+
+    def record_skip(self) -> None:
+        with self._lock:
+            self.skipped += 1
+
+    def summary(self) -> List[Dict]:
+        """모델별 지표 (표시용 행 목록)"""
+        with self._lock:
+            return [
+                {
+                    "모델": model,
+                    "호출 수": entry["calls"],
+                    "평균 지연(ms)": round(entry["latency_ms"] / entry["calls"], 1),
+                    "최대 지연(ms)": round(entry["max_latency_ms"], 1),
+                    "입력 토큰": entry["prompt_tokens"],
+                    "캐시 토큰": entry["cached_tokens"],
+                    "출력 토큰": entry["completion_tokens"],
+                    "비용(USD)": round(entry["cost_usd"], 4),
+                    "평균 비용(USD)": round(entry["cost_usd"] / max(entry["calls"] - entry["unmetered"], 1), 5),
+                }
+                for model, entry in sorted(self._models.items())
+            ]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            prompt_tokens = sum(entry["prompt_tokens"] for entry in self._models.values())
+            cached_tokens = sum(entry["cached_tokens"] for entry in self._models.values())
+            return {
+                "calls": sum(entry["calls"] for entry in self._models.values()),
+                "prompt_tokens": prompt_tokens,
+                "cached_tokens": cached_tokens,
+                "cached_ratio": cached_tokens / prompt_tokens if prompt_tokens else 0.0,
+                "cost_usd": round(sum(entry["cost_usd"] for entry in self._models.values()), 4),
+                "escalations": self.escalations,
+                "skipped": self.skipped,
+            }
+
+
+model_stats = ModelStats()
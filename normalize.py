@@ -0,0 +1,121 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Naver Item Normalization
+------------------------
+네이버 검색 API 응답 항목을 페이지 단위로 한 번에 정규화하는 모듈.
+HTML 정리는 미리 컴파일한 정규식과 html.unescape로, 발행일은 페이지 전체를
+numpy datetime64 배열로 한 번에 변환하여 기간 필터와 날짜 문자열 생성을 벡터 연산으로 처리한다.
+"""
+
+import html
+import re
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import KST
+from press import resolve_press_batch
+from tracing import span
+
+# 네이버 API 발행일 형식 (RFC 822): "Wed, 15 Jan 2025 10:30:00 +0900"
+_RFC822_RE = re.compile(r"^\w{3}, (\d{2}) (\w{3}) (\d{4}) (\d{2}:\d{2}:\d{2}) ([+-])(\d{2})(\d{2})$")
+_MONTHS = {name: f"{i:02d}" for i, name in enumerate(
+    ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"], 1)}
+_KST_OFFSET = np.timedelta64(9 * 3600, "s")
+
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def clean_html_entities(text):
+    """HTML 태그 제거, 엔티티 디코딩, 연속 공백 정리"""
+    if not text:
+        return ""
+    if "<" in text:
+        text = _TAG_RE.sub("", text)
+    if "&" in text:
+        text = html.unescape(text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def to_utc64(dt: datetime, unit: str = "s") -> np.datetime64:
+    """tz-aware datetime을 UTC 기준 datetime64로 변환"""
+    return np.datetime64(dt.astimezone(timezone.utc).replace(tzinfo=None), unit)
+
+
+def parse_pub_dates(date_strings: Sequence[str], now: Optional[datetime] = None) -> np.ndarray:
+    """
+    발행일 문자열 목록을 한 번에 UTC 기준 datetime64[s] 배열로 변환.
+    형식이 다른 문자열은 개별 파싱하고, 비어 있거나 파싱에 실패하면 현재 시각을 사용한다.
+    """
+    now_iso = to_utc64(now or datetime.now(KST)).astype(str)
+
+    local_iso = []
+    offsets = np.zeros(len(date_strings), dtype="int64")
+    for i, date_str in enumerate(date_strings):
+        match = _RFC822_RE.match(date_str) if date_str else None
+        if match and match.group(2) in _MONTHS:
+            day, month, year, hms, sign, off_h, off_m = match.groups()
+            local_iso.append(f"{year}-{_MONTHS[month]}-{day}T{hms}")
+            offset = int(off_h) * 3600 + int(off_m) * 60
+            offsets[i] = offset if sign == "+" else -offset
+            continue
+
+        # 정해진 형식이 아닌 문자열만 개별 파싱 (드묾) - naive면 UTC로 가정
+        try:
+            parsed = parsedate_to_datetime(date_str)
+            if parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            local_iso.append(to_utc64(parsed).astype(str))
+        except (TypeError, ValueError):
+            local_iso.append(now_iso)
+
+    return np.array(local_iso, dtype="datetime64[s]") - offsets.astype("timedelta64[s]")
+
+
+def normalize_items(items: Sequence[Dict], start_dt: datetime, end_dt: datetime,
+                    keyword: str, now: Optional[datetime] = None) -> List[Dict]:
+    """
+    네이버 API 항목 한 페이지(또는 한 키워드 결과 전체)를 뉴스 딕셔너리로 정규화.
+    기간 밖의 항목은 제외한다.
+
+    Args:
+        items (Sequence[Dict]): 네이버 API 응답의 items
+        start_dt (datetime): 수집 시작 시각 (tz-aware)
+        end_dt (datetime): 수집 종료 시각 (tz-aware)
+        keyword (str): 검색 쿼리 ("삼일PWC OR 삼일회계법인" 형태)
+        now (Optional[datetime]): 발행일이 없는 항목에 쓸 시각 (기본값: 현재 시각)
+
+    Returns:
+        List[Dict]: title, url, originallink, date, summary, keyword, press를 포함한 뉴스 목록
+    """
+    if not items:
+        return []
+
+    with span("normalize.dates", "collect", items=len(items)):
+        pub_dates = parse_pub_dates([item.get("pubDate", "") for item in items], now=now)
+        # 경계는 마이크로초 단위로 비교 (초 단위로 자르면 경계 직전 기사가 포함됨)
+        in_range = (pub_dates >= to_utc64(start_dt, "us")) & (pub_dates <= to_utc64(end_dt, "us"))
+        selected = np.flatnonzero(in_range).tolist()
+        date_strs = np.datetime_as_string((pub_dates[selected] + _KST_OFFSET).astype("datetime64[D]")).tolist()
+
+    with span("normalize.press", "collect", items=len(selected)):
+        press_names = resolve_press_batch(items[i] for i in selected)
+
+    with span("normalize.html", "collect", items=len(selected)):
+        return [
+            {
+                "title": clean_html_entities(items[i].get("title", "")),
+                "url": items[i].get("link", ""),
+                "originallink": items[i].get("originallink", ""),
+                "date": date_str,
+                "summary": clean_html_entities(items[i].get("description", "")),
+                "keyword": keyword,
+                "press": press_name,
+            }
+            for i, date_str, press_name in zip(selected, date_strs, press_names)
+        ]
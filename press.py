@@ -0,0 +1,155 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Press Resolution
+----------------
+기사 URL에서 언론사명을 판별하는 모듈.
+매핑은 데이터 파일(press_map.json)에서 한 번만 읽어 불변 맵으로 보관하고,
+도메인 매칭은 라벨을 뒤집은 접미사 트라이로 수행한다 (가장 긴 접미사 우선).
+도메인별 결과는 LRU로 메모이즈한다.
+"""
+
+import json
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from config import PRESS_MAP_PATH
+
+UNKNOWN_PRESS = "언론사 정보 없음"
+NAVER_UNRESOLVED = "네이버 뉴스(원문 확인)"
+
+# 트라이 노드에서 언론사명을 저장하는 키 (도메인 라벨과 겹치지 않음)
+_TERMINAL = "\0"
+
+
+def load_press_maps(path: str = PRESS_MAP_PATH) -> Dict:
+    """언론사 매핑 데이터 파일 로드"""
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {
+        "naver_hosts": frozenset(data.get("naver_hosts", [])),
+        "oid": MappingProxyType(dict(data.get("oid", {}))),
+        "domains": MappingProxyType(dict(data.get("domains", {}))),
+    }
+
+
+def build_suffix_trie(domain_map: Mapping[str, str]) -> Dict:
+    """
+    도메인 → 언론사 매핑으로 역순 라벨 트라이 생성.
+    예: "it.chosun.com" → root["com"]["chosun"]["it"][_TERMINAL] = "IT조선"
+    """
+    root: Dict = {}
+    for domain, press in domain_map.items():
+        node = root
+        for label in reversed(domain.lower().split(".")):
+            node = node.setdefault(label, {})
+        node[_TERMINAL] = press
+    return root
+
+
+_MAPS = load_press_maps()
+NAVER_HOSTS = _MAPS["naver_hosts"]
+OID_MAP = _MAPS["oid"]
+PRESS_MAP = _MAPS["domains"]
+_SUFFIX_TRIE = build_suffix_trie(PRESS_MAP)
+
+
+def split_url(url: str) -> tuple:
+    """
+    urlparse 없이 URL을 (host, path_and_query)로 분리.
+    host는 소문자이며 사용자 정보와 포트는 제거한다.
+    """
+    scheme_end = url.find("://")
+    rest = url[scheme_end + 3:] if scheme_end != -1 else url
+
+    end = len(rest)
+    for sep in "/?#":
+        pos = rest.find(sep)
+        if pos != -1 and pos < end:
+            end = pos
+
+    host = rest[:end]
+    if "@" in host:
+        host = host.rsplit("@", 1)[1]
+    if ":" in host:
+        host = host.split(":", 1)[0]
+    return host.lower(), rest[end:]
+
+
+@lru_cache(maxsize=4096)
+def resolve_domain(host: str) -> str:
+    """
+    호스트명으로 언론사 판별 (도메인별 LRU 메모이즈).
+    라벨 경계 기준으로 가장 긴 접미사가 일치하는 언론사를 반환하고,
+    일치하는 항목이 없으면 www.을 제거한 도메인을 그대로 반환한다.
+    """
+    base = host[4:] if host.startswith("www.") else host
+
+    node = _SUFFIX_TRIE
+    press = None
+    for label in reversed(base.split(".")):
+        node = node.get(label)
+        if node is None:
+            break
+        press = node.get(_TERMINAL, press)
+
+    return press or base
+
+
+def _naver_oid(path: str) -> Optional[str]:
+    """네이버 기사 경로/쿼리에서 언론사 id(oid) 추출"""
+    # 예: /mnews/article/001/0012345678?sid=101
+    path_only = path.split("?", 1)[0].split("#", 1)[0]
+    parts = [p for p in path_only.split("/") if p]
+    if "article" in parts:
+        i = parts.index("article")
+        if i + 1 < len(parts):
+            return parts[i + 1]
+
+    # 예: /main/read.naver?mode=LSD&oid=001&aid=0012345678
+    if "?" in path:
+        for pair in path.split("?", 1)[1].split("&"):
+            name, _, value = pair.partition("=")
+            if name == "oid" and value:
+                return value
+    return None
+
+
+def resolve_press(url: str, originallink: Optional[str] = None) -> str:
+    """
+    URL에서 언론사 정보를 추출.
+    - originallink가 있으면 우선 사용 (네이버 뉴스 원문 복원)
+    - 네이버 뉴스 링크는 oid로 판별
+    - 도메인 접미사 매칭, 실패 시 베이스 도메인 반환
+    """
+    target_url = originallink or url
+    if not target_url:
+        return UNKNOWN_PRESS
+
+    try:
+        host, path = split_url(target_url)
+        base = host[4:] if host.startswith("www.") else host
+
+        if base in NAVER_HOSTS:
+            # oid로 못 찾았으면 네이버 링크에선 명확히 단정하지 않음
+            oid = _naver_oid(path)
+            return OID_MAP.get(oid, NAVER_UNRESOLVED) if oid else NAVER_UNRESOLVED
+
+        return resolve_domain(host) or UNKNOWN_PRESS
+    except Exception:
+        return UNKNOWN_PRESS
+
+
+def resolve_press_batch(items: Iterable[Dict]) -> List[str]:
+    """
+    네이버 검색 API 항목(link/originallink 포함) 목록의 언론사를 한 번에 판별.
+
+    Args:
+        items (Iterable[Dict]): 네이버 API 응답의 items
+
+    Returns:
+        List[str]: 항목 순서대로의 언론사명
+    """
+    return [resolve_press(item.get("link", ""), item.get("originallink")) for item in items]
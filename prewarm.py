@@ -0,0 +1,194 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache Pre-warming
+-----------------
+화면의 기본 분석 기간(어제 10시 ~ 오늘 10시, 한국 시간)의 수집/AI 선별을 분석가들이 실행하기 전에
+예약 실행하여 공유 캐시(cache.news_cache, cache.llm_cache)와 임베딩/본문 디스크 캐시를 채우는 모듈.
+
+- 기준 시각 전 실행(기본 09:50): 기간을 실행 시각까지로 잘라 수집·선별한다. 임베딩/본문 캐시가 채워지고,
+  기준 시각까지 새 기사가 없는 카테고리는 후보 목록이 같으므로 AI 선별 결과가 그대로 재사용된다.
+- 기준 시각 실행(기본 10:01): 기본 기간 그대로 수집·선별한다. 화면 기본값으로 실행하면 수집과 AI 선별
+  모두 캐시에서 바로 결과를 받는다 (끝난 기간의 수집 결과는 CACHE_SETTINGS["closed_window_ttl_seconds"] 동안 보관).
+
+실행은 submit(params) 함수로 백그라운드 작업(jobs.JobRunner)에 제출하므로, 같은 조건의 백그라운드 실행과
+작업을 공유하고 진행 상황도 작업 테이블에서 볼 수 있다.
+
+    get_prewarmer().start(lambda params: get_job_runner().submit(params, run_analysis_job))
+"""
+
+import threading
+import time
+from collections import deque
+from datetime import datetime, time as dt_time, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import KEYWORD_CATEGORIES, EMBEDDING_SETTINGS, FULLTEXT_SETTINGS, PREWARM_SETTINGS, KST
+
+# 예약 시각까지 한 번에 기다리는 최대 시간 (시스템 시계 변경에 대비해 나눠서 기다림)
+_MAX_SLEEP_SECONDS = 60
+
+
+def parse_clock(value: str) -> dt_time:
+    """"HH:MM" 문자열을 시각으로 변환"""
+    hour, minute = value.split(":")
+    return dt_time(int(hour), int(minute))
+
+
+def default_window(now: Optional[datetime] = None) -> Tuple[datetime, datetime]:
+    """화면의 기본 분석 기간 (어제 기준 시각 ~ 오늘 기준 시각, 한국 시간)"""
+    now = now or datetime.now(KST)
+    end_dt = datetime.combine(now.date(), parse_clock(PREWARM_SETTINGS["window_time"])).replace(tzinfo=KST)
+    return end_dt - timedelta(days=1), end_dt
+
+
+def prewarm_params(now: datetime, categories: Optional[List[str]] = None, analyze: bool = True) -> Dict:
+    """
+    미리 채우기 작업 파라미터 - 화면 기본값으로 백그라운드 실행할 때와 같은 형태 (같은 작업/캐시 키).
+
+    Args:
+        now (datetime): 실행 시각 (기준 시각 전이면 기간 끝을 이 시각(분 단위)까지로 자름)
+        categories (Optional[List[str]]): 카테고리 (없으면 화면 기본값인 전체 카테고리)
+        analyze (bool): False면 수집만 (collect_only)
+
+    Returns:
+        Dict: categories, start_dt, end_dt, dedupe, fulltext (+ collect_only)
+    """
+    start_dt, end_dt = default_window(now)
+    end_dt = min(end_dt, now.replace(second=0, microsecond=0))
+    params = {
+        "categories": list(categories or KEYWORD_CATEGORIES),
+        "start_dt": start_dt.isoformat(),
+        "end_dt": end_dt.isoformat(),
+        "dedupe": EMBEDDING_SETTINGS["enabled"],
+        "fulltext": FULLTEXT_SETTINGS["enabled"]
+    }
+    if not analyze:
+        params["collect_only"] = True
+    return params
+
+
+class Prewarmer:
+    """
+    예약 시각마다 미리 채우기 작업을 제출하는 백그라운드 스레드입니다.
+    """
+
+    def __init__(self, settings: Dict = PREWARM_SETTINGS):
+        """
+        Args:
+            settings (Dict): PREWARM_SETTINGS 형태의 설정
+        """
+        self.enabled = settings["enabled"]
+        self.times = sorted(parse_clock(value) for value in settings["times"])
+        self.weekdays = set(settings["weekdays"])
+        self.categories = settings["categories"]
+        self.analyze = settings["analyze"]
+
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._submit: Optional[Callable[[Dict], str]] = None
+        self._runs: deque = deque(maxlen=settings["history"])
+
+    def start(self, submit: Callable[[Dict], str]) -> bool:
+        """
+        예약 스레드 시작 (프로세스당 한 번, 이후 호출은 submit 함수만 갱신).
+
+        Args:
+            submit (Callable[[Dict], str]): 작업 파라미터를 받아 백그라운드 작업 ID를 반환하는 함수
+
+        Returns:
+            bool: 이번 호출로 스레드를 시작했으면 True
+        """
+        with self._lock:
+            self._submit = submit
+            if not self.enabled or self._thread is not None:
+                return False
+            self._thread = threading.Thread(target=self._loop, name="news-prewarm", daemon=True)
+            self._thread.start()
+            return True
+
+    def next_run(self, now: Optional[datetime] = None) -> Optional[datetime]:
+        """다음 예약 시각 (실행 요일이 없으면 None)"""
+        now = now or datetime.now(KST)
+        for days in range(8):
+            day = now.date() + timedelta(days=days)
+            if day.weekday() not in self.weekdays:
+                continue
+            for at in self.times:
+                slot = datetime.combine(day, at).replace(tzinfo=KST)
+                if slot > now:
+                    return slot
+        return None
+
+    def _loop(self) -> None:
+        """예약 시각까지 기다렸다가 작업 제출 (반복)"""
+        while True:
+            slot = self.next_run()
+            if slot is None:
+                return
+            remaining = (slot - datetime.now(KST)).total_seconds()
+            while remaining > 0:
+                time.sleep(min(remaining, _MAX_SLEEP_SECONDS))
+                remaining = (slot - datetime.now(KST)).total_seconds()
+            self.run_now(slot)
+
+    def run_now(self, slot: Optional[datetime] = None) -> Optional[str]:
+        """
+        미리 채우기 작업을 지금 제출합니다 (slot이 없으면 수동 실행).
+
+        Returns:
+            Optional[str]: 작업 ID (제출하지 못했으면 None)
+        """
+        now = datetime.now(KST)
+        params = prewarm_params(now, self.categories, self.analyze)
+        run = {
+            "slot": slot.strftime("%H:%M") if slot else None,
+            "submitted_at": now,
+            "params": params,
+            "job_id": None,
+            "error": ""
+        }
+        try:
+            if self._submit is None:
+                raise RuntimeError("작업 제출 함수가 없습니다 (start()를 먼저 호출)")
+            run["job_id"] = self._submit(params)
+        except Exception as e:
+            run["error"] = str(e)
+            print(f"캐시 미리 채우기 작업 제출 실패: {str(e)}")
+
+        with self._lock:
+            self._runs.appendleft(run)
+        return run["job_id"]
+
+    def status(self) -> Dict:
+        """
+        예약 상태.
+
+        Returns:
+            Dict: enabled, running(스레드 동작 여부), times, next_run, runs(최근 실행, 최신순 -
+                  slot(None이면 수동), submitted_at, params, job_id, error)
+        """
+        with self._lock:
+            running = self._thread is not None and self._thread.is_alive()
+            runs = list(self._runs)
+        return {
+            "enabled": self.enabled,
+            "running": running,
+            "times": [at.strftime("%H:%M") for at in self.times],
+            "next_run": self.next_run() if self.enabled else None,
+            "runs": runs
+        }
+
+
+_prewarmer: Optional[Prewarmer] = None
+_prewarmer_lock = threading.Lock()
+
+
+def get_prewarmer() -> Prewarmer:
+    """프로세스 전역 Prewarmer (모든 Streamlit 세션이 공유)"""
+    global _prewarmer
+    with _prewarmer_lock:
+        if _prewarmer is None:
+            _prewarmer = Prewarmer()
+        return _prewarmer
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Prompt Assembly
+---------------
+AI 뉴스 선별 프롬프트 조립 모듈.
+OpenAI 자동 프롬프트 캐싱은 요청 앞부분(prefix)이 이전 요청과 바이트 단위로 같아야 적용되므로,
+버전이 붙은 고정 시스템 프롬프트 → 카테고리 지침(실행마다 동일) → 기사 목록(매번 달라짐) 순서로 조립한다.
+
+- 시스템 프롬프트(공통 규칙, 응답 형식)는 모든 카테고리가 공유
+- 일반 지침은 삼일PwC/경쟁사를 제외한 모든 카테고리가 공유 (카테고리 이름은 기사 목록 쪽에 둠)
+- 캐싱은 같은 prefix가 1024토큰 이상일 때만 적용되므로, 짧은 삼일PwC/경쟁사 지침은 일반 지침에 합치지 않음
+- 고정 부분의 문구를 바꾸면 PROMPT_VERSION을 올려 결과 캐시도 함께 무효화한다
+
+    messages = build_messages("삼일PwC", news_list)
+"""
+
+from typing import Dict, List, Sequence
+
+from fulltext import body_excerpt
+
+PROMPT_VERSION = "2026.10-1"
+
+SYSTEM_PROMPT = f"""[뉴스 선별 지침 {PROMPT_VERSION}]
+당신은 회계법인 관점에서 뉴스를 분석하는 전문가입니다.
+사용자가 카테고리별 선별 기준과 함께 후보 기사 목록을 주면, 기준에 맞는 중요한 뉴스를 선별합니다.
+
+[공통 규칙]
+- 무조건 2개 이상의 뉴스를 반드시 선별해야 합니다. 2개 미만으로 선별하면 안 됩니다.
+- 같은 이슈는 반드시 1건만 남깁니다. 제목의 중복뿐 아니라 내용의 유사도가 너무 높은 것도 중복으로 간주합니다.
+- 다만 핵심 사건이나 시점이 다르면 별개 이슈로 인정합니다.
+- 언론사명은 정확하게 표기하고, 선별 이유는 간단명료하게 작성합니다.
+- 링크는 후보 기사 목록에 적힌 링크를 그대로 옮겨 적습니다.
+
+[응답 형식]
+선별된 뉴스를 다음과 같이 번호를 붙여 나열하세요:
+
+1. [뉴스 제목]
+   선별 이유: [간단한 선별 이유]
+   링크: [뉴스 URL]
+
+2. [뉴스 제목]
+   선별 이유: [간단한 선별 이유]
+   링크: [뉴스 URL]
+
+...
+"""
+
+SAMIL_INSTRUCTIONS = """[선별 기준: 삼일PwC]
+삼일PwC 관련 뉴스를 분석하여 중요한 뉴스를 선별하세요.
+
+- 삼일회계법인과 관련이 높은 것을 우선순위로 선별합니다.
+- 중복이 있는 경우 1건만 선택합니다.
+"""
+
+COMPETITOR_INSTRUCTIONS = """[선별 기준: 경쟁사]
+경쟁 회계법인(삼정KPMG, 한영EY, 딜로이트안진 등) 관련 뉴스를 분석하여 중요한 뉴스만 선별하세요.
+
+[우선순위]
+- 경쟁사 회계법인이 기사 주제일 때
+- 경쟁사가 핵심 역할(자문·감정·보고서·매각주관 등)을 맡았을 때
+- 경쟁사 보고서·코멘트·발표가 기사 논거의 중심일 때
+- 경쟁사 자체 발표·행사·보도자료
+
+[제외(N)]
+- 스포츠 기사
+- 광고성/스폰서 기사
+- 시스템 오류/버그/장애 관련 단순 보도
+- 목표주가/증권사 리포트 기사
+- 외국어 기사
+
+**중요**
+- 가능하면 3개까지 선별하되, 같은 이슈 중복은 금지
+- 기사 내용도 중복되면 안 됨
+"""
+
+GENERAL_INSTRUCTIONS = """[선별 기준: 일반 카테고리]
+후보 기사는 유효언론사 기사만 포함되어 있습니다.
+
+[선별 기준]
+- 재무/실적 정보 (매출, 영업이익, 순이익, 투자계획)
+- 회계/감사 관련 (회계처리 변경, 감사의견, 회계법인 소식)
+- 비즈니스 중요도 (신규사업, M&A, 조직변화, 경영진 인사)
+- 산업 동향 (정책, 규제, 시장 변화)
+
+다음 조건 중 하나라도 해당하는 뉴스는 제외하세요:
+
+1. 경기 관련 내용
+   - 스포츠단 관련 내용
+   - 키워드: 야구단, 축구단, 구단, KBO, 프로야구, 감독, 선수
+
+2. 신제품 홍보, 사회공헌, ESG, 기부 등
+   - 키워드: 출시, 기부, 환경 캠페인, 브랜드 홍보, 사회공헌, 나눔, 캠페인 진행, 소비자 반응
+
+3. 단순 시스템 장애, 버그, 서비스 오류
+   - 키워드: 일시 중단, 접속 오류, 서비스 오류, 버그, 점검 중, 업데이트 실패
+
+4. 기술 성능, 품질, 테스트 관련 보도
+   - 키워드: 우수성 입증, 기술력 인정, 성능 비교, 품질 테스트, 기술 성과
+
+5. 목표가 관련 보도
+   - 키워드: 목표가, 목표주가 달성, 목표주가 도달, 목표주가 향상, 목표가↑, 목표가
+
+6. 학생 정책 관련한 기사
+7. 교육 정책 관련한 기사
+8. 단순 워크숍 관련한 기사
+9. 단순 세미나 관련한 기사
+
+다음 기준에 해당하는 뉴스가 있다면 반드시 선택해야 합니다:
+
+1. 재무/실적 관련 정보 (최우선 순위)
+   - 매출, 영업이익, 순이익 등 실적 발표
+   - 재무제표 관련 정보
+   - 배당 정책 변경
+
+2. 회계/감사 관련 정보 (최우선 순위)
+   - 회계처리 방식 변경
+   - 감사의견 관련 내용
+   - 내부회계관리제도
+   - 회계 감리 결과
+
+3. 구조적 기업가치 변동 정보 (높은 우선순위)
+    - 신규사업/투자/계약에 대한 내용
+    - 대외 전략(정부 정책, 글로벌 파트너, 지정학 리스크 등)
+    - 기업의 새로운 사업전략 및 방향성, 신사업 등
+    - 기업의 전략 방향성에 영향을 미칠 수 있는 정보
+    - 기존 수입모델/사업구조/고객구조 변화
+    - 공급망/수요망 등 valuechain 관련 내용 (예: 대형 생산지 이전, 주력 사업군 정리 등)
+
+4. 기업구조 변경 정보 (높은 우선순위)
+   - 인수합병(M&A)
+   - 자회사 설립/매각
+   - 지분 변동
+   - 조직 개편
+
+**언론사 우선순위**
+다음 순서로 우선선별하세요:
+1. 대형 언론사: 조선일보 > 중앙일보 > 동아일보 > 한국경제 > 매일경제 > 연합뉴스
+2. 전문 경제지: 이데일리 > 아시아경제 > 뉴스핌 > 뉴시스 > 헤럴드경제 > 더벨 > 비즈니스포스트 > 머니투데이
+3. 기타 언론사: KBS > 경향신문 > 노컷뉴스 > 데일리안 > 뉴스1 > 매경이코노미
+
+**중복 제거 기준**
+다음 기준으로 중복 기사를 제거하세요:
+
+1. **동일 이슈 중복 보도**
+   - 같은 사건/이슈에 대한 여러 언론사 보도 중 가장 상세하고 신뢰할 수 있는 기사만 선택
+   - 우선순위: 조선일보 > 중앙일보 > 동아일보 > 한국경제 > 매일경제 > 연합뉴스 등 대형·원문 보도 매체
+
+2. **기사 품질 기준**
+   - 더 자세한 정보를 포함한 기사 우선
+   - 주요 인용문이나 전문가 의견이 포함된 기사 우선
+   - 단순 보도보다 분석적 내용이 포함된 기사 우선
+
+3. **시간 순서**
+   - 최초 보도나 가장 최신 정보를 담은 기사 우선
+
+4. **제목 유사성 판단**
+   - 제목이 거의 동일하거나 핵심 내용이 같은 경우 중복으로 간주
+   - 예: "삼성전자 실적 발표" vs "삼성전자, 2024년 실적 공개" → 중복
+   - 예: "삼성전자 실적 발표" vs "삼성전자 신규 사업 진출" → 중복 아님
+
+**중요**
+- 가능하면 5개까지 선별하되, 최소 2개는 반드시 선별하세요.
+- 선별된 뉴스에 중복이 없어야 하며, 내용도 반드시 중복되면 안 됩니다.
+"""
+
+CATEGORY_INSTRUCTIONS = {
+    "삼일PwC": SAMIL_INSTRUCTIONS,
+    "경쟁사": COMPETITOR_INSTRUCTIONS,
+}
+
+
+def category_instructions(category_name: str) -> str:
+    """카테고리의 고정 선별 지침 (전용 지침이 없으면 일반 지침)"""
+    return CATEGORY_INSTRUCTIONS.get(category_name, GENERAL_INSTRUCTIONS)
+
+
+def format_articles(category_name: str, news_list: Sequence[Dict]) -> str:
+    """요청마다 달라지는 부분 - 카테고리 이름과 후보 기사 목록"""
+    lines = [f"[분석 대상]\n카테고리: {category_name}\n후보 기사: {len(news_list)}건\n"]
+    for i, news in enumerate(news_list, 1):
+        lines.append(f"{i}. 제목: {news.get('title', '제목 없음')}")
+        lines.append(f"   요약: {news.get('summary', '요약 없음')}")
+        if news.get('body'):
+            lines.append(f"   본문: {body_excerpt(news)}")
+        lines.append(f"   링크: {news.get('url', '링크 없음')}")
+        lines.append(f"   언론사: {news.get('press', '언론사 정보 없음')}")
+        lines.append(f"   날짜: {news.get('date', '날짜 없음')}")
+        lines.append(f"   검색키워드: {news.get('keyword', '키워드 없음')}\n")
+    return "\n".join(lines)
+
+
+def build_messages(category_name: str, news_list: Sequence[Dict]) -> List[Dict]:
+    """
+    AI 선별 요청 메시지 조립.
+
+    Args:
+        category_name (str): 카테고리 이름
+        news_list (Sequence[Dict]): 후보 기사 목록
+
+    Returns:
+        List[Dict]: chat completion messages (고정 부분이 앞, 기사 목록이 맨 뒤)
+    """
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": category_instructions(category_name) + "\n" + format_articles(category_name, news_list)},
+    ]
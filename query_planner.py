@@ -0,0 +1,497 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Naver Query Planner
+-------------------
+카테고리 키워드를 네이버 검색 쿼리 목록으로 바꾸는 모듈.
+키워드를 정규화해 중복을 없애고, 더 넓은 키워드에 포함되는 키워드는 뺀 뒤,
+지난 실행에서 기록한 키워드별 결과 수를 보고 한 쿼리의 결과 상한을 넘지 않는 만큼
+"A OR B OR C" 형태로 묶어 API 호출 수를 줄인다.
+여러 카테고리를 함께 수집할 때는 plan_run / RunQueryFetcher로 카테고리 사이에 겹치는 검색도 한 번만 한다.
+
+    plan = plan_queries(KEYWORD_CATEGORIES["금융"], "금융", start_dt, end_dt, capacity=100)
+    for query in plan["queries"]:
+        ...query["query"], query["terms"], query["expected"]
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+import unicodedata
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from config import QUERY_PLANNER_SETTINGS
+
+_SECONDS_PER_DAY = 86400
+
+
+def _fold(term: str) -> str:
+    return term.casefold()
+
+
+def normalize_keywords(keywords: Sequence[str]) -> List[str]:
+    """
+    키워드 정규화 (유니코드 NFKC, 공백 정리) 후 대소문자 무시 중복 제거 - 처음 나온 표기를 유지.
+    """
+    seen = set()
+    normalized = []
+    for keyword in keywords:
+        term = " ".join(unicodedata.normalize("NFKC", keyword).split())
+        if term and _fold(term) not in seen:
+            seen.add(_fold(term))
+            normalized.append(term)
+    return normalized
+
+
+def window_days(start_dt: datetime, end_dt: datetime) -> float:
+    """수집 기간 (일, 최소 1시간)"""
+    return max((end_dt - start_dt).total_seconds() / _SECONDS_PER_DAY, 1 / 24)
+
+
+class QueryStats:
+    """
+    키워드별 과거 검색 결과 수 기록입니다.
+    rate(하루당 기간 내 기사 수, 지수이동평균)와 saturated(마지막 검색이 결과 상한에 걸렸는지)를 저장한다.
+    """
+
+    def __init__(self, path: Optional[str]):
+        """
+        Args:
+            path (Optional[str]): JSON 저장 경로 (None이면 메모리에만 기록)
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._terms: Dict[str, Dict] = {}
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self._terms = json.load(f)
+            except (OSError, ValueError):
+                self._terms = {}
+
+    def get(self, term: str) -> Optional[Dict]:
+        with self._lock:
+            entry = self._terms.get(_fold(term))
+            return dict(entry) if entry else None
+
+    def expected(self, term: str, days: float, capacity: int, unknown_share: float) -> float:
+        """기간 내 예상 결과 수 (상한에 걸린 적이 있으면 capacity, 기록이 없으면 capacity * unknown_share)"""
+        entry = self.get(term)
+        if entry is None:
+            return capacity * unknown_share
+        if entry["saturated"]:
+            return float(capacity)
+        return entry["rate"] * days
+
+    def record(self, query: Dict, raw_count: int, oldest_pub_date: str, news_list: Iterable[Dict],
+               start_dt: datetime, end_dt: datetime, capacity: int) -> None:
+        """
+        쿼리 하나의 검색 결과를 키워드별로 기록.
+
+        Args:
+            query (Dict): plan_queries의 쿼리 항목
+            raw_count (int): API 원본 항목 수
+            oldest_pub_date (str): 마지막(가장 오래된) 원본 항목의 pubDate
+            news_list (Iterable[Dict]): 기간 필터를 거친 정규화 뉴스
+            capacity (int): 쿼리당 결과 상한
+        """
+        saturated = raw_count >= capacity and _oldest_after(oldest_pub_date, start_dt)
+        days = window_days(start_dt, end_dt)
+        texts = [_fold(news.get("title", "") + " " + news.get("summary", "")) for news in news_list]
+        alpha = QUERY_PLANNER_SETTINGS["ewma_alpha"]
+
+        with self._lock:
+            for term in query["terms"]:
+                key = _fold(term)
+                # 여러 키워드를 묶은 쿼리는 제목/요약에 키워드가 포함된 기사 수로 나눠 집계
+                hits = len(texts) if len(query["terms"]) == 1 else sum(1 for text in texts if key in text)
+                rate = hits / days
+                previous = self._terms.get(key)
+                if previous and not previous["saturated"] and not saturated:
+                    rate = alpha * rate + (1 - alpha) * previous["rate"]
+                self._terms[key] = {"rate": round(rate, 3), "saturated": saturated, "updated": time.time()}
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        with self._lock:
+            data = json.dumps(self._terms, ensure_ascii=False).encode("utf-8")
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(self.path), prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+def _oldest_after(oldest_pub_date: str, start_dt: datetime) -> bool:
+    """가장 오래된 결과가 아직 수집 시작 시각 이후인지 (그렇다면 상한 때문에 기간 내 기사가 잘렸을 수 있음)"""
+    try:
+        return parsedate_to_datetime(oldest_pub_date) >= start_dt
+    except (TypeError, ValueError, IndexError):
+        return True
+
+
+_stats: Optional[QueryStats] = None
+_stats_lock = threading.Lock()
+
+
+def get_query_stats() -> QueryStats:
+    """프로세스 전역 키워드 결과 수 기록"""
+    global _stats
+    with _stats_lock:
+        if _stats is None:
+            _stats = QueryStats(QUERY_PLANNER_SETTINGS["stats_path"])
+        return _stats
+
+
+def reset_query_stats() -> None:
+    """전역 기록 초기화 - 다음 get_query_stats()가 stats_path에서 새로 읽는다 (stats_path가 None이면 빈 기록)"""
+    global _stats
+    with _stats_lock:
+        _stats = None
+
+
+def _setting_for(table: Dict, category_name: str):
+    return table.get(category_name, table["default"])
+
+
+def _split_covered(terms: Sequence[str], stats: QueryStats, days: float, capacity: int):
+    """
+    넓은 키워드(부분 문자열)의 결과에 이미 포함되는 키워드 분리.
+    넓은 키워드의 이번 기간 예상 결과 수가 상한 안에 들어올 때만 뺀다 (넘으면 좁은 키워드 결과가 잘릴 수 있음).
+
+    Returns:
+        (남은 키워드, 뺀 키워드 [{term, covered_by}], 포함되지만 유지한 키워드 [{term, broader}])
+    """
+    dropped, kept, remaining = [], [], []
+    for term in terms:
+        broader = [other for other in terms if other != term and _fold(other) in _fold(term)]
+        if not broader:
+            remaining.append(term)
+            continue
+        covering = next((other for other in broader if _covers(stats, other, days, capacity)), None)
+        if covering:
+            dropped.append({"term": term, "covered_by": covering})
+        else:
+            kept.append({"term": term, "broader": broader[0]})
+            remaining.append(term)
+    return remaining, dropped, kept
+
+
+def _covers(stats: QueryStats, term: str, days: float, capacity: int) -> bool:
+    """
+    키워드 결과가 이번 기간에도 상한에 걸리지 않을지 (포함되는 키워드를 따로 검색하지 않아도 되는지).
+    기록이 있고, 이번 기간의 예상 결과 수가 capacity * fill_ratio 이하일 때만 True
+    (지난 검색이 상한에 걸리지 않았어도 이번 기간이 더 길면 잘릴 수 있음).
+    """
+    if stats.get(term) is None:
+        return False
+    return stats.expected(term, days, capacity, 1.0) <= capacity * QUERY_PLANNER_SETTINGS["fill_ratio"]
+
+
+def _pack(terms: Sequence[str], expected: Dict[str, float], budget: float, max_terms: int) -> List[Dict]:
+    """
+    예상 결과 수가 큰 키워드부터 budget을 넘지 않는 첫 쿼리에 배정 (first-fit decreasing).
+    결과는 terms 순서대로 정렬된 쿼리 목록.
+    """
+    bins: List[Dict] = []
+    for term in sorted(terms, key=lambda t: -expected[t]):
+        target = next((b for b in bins
+                       if len(b["terms"]) < max_terms and b["expected"] + expected[term] <= budget), None)
+        if target is None:
+            target = {"terms": [], "expected": 0.0}
+            bins.append(target)
+        target["terms"].append(term)
+        target["expected"] += expected[term]
+
+    # 원래 키워드 순서대로 정렬 (화면 표시/결과 순서 유지)
+    order = {term: i for i, term in enumerate(terms)}
+    for b in bins:
+        b["terms"].sort(key=order.get)
+    bins.sort(key=lambda b: order[b["terms"][0]])
+    return [{"query": " OR ".join(b["terms"]), "terms": b["terms"], "expected": round(b["expected"], 1)}
+            for b in bins]
+
+
+def plan_queries(keywords: Sequence[str], category_name: str, start_dt: datetime, end_dt: datetime,
+                 capacity: int, stats: Optional[QueryStats] = None) -> Dict:
+    """
+    카테고리 하나의 검색 계획 수립.
+
+    Args:
+        keywords (Sequence[str]): 카테고리 키워드 (config.KEYWORD_CATEGORIES)
+        category_name (str): 카테고리 이름 (카테고리별 설정 선택)
+        start_dt, end_dt (datetime): 수집 기간
+        capacity (int): 쿼리 하나에서 가져올 최대 결과 수
+        stats (Optional[QueryStats]): 과거 결과 수 기록 (기본값: get_query_stats())
+
+    Returns:
+        Dict: queries(query, terms, expected 목록), dropped(포함 관계로 뺀 키워드와 포함하는 키워드),
+              kept(포함되지만 넓은 키워드가 이번 기간에 상한을 넘을 것으로 보이거나 기록이 없어 유지한 키워드), keywords(원래 키워드 수)
+    """
+    stats = stats or get_query_stats()
+    days = window_days(start_dt, end_dt)
+    unknown_share = _setting_for(QUERY_PLANNER_SETTINGS["unknown_share"], category_name)
+    max_terms = _setting_for(QUERY_PLANNER_SETTINGS["max_terms"], category_name)
+
+    remaining, dropped, kept = _split_covered(normalize_keywords(keywords), stats, days, capacity)
+    expected = {term: stats.expected(term, days, capacity, unknown_share) for term in remaining}
+    queries = _pack(remaining, expected, capacity * QUERY_PLANNER_SETTINGS["fill_ratio"], max_terms)
+    return {"queries": queries, "dropped": dropped, "kept": kept, "keywords": len(keywords)}
+
+
+def plan_run(categories: Dict[str, Sequence[str]], start_dt: datetime, end_dt: datetime,
+             capacity: int, stats: Optional[QueryStats] = None) -> Dict:
+    """
+    여러 카테고리를 한 번에 수집할 때의 검색 계획 - 카테고리 사이에 겹치는 검색을 한 번만 하도록 수립.
+
+    - 여러 카테고리에 있는 같은 키워드는 같은 쿼리로 묶어 한 번만 검색하고 결과를 모든 카테고리에 나눠준다.
+    - 다른 카테고리의 넓은 키워드에 포함되는 키워드(예: 삼일회계법인 ⊂ 회계법인)는 넓은 키워드의
+      이번 기간 예상 결과 수가 상한 안에 들어오면 따로 검색하지 않고, 그 결과 중 해당 키워드가 들어간 기사만 가져온다.
+
+    Args:
+        categories (Dict[str, Sequence[str]]): 카테고리 이름 → 키워드 목록 (수집 순서대로)
+
+    Returns:
+        Dict:
+            queries: 실제로 검색할 쿼리 목록 (query, terms, expected,
+                     categories(결과 전체를 받는 카테고리), borrowed(카테고리 → 결과에서 골라 가져갈 키워드))
+            categories: 카테고리 → queries(사용할 쿼리 번호), dropped, kept, borrowed([{term, from}]), keywords,
+                        category_queries(따로 수집했을 때의 쿼리 수)
+            category_queries: 카테고리마다 따로 수집했을 때의 쿼리 수 (plan_queries 기준)
+    """
+    stats = stats or get_query_stats()
+    days = window_days(start_dt, end_dt)
+    budget = capacity * QUERY_PLANNER_SETTINGS["fill_ratio"]
+
+    # 1) 카테고리 안의 중복/포함 관계 정리
+    category_plans = {}
+    owners: Dict[str, Dict] = {}  # 정규화 키워드 → 표시 표기, 소유 카테고리
+    for category, keywords in categories.items():
+        remaining, dropped, kept = _split_covered(normalize_keywords(keywords), stats, days, capacity)
+        category_plans[category] = {"queries": [], "dropped": dropped, "kept": kept, "borrowed": [],
+                                    "keywords": len(keywords)}
+        for term in remaining:
+            owner = owners.setdefault(_fold(term), {"term": term, "categories": [], "order": len(owners)})
+            owner["categories"].append(category)
+
+    # 2) 다른 카테고리의 넓은 키워드 결과에서 가져올 수 있는 키워드 (짧은 키워드부터 결정)
+    fetched: Dict[str, Dict] = {}
+    borrowed: Dict[str, List] = {}  # 넓은 키워드 → [(카테고리, 좁은 키워드)]
+    for key in sorted(owners, key=len):
+        owner = owners[key]
+        sources = [other for other in fetched if other in key and _covers(stats, fetched[other]["term"], days, capacity)]
+        for category in list(owner["categories"]):
+            source = next((other for other in sources if category not in fetched[other]["categories"]), None)
+            if source:
+                owner["categories"].remove(category)
+                borrowed.setdefault(source, []).append((category, owner["term"]))
+                category_plans[category]["borrowed"].append({"term": owner["term"], "from": fetched[source]["term"]})
+        if owner["categories"]:
+            fetched[key] = owner
+
+    # 3) 같은 카테고리 조합의 키워드끼리 묶기 (쿼리 결과를 받는 카테고리가 모두 같도록)
+    groups: Dict[tuple, List[str]] = {}
+    for key, owner in fetched.items():
+        groups.setdefault(tuple(owner["categories"]), []).append(key)
+
+    queries = []
+    order = list(categories)
+    for group in sorted(groups, key=lambda g: (order.index(g[0]), len(g))):
+        terms = [fetched[key]["term"] for key in sorted(groups[group], key=lambda k: fetched[k]["order"])]
+        # 여러 카테고리가 공유하는 쿼리는 가장 보수적인 설정 사용
+        unknown_share = max(_setting_for(QUERY_PLANNER_SETTINGS["unknown_share"], c) for c in group)
+        max_terms = min(_setting_for(QUERY_PLANNER_SETTINGS["max_terms"], c) for c in group)
+        expected = {term: stats.expected(term, days, capacity, unknown_share) for term in terms}
+        for query in _pack(terms, expected, budget, max_terms):
+            query["categories"] = list(group)
+            query["borrowed"] = {}
+            for term in query["terms"]:
+                for category, narrow in borrowed.get(_fold(term), []):
+                    query["borrowed"].setdefault(category, []).append(narrow)
+            for category in {*query["categories"], *query["borrowed"]}:
+                category_plans[category]["queries"].append(len(queries))
+            queries.append(query)
+
+    for category, keywords in categories.items():
+        category_plans[category]["category_queries"] = len(
+            plan_queries(keywords, category, start_dt, end_dt, capacity, stats=stats)["queries"])
+    category_queries = sum(plan["category_queries"] for plan in category_plans.values())
+    return {"queries": queries, "categories": category_plans, "category_queries": category_queries}
+
+
+def news_for_category(query: Dict, category: str, news_list: Iterable[Dict]) -> Iterable[Dict]:
+    """
+    plan_run 쿼리 결과 중 카테고리에 해당하는 기사.
+    결과 전체를 받는 카테고리는 그대로, 결과에서 골라 가져가는 카테고리는 자기 키워드가 들어간 기사만
+    (keyword를 그 키워드로 바꿔서) 돌려준다.
+    """
+    if category in query["categories"]:
+        return news_list
+    terms = [(term, _fold(term)) for term in query["borrowed"].get(category, [])]
+    selected = []
+    for news in news_list:
+        text = _fold(news.get("title", "") + " " + news.get("summary", ""))
+        term = next((term for term, key in terms if key in text), None)
+        if term:
+            selected.append(dict(news, keyword=term))
+    return selected
+
+
+class RunQueryFetcher:
+    """
+    한 번의 실행 동안 같은 검색 쿼리를 한 번만 가져오는 수집기입니다.
+    카테고리를 순서대로 수집하면서 필요한 쿼리만 가져오고, 이미 가져온 쿼리는 결과를 재사용한다.
+    """
+
+    def __init__(self, plan: Dict, fetch: Callable[[str, int], Dict],
+                 start_dt: datetime, end_dt: datetime, capacity: int, stats: Optional[QueryStats] = None,
+                 spool=None, schedule: Optional[Dict] = None):
+        """
+        Args:
+            plan (Dict): plan_run 결과
+            fetch (Callable): (쿼리, 최대 결과 수) → raw_count(API 원본 항목 수),
+                              oldest_pub_date(마지막 원본 항목의 pubDate), news(기간 내 정규화 뉴스), http_calls,
+                              complete(API 오류 없이 끝났는지 - False면 결과 수를 기록하지 않음)
+            start_dt, end_dt (datetime): 수집 기간 (결과 수 기록용)
+            capacity (int): 쿼리당 결과 상한
+            spool (Optional[NewsSpool]): 주어지면 쿼리 결과를 디스크에 내려 두고 재사용할 때 다시 읽음
+                                         (없으면 실행이 끝날 때까지 메모리에 보관)
+            schedule (Optional[Dict]): scheduler.schedule_run 결과 - 쿼리별 최대 결과 수(limits)를 따르고,
+                                       수집 시간이 deadline_seconds를 넘으면 남은 쿼리는 late_limit까지만 가져옴
+        """
+        self.plan = plan
+        self._fetch = fetch
+        self.start_dt = start_dt
+        self.end_dt = end_dt
+        self.capacity = capacity
+        self.stats = stats or get_query_stats()
+        self.spool = spool
+        self.schedule = schedule
+        self._results: Dict[int, Iterable[Dict]] = {}
+        self._limits: Dict[int, int] = {}  # 쿼리 번호 → 검색한 최대 결과 수 (0이면 건너뜀)
+        self._lock = threading.Lock()
+        self._collected: List[str] = []
+        self.http_calls = 0
+        self.reused = 0
+        self.skipped = 0
+        self.late = 0
+        self.fetch_seconds = 0.0
+        self.calls_by_category: Dict[str, int] = {}
+
+    def _limit(self, index: int) -> int:
+        """쿼리의 최대 결과 수 (0이면 검색하지 않음)"""
+        if self.schedule is None:
+            return self.capacity
+        limit = self.schedule["limits"].get(index, self.capacity)
+        if limit and self.fetch_seconds > self.schedule["deadline_seconds"]:
+            # 수집 제한 시간을 넘기면 남은 (우선순위가 낮은) 쿼리는 얕게 검색
+            with self._lock:
+                self.late += 1
+            limit = min(limit, self.schedule["late_limit"])
+        return limit
+
+    def _query_news(self, index: int, category: str) -> Iterable[Dict]:
+        with self._lock:
+            if index in self._results:
+                self.reused += 1
+                return self._results[index]
+        query = self.plan["queries"][index]
+        limit = self._limit(index)
+        with self._lock:
+            self._limits[index] = limit
+        if not limit:
+            with self._lock:
+                self.skipped += 1
+            return []
+        started = time.monotonic()
+        result = self._fetch(query["query"], limit)
+        news_list = result["news"]
+        if result["complete"]:
+            self.stats.record(query, result["raw_count"], result["oldest_pub_date"], news_list,
+                              self.start_dt, self.end_dt, capacity=limit)
+        if self.spool is not None:
+            bucket = f"query:{index}"
+            self.spool.extend(bucket, news_list)
+            news_list = self.spool.view(bucket)
+        with self._lock:
+            self.http_calls += result["http_calls"]
+            self.fetch_seconds += time.monotonic() - started
+            # 호출 수는 쿼리를 처음 검색한 카테고리에 기록 (scheduler.schedule_run의 배정과 같은 기준)
+            self.calls_by_category[category] = self.calls_by_category.get(category, 0) + result["http_calls"]
+            self._results[index] = news_list
+        return news_list
+
+    def collect(self, category: str, on_query: Optional[Callable[[str, int], None]] = None,
+                on_error: Optional[Callable[[str, Exception], None]] = None) -> List[Dict]:
+        """
+        카테고리 기사 수집 (계획에 없는 카테고리는 빈 목록).
+
+        Args:
+            on_query (Optional[Callable]): 쿼리 하나가 끝날 때마다 (쿼리, 누적 기사 수)로 호출
+            on_error (Optional[Callable]): 쿼리 검색이 실패하면 (쿼리, 예외)로 호출하고 다음 쿼리로 진행
+                                           (없으면 예외를 그대로 전달). 실패한 쿼리는 다음 카테고리에서 다시 시도한다.
+        """
+        category_plan = self.plan["categories"].get(category)
+        if category_plan is None:
+            return []
+        self._collected.append(category)
+
+        all_news = []
+        for index in category_plan["queries"]:
+            query = self.plan["queries"][index]
+            try:
+                news_list = self._query_news(index, category)
+            except Exception as e:
+                if on_error is None:
+                    raise
+                on_error(query["query"], e)
+                continue
+            all_news.extend(news_for_category(query, category, news_list))
+            if on_query:
+                on_query(query["query"], len(all_news))
+        return all_news
+
+    def truncated(self, category: str) -> bool:
+        """
+        카테고리 수집이 일정 때문에 잘렸는지 - 건너뛴(limit 0) 쿼리나 상한보다 얕게 검색한(limits, late_limit) 쿼리가 있으면 True.
+        잘린 수집 결과는 부분 결과이므로 공유 캐시/체크포인트에 남기지 않는다.
+        """
+        category_plan = self.plan["categories"].get(category)
+        if category_plan is None:
+            return False
+        with self._lock:
+            return any(self._limits.get(index, self.capacity) < self.capacity for index in category_plan["queries"])
+
+    def summary(self) -> Dict:
+        """
+        Returns:
+            Dict: queries(검색한 쿼리 수), reused(재사용 횟수), http_calls(HTTP 호출 수),
+                  category_queries(카테고리별로 수집했다면의 쿼리 수), http_calls_saved(절약한 HTTP 호출 수 추정),
+                  calls_by_category(카테고리별 실제 호출 수), skipped(일정에서 뺀 쿼리 수),
+                  late(수집 제한 시간을 넘겨 얕게 검색한 쿼리 수), planned_calls(일정의 예상 호출 수, 일정이 없으면 None)
+        """
+        fetched = len(self._results)
+        per_query = self.http_calls / fetched if fetched else 0.0
+        baseline = sum(self.plan["categories"][category]["category_queries"] for category in set(self._collected))
+        return {
+            "queries": fetched,
+            "reused": self.reused,
+            "http_calls": self.http_calls,
+            "category_queries": baseline,
+            "http_calls_saved": max(0, round((baseline - fetched - self.skipped) * per_query)),
+            "calls_by_category": dict(self.calls_by_category),
+            "skipped": self.skipped,
+            "late": self.late,
+            "planned_calls": self.schedule["planned_calls"] if self.schedule else None,
+        }
@@ -0,0 +1,208 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Local Pre-Ranking
+-----------------
+AI 선별 전에 기사 중요도를 로컬에서 점수화하는 모듈.
+프롬프트의 우선순위 기준(실적·회계·기업구조 등 키워드 분류, 언론사 순위, 최신성)을
+numpy 벡터 연산으로 계산하여 카테고리별 상위 N건만 AI에 보내고,
+AI가 한 건도 선별하지 않았을 때의 자동 선택(폴백)에도 같은 점수를 사용한다.
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config import KST, RANKING_SETTINGS, VALID_PRESS
+
+_PUNCT_RE = re.compile(r"[^\w\s]")
+
+
+def check_title_similarity(title1, title2):
+    """제목 유사도를 계산하는 함수 (단어 Jaccard)"""
+    if not title1 or not title2:
+        return 0.0
+
+    # 제목을 소문자로 변환하고 특수문자 제거
+    words1 = set(_PUNCT_RE.sub('', title1.lower()).split())
+    words2 = set(_PUNCT_RE.sub('', title2.lower()).split())
+
+    if not words1 or not words2:
+        return 0.0
+
+    # Jaccard 유사도 계산
+    intersection = len(words1.intersection(words2))
+    union = len(words1.union(words2))
+
+    return intersection / union if union > 0 else 0.0
+
+
+@lru_cache(maxsize=None)
+def _term_pattern(terms: Tuple[str, ...]) -> re.Pattern:
+    """키워드 목록을 하나의 정규식으로 (긴 키워드부터 시도)"""
+    return re.compile("|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)))
+
+
+def _category_classes(category_name: str) -> List[Tuple[str, float, re.Pattern]]:
+    classes = []
+    for class_name, spec in RANKING_SETTINGS["keyword_classes"].items():
+        if category_name in spec.get("skip_categories", ()):
+            continue
+        classes.append((class_name, spec["weight"], _term_pattern(tuple(spec["terms"]))))
+    return classes
+
+
+def _hit_matrix(texts: Sequence[str], patterns: Sequence[re.Pattern]) -> np.ndarray:
+    """기사 x 패턴 포함 여부 (bool 행렬)"""
+    hits = np.zeros((len(texts), len(patterns)), dtype=bool)
+    for col, pattern in enumerate(patterns):
+        search = pattern.search
+        hits[:, col] = [search(text) is not None for text in texts]
+    return hits
+
+
+def _press_scores(news_list: Sequence[Dict]) -> np.ndarray:
+    """유효언론사 순위 점수 (1위 1.0 → 최하위 1/len, 목록 외 0)"""
+    ranks = np.array([VALID_PRESS.get(news.get("press", ""), 0) for news in news_list], dtype=np.float64)
+    worst = max(VALID_PRESS.values())
+    return np.where(ranks > 0, (worst + 1 - ranks) / worst, 0.0)
+
+
+def _recency_scores(news_list: Sequence[Dict], now: datetime) -> np.ndarray:
+    """발행일 기준 최신성 (오늘 1.0, half_life_days마다 절반, 날짜 없음 0)"""
+    dates = np.array([news.get("date", "") for news in news_list], dtype="U10")
+    valid = np.char.count(dates, "-") == 2
+    days = np.full(len(news_list), np.inf)
+    if valid.any():
+        today = np.datetime64(now.astimezone(KST).date(), "D")
+        age = (today - dates[valid].astype("datetime64[D]")).astype(np.float64)
+        days[valid] = np.maximum(age, 0.0)
+    return np.exp2(-days / RANKING_SETTINGS["half_life_days"])
+
+
+def score_news(news_list: Sequence[Dict], category_name: str, now: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+    """
+    기사별 중요도 점수 계산.
+
+    Args:
+        news_list (Sequence[Dict]): 수집된 뉴스 목록
+        category_name (str): 카테고리 이름 (키워드 분류/주제 키워드 선택)
+        now (Optional[datetime]): 최신성 기준 시각 (기본값: 현재 시각)
+
+    Returns:
+        Dict[str, np.ndarray]: total(총점)과 구성 요소별 점수
+            (keyword, subject_title, subject_summary, subject_keyword, press, recency)
+    """
+    count = len(news_list)
+    weights = RANKING_SETTINGS["weights"]
+    title_weight = RANKING_SETTINGS["title_weight"]
+    titles = [news.get("title", "").lower() for news in news_list]
+    summaries = [news.get("summary", "").lower() for news in news_list]
+
+    classes = _category_classes(category_name)
+    class_weights = np.array([weight for _, weight, _ in classes], dtype=np.float64)
+    patterns = [pattern for _, _, pattern in classes]
+    # 제목에 있으면 title_weight배, 요약에만 있으면 1배
+    title_hits = _hit_matrix(titles, patterns)
+    summary_hits = _hit_matrix(summaries, patterns) & ~title_hits
+    keyword = (title_hits * title_weight + summary_hits) @ class_weights if classes else np.zeros(count)
+
+    subject_title = subject_summary = subject_keyword = np.zeros(count, dtype=bool)
+    subject = RANKING_SETTINGS["subject_terms"].get(category_name)
+    subject_score = np.zeros(count)
+    if subject:
+        pattern = [_term_pattern(tuple(subject["terms"]))]
+        subject_title = _hit_matrix(titles, pattern)[:, 0]
+        subject_summary = _hit_matrix(summaries, pattern)[:, 0]
+        subject_keyword = _hit_matrix([news.get("keyword", "").lower() for news in news_list], pattern)[:, 0]
+        # 기존 폴백 기준과 같은 비중 (제목 100 : 요약 50 : 검색키워드 30)
+        subject_score = subject["weight"] * (subject_title * 1.0 + subject_summary * 0.5 + subject_keyword * 0.3)
+
+    press = _press_scores(news_list)
+    recency = _recency_scores(news_list, now or datetime.now(KST))
+
+    total = (weights["keyword"] * keyword + weights["subject"] * subject_score
+             + weights["press"] * press + weights["recency"] * recency)
+    return {
+        "total": total,
+        "keyword": keyword,
+        "subject_title": subject_title,
+        "subject_summary": subject_summary,
+        "subject_keyword": subject_keyword,
+        "press": press,
+        "recency": recency,
+    }
+
+
+def _setting_for(table: Dict, category_name: str):
+    return table.get(category_name, table["default"])
+
+
+def rank_candidates(news_list: Sequence[Dict], category_name: str, top_n: Optional[int] = None,
+                    now: Optional[datetime] = None) -> Tuple[List[Dict], List[Dict]]:
+    """
+    점수 상위 top_n건만 AI 분석 후보로 남기기.
+
+    Returns:
+        Tuple[List[Dict], List[Dict]]: (점수 내림차순 상위 후보, 순위 밖 기사)
+            두 목록 모두 rank_score가 추가된 사본이다.
+    """
+    if not news_list:
+        return [], []
+    top_n = top_n or _setting_for(RANKING_SETTINGS["top_n"], category_name)
+    total = score_news(news_list, category_name, now=now)["total"]
+    # 동점이면 원래 순서 유지 (stable)
+    order = np.argsort(-total, kind="stable")
+    ranked = [dict(news_list[i], rank_score=round(float(total[i]), 3)) for i in order]
+    return ranked[:top_n], ranked[top_n:]
+
+
+def fallback_selection(news_list: Sequence[Dict], category_name: str, count: Optional[int] = None,
+                       now: Optional[datetime] = None) -> List[Dict]:
+    """
+    AI가 한 건도 선별하지 않았을 때 점수 순으로 자동 선택 (같은 사건/유사 제목은 건너뜀).
+
+    Returns:
+        List[Dict]: parse_ai_response 결과와 같은 형식의 선별 뉴스 목록
+    """
+    count = count or _setting_for(RANKING_SETTINGS["fallback_count"], category_name)
+    scores = score_news(news_list, category_name, now=now)
+    order = np.argsort(-scores["total"], kind="stable")
+    subject = RANKING_SETTINGS["subject_terms"].get(category_name)
+
+    selected, chosen = [], []
+    for i in order:
+        if len(selected) >= count:
+            break
+        news = news_list[i]
+        # 같은 사건(embeddings 묶음) 또는 제목이 70% 이상 유사하면 중복으로 간주
+        if any((news.get("story_id") is not None and news.get("story_id") == other.get("story_id"))
+               or check_title_similarity(news.get("title", ""), other.get("title", "")) > 0.7
+               for other in chosen):
+            continue
+
+        if subject and scores["subject_title"][i]:
+            basis = f"제목에 {subject['label']} 키워드 포함"
+        elif subject and scores["subject_summary"][i]:
+            basis = f"요약에 {subject['label']} 키워드 포함"
+        elif scores["press"][i] > 0:
+            basis = "중요도/유효언론사/최신성 기준"
+        else:
+            basis = "중요도/최신성 기준"
+
+        chosen.append(news)
+        selected.append({
+            "title": news.get("title", "제목 없음"),
+            "url": news.get("url", ""),
+            "date": news.get("date", ""),
+            "keyword": news.get("keyword", ""),
+            "press_analysis": news.get("press", "언론사 정보 없음"),
+            "selection_reason": f"AI 무선별 → 폴백({basis} 자동선택 {len(selected) + 1}/{count})",
+            "importance": "보통",
+        })
+
+    return selected
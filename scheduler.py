@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Naver Call Scheduler
+--------------------
+네이버 검색 API 하루 호출 한도를 모든 실행(분석 실행, 백필)이 나눠 쓰도록 하는 모듈.
+
+- CallLedger: 한국 시간 날짜별/사용처별 네이버 호출 수 기록 (SQLite, 모든 프로세스 공유)
+- schedule_run: 실행 검색 계획(query_planner.plan_run)의 카테고리별 호출 수를 쿼리 수와 페이지 깊이로 추정하고,
+  우선순위(SCHEDULER_SETTINGS["priority"], 삼일PwC 먼저) 순서로 수집하도록 정한 뒤
+  남은 하루 한도나 수집 제한 시간 안에 들지 않으면 우선순위가 낮은 카테고리부터 검색 깊이를 줄이고,
+  그래도 넘으면 예상 결과가 적은 쿼리부터 뺀다.
+
+    schedule = schedule_run(plan, selected_categories, capacity=100, quota_remaining=get_call_ledger().remaining())
+    for category in schedule["order"]:
+        ...schedule["limits"][query_index]  # 쿼리별 최대 결과 수 (0이면 검색하지 않음)
+"""
+
+import math
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from config import DATA_DIR, KST, NAVER_API_SETTINGS, SCHEDULER_SETTINGS
+
+CALL_LEDGER_DB_PATH = os.path.join(DATA_DIR, "naver_calls.db")
+
+# 호출 사용처
+CONSUMER_RUN = "run"
+CONSUMER_BACKFILL = "backfill"
+
+# 네이버 검색 API 한 페이지 최대 결과 수
+_PAGE_SIZE = 100
+
+
+def _today() -> str:
+    return datetime.now(KST).date().isoformat()
+
+
+class CallLedger:
+    """
+    SQLite 네이버 호출 수 기록입니다.
+    """
+
+    def __init__(self, db_path: str = CALL_LEDGER_DB_PATH, daily_quota: int = NAVER_API_SETTINGS["daily_quota"]):
+        """
+        Args:
+            db_path (str): 호출 기록 SQLite 파일 경로
+            daily_quota (int): 네이버 검색 API 하루 호출 한도
+        """
+        self.db_path = db_path
+        self.daily_quota = daily_quota
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS calls (
+                    day TEXT NOT NULL,
+                    consumer TEXT NOT NULL,
+                    calls INTEGER NOT NULL,
+                    PRIMARY KEY (day, consumer)
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def add(self, consumer: str, calls: int) -> None:
+        """이미 보낸 호출 기록"""
+        if calls <= 0:
+            return
+        with self._lock, self._connect() as conn:
+            conn.execute(
+                "INSERT INTO calls (day, consumer, calls) VALUES (?, ?, ?) "
+                "ON CONFLICT (day, consumer) DO UPDATE SET calls = calls + excluded.calls",
+                (_today(), consumer, calls)
+            )
+
+    def take(self, consumer: str, limit: int) -> bool:
+        """
+        호출 하나를 예약 - 오늘 전체 호출 수가 이미 limit 이상이면 기록하지 않고 False.
+        """
+        day = _today()
+        with self._lock, self._connect() as conn:
+            used = conn.execute("SELECT COALESCE(SUM(calls), 0) FROM calls WHERE day = ?", (day,)).fetchone()[0]
+            if used >= limit:
+                return False
+            conn.execute(
+                "INSERT INTO calls (day, consumer, calls) VALUES (?, ?, 1) "
+                "ON CONFLICT (day, consumer) DO UPDATE SET calls = calls + 1",
+                (day, consumer)
+            )
+            return True
+
+    def used(self, consumer: Optional[str] = None) -> int:
+        """오늘 호출 수 (consumer가 없으면 전체)"""
+        sql, args = "SELECT COALESCE(SUM(calls), 0) FROM calls WHERE day = ?", [_today()]
+        if consumer:
+            sql += " AND consumer = ?"
+            args.append(consumer)
+        with self._connect() as conn:
+            return conn.execute(sql, args).fetchone()[0]
+
+    def remaining(self) -> int:
+        """오늘 남은 호출 수"""
+        return max(0, self.daily_quota - self.used())
+
+
+_ledger: Optional[CallLedger] = None
+_ledger_lock = threading.Lock()
+
+
+def get_call_ledger() -> CallLedger:
+    """프로세스 전역 네이버 호출 기록"""
+    global _ledger
+    with _ledger_lock:
+        if _ledger is None:
+            _ledger = CallLedger()
+        return _ledger
+
+
+def reset_call_ledger(ledger: Optional[CallLedger] = None) -> None:
+    """
+    전역 호출 기록 교체 (벤치마크처럼 실제 하루 호출 기록에 남기면 안 되는 실행용).
+
+    Args:
+        ledger (Optional[CallLedger]): 사용할 기록 (없으면 다음 get_call_ledger()가 기본 경로에서 다시 연다)
+    """
+    global _ledger
+    with _ledger_lock:
+        _ledger = ledger
+
+
+def priority_order(categories: Sequence[str]) -> List[str]:
+    """우선순위 순서 (설정에 없는 카테고리는 뒤에, 선택한 순서대로)"""
+    ranks = {category: rank for rank, category in enumerate(SCHEDULER_SETTINGS["priority"])}
+    return sorted(categories, key=lambda category: ranks.get(category, len(ranks)))
+
+
+def query_pages(query: Dict, capacity: int) -> int:
+    """쿼리 하나의 예상 호출 수 (예상 결과 수를 capacity까지 가져오는 페이지 수)"""
+    page_size = min(_PAGE_SIZE, capacity)
+    return max(1, math.ceil(min(query["expected"], capacity) / page_size))
+
+
+def schedule_run(plan: Dict, categories: Sequence[str], capacity: int, quota_remaining: int,
+                 deadline_seconds: float = SCHEDULER_SETTINGS["deadline_seconds"]) -> Dict:
+    """
+    실행 하나의 카테고리 수집 순서와 쿼리별 검색 깊이 결정.
+    여러 카테고리가 함께 쓰는 쿼리의 호출 수는 그 중 우선순위가 가장 높은 카테고리에 넣는다.
+
+    Args:
+        plan (Dict): query_planner.plan_run 결과
+        categories (Sequence[str]): 선택한 카테고리
+        capacity (int): 쿼리당 최대 결과 수
+        quota_remaining (int): 오늘 남은 네이버 호출 수
+        deadline_seconds (float): 수집 제한 시간 (초, 호출당 예상 시간으로 호출 수 상한 계산)
+
+    Returns:
+        Dict:
+            order: 수집할 카테고리 순서
+            limits: 쿼리 번호 → 최대 결과 수 (0이면 검색하지 않음, 상한 안에 들면 모두 capacity)
+            budget: 호출 수 상한 (min(남은 한도, 제한 시간 / 호출당 예상 시간)), quota_remaining
+            full_calls / planned_calls: 줄이기 전 / 후 예상 호출 수
+            categories: 카테고리 → priority(1부터), full_calls, planned_calls, shallow(깊이를 줄인 쿼리 수),
+                        dropped(뺀 쿼리 수)
+            deadline_seconds, late_limit: 수집 시간이 제한을 넘긴 뒤 쿼리당 최대 결과 수 (RunQueryFetcher용)
+    """
+    order = priority_order([category for category in categories if category in plan["categories"]])
+    budget = min(quota_remaining, int(deadline_seconds / SCHEDULER_SETTINGS["seconds_per_call"]))
+    min_pages = SCHEDULER_SETTINGS["min_pages"]
+    page_size = min(_PAGE_SIZE, capacity)
+
+    # 쿼리별 호출 수를 가장 먼저 수집하는 카테고리(결과를 받는 카테고리 중 우선순위가 가장 높은 곳)에 배정
+    owners: Dict[int, str] = {}
+    for category in order:
+        for index in plan["categories"][category]["queries"]:
+            owners.setdefault(index, category)
+    pages = {index: query_pages(plan["queries"][index], capacity) for index in owners}
+    full = dict(pages)
+    owned = {category: [index for index in owners if owners[index] == category] for category in order}
+
+    def total() -> int:
+        return sum(pages.values())
+
+    # 상한 안에 들면 예상 페이지 수로 자르지 않고 쿼리마다 capacity까지 검색 (예상은 호출 수 계산에만 사용)
+    over_budget = total() > budget
+
+    # 1) 우선순위가 낮은 카테고리부터 검색 깊이를 min_pages까지 줄임
+    for category in reversed(order):
+        if total() <= budget:
+            break
+        for index in owned[category]:
+            pages[index] = min(pages[index], min_pages)
+
+    # 2) 그래도 넘으면 우선순위가 낮은 카테고리부터 예상 결과가 적은 쿼리를 뺌
+    for category in reversed(order):
+        for index in sorted(owned[category], key=lambda i: plan["queries"][i]["expected"]):
+            if total() <= budget:
+                break
+            pages[index] = 0
+
+    category_schedule = {}
+    for rank, category in enumerate(order, 1):
+        indexes = owned[category]
+        category_schedule[category] = {
+            "priority": rank,
+            "full_calls": sum(full[index] for index in indexes),
+            "planned_calls": sum(pages[index] for index in indexes),
+            "shallow": sum(1 for index in indexes if 0 < pages[index] < full[index]),
+            "dropped": sum(1 for index in indexes if pages[index] == 0),
+        }
+    if over_budget:
+        limits = {index: min(capacity, count * page_size) for index, count in pages.items()}
+    else:
+        limits = {index: capacity for index in pages}
+    return {
+        "order": order,
+        "limits": limits,
+        "budget": budget,
+        "quota_remaining": quota_remaining,
+        "full_calls": sum(full.values()),
+        "planned_calls": total(),
+        "categories": category_schedule,
+        "deadline_seconds": deadline_seconds,
+        "late_limit": min(capacity, min_pages * page_size),
+    }
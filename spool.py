@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+News Spool
+----------
+실행 하나 동안 수집한 기사를 디스크에 내려 두는 임시 저장소.
+검색 쿼리 결과와 카테고리별 수집 목록을 버킷별 JSON Lines 파일에 쓰고, 필요할 때 한 줄씩 다시 읽는다.
+여러 날짜/카테고리를 한 번에 수집해도 메모리에는 처리 중인 카테고리 하나의 목록만 남는다.
+
+- view()가 돌려주는 SpooledNews는 len()/반복/bool을 지원하는 읽기 전용 목록 (반복할 때마다 파일에서 읽음)
+- 스풀 디렉터리는 마지막 SpooledNews까지 쓰이지 않게 되면(가비지 컬렉션) 또는 close()에서 삭제
+- 프로세스가 비정상 종료되어 남은 디렉터리는 다음 스풀을 만들 때 정리
+
+    spool = NewsSpool()
+    spool.extend("category:삼일PwC", news_list)
+    collected = spool.view("category:삼일PwC")
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
+from typing import Dict, Iterable, Iterator
+
+from config import SPOOL_SETTINGS
+
+
+def _prune_stale(root: str, stale_seconds: float) -> None:
+    """비정상 종료로 남은 오래된 스풀 디렉터리 삭제"""
+    expired = time.time() - stale_seconds
+    try:
+        names = os.listdir(root)
+    except OSError:
+        return
+    for name in names:
+        path = os.path.join(root, name)
+        try:
+            if name.startswith("run-") and os.path.getmtime(path) < expired:
+                shutil.rmtree(path, ignore_errors=True)
+        except OSError:
+            continue
+
+
+class SpooledNews:
+    """
+    스풀 버킷 하나의 읽기 전용 기사 목록입니다.
+    """
+
+    def __init__(self, spool: "NewsSpool", bucket: str, count: int):
+        self._spool = spool
+        self._bucket = bucket
+        self._count = count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __bool__(self) -> bool:
+        return self._count > 0
+
+    def __iter__(self) -> Iterator[Dict]:
+        return self._spool.iter(self._bucket)
+
+    def __repr__(self) -> str:
+        return f"SpooledNews({self._bucket!r}, {self._count}건)"
+
+
+class NewsSpool:
+    """
+    실행 단위 디스크 기사 저장소입니다.
+    """
+
+    def __init__(self, root: str = SPOOL_SETTINGS["dir"]):
+        """
+        Args:
+            root (str): 스풀 디렉터리들을 만들 상위 경로
+        """
+        os.makedirs(root, exist_ok=True)
+        _prune_stale(root, SPOOL_SETTINGS["stale_seconds"])
+        self.path = tempfile.mkdtemp(prefix="run-", dir=root)
+        self._counts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.bytes_written = 0
+        self._finalizer = weakref.finalize(self, shutil.rmtree, self.path, True)
+
+    def _file(self, bucket: str) -> str:
+        # 버킷 이름(카테고리, 검색 쿼리)에는 파일 이름에 쓸 수 없는 문자가 있을 수 있음
+        return os.path.join(self.path, hashlib.sha1(bucket.encode("utf-8")).hexdigest()[:16] + ".jsonl")
+
+    def extend(self, bucket: str, items: Iterable[Dict]) -> int:
+        """
+        버킷 끝에 기사 추가 (items는 제너레이터여도 됨 - 한 건씩 바로 파일에 씀).
+
+        Returns:
+            int: 추가한 기사 수
+        """
+        written = size = 0
+        with open(self._file(bucket), "a", encoding="utf-8") as f:
+            for item in items:
+                line = json.dumps(item, ensure_ascii=False) + "\n"
+                f.write(line)
+                written += 1
+                size += len(line)
+        with self._lock:
+            self._counts[bucket] = self._counts.get(bucket, 0) + written
+            self.bytes_written += size
+        return written
+
+    def count(self, bucket: str) -> int:
+        with self._lock:
+            return self._counts.get(bucket, 0)
+
+    def iter(self, bucket: str) -> Iterator[Dict]:
+        """버킷의 기사를 저장한 순서대로 한 건씩 읽음"""
+        if not self.count(bucket):
+            return
+        with open(self._file(bucket), encoding="utf-8") as f:
+            for line in f:
+                yield json.loads(line)
+
+    def view(self, bucket: str) -> SpooledNews:
+        return SpooledNews(self, bucket, self.count(bucket))
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {"buckets": len(self._counts), "items": sum(self._counts.values()), "bytes": self.bytes_written}
+
+    def close(self) -> None:
+        """스풀 파일 삭제 (이후 이 스풀의 SpooledNews는 읽을 수 없음)"""
+        self._finalizer()
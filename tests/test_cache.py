@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+
+from cache import SharedCache, estimate_size
+
+
+def make_cache(max_entries=10, max_bytes=10_000, ttl_seconds=60):
+    return SharedCache("test", max_entries=max_entries, max_bytes=max_bytes, ttl_seconds=ttl_seconds)
+
+
+def start_waiter(cache, key, compute_fn, results):
+    """리더가 계산 중일 때 같은 키를 요청하는 스레드 (결과나 예외를 results에 기록)"""
+    def run():
+        try:
+            results.append(cache.get_or_compute(key, compute_fn))
+        except Exception as e:
+            results.append(e)
+
+    thread = threading.Thread(target=run)
+    thread.start()
+    return thread
+
+
+def wait_for_waiter(cache):
+    """대기 스레드가 진행 중인 계산에 합류할 때까지"""
+    for _ in range(1000):
+        if cache.stats()["shared_waits"]:
+            return
+        time.sleep(0.005)
+    raise AssertionError("대기 스레드가 진행 중인 계산에 합류하지 않음")
+
+
+def test_get_or_compute_runs_one_computation_for_concurrent_requests():
+    cache = make_cache()
+    started, release = threading.Event(), threading.Event()
+    calls, results = [], []
+
+    def compute():
+        calls.append(1)
+        started.set()
+        release.wait(5)
+        return ["기사"]
+
+    leader = start_waiter(cache, "key", compute, results)
+    assert started.wait(5)
+    follower = start_waiter(cache, "key", lambda: pytest.fail("대기 중인 요청이 다시 계산함"), results)
+    wait_for_waiter(cache)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert results == [["기사"], ["기사"]]
+    assert len(calls) == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.get("key") == ["기사"]
+
+
+def test_get_or_compute_propagates_leader_error_to_waiters_and_does_not_cache():
+    cache = make_cache()
+    started, release = threading.Event(), threading.Event()
+    results = []
+
+    def compute():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("수집 실패")
+
+    leader = start_waiter(cache, "key", compute, results)
+    assert started.wait(5)
+    follower = start_waiter(cache, "key", lambda: pytest.fail("대기 중인 요청이 다시 계산함"), results)
+    wait_for_waiter(cache)
+    release.set()
+    leader.join(5)
+    follower.join(5)
+
+    assert [str(result) for result in results] == ["수집 실패", "수집 실패"]
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert cache.stats()["inflight"] == 0
+    # 실패는 캐시하지 않으므로 다음 요청은 다시 계산
+    assert cache.get_or_compute("key", lambda: "재시도") == "재시도"
+
+
+def test_get_or_compute_skips_results_rejected_by_should_cache():
+    cache = make_cache()
+    assert cache.get_or_compute("key", lambda: [], should_cache=bool) == []
+    assert not cache.contains("key")
+
+
+def test_lru_eviction_removes_least_recently_used_entry():
+    cache = make_cache(max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # a를 최근 사용으로
+    cache.set("c", 3)
+
+    assert cache.contains("a") and cache.contains("c")
+    assert not cache.contains("b")
+    assert cache.stats()["evictions"] == 1
+
+
+def test_byte_cap_evicts_oldest_entries_until_under_limit():
+    value = "x" * 100
+    size = estimate_size(value)
+    cache = make_cache(max_bytes=size * 2)
+    cache.set("a", value)
+    cache.set("b", value)
+    cache.set("c", value)
+
+    assert not cache.contains("a")
+    assert cache.contains("b") and cache.contains("c")
+    assert cache.stats()["size_bytes"] == size * 2
+
+
+def test_value_larger_than_byte_cap_is_not_stored():
+    cache = make_cache(max_bytes=10)
+    cache.set("big", "x" * 100)
+    assert not cache.contains("big")
+    assert cache.stats()["size_bytes"] == 0
+
+
+def test_expired_entry_is_recomputed():
+    cache = make_cache()
+    cache.set("key", "old", ttl_seconds=-1)
+    assert cache.get_or_compute("key", lambda: "new") == "new"
+    assert cache.stats()["expirations"] == 1
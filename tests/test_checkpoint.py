@@ -0,0 +1,85 @@
+import pytest
+
+from checkpoint import CheckpointStore, RunCheckpoint
+
+PARAMS = {"categories": ["삼일PwC", "경제"], "start_dt": "2026-10-18T10:00:00+09:00",
+          "end_dt": "2026-10-19T10:00:00+09:00", "dedupe": True, "fulltext": False}
+NEWS = [{"title": "삼일PwC 기사", "url": "https://news.example.com/1"}]
+RESULT = {"collected_news": NEWS, "analysis_result": {"selected_news": NEWS, "selected_count": 1}}
+
+
+@pytest.fixture
+def store(tmp_path):
+    return CheckpointStore(str(tmp_path / "checkpoints.db"))
+
+
+def test_new_run_has_nothing_to_resume(store):
+    checkpoint = store.open_run(PARAMS)
+    assert not checkpoint.resumed
+    assert checkpoint.collected("삼일PwC") is None
+    assert checkpoint.result("삼일PwC") is None
+
+
+def test_unfinished_run_resumes_saved_stages(store):
+    checkpoint = store.open_run(PARAMS)
+    checkpoint.save_result("삼일PwC", RESULT)
+    checkpoint.save_collected("경제", NEWS)
+
+    resumed = store.open_run(PARAMS)
+    assert resumed.run_id == checkpoint.run_id
+    assert resumed.resumed
+    assert resumed.finished_categories() == ["삼일PwC"]
+    assert resumed.result("삼일PwC") == RESULT
+    assert resumed.collected("경제") == NEWS
+    assert resumed.result("경제") is None
+
+
+def test_different_params_start_a_new_run(store):
+    store.open_run(PARAMS).save_collected("경제", NEWS)
+    other = store.open_run(dict(PARAMS, delta=True))
+    assert not other.resumed
+
+
+def test_finished_run_is_not_resumed(store):
+    checkpoint = store.open_run(PARAMS)
+    checkpoint.save_result("삼일PwC", RESULT)
+    checkpoint.finish()
+
+    fresh = store.open_run(PARAMS)
+    assert fresh.run_id != checkpoint.run_id
+    assert not fresh.resumed
+
+
+def test_stale_run_is_not_resumed(tmp_path):
+    store = CheckpointStore(str(tmp_path / "checkpoints.db"), resume_seconds=-1)
+    store.open_run(PARAMS).save_collected("경제", NEWS)
+    assert not store.open_run(PARAMS).resumed
+
+
+def test_failed_or_partial_stages_are_not_saved(store):
+    checkpoint = store.open_run(PARAMS)
+    checkpoint.save_collected("경제", [dict(NEWS[0], source="google_news")])  # 대체 소스
+    checkpoint.save_collected("금융", NEWS, complete=False)  # 호출 일정 때문에 잘린 수집
+    checkpoint.save_result("삼일PwC", dict(RESULT, analysis_result={"error": "AI 분석 오류"}))
+    checkpoint.save_result("M&A", RESULT, complete=False)
+
+    resumed = store.open_run(PARAMS)
+    assert not resumed.resumed
+
+
+def test_save_error_is_recorded_and_later_saves_stop(store):
+    checkpoint = store.open_run(PARAMS)
+    checkpoint.save_collected("경제", [{"title": object()}])  # JSON으로 저장할 수 없는 값
+    assert checkpoint.error
+    checkpoint.save_collected("금융", NEWS)
+    # 저장소에는 남지 않지만 이번 실행 안에서는 사용 가능
+    assert checkpoint.collected("금융") == NEWS
+    assert not store.open_run(PARAMS).resumed
+
+
+def test_checkpoint_without_store_keeps_stages_in_memory():
+    checkpoint = RunCheckpoint(None, "memory", {})
+    checkpoint.save_collected("경제", NEWS)
+    checkpoint.finish()
+    assert checkpoint.collected("경제") == NEWS
+    assert checkpoint.error is None
@@ -0,0 +1,81 @@
+import pytest
+
+from circuit_breaker import STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN, CircuitBreaker
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """circuit_breaker의 time.monotonic을 직접 움직이는 시계"""
+    now = {"value": 1000.0}
+    monkeypatch.setattr("circuit_breaker.time.monotonic", lambda: now["value"])
+    return now
+
+
+def open_breaker(clock, reset_seconds=30):
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=reset_seconds)
+    for _ in range(2):
+        assert breaker.allow()
+        breaker.record_failure(RuntimeError("타임아웃"))
+    assert breaker.state == STATE_OPEN
+    return breaker
+
+
+def test_consecutive_failures_open_the_circuit(clock):
+    breaker = open_breaker(clock)
+    assert not breaker.allow()
+    assert breaker.trips == 1
+    assert breaker.retry_in() == 30
+    assert breaker.last_error == "타임아웃"
+
+
+def test_success_resets_the_failure_count():
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_seconds=30)
+    breaker.record_failure()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+
+
+def test_half_open_allows_a_single_probe(clock):
+    breaker = open_breaker(clock)
+    clock["value"] += 30
+
+    assert breaker.allow()
+    assert breaker.state == STATE_HALF_OPEN
+    # 시험 요청이 끝나기 전의 다른 요청은 차단
+    assert not breaker.allow()
+    assert breaker.rejected == 1
+
+
+def test_successful_probe_closes_the_circuit(clock):
+    breaker = open_breaker(clock)
+    clock["value"] += 30
+    assert breaker.allow()
+    breaker.record_success()
+
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow() and breaker.allow()
+
+
+def test_failed_probe_reopens_the_circuit_immediately(clock):
+    breaker = open_breaker(clock)
+    clock["value"] += 30
+    assert breaker.allow()
+    breaker.record_failure(RuntimeError("5xx"))
+
+    assert breaker.state == STATE_OPEN
+    assert breaker.trips == 2
+    assert not breaker.allow()
+    clock["value"] += 30
+    assert breaker.allow()
+
+
+def test_released_probe_lets_another_request_probe(clock):
+    breaker = open_breaker(clock)
+    clock["value"] += 30
+    assert breaker.allow()
+    breaker.release()  # 취소 등으로 결과를 알 수 없음
+
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
@@ -0,0 +1,63 @@
+import sqlite3
+
+from archive import DECISION_EXCLUDED, DECISION_SELECTED, NewsArchive
+from delta import delta_candidates, has_new_articles, judged_ids, summarize_delta
+
+
+def make_news(n):
+    return {"title": f"기사 {n}", "url": f"https://news.example.com/{n}", "press": "한국경제", "date": "2026-10-19"}
+
+
+def record_baseline(archive, picked, excluded, cut):
+    """직전 실행 - picked(선별)와 excluded(제외)는 AI 후보, cut은 순위 밖이라 AI에 보내지 않은 기사"""
+    records = ([{"news": news, "category": "경제", "decision": DECISION_SELECTED, "reason": "중요", "candidate": True}
+                for news in picked]
+               + [{"news": news, "category": "경제", "decision": DECISION_EXCLUDED, "reason": "관련성 부족", "candidate": True}
+                  for news in excluded]
+               + [{"news": news, "category": "경제", "decision": DECISION_EXCLUDED, "reason": "순위 밖", "candidate": False}
+                  for news in cut])
+    archive.record_run({"categories": ["경제"]}, records)
+    return archive.last_run("경제", 0)
+
+
+def test_rank_cut_articles_from_previous_run_are_still_new_candidates(tmp_path):
+    archive = NewsArchive(str(tmp_path / "archive.db"))
+    picked, excluded, cut = make_news(1), make_news(2), make_news(3)
+    baseline = record_baseline(archive, [picked], [excluded], [cut])
+
+    news_list = [picked, excluded, cut, make_news(4)]
+    # 이번에는 순위 밖이던 기사와 새 기사가 후보에 듦
+    candidates = delta_candidates(news_list, [excluded, cut, make_news(4)], baseline)
+
+    assert [news["url"] for news in candidates] == [picked["url"], cut["url"], make_news(4)["url"]]
+    assert has_new_articles(candidates, baseline)
+    analysis = {"selected_news": [picked]}
+    assert summarize_delta(analysis, news_list, candidates, baseline)["analyzed_new"] == 2
+
+
+def test_judged_ids_carry_previous_judgements_forward(tmp_path):
+    archive = NewsArchive(str(tmp_path / "archive.db"))
+    picked, excluded, cut = make_news(1), make_news(2), make_news(3)
+    baseline = record_baseline(archive, [picked], [excluded], [cut])
+
+    news_list = [picked, excluded, cut]
+    candidates = delta_candidates(news_list, [excluded], baseline)
+    assert not has_new_articles(candidates, baseline)
+    # 직전 실행에서 판단한 기사는 이번에 보내지 않았어도 판단한 것으로 기록, 순위 밖 기사는 기록하지 않음
+    ids = set(judged_ids(news_list, candidates, baseline))
+    assert ids == set(judged_ids([], [picked, excluded]))
+
+
+def test_archive_adds_candidate_column_to_existing_database(tmp_path):
+    path = str(tmp_path / "archive.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute("""
+            CREATE TABLE run_articles (
+                run_id TEXT NOT NULL, url_hash TEXT NOT NULL, category TEXT NOT NULL,
+                keyword TEXT NOT NULL DEFAULT '', decision TEXT NOT NULL, reason TEXT NOT NULL DEFAULT '',
+                PRIMARY KEY (run_id, url_hash, category)
+            )
+        """)
+    archive = NewsArchive(path)
+    baseline = record_baseline(archive, [make_news(1)], [], [])
+    assert all(article["candidate"] for article in baseline["articles"].values())
@@ -0,0 +1,122 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from circuit_breaker import CircuitBreaker
+from config import LLM_CLIENT_SETTINGS
+from llm_client import LLMClient
+
+MESSAGES = [{"role": "user", "content": "선별"}]
+# 지연 표본 하나로 hedging 시작, 첫 요청이 20ms 안에 응답하지 않으면 hedging 요청
+SETTINGS = dict(LLM_CLIENT_SETTINGS, hedge=True, hedge_min_samples=1, hedge_min_ms=20, max_concurrency=4, max_retries=0)
+
+
+def response(text):
+    return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))], usage=None)
+
+
+def reply(text, delay=0.0):
+    async def behave():
+        await asyncio.sleep(delay)
+        return response(text)
+    return behave
+
+
+def fail(error, delay=0.0):
+    async def behave():
+        await asyncio.sleep(delay)
+        raise error
+    return behave
+
+
+class FakeOpenAI:
+    """create 호출마다 behaviors를 순서대로 실행하는 AsyncOpenAI 대역"""
+
+    def __init__(self, behaviors):
+        self.behaviors = list(behaviors)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        behave = self.behaviors[self.calls]
+        self.calls += 1
+        return await behave()
+
+
+@pytest.fixture
+def make_client():
+    clients = []
+
+    def make(*behaviors):
+        # 첫 요청은 지연 표본을 쌓는 빠른 응답
+        fake = FakeOpenAI([reply("warmup"), *behaviors])
+        client = LLMClient(SETTINGS, client_factory=lambda settings: fake,
+                           breaker=CircuitBreaker("test", failure_threshold=3, reset_seconds=60))
+        assert client.complete(MESSAGES, model="m")["text"] == "warmup"
+        clients.append(client)
+        return client, fake
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def free_slots(client):
+    """반납되지 않은 세마포어가 없는지 확인용 (남은 동시 요청 자리 수)"""
+    return client._semaphore._value
+
+
+def test_primary_win_cancels_hedge_and_releases_its_slot(make_client):
+    client, fake = make_client(reply("primary", delay=0.1), reply("hedge", delay=2.0))
+    result = client.complete(MESSAGES, model="m")
+
+    assert result["text"] == "primary"
+    assert result["hedged"]
+    assert fake.calls == 3
+    assert client.counters["hedged"] == 1 and client.counters["hedge_wins"] == 0
+    assert free_slots(client) == SETTINGS["max_concurrency"]
+
+
+def test_hedge_win_cancels_primary_and_releases_its_slot(make_client):
+    client, fake = make_client(reply("primary", delay=2.0), reply("hedge"))
+    result = client.complete(MESSAGES, model="m")
+
+    assert result["text"] == "hedge"
+    assert client.counters["hedge_wins"] == 1
+    assert free_slots(client) == SETTINGS["max_concurrency"]
+
+
+def test_losing_response_that_also_succeeded_is_discarded_and_releases_its_slot(make_client):
+    arrived = asyncio.Event()
+
+    async def primary():
+        await arrived.wait()
+        return response("primary")
+
+    async def hedge():
+        # hedging 요청이 도착하는 순간 첫 요청도 응답 - 둘 다 성공한 상태로 경쟁이 끝남
+        arrived.set()
+        return response("hedge")
+
+    client, fake = make_client(primary, hedge)
+    result = client.complete(MESSAGES, model="m")
+
+    # 둘 다 성공하면 첫 요청 응답을 쓰고 hedging 응답은 정리
+    assert result["text"] == "primary"
+    assert free_slots(client) == SETTINGS["max_concurrency"]
+
+
+def test_hedge_failure_waits_for_primary(make_client):
+    client, fake = make_client(reply("primary", delay=0.1), fail(ValueError("bad request")))
+    result = client.complete(MESSAGES, model="m")
+
+    assert result["text"] == "primary"
+    assert free_slots(client) == SETTINGS["max_concurrency"]
+
+
+def test_both_failures_raise_and_release_slots(make_client):
+    client, fake = make_client(fail(ValueError("primary"), delay=0.05), fail(ValueError("hedge")))
+    with pytest.raises(ValueError):
+        client.complete(MESSAGES, model="m")
+    assert free_slots(client) == SETTINGS["max_concurrency"]
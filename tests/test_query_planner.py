@@ -0,0 +1,89 @@
+from datetime import datetime, timedelta
+
+from config import KST, QUERY_PLANNER_SETTINGS
+from query_planner import QueryStats, RunQueryFetcher, get_query_stats, plan_queries, plan_run, reset_query_stats
+
+START = datetime(2026, 10, 18, 10, 0, tzinfo=KST)
+DAY = timedelta(days=1)
+
+
+def record(stats, term, hits, capacity=100):
+    """하루 기간에 상한에 걸리지 않고 hits건이 나온 검색 기록"""
+    news = [{"title": f"{term} 기사 {i}", "summary": ""} for i in range(hits)]
+    stats.record({"terms": [term]}, hits, "", news, START, START + DAY, capacity)
+
+
+def test_split_covered_drops_narrow_term_when_broad_term_fits_window():
+    stats = QueryStats(None)
+    record(stats, "회계법인", 30)
+    plan = plan_queries(["회계법인", "삼일회계법인"], "default", START, START + DAY, 100, stats=stats)
+    assert plan["dropped"] == [{"term": "삼일회계법인", "covered_by": "회계법인"}]
+
+
+def test_split_covered_keeps_narrow_term_when_longer_window_would_saturate():
+    stats = QueryStats(None)
+    record(stats, "회계법인", 30)  # 하루 30건 → 7일이면 210건으로 상한(100)을 넘음
+    plan = plan_queries(["회계법인", "삼일회계법인"], "default", START, START + 7 * DAY, 100, stats=stats)
+    assert plan["dropped"] == []
+    assert plan["kept"] == [{"term": "삼일회계법인", "broader": "회계법인"}]
+
+
+def test_split_covered_keeps_narrow_term_without_history():
+    plan = plan_queries(["회계법인", "삼일회계법인"], "default", START, START + DAY, 100, stats=QueryStats(None))
+    assert plan["dropped"] == []
+
+
+def test_plan_run_borrows_from_broad_term_that_fits_window():
+    stats = QueryStats(None)
+    record(stats, "회계법인", 30)
+    plan = plan_run({"회계업계_일반": ["회계법인"], "삼일PwC": ["삼일회계법인"]}, START, START + DAY, 100, stats=stats)
+    assert plan["categories"]["삼일PwC"]["borrowed"] == [{"term": "삼일회계법인", "from": "회계법인"}]
+    assert len(plan["queries"]) == 1
+
+
+def test_plan_run_searches_narrow_term_when_longer_window_would_saturate():
+    stats = QueryStats(None)
+    record(stats, "회계법인", 30)
+    plan = plan_run({"회계업계_일반": ["회계법인"], "삼일PwC": ["삼일회계법인"]}, START, START + 7 * DAY, 100, stats=stats)
+    assert plan["categories"]["삼일PwC"]["borrowed"] == []
+    assert [query["terms"] for query in plan["queries"]] == [["회계법인"], ["삼일회계법인"]]
+
+
+def test_reset_query_stats_starts_a_fresh_record(monkeypatch):
+    monkeypatch.setitem(QUERY_PLANNER_SETTINGS, "stats_path", None)
+    reset_query_stats()
+    record(get_query_stats(), "회계법인", 30)
+    reset_query_stats()
+    assert get_query_stats().get("회계법인") is None
+
+
+def fake_fetch(query, limit):
+    return {"raw_count": 0, "oldest_pub_date": "", "news": [], "http_calls": 1, "complete": True}
+
+
+def run_fetcher(limits, late_limit=100, deadline_seconds=60):
+    plan = plan_run({"경제": ["금리"], "금융": ["은행"]}, START, START + DAY, 100, stats=QueryStats(None))
+    schedule = {"limits": limits, "deadline_seconds": deadline_seconds, "late_limit": late_limit, "planned_calls": 2}
+    return RunQueryFetcher(plan, fake_fetch, START, START + DAY, 100, stats=QueryStats(None), schedule=schedule)
+
+
+def test_fetcher_reports_full_depth_collection_as_not_truncated():
+    fetcher = run_fetcher({0: 100, 1: 100})
+    fetcher.collect("경제")
+    fetcher.collect("금융")
+    assert not fetcher.truncated("경제")
+    assert not fetcher.truncated("금융")
+
+
+def test_fetcher_reports_skipped_and_shortened_queries_as_truncated():
+    fetcher = run_fetcher({0: 40, 1: 0})
+    fetcher.collect("경제")
+    fetcher.collect("금융")
+    assert fetcher.truncated("경제")
+    assert fetcher.truncated("금융")
+
+
+def test_fetcher_reports_late_queries_as_truncated():
+    fetcher = run_fetcher({0: 100, 1: 100}, late_limit=20, deadline_seconds=-1)
+    fetcher.collect("경제")
+    assert fetcher.truncated("경제")
@@ -0,0 +1,50 @@
+from scheduler import CONSUMER_RUN, CallLedger, get_call_ledger, reset_call_ledger, schedule_run
+
+CAPACITY = 200  # 쿼리 하나가 최대 2페이지
+
+
+def make_plan(expected):
+    """카테고리마다 쿼리 하나인 plan_run 형태의 계획 (expected: 카테고리 → 예상 결과 수)"""
+    queries, categories = [], {}
+    for category, count in expected.items():
+        categories[category] = {"queries": [len(queries)]}
+        queries.append({"query": category, "terms": [category], "expected": count,
+                        "categories": [category], "borrowed": {}})
+    return {"queries": queries, "categories": categories}
+
+
+def schedule(expected, quota):
+    return schedule_run(make_plan(expected), list(expected), CAPACITY, quota, deadline_seconds=1000)
+
+
+def test_under_budget_plan_keeps_full_depth():
+    result = schedule({"산업동향": 30, "삼일PwC": 30}, quota=100)
+    assert result["order"] == ["삼일PwC", "산업동향"]
+    # 예상 결과가 한 페이지여도 상한 안이면 쿼리마다 capacity까지 검색
+    assert result["limits"] == {0: CAPACITY, 1: CAPACITY}
+    assert result["planned_calls"] == result["full_calls"] == 2
+
+
+def test_over_budget_plan_shortens_lowest_priority_category_first():
+    result = schedule({"산업동향": 180, "삼일PwC": 180}, quota=3)
+    assert result["limits"] == {0: 100, 1: CAPACITY}
+    assert result["planned_calls"] == 3
+    assert result["categories"]["산업동향"]["shallow"] == 1
+    assert result["categories"]["삼일PwC"]["shallow"] == 0
+
+
+def test_over_budget_plan_drops_queries_when_shortening_is_not_enough():
+    result = schedule({"산업동향": 180, "삼일PwC": 180}, quota=1)
+    assert result["limits"] == {0: 0, 1: 100}
+    assert result["planned_calls"] == 1
+    assert result["categories"]["산업동향"]["dropped"] == 1
+
+
+def test_reset_call_ledger_swaps_the_process_ledger(tmp_path):
+    ledger = CallLedger(str(tmp_path / "naver_calls.db"), daily_quota=10)
+    reset_call_ledger(ledger)
+    try:
+        get_call_ledger().add(CONSUMER_RUN, 4)
+        assert ledger.remaining() == 6
+    finally:
+        reset_call_ledger()
@@ -0,0 +1,233 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Tracing
+-------
+실행 단계별 시간 측정 (span) 과 프로파일링.
+활성화된 Tracer가 없으면 span()은 아무 일도 하지 않으므로 코드 곳곳에 두어도 부담이 없다.
+측정 결과는 Chrome trace JSON (chrome://tracing, Perfetto) 또는
+OpenTelemetry OTLP/JSON 형식으로 내보낼 수 있다.
+"""
+
+import contextvars
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+_current_tracer: contextvars.ContextVar = contextvars.ContextVar("news_tracer", default=None)
+_current_span: contextvars.ContextVar = contextvars.ContextVar("news_span", default=None)
+
+
+class Span:
+    """측정 구간 하나"""
+
+    __slots__ = ("span_id", "parent_id", "name", "kind", "attrs", "thread_id", "start_ns", "end_ns")
+
+    def __init__(self, span_id: int, parent_id: Optional[int], name: str, kind: str, attrs: Dict):
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.name = name
+        self.kind = kind
+        self.attrs = attrs
+        self.thread_id = threading.get_ident()
+        self.start_ns = time.perf_counter_ns()
+        self.end_ns = None
+
+    @property
+    def duration_ms(self) -> float:
+        return ((self.end_ns or time.perf_counter_ns()) - self.start_ns) / 1e6
+
+    def set(self, **attrs) -> None:
+        """실행 중 알게 된 속성 추가 (예: 수집 건수)"""
+        self.attrs.update(attrs)
+
+
+class Tracer:
+    """
+    한 번의 실행에서 발생한 span을 모으는 수집기입니다.
+    """
+
+    def __init__(self, name: str = "news_run"):
+        self.name = name
+        self.spans: List[Span] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # perf_counter 기준 시각을 실제 시각(unix ns)으로 바꾸기 위한 기준점
+        self._origin_perf_ns = time.perf_counter_ns()
+        self._origin_unix_ns = time.time_ns()
+        self.trace_id = os.urandom(16).hex()
+
+    def start_span(self, name: str, kind: str, attrs: Dict) -> Span:
+        parent = _current_span.get()
+        with self._lock:
+            span = Span(next(self._ids), parent.span_id if parent else None, name, kind, attrs)
+            self.spans.append(span)
+        return span
+
+    def _unix_ns(self, perf_ns: int) -> int:
+        return self._origin_unix_ns + (perf_ns - self._origin_perf_ns)
+
+    def summary(self) -> List[Dict]:
+        """
+        이름별 집계 (호출 수, 총/자체/최대 시간).
+        자체 시간은 자식 span 시간을 뺀 값이다.
+
+        Returns:
+            List[Dict]: 총 시간 내림차순 목록
+        """
+        child_ms: Dict[int, float] = {}
+        for span in self.spans:
+            if span.parent_id is not None:
+                child_ms[span.parent_id] = child_ms.get(span.parent_id, 0.0) + span.duration_ms
+
+        rows: Dict[str, Dict] = {}
+        for span in self.spans:
+            row = rows.setdefault(span.name, {"단계": span.name, "호출 수": 0, "총 시간(ms)": 0.0,
+                                              "자체 시간(ms)": 0.0, "최대(ms)": 0.0})
+            row["호출 수"] += 1
+            row["총 시간(ms)"] += span.duration_ms
+            row["자체 시간(ms)"] += max(0.0, span.duration_ms - child_ms.get(span.span_id, 0.0))
+            row["최대(ms)"] = max(row["최대(ms)"], span.duration_ms)
+
+        for row in rows.values():
+            for key in ("총 시간(ms)", "자체 시간(ms)", "최대(ms)"):
+                row[key] = round(row[key], 1)
+        return sorted(rows.values(), key=lambda r: r["총 시간(ms)"], reverse=True)
+
+    def to_chrome_trace(self) -> Dict:
+        """Chrome trace event 형식 (chrome://tracing, ui.perfetto.dev 에서 열람)"""
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            end_ns = span.end_ns or time.perf_counter_ns()
+            events.append({
+                "name": span.name,
+                "cat": span.kind,
+                "ph": "X",
+                "ts": (span.start_ns - self._origin_perf_ns) / 1000,
+                "dur": (end_ns - span.start_ns) / 1000,
+                "pid": pid,
+                "tid": span.thread_id,
+                "args": {k: _plain(v) for k, v in span.attrs.items()},
+            })
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"run": self.name}}
+
+    def to_otlp_json(self) -> Dict:
+        """OpenTelemetry OTLP/JSON (ExportTraceServiceRequest) 형식"""
+        spans = []
+        for span in self.spans:
+            otel_span = {
+                "traceId": self.trace_id,
+                "spanId": f"{span.span_id:016x}",
+                "name": span.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(self._unix_ns(span.start_ns)),
+                "endTimeUnixNano": str(self._unix_ns(span.end_ns or time.perf_counter_ns())),
+                "attributes": [_otlp_attribute("news.kind", span.kind)] +
+                              [_otlp_attribute(k, v) for k, v in span.attrs.items()],
+            }
+            if span.parent_id is not None:
+                otel_span["parentSpanId"] = f"{span.parent_id:016x}"
+            spans.append(otel_span)
+
+        return {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", "pwc-news-analyzer")]},
+            "scopeSpans": [{"scope": {"name": "tracing", "version": "1"}, "spans": spans}],
+        }]}
+
+
+def _plain(value):
+    return value if isinstance(value, (str, int, float, bool)) or value is None else str(value)
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+@contextmanager
+def activate(tracer: Optional[Tracer]):
+    """현재 컨텍스트에서 tracer를 활성화 (None이면 추적하지 않음)"""
+    token = _current_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current_tracer.reset(token)
+
+
+@contextmanager
+def span(name: str, kind: str = "app", **attrs):
+    """
+    측정 구간. 활성화된 Tracer가 없으면 아무 일도 하지 않는다.
+    kind는 단계 분류(collect, llm, display 등)이고 나머지 키워드 인자는 span 속성이 된다.
+
+        with span("naver.page", query=query) as s:
+            ...
+            if s: s.set(items=len(items))
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+
+    current = tracer.start_span(name, kind, attrs)
+    token = _current_span.set(current)
+    try:
+        yield current
+    finally:
+        current.end_ns = time.perf_counter_ns()
+        _current_span.reset(token)
+
+
+class RunProfiler:
+    """
+    한 번의 실행 전체를 cProfile로 측정합니다 (선택 사항, 오버헤드가 큼).
+    """
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+
+    @contextmanager
+    def running(self):
+        self.profile.enable()
+        try:
+            yield self
+        finally:
+            self.profile.disable()
+
+    def stats_text(self, limit: int = 40, sort: str = "cumulative") -> str:
+        """상위 함수 목록 (pstats 텍스트)"""
+        buffer = io.StringIO()
+        pstats.Stats(self.profile, stream=buffer).sort_stats(sort).print_stats(limit)
+        return buffer.getvalue()
+
+    def dump_bytes(self) -> bytes:
+        """snakeviz, pstats 등에서 열 수 있는 .prof 파일 내용"""
+        import marshal
+        self.profile.create_stats()
+        return marshal.dumps(self.profile.stats)
+
+
+@contextmanager
+def maybe_profile(enabled: bool):
+    """enabled면 RunProfiler로 측정하고, 아니면 None을 넘긴다"""
+    if not enabled:
+        yield None
+        return
+    profiler = RunProfiler()
+    with profiler.running():
+        yield profiler